@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for Bindigo.
+
+Benchmarks are asv-style classes (``setup``/``teardown`` and ``time_*``
+methods) in the ``bench_*`` modules. Run them with ``python -m
+benchmarks.run`` or with asv; see README.md.
+"""
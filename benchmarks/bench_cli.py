@@ -0,0 +1,29 @@
+"""
+Benchmarks for CLI startup.
+
+Each call starts a fresh interpreter, so the times include Python's own
+startup; compare them against a baseline rather than reading them alone.
+"""
+
+import subprocess
+import sys
+
+from .common import IsolatedBenchmark
+
+
+def _run_python(code: str) -> None:
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+class TimeCLIStartup(IsolatedBenchmark):
+    """Startup of the bindigo command before any chemistry is loaded."""
+
+    def time_import_cli(self):
+        _run_python("import bindigo.cli.main")
+
+    def time_help(self):
+        _run_python(
+            "from click.testing import CliRunner\n"
+            "from bindigo.cli.main import cli\n"
+            "CliRunner().invoke(cli, ['--help'])"
+        )
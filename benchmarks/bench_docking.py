@@ -0,0 +1,53 @@
+"""
+Benchmarks for docking with the NumPy stand-in backend.
+
+The NumPy backend follows the same receptor, map and batch code paths as
+the Vina backend, so these benchmarks track the overhead around the
+docking engine without needing AutoDock Vina installed.
+"""
+
+from rdkit import Chem
+
+from bindigo.docking.backend import get_backend
+from bindigo.preprocessing.ligand import prepare_ligands
+from bindigo.preprocessing.protein import prepare_receptor
+
+from .common import (
+    CAVITY_CENTER,
+    LIGAND_SMILES,
+    IsolatedBenchmark,
+    items,
+    receptor_pdb_text,
+)
+
+BOX_SIZE = 10.0
+OPTIONS = {"exhaustiveness": 4, "n_poses": 3, "seed": 0}
+
+
+class TimeDocking(IsolatedBenchmark):
+    """Affinity maps for the synthetic receptor and docking the bundled ligands."""
+
+    def setup(self):
+        super().setup()
+        structure_file = self.tmpdir / "receptor.pdb"
+        structure_file.write_text(receptor_pdb_text())
+        self.receptor = prepare_receptor(str(structure_file))["pdbqt_file"]
+        mols = [Chem.MolFromSmiles(smiles) for smiles in LIGAND_SMILES]
+        self.ligands = [ligand["pdbqt"] for ligand in prepare_ligands(mols)]
+        self.backend = self._backend()
+        self.backend.set_box(CAVITY_CENTER, BOX_SIZE)
+
+    def _backend(self, **kwargs):
+        backend = get_backend("numpy", **OPTIONS, **kwargs)
+        backend.prepare_receptor(self.receptor)
+        return backend
+
+    def time_compute_maps(self):
+        self._backend(use_map_cache=False).set_box(CAVITY_CENTER, BOX_SIZE)
+
+    def time_load_maps(self):
+        self._backend().set_box(CAVITY_CENTER, BOX_SIZE)
+
+    @items(len(LIGAND_SMILES))
+    def time_dock_many(self):
+        self.backend.dock_many(self.ligands)
@@ -0,0 +1,26 @@
+"""
+Benchmarks for ligand preparation.
+"""
+
+from rdkit import Chem
+
+from bindigo.preprocessing.ligand import prepare_ligands
+
+from .common import LIGAND_SMILES, IsolatedBenchmark
+
+
+class TimeLigandPreparation(IsolatedBenchmark):
+    """Preparing the bundled ligands, with and without the ligand cache."""
+
+    items = len(LIGAND_SMILES)
+
+    def setup(self):
+        super().setup()
+        self.mols = [Chem.MolFromSmiles(smiles) for smiles in LIGAND_SMILES]
+        prepare_ligands(self.mols)
+
+    def time_prepare_ligands(self):
+        prepare_ligands(self.mols, use_cache=False)
+
+    def time_prepare_ligands_cached(self):
+        prepare_ligands(self.mols)
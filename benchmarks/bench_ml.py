@@ -0,0 +1,48 @@
+"""
+Benchmarks for feature extraction and batched ML inference.
+"""
+
+import numpy as np
+
+from bindigo.ml.features import FeatureExtractor
+from bindigo.ml.models import FEATURE_NAMES, AffinityModel
+
+from .common import LIGAND_SMILES, IsolatedBenchmark, items, ligand_library, train_model
+
+N_ROWS = 10_000
+
+
+class TimeFeatureExtraction(IsolatedBenchmark):
+    """Building model features for docked ligands."""
+
+    def setup(self):
+        super().setup()
+        self.smiles = list(LIGAND_SMILES)
+        self.library = ligand_library(N_ROWS)
+        self.scores = [-7.5] * N_ROWS
+        self.extractor = FeatureExtractor(use_cache=False)
+        self.extractor.ligand_descriptors(self.smiles)
+
+    @items(len(LIGAND_SMILES))
+    def time_compute_descriptors(self):
+        FeatureExtractor(use_cache=False).ligand_descriptors(self.smiles)
+
+    @items(N_ROWS)
+    def time_features_memoized(self):
+        self.extractor.features(self.library, self.scores)
+
+
+class TimeInference(IsolatedBenchmark):
+    """Predicting pKd for 10,000 feature rows."""
+
+    items = N_ROWS
+
+    def setup(self):
+        super().setup()
+        paths = train_model(self.tmpdir / "models")
+        self.model = AffinityModel.load(paths["model"], paths["scaler"])
+        rng = np.random.default_rng(1)
+        self.features = rng.normal(size=(N_ROWS, len(FEATURE_NAMES)))
+
+    def time_predict_batch(self):
+        self.model.predict_batch(self.features)
@@ -0,0 +1,56 @@
+"""
+Benchmarks for writing screening results.
+"""
+
+from bindigo.core.pipeline import RESULT_COLUMN_TYPES
+from bindigo.utils.io import open_result_writer
+
+from .common import IsolatedBenchmark, ligand_library
+
+N_ROWS = 20_000
+
+SUFFIXES = {
+    "csv": ".csv",
+    "csv.gz": ".csv.gz",
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+
+class TimeResultWriting(IsolatedBenchmark):
+    """Streaming 20,000 result rows to each output format."""
+
+    params = list(SUFFIXES)
+    param_names = ["format"]
+    items = N_ROWS
+
+    def setup(self, fmt):
+        if fmt in ("parquet", "arrow"):
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise NotImplementedError("pyarrow is not installed")
+        super().setup(fmt)
+        self.path = self.tmpdir / f"results{SUFFIXES[fmt]}"
+        self.rows = [
+            {
+                "ligand_id": f"ligand_{i + 1}",
+                "ligand_name": f"lig{i}",
+                "smiles": smiles,
+                "predicted_kd_nM": 120.5 + i,
+                "predicted_pKd": 6.9,
+                "confidence": "medium",
+                "docking_score_kcal_mol": -7.25,
+                "binding_site_center": "(16.5, 16.5, 16.5)",
+                "box_size": 20.0,
+                "pose_file": "",
+                "timestamp": "2026-01-01T00:00:00",
+                "status": "success",
+                "error": "",
+            }
+            for i, smiles in enumerate(ligand_library(N_ROWS))
+        ]
+
+    def time_write_results(self, fmt):
+        with open_result_writer(self.path, RESULT_COLUMN_TYPES) as writer:
+            writer.write_rows(self.rows)
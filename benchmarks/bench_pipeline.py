@@ -0,0 +1,91 @@
+"""
+End-to-end benchmarks of the prediction and screening pipelines.
+"""
+
+from bindigo.core.pipeline import run_prediction, run_screen
+from bindigo.core.predictor import BindingPredictor
+
+from .common import (
+    CAVITY_CENTER,
+    LIGAND_SMILES,
+    IsolatedBenchmark,
+    items,
+    receptor_pdb_text,
+    train_model,
+    write_smiles_library,
+)
+
+N_LIGANDS = 64
+SITE = {"center": CAVITY_CENTER, "box_size": 10.0}
+
+
+class TimePipeline(IsolatedBenchmark):
+    """
+    Predicting one complex and screening a 64-ligand library against the
+    synthetic receptor, with warm receptor and map caches.
+    """
+
+    timeout = 300
+
+    def setup(self):
+        super().setup()
+        train_model(self.tmpdir / "models")
+        self.protein = str(self.tmpdir / "receptor.pdb")
+        (self.tmpdir / "receptor.pdb").write_text(receptor_pdb_text())
+        self.library = str(write_smiles_library(self.tmpdir / "library.smi", N_LIGANDS))
+        self.output = self.tmpdir / "out"
+        self.output.mkdir()
+        # Warm the receptor and map caches shared by all runs
+        run_prediction(
+            self.protein,
+            "CCO",
+            str(self.output / "warmup.csv"),
+            save_pose=False,
+            **SITE,
+        )
+
+    def time_run_prediction(self):
+        run_prediction(
+            self.protein,
+            "CC(=O)Nc1ccc(O)cc1",
+            str(self.output / "prediction.csv"),
+            save_pose=False,
+            **SITE,
+        )
+
+    @items(N_LIGANDS)
+    def time_run_screen(self):
+        run_screen(
+            self.protein, self.library, str(self.output / "screen.csv"), jobs=1, **SITE
+        )
+
+
+class TimeWarmPredictor(IsolatedBenchmark):
+    """
+    Predictions by a BindingPredictor whose target is warm: one complex,
+    and 32 requests submitted at once and served as a micro-batch.
+    """
+
+    def setup(self):
+        super().setup()
+        train_model(self.tmpdir / "models")
+        self.protein = str(self.tmpdir / "receptor.pdb")
+        (self.tmpdir / "receptor.pdb").write_text(receptor_pdb_text())
+        self.predictor = BindingPredictor()
+        self.predictor.predict(self.protein, "CCO", **SITE)
+
+    def teardown(self):
+        self.predictor.close()
+        super().teardown()
+
+    def time_predict(self):
+        self.predictor.predict(self.protein, "CC(=O)Nc1ccc(O)cc1", **SITE)
+
+    @items(len(LIGAND_SMILES))
+    def time_predict_concurrent(self):
+        futures = [
+            self.predictor.submit(self.protein, smiles, **SITE)
+            for smiles in LIGAND_SMILES
+        ]
+        for future in futures:
+            future.result()
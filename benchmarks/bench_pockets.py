@@ -0,0 +1,18 @@
+"""
+Benchmarks for pocket detection.
+"""
+
+from bindigo.preprocessing.pockets import find_pockets
+
+from .common import IsolatedBenchmark, block_with_cavity
+
+
+class TimePocketDetection(IsolatedBenchmark):
+    """Detecting the cavity in a protein-sized block of atoms."""
+
+    def setup(self):
+        super().setup()
+        self.coords = block_with_cavity()
+
+    def time_find_pockets(self):
+        find_pockets(self.coords)
@@ -0,0 +1,54 @@
+"""
+Benchmarks for structure parsing and receptor preparation.
+"""
+
+from bindigo.preprocessing.protein import prepare_receptor
+from bindigo.preprocessing.structure import clean_structure, parse_mmcif, parse_pdb
+
+from .common import (
+    IsolatedBenchmark,
+    mmcif_text,
+    pdb_text,
+    random_coords,
+    receptor_pdb_text,
+)
+
+N_ATOMS = 50_000
+
+
+class TimeStructureParsing(IsolatedBenchmark):
+    """Parsing a 50,000-atom structure from PDB and mmCIF text."""
+
+    items = N_ATOMS
+
+    def setup(self):
+        super().setup()
+        coords = random_coords(N_ATOMS)
+        self.pdb = pdb_text(coords).encode()
+        self.cif = mmcif_text(coords).encode()
+        self.structure = parse_pdb(self.pdb)
+
+    def time_parse_pdb(self):
+        parse_pdb(self.pdb)
+
+    def time_parse_mmcif(self):
+        parse_mmcif(self.cif)
+
+    def time_clean_structure(self):
+        clean_structure(self.structure, True, "A")
+
+
+class TimeReceptorPreparation(IsolatedBenchmark):
+    """Preparing the synthetic receptor block, uncached and from the cache."""
+
+    def setup(self):
+        super().setup()
+        self.structure_file = self.tmpdir / "receptor.pdb"
+        self.structure_file.write_text(receptor_pdb_text())
+        prepare_receptor(str(self.structure_file))
+
+    def time_prepare_receptor(self):
+        prepare_receptor(str(self.structure_file), use_cache=False)
+
+    def time_prepare_receptor_cached(self):
+        prepare_receptor(str(self.structure_file))
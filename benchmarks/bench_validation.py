@@ -0,0 +1,50 @@
+"""
+Benchmarks for input validation.
+"""
+
+from bindigo.utils.validation import (
+    validate_binding_site,
+    validate_ligand_input,
+    validate_ligand_library,
+    validate_output_path,
+    validate_protein_input,
+)
+
+from .common import IsolatedBenchmark, items, ligand_library, write_smiles_library
+
+# Syntactically valid PDB IDs, 1AA0 to 9ZZ9
+PDB_IDS = [
+    f"{i % 9 + 1}{chr(65 + i % 26)}{chr(65 + i // 26 % 26)}{i % 10}"
+    for i in range(1000)
+]
+
+
+class TimeValidation(IsolatedBenchmark):
+    """Validation of CLI inputs, run once per protein or ligand argument."""
+
+    def setup(self):
+        super().setup()
+        self.smiles = ligand_library(256)
+        self.library = write_smiles_library(self.tmpdir / "library.smi", 256)
+        self.output = str(self.tmpdir / "results.csv")
+
+    @items(len(PDB_IDS))
+    def time_validate_protein_input(self):
+        for pdb_id in PDB_IDS:
+            validate_protein_input(pdb_id)
+
+    @items(256)
+    def time_validate_ligand_input(self):
+        for smiles in self.smiles:
+            validate_ligand_input(smiles)
+
+    def time_validate_ligand_library(self):
+        validate_ligand_library(str(self.library))
+
+    @items(1000)
+    def time_validate_binding_site(self):
+        for i in range(1000):
+            validate_binding_site((float(i), 1.0, -2.5), 20.0)
+
+    def time_validate_output_path(self):
+        validate_output_path(self.output)
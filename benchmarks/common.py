@@ -0,0 +1,204 @@
+"""
+Synthetic inputs and isolation helpers shared by the benchmarks.
+
+Everything here is generated from fixed seeds, so the benchmarks run
+offline and measure the same work on every machine and every release.
+"""
+
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from bindigo.core.config import Config
+
+# Drug-like ligands of 10-35 heavy atoms
+LIGAND_SMILES = [
+    "CC(=O)Nc1ccc(O)cc1",
+    "CC(=O)Oc1ccccc1C(=O)O",
+    "Cn1cnc2c1c(=O)n(C)c(=O)n2C",
+    "CC(C)Cc1ccc(C(C)C(=O)O)cc1",
+    "COc1ccc2[nH]cc(CCN(C)C)c2c1",
+    "CN1CCC[C@H]1c1cccnc1",
+    "O=C(O)c1ccccc1O",
+    "CC(C)NCC(O)COc1cccc2ccccc12",
+    "CN(C)CCCN1c2ccccc2CCc2ccccc21",
+    "Clc1ccc2c(c1)C(c1ccccc1)=NCC(=O)N2",
+    "CC1=C(C(=O)OC)C(c2ccccc2[N+](=O)[O-])C(C(=O)OC)=C(C)N1",
+    "CCOC(=O)C1=C(COCCN)NC(C)=C(C(=O)OC)C1c1ccccc1Cl",
+    "CC(C)(C)NCC(O)c1ccc(O)c(CO)c1",
+    "NC(=O)c1ccc[n+]([C@@H]2O[C@H](CO)[C@@H](O)[C@H]2O)c1",
+    "CS(=O)(=O)Nc1ccc(cc1)C(O)CNC(C)C",
+    "OC(=O)CCCc1ccc(N(CCCl)CCCl)cc1",
+    "COc1cc(Cc2cnc(N)nc2N)cc(OC)c1OC",
+    "Nc1ccc(cc1)S(=O)(=O)Nc1ccccn1",
+    "CC(=O)Nc1nnc(s1)S(N)(=O)=O",
+    "O=C1CN=C(c2ccccc2)c2cc(Cl)ccc2N1",
+    "CN1C(=O)CN=C(c2ccccc2)c2cc(Cl)ccc21",
+    "CCN(CC)CC(=O)Nc1c(C)cccc1C",
+    "C[C@H](N)Cc1ccccc1",
+    "OC[C@H]1O[C@@H](O)[C@H](O)[C@@H](O)[C@@H]1O",
+    "c1ccc2c(c1)ccc1ccccc12",
+    "CC(C)(C)c1ccc(cc1)C(=O)CCCN1CCC(CC1)OC(c1ccccc1)c1ccccc1",
+    "COc1ccc(CCN(C)CCCC(C#N)(C(C)C)c2ccc(OC)c(OC)c2)cc1OC",
+    "CC(=O)OCC(=O)[C@@]12OC(C)(C)O[C@@H]1C[C@H]1[C@@H]3CCC4=CC(=O)C=C[C@]4(C)[C@@]3(F)[C@@H](O)C[C@@]12C",
+    "Cc1ccc(cc1)S(=O)(=O)NC(=O)NN1CCCCCC1",
+    "CCCCc1oc2ccccc2c1C(=O)c1cc(I)c(OCCN(CC)CC)c(I)c1",
+    "O=C(O)Cc1ccccc1Nc1c(Cl)cccc1Cl",
+    "CNC(=O)c1cc(Oc2ccc(NC(=O)Nc3ccc(Cl)c(C(F)(F)F)c3)cc2)ccn1",
+]
+
+# Cavity center of the synthetic receptor block
+CAVITY_CENTER = (16.5, 16.5, 16.5)
+
+# Lattice spacing of synthetic receptors, just beyond bonding distance
+RECEPTOR_SPACING = 2.2
+
+_BACKBONE = (("N", "N"), ("CA", "C"), ("C", "C"), ("O", "O"))
+
+
+def ligand_library(n: int) -> List[str]:
+    """Return ``n`` SMILES, cycling through LIGAND_SMILES."""
+    return [LIGAND_SMILES[i % len(LIGAND_SMILES)] for i in range(n)]
+
+
+def write_smiles_library(path: Path, n: int) -> Path:
+    """Write a SMILES library file with ``n`` named entries."""
+    lines = [f"{smiles} lig{i}\n" for i, smiles in enumerate(ligand_library(n))]
+    path.write_text("".join(lines))
+    return path
+
+
+def block_with_cavity(
+    extent: float = 33.0, radius: float = 6.0, spacing: float = 1.5
+) -> np.ndarray:
+    """
+    Return jittered lattice atoms filling a cube, minus a spherical cavity.
+
+    The default spacing packs atoms as densely as in a protein. Receptors
+    to be prepared need ``spacing=RECEPTOR_SPACING``: RDKit bonds atoms
+    closer than about 2 A, and a dense lattice turns into one huge ring
+    system.
+    """
+    rng = np.random.default_rng(0)
+    axis = np.arange(0.0, extent, spacing)
+    coords = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), -1).reshape(-1, 3)
+    coords += rng.normal(scale=0.2, size=coords.shape)
+    return coords[np.linalg.norm(coords - CAVITY_CENTER, axis=1) > radius]
+
+
+def pdb_text(coords: np.ndarray, chains: str = "AB") -> str:
+    """
+    Format coordinates as PDB ATOM records of glycine backbone atoms.
+
+    Atoms are split evenly over ``chains``; every fourth atom starts a new
+    residue.
+    """
+    lines = []
+    per_chain = -(-len(coords) // len(chains))
+    for i, (x, y, z) in enumerate(coords):
+        name, element = _BACKBONE[i % 4]
+        chain = chains[i // per_chain]
+        lines.append(
+            f"ATOM  {(i + 1) % 100000:5d}  {name:<3} GLY {chain}{i // 4 % 10000:4d}    "
+            f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00 10.00          {element:>2}\n"
+        )
+    lines.append("END\n")
+    return "".join(lines)
+
+
+def mmcif_text(coords: np.ndarray) -> str:
+    """Format coordinates as an mmCIF atom_site loop of glycine backbone atoms."""
+    fields = (
+        "group_PDB id type_symbol label_atom_id label_alt_id label_comp_id "
+        "label_asym_id label_seq_id Cartn_x Cartn_y Cartn_z occupancy "
+        "B_iso_or_equiv auth_asym_id pdbx_PDB_model_num"
+    ).split()
+    lines = ["data_BENCH\n", "loop_\n"] + [f"_atom_site.{field}\n" for field in fields]
+    for i, (x, y, z) in enumerate(coords):
+        name, element = _BACKBONE[i % 4]
+        lines.append(
+            f"ATOM {i + 1} {element} {name} . GLY A {i // 4 + 1} "
+            f"{x:.3f} {y:.3f} {z:.3f} 1.00 10.00 A 1\n"
+        )
+    lines.append("#\n")
+    return "".join(lines)
+
+
+def receptor_pdb_text() -> str:
+    """Return PDB text of a receptor block with a cavity at CAVITY_CENTER."""
+    return pdb_text(block_with_cavity(spacing=RECEPTOR_SPACING), chains="A")
+
+
+def random_coords(n_atoms: int, seed: int = 0) -> np.ndarray:
+    """Return ``n_atoms`` random coordinates in a 100 A cube."""
+    return np.random.default_rng(seed).uniform(0.0, 100.0, size=(n_atoms, 3))
+
+
+def train_model(models_dir: Path) -> Dict[str, Path]:
+    """
+    Train a small affinity model on random features and save it as the
+    default model in ``models_dir``.
+
+    Returns:
+        Written artifact paths (see bindigo.ml.models.model_files)
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    from bindigo.ml.models import FEATURE_NAMES, save_model
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(256, len(FEATURE_NAMES)))
+    target = 6.0 - features[:, 0] + 0.1 * features[:, 1]
+    scaler = StandardScaler().fit(features)
+    model = RandomForestRegressor(n_estimators=50, max_depth=8, random_state=0)
+    model.fit(scaler.transform(features), target)
+    return save_model(model, scaler, models_dir=models_dir)
+
+
+class IsolatedBenchmark:
+    """
+    Base class running each benchmark against a private temporary directory.
+
+    ``setup`` points every on-disk cache and the models directory at a new
+    temporary directory and selects the NumPy docking backend, so no
+    benchmark reads state left by a user's runs or by another benchmark.
+    ``teardown`` restores the configuration and removes the directory.
+    Subclasses extend ``setup`` and call the base method first.
+    """
+
+    def setup(self, *params: Any) -> None:
+        self.tmpdir = Path(tempfile.mkdtemp(prefix="bindigo-bench-"))
+        overrides: Dict[str, Any] = {
+            "PDB_CACHE_DIR": self.tmpdir / "cache" / "pdb",
+            "RECEPTOR_CACHE_DIR": self.tmpdir / "cache" / "receptors",
+            "LIGAND_CACHE_FILE": self.tmpdir / "cache" / "ligands.sqlite",
+            "GRID_MAP_CACHE_DIR": self.tmpdir / "cache" / "grid_maps",
+            "POCKET_CACHE_DIR": self.tmpdir / "cache" / "pockets",
+            "MODELS_DIR": self.tmpdir / "models",
+            "DOCKING_BACKEND": "numpy",
+        }
+        self._saved_config = {key: getattr(Config, key) for key in overrides}
+        Config.update(**overrides)
+
+    def teardown(self, *params: Any) -> None:
+        Config.update(**self._saved_config)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def items(n: int) -> Callable[[Callable], Callable]:
+    """
+    Mark a benchmark as processing ``n`` items per call.
+
+    The runner reports throughput (items per second) for marked
+    benchmarks; a class attribute ``items`` applies to all its methods.
+    """
+
+    def mark(func: Callable) -> Callable:
+        func.items = n
+        return func
+
+    return mark
@@ -0,0 +1,283 @@
+#!/usr/bin/env python
+"""
+Run the Bindigo benchmarks and write the results as JSON.
+
+The benchmarks are asv-style classes, so they also run under asv; this
+runner needs nothing beyond Bindigo's own dependencies. Each benchmark is
+set up once, called repeatedly, and reported as the median, minimum,
+mean and standard deviation of the time per call, plus throughput for
+benchmarks that declare how many items one call processes.
+
+Usage:
+    python -m benchmarks.run                          # all benchmarks
+    python -m benchmarks.run -b docking -o new.json   # matching names only
+    python -m benchmarks.run --compare baseline.json  # fail on regressions
+
+With ``--compare``, a benchmark whose median time grew by more than
+``--threshold`` (a fraction, default 0.2) over the baseline is reported
+as a regression and the runner exits with status 1.
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import os
+import pkgutil
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+RESULTS_FORMAT = 1
+
+if __package__ in (None, ""):
+    # Allow "python benchmarks/run.py" as well as "python -m benchmarks.run"
+    sys.path.insert(0, str(BENCHMARK_DIR.parent))
+
+
+def discover(pattern: Optional[str] = None) -> Iterator[Tuple[str, type, str, Tuple]]:
+    """
+    Yield (name, class, method name, params) for every benchmark.
+
+    Names have the form ``<module>.<Class>.<method>``, with the parameter
+    values appended in parentheses for parameterized classes.
+
+    Args:
+        pattern: Regular expression a name must contain to be included
+    """
+    regex = re.compile(pattern) if pattern else None
+    for module_info in sorted(pkgutil.iter_modules([str(BENCHMARK_DIR)])):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"benchmarks.{module_info.name}")
+        short = module_info.name[len("bench_") :]
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            params = getattr(cls, "params", None)
+            if params and not isinstance(params[0], (list, tuple)):
+                params = [params]
+            combinations = list(itertools.product(*params)) if params else [()]
+            for method in sorted(m for m in dir(cls) if m.startswith("time_")):
+                for combination in combinations:
+                    name = f"{short}.{cls_name}.{method}"
+                    if combination:
+                        name += f"({', '.join(map(str, combination))})"
+                    if regex is None or regex.search(name):
+                        yield name, cls, method, combination
+
+
+def measure(
+    cls: type,
+    method: str,
+    params: Tuple,
+    repeat: int,
+    min_time: float,
+) -> Dict[str, Any]:
+    """
+    Time one benchmark.
+
+    The benchmark is called once to warm up, then in ``repeat`` samples of
+    ``number`` calls each, with ``number`` chosen so a sample takes at
+    least ``min_time`` seconds.
+
+    Returns:
+        Result dictionary (times are seconds per call)
+
+    Raises:
+        NotImplementedError: If the benchmark's setup skips it
+    """
+    instance = cls()
+    if hasattr(instance, "setup"):
+        instance.setup(*params)
+    try:
+        func = getattr(instance, method)
+        start = time.perf_counter()
+        func(*params)
+        warmup = time.perf_counter() - start
+        number = max(1, int(min_time / warmup)) if warmup > 0 else 1
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func(*params)
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown(*params)
+
+    median = statistics.median(samples)
+    n_items = getattr(func, "items", getattr(cls, "items", None))
+    return {
+        "median": median,
+        "min": min(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        "number": number,
+        "repeat": repeat,
+        "samples": samples,
+        "items": n_items,
+        "items_per_second": n_items / median if n_items and median > 0 else None,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code the benchmarks ran on."""
+    import bindigo
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BENCHMARK_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "bindigo_version": bindigo.__version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def compare(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[Tuple[str, float]]:
+    """
+    Compare median times against a baseline results file.
+
+    Returns:
+        (name, ratio) of benchmarks slower than the baseline by more than
+        ``threshold``, where ratio is new median / baseline median
+    """
+    regressions = []
+    print(f"\n{'Benchmark':<60}{'Baseline':>12}{'Current':>12}{'Ratio':>8}")
+    for name, result in results["benchmarks"].items():
+        before = baseline.get("benchmarks", {}).get(name)
+        if before is None or not before["median"]:
+            continue
+        ratio = result["median"] / before["median"]
+        flag = ""
+        if ratio > 1.0 + threshold:
+            regressions.append((name, ratio))
+            flag = "  REGRESSION"
+        print(
+            f"{name:<60}{_format_time(before['median']):>12}"
+            f"{_format_time(result['median']):>12}{ratio:>8.2f}{flag}"
+        )
+    return regressions
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks; return the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "-b", "--bench", help="Only run benchmarks whose name matches this regex"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="benchmark-results.json",
+        help="Results file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Samples per benchmark (default: 5)"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Minimum seconds per sample (default: 0.2)",
+    )
+    parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="One sample of one call per benchmark, to check they run",
+    )
+    parser.add_argument("--compare", type=Path, help="Baseline results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Slowdown over the baseline counted as a regression (default: 0.2)",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="List benchmark names and exit"
+    )
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 1, 0.0
+
+    benchmarks = list(discover(args.bench))
+    if args.list:
+        for name, *_ in benchmarks:
+            print(name)
+        return 0
+
+    results: Dict[str, Any] = {
+        "format": RESULTS_FORMAT,
+        "environment": environment(),
+        "quick": args.quick,
+        "benchmarks": {},
+        "skipped": {},
+        "errors": {},
+    }
+    for name, cls, method, params in benchmarks:
+        try:
+            result = measure(cls, method, params, args.repeat, args.min_time)
+        except NotImplementedError as e:
+            results["skipped"][name] = str(e)
+            print(f"{name:<60}{'skipped':>12}  {e}")
+            continue
+        except Exception:
+            results["errors"][name] = traceback.format_exc()
+            print(f"{name:<60}{'failed':>12}", file=sys.stderr)
+            traceback.print_exc()
+            continue
+        results["benchmarks"][name] = result
+        rate = result["items_per_second"]
+        rate_text = f"{rate:>14,.0f} items/s" if rate else ""
+        print(f"{name:<60}{_format_time(result['median']):>12}{rate_text}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nWrote {len(results['benchmarks'])} results to {output}")
+
+    status = 1 if results["errors"] else 0
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text())
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} benchmark(s) regressed by more than "
+                f"{args.threshold:.0%}"
+            )
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
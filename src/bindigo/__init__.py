@@ -8,10 +8,17 @@ Example usage:
     Basic prediction from command line:
         $ bindigo predict --protein 1HSG --ligand "CCO" --output results.csv
 
+    Python API:
+        from bindigo import run_prediction
+        result = run_prediction("1HSG", "CCO", "results.csv")
+
     Python API (v1.1+):
         from bindigo import BindingPredictor
         predictor = BindingPredictor()
         result = predictor.predict(protein="1HSG", ligand="CCO")
+
+Subpackages and the names exported here are imported on first access, so
+``import bindigo`` does not load NumPy, RDKit or scikit-learn.
 """
 
 from bindigo.__version__ import (
@@ -22,6 +29,7 @@ from bindigo.__version__ import (
     __author__,
     __license__,
 )
+from bindigo.utils.lazy import lazy_exports
 
 # Package-level exports (will be populated as modules are implemented)
 __all__ = [
@@ -31,8 +39,30 @@ __all__ = [
     "__description__",
     "__author__",
     "__license__",
+    "config",
+    "run_prediction",
+    "run_screen",
 ]
 
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    submodules=[
+        "cli",
+        "core",
+        "database",
+        "docking",
+        "ml",
+        "preprocessing",
+        "utils",
+        "visualization",
+    ],
+    exports={
+        "config": "core.config",
+        "run_prediction": "core.pipeline",
+        "run_screen": "core.pipeline",
+    },
+)
+
 # Python API exports (v1.1+)
 # from bindigo.core.predictor import BindingPredictor
 # __all__.append("BindingPredictor")
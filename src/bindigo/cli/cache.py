@@ -0,0 +1,147 @@
+"""
+Cache command for Bindigo CLI.
+
+Manages the local PDB structure cache: prefetching entries for offline
+use, verifying checksums, listing and pruning.
+"""
+
+import time
+from pathlib import Path
+
+import click
+
+from bindigo.cli.utils import print_error, print_success, print_warning
+
+
+def _format_size(n_bytes: int) -> str:
+    """Format a byte count for display."""
+    size = float(n_bytes)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _format_age(timestamp: float) -> str:
+    """Format the time since a Unix timestamp for display."""
+    seconds = max(time.time() - timestamp, 0)
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m ago"
+    if seconds < 86400:
+        return f"{seconds / 3600:.0f}h ago"
+    return f"{seconds / 86400:.0f}d ago"
+
+
+@click.group()
+def cache():
+    """
+    Manage the local PDB structure cache.
+
+    Entries in the cache are used without any network access, so
+    prefetching the targets of a run makes it work offline.
+
+    \b
+    Examples:
+      $ bindigo cache prefetch 1HSG 3ERT 4DJU
+      $ bindigo cache prefetch --file targets.txt
+      $ bindigo cache list
+      $ bindigo cache verify --fix
+      $ bindigo cache prune --max-size 500 --older-than 30
+    """
+
+
+@cache.command()
+@click.argument("pdb_ids", nargs=-1)
+@click.option(
+    "--file",
+    "id_file",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="File with PDB IDs, separated by whitespace or newlines",
+)
+@click.option("--force", is_flag=True, help="Fetch again even if already cached")
+def prefetch(pdb_ids, id_file, force):
+    """Fetch PDB entries into the cache."""
+    from bindigo.database.pdb import fetch_pdbs
+
+    pdb_ids = list(pdb_ids)
+    if id_file is not None:
+        pdb_ids += id_file.read_text().split()
+    if not pdb_ids:
+        raise click.UsageError("Give PDB IDs as arguments or with --file")
+
+    results = fetch_pdbs(list(dict.fromkeys(pdb_ids)), force=force)
+    failed = [r for r in results if isinstance(r, Exception)]
+    for result in failed:
+        print_error(str(result))
+    print_success(f"{len(results) - len(failed)} of {len(results)} entries cached")
+    if failed:
+        raise click.exceptions.Exit(1)
+
+
+@cache.command(name="list")
+def list_entries():
+    """List cached entries, most recently used first."""
+    from bindigo.database.pdb import get_fetcher
+
+    index = get_fetcher().index
+    entries = index.entries()
+    if not entries:
+        click.echo(f"No cached entries in {index.cache_dir}")
+        return
+    click.echo(f"{'PDB ID':<8}{'Format':<8}{'Size':>10}  {'Last used':<12}")
+    for entry in entries:
+        click.echo(
+            f"{entry['pdb_id']:<8}{entry['format']:<8}"
+            f"{_format_size(entry['size']):>10}  {_format_age(entry['last_access']):<12}"
+        )
+    click.echo(
+        f"\n{len(entries)} entries, {_format_size(index.size_bytes())} "
+        f"in {index.cache_dir}"
+    )
+
+
+@cache.command()
+@click.option("--fix", is_flag=True, help="Remove missing and corrupt entries")
+def verify(fix):
+    """Check cached files against their recorded checksums."""
+    from bindigo.database.pdb import get_fetcher
+
+    report = get_fetcher().index.verify(fix=fix)
+    if report["indexed"]:
+        print_success(f"Indexed {len(report['indexed'])} untracked file(s)")
+    problems = report["missing"] + report["corrupt"]
+    for pdb_id in report["missing"]:
+        print_warning(f"{pdb_id}: file missing")
+    for pdb_id in report["corrupt"]:
+        print_warning(f"{pdb_id}: checksum mismatch")
+    print_success(f"{len(report['ok'])} entries verified")
+    if problems:
+        if fix:
+            print_success(f"Removed {len(problems)} bad entries")
+        else:
+            click.echo("Run 'bindigo cache verify --fix' to remove bad entries")
+            raise click.exceptions.Exit(1)
+
+
+@cache.command()
+@click.option(
+    "--max-size",
+    type=click.FloatRange(min=0),
+    help="Remove least recently used entries until the cache is at most this "
+    "many MB  [default: Config.PDB_CACHE_MAX_MB]",
+)
+@click.option(
+    "--older-than",
+    type=click.FloatRange(min=0),
+    help="Remove entries not used for this many days",
+)
+def prune(max_size, older_than):
+    """Remove entries by size or age."""
+    from bindigo.core.config import config
+    from bindigo.database.pdb import get_fetcher
+
+    if max_size is None and older_than is None:
+        max_size = config.PDB_CACHE_MAX_MB
+    removed = get_fetcher().index.prune(max_size_mb=max_size, max_age_days=older_than)
+    print_success(f"Removed {len(removed)} entries")
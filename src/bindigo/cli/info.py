@@ -60,11 +60,14 @@ def info(show_version, show_models, show_citation):
         try:
             from bindigo.ml.models import list_available_models
             models = list_available_models()
+            if not models:
+                click.echo("\n  No models installed")
             for model in models:
                 click.echo(f"\n  • {model['name']}")
                 click.echo(f"    Algorithm: {model.get('algorithm', 'N/A')}")
                 click.echo(f"    Training set: {model.get('training_set', 'N/A')}")
                 click.echo(f"    Features: {model.get('n_features', 'N/A')}")
+                click.echo(f"    Size: {model['size_mb']:.1f} MB")
         except ImportError:
             click.echo("\n  • default (Random Forest, PDBbind v2020, 8 features)")
         click.echo()
@@ -7,7 +7,10 @@ This module defines the main command group and imports subcommands.
 import click
 
 from bindigo.__version__ import __version__
+from bindigo.cli.cache import cache
 from bindigo.cli.predict import predict
+from bindigo.cli.screen import screen
+from bindigo.cli.serve import serve
 from bindigo.cli.info import info
 
 
@@ -32,6 +35,16 @@ def cli(ctx):
       # Custom binding site
       $ bindigo predict --protein 1HSG --ligand "CCO" --center 10 20 15 --output results.csv
 
+      # Virtual screening of a compound library
+      $ bindigo screen --protein protein.pdb --ligands compounds.sdf --output screen.csv --jobs 4
+
+      # Keep models and prepared targets warm for repeated predictions
+      $ bindigo serve --preload 1HSG
+      $ bindigo predict --server --protein 1HSG --ligand "CCO" --output results.csv
+
+      # Prefetch structures for offline use
+      $ bindigo cache prefetch 1HSG 3ERT
+
     \b
     Documentation: https://github.com/bindigo/bindigo
     Report issues: https://github.com/bindigo/bindigo/issues
@@ -42,7 +55,10 @@ def cli(ctx):
 
 # Register subcommands
 cli.add_command(predict)
+cli.add_command(screen)
 cli.add_command(info)
+cli.add_command(cache)
+cli.add_command(serve)
 
 
 def main():
@@ -5,7 +5,6 @@ Handles single protein-ligand binding affinity predictions.
 """
 
 import click
-from pathlib import Path
 
 from bindigo.cli.utils import print_header, print_error, print_success
 
@@ -40,9 +39,9 @@ from bindigo.cli.utils import print_header, print_error, print_success
 @click.option(
     "--size",
     type=float,
-    default=20.0,
-    show_default=True,
-    help="Binding site box size in Angstroms. "
+    default=None,
+    help="Binding site box size in Angstroms [default: fitted to the detected "
+    "pocket, or Config.BINDING_SITE_DEFAULT_SIZE with --center]. "
     "Larger values cover more space but increase computation time.",
 )
 @click.option(
@@ -51,13 +50,31 @@ from bindigo.cli.utils import print_header, print_error, print_success
     show_default=True,
     help="Save docked ligand pose as PDB file",
 )
+@click.option(
+    "--metrics",
+    "metrics_file",
+    type=click.Path(dir_okay=False),
+    help="Write per-stage timings, cache hits and peak memory to this file "
+    "(Prometheus text for .prom files, JSON otherwise)",
+)
+@click.option(
+    "--server",
+    is_flag=False,
+    flag_value="",
+    default=None,
+    metavar="[ADDRESS]",
+    help="Send the prediction to a running 'bindigo serve' (HOST:PORT or "
+    "unix:/path/to.sock; default: Config.SERVER_HOST:Config.SERVER_PORT)",
+)
 @click.option(
     "--verbose",
     is_flag=True,
     default=False,
     help="Show detailed progress and intermediate results",
 )
-def predict(protein, ligand, output, center, size, save_pose, verbose):
+def predict(
+    protein, ligand, output, center, size, save_pose, metrics_file, server, verbose
+):
     """
     Predict protein-ligand binding affinity using docking + ML.
 
@@ -84,24 +101,33 @@ def predict(protein, ligand, output, center, size, save_pose, verbose):
 
       # Verbose output for debugging
       $ bindigo predict --protein 1HSG --ligand "CCO" --output test.csv --verbose
+
+      # Use a warm server started with 'bindigo serve'
+      $ bindigo predict --server --protein 1HSG --ligand "CCO" --output results.csv
     """
     try:
         # Print header
         print_header(verbose=verbose)
 
-        # Import here to avoid slow startup
-        from bindigo.core.pipeline import run_prediction
-
-        # Run prediction pipeline
-        result = run_prediction(
-            protein=protein,
-            ligand=ligand,
-            output=output,
-            center=center,
-            box_size=size,
-            save_pose=save_pose,
-            verbose=verbose,
-        )
+        if server is not None:
+            result = _predict_on_server(
+                server, protein, ligand, output, center, size, save_pose, metrics_file
+            )
+        else:
+            # Import here to avoid slow startup
+            from bindigo.core.pipeline import run_prediction
+
+            # Run prediction pipeline
+            result = run_prediction(
+                protein=protein,
+                ligand=ligand,
+                output=output,
+                center=center,
+                box_size=size,
+                save_pose=save_pose,
+                verbose=verbose,
+                metrics_file=metrics_file,
+            )
 
         # Print success message
         print_success(f"Results saved to: {output}")
@@ -113,3 +139,38 @@ def predict(protein, ligand, output, center, size, save_pose, verbose):
     except Exception as e:
         print_error(str(e))
         raise click.Abort()
+
+
+def _predict_on_server(
+    server, protein, ligand, output, center, size, save_pose, metrics_file
+):
+    """
+    Run a prediction on a 'bindigo serve' server and write its results here.
+
+    Only the standard library and Bindigo's lightweight modules are
+    imported, so the client starts quickly; the server does the docking
+    and the affinity prediction.
+    """
+    from bindigo.core.server import PredictionClient
+    from bindigo.docking.pose_extraction import save_best_pose
+    from bindigo.utils.io import RESULT_COLUMN_TYPES, open_result_writer
+    from bindigo.utils.metrics import PipelineMetrics
+    from bindigo.utils.validation import validate_output_path
+
+    output_path = validate_output_path(output)
+    result = PredictionClient(server).predict(
+        protein, ligand, center=center or None, box_size=size, save_pose=save_pose
+    )
+
+    row = result["row"]
+    if save_pose:
+        pose_file = output_path.parent / f"{row['ligand_id']}_pose.pdb"
+        row["pose_file"] = str(save_best_pose(result.pop("poses"), pose_file))
+    with open_result_writer(output_path, RESULT_COLUMN_TYPES) as writer:
+        writer.write_row(row)
+    if metrics_file:
+        PipelineMetrics.from_dict(result["metrics"]).write(metrics_file)
+
+    result["output"] = str(output_path)
+    result["pose_file"] = row["pose_file"]
+    return result
@@ -0,0 +1,227 @@
+"""
+Screen command for Bindigo CLI.
+
+Handles batch virtual screening of a ligand library against one protein.
+"""
+
+import click
+
+from bindigo.cli.utils import print_header, print_error, print_success, print_warning
+
+
+@click.command()
+@click.option(
+    "--protein",
+    required=True,
+    type=str,
+    help="PDB ID (e.g., '1HSG') or file path (e.g., './protein.pdb')",
+)
+@click.option(
+    "--ligands",
+    required=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="Multi-molecule SDF or SMILES (.smi) library file, optionally gzipped",
+)
+@click.option(
+    "--output",
+    required=True,
+    type=click.Path(),
+    help="Output file path: .csv, .csv.gz, .parquet or .arrow (e.g., 'screen.csv')",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["csv", "parquet", "arrow"]),
+    default=None,
+    help="Output format for paths without an extension "
+    "[default: Config.OUTPUT_FORMAT]",
+)
+@click.option(
+    "--center",
+    type=float,
+    nargs=3,
+    metavar="X Y Z",
+    help="Binding site center coordinates (X Y Z in Angstroms). "
+    "If not specified, the largest pocket will be detected automatically.",
+)
+@click.option(
+    "--size",
+    type=float,
+    default=None,
+    help="Binding site box size in Angstroms [default: fitted to the detected "
+    "pocket, or Config.BINDING_SITE_DEFAULT_SIZE with --center]. "
+    "Larger values cover more space but increase computation time.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of parallel worker processes [default: number of CPU cores]. "
+    "Fewer run at once if they would not fit in Config.MAX_MEMORY_GB.",
+)
+@click.option(
+    "--start",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Index of the first library record to screen (for sharding)",
+)
+@click.option(
+    "--stop",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Index one past the last library record to screen [default: end]",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    default=False,
+    help="Resume an interrupted screen from its checkpoint journal "
+    "(<output>.journal), skipping ligands that already finished",
+)
+@click.option(
+    "--funnel",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=None,
+    metavar="FRACTION",
+    help="Dock every ligand at low exhaustiveness first, then re-dock only "
+    "the top FRACTION (e.g. 0.05) at full exhaustiveness",
+)
+@click.option(
+    "--funnel-by",
+    type=click.Choice(["score", "pkd"]),
+    default="score",
+    show_default=True,
+    help="Ranking used to pick the ligands re-docked by --funnel",
+)
+@click.option(
+    "--metrics",
+    "metrics_file",
+    type=click.Path(dir_okay=False),
+    help="Write per-stage timings, cache hits and peak memory to this file "
+    "(Prometheus text for .prom files, JSON otherwise)",
+)
+@click.option(
+    "--verbose",
+    is_flag=True,
+    default=False,
+    help="Show detailed progress and intermediate results",
+)
+def screen(
+    protein,
+    ligands,
+    output,
+    output_format,
+    center,
+    size,
+    jobs,
+    start,
+    stop,
+    resume,
+    funnel,
+    funnel_by,
+    metrics_file,
+    verbose,
+):
+    """
+    Screen a ligand library against a protein using docking + ML.
+
+    The protein is prepared once and ligands are distributed over a pool
+    of worker processes. Result rows are written to the output file as
+    they complete, so partial results are available during long screens,
+    and every finished batch is checkpointed so --resume can pick up an
+    interrupted run where it stopped.
+
+    \b
+    Input Formats:
+      Protein:  PDB file, PDB ID (auto-fetched from RCSB)
+      Ligands:  Multi-molecule SDF file, SMILES file (one per line),
+                or gzipped variants (.sdf.gz, .smi.gz)
+
+    \b
+    Output Formats:
+      .csv / .csv.gz    Text results (streamed, resumable in place)
+      .parquet          Columnar results with typed columns (needs pyarrow)
+      .arrow            Arrow IPC file (needs pyarrow)
+
+    \b
+    Examples:
+      # Screen an SDF library on 4 cores
+      $ bindigo screen --protein protein.pdb --ligands compounds.sdf --output screen.csv --jobs 4
+
+      # SMILES library with a custom binding site
+      $ bindigo screen --protein 1HSG --ligands library.smi --center 10 20 15 --output screen.csv
+
+      # Screen records 100000-199999 of a large library (one shard)
+      $ bindigo screen --protein 1HSG --ligands library.sdf.gz --start 100000 --stop 200000 --output shard2.csv
+
+      # Columnar output for large screens
+      $ bindigo screen --protein protein.pdb --ligands compounds.sdf.gz --output screen.parquet
+
+      # Coarse-dock everything, re-dock the best 5% at full exhaustiveness
+      $ bindigo screen --protein protein.pdb --ligands library.smi --output screen.csv --funnel 0.05
+
+      # Continue a screen that was interrupted
+      $ bindigo screen --protein protein.pdb --ligands compounds.sdf --output screen.csv --resume
+    """
+    try:
+        print_header(verbose=verbose)
+
+        # Import here to avoid slow startup
+        from bindigo.core.pipeline import run_screen
+
+        result = run_screen(
+            protein=protein,
+            ligands=ligands,
+            output=output,
+            center=center,
+            box_size=size,
+            jobs=jobs,
+            start=start,
+            stop=stop,
+            resume=resume,
+            output_format=output_format,
+            funnel=funnel,
+            funnel_by=funnel_by,
+            verbose=verbose,
+            metrics_file=metrics_file,
+        )
+
+        print_success(f"Results saved to: {result['output']}")
+        if result["n_resumed"]:
+            print_success(
+                f"Resumed from checkpoint: {result['n_resumed']} ligands already done"
+            )
+        if result["n_failed"]:
+            print_warning(
+                f"{result['n_failed']} of {result['n_ligands']} ligands failed "
+                "(see 'status' and 'error' columns)"
+            )
+        if result["ligand_timeouts"]:
+            print_warning(
+                f"{result['ligand_timeouts']} ligands timed out or lost their "
+                "worker and were skipped (Config.TIMEOUT_SECONDS)"
+            )
+
+        if "funnel" in result:
+            summary = result["funnel"]
+            message = (
+                f"Funnel re-docked {summary['n_refined']} ligands at full "
+                "exhaustiveness"
+            )
+            if summary["time_saved"] is not None:
+                message += (
+                    f", saving ~{summary['time_saved']:.0f}s (estimated "
+                    f"single-stage: {summary['estimated_single_stage_time']:.0f}s)"
+                )
+            print_success(message)
+
+        click.echo(
+            f"\n✓ Screened {result['n_ligands']} ligands with {result['jobs']} "
+            f"worker(s) in {result.get('execution_time', 0):.0f}s"
+        )
+
+    except Exception as e:
+        print_error(str(e))
+        raise click.Abort()
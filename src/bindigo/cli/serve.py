@@ -0,0 +1,113 @@
+"""
+Serve command for Bindigo CLI.
+
+Runs a long-lived prediction server that keeps the affinity model,
+prepared receptors and docking maps in memory between requests.
+"""
+
+import click
+
+from bindigo.cli.utils import print_error, print_success
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    help="Listen on this Unix domain socket instead of TCP",
+)
+@click.option(
+    "--host",
+    default=None,
+    help="TCP host to listen on [default: Config.SERVER_HOST, 127.0.0.1]",
+)
+@click.option(
+    "--port",
+    type=int,
+    default=None,
+    help="TCP port to listen on [default: Config.SERVER_PORT, 8765]",
+)
+@click.option(
+    "--preload",
+    multiple=True,
+    metavar="PROTEIN",
+    help="Prepare this target (PDB ID or file) before serving; repeatable",
+)
+@click.option(
+    "--max-targets",
+    type=int,
+    default=None,
+    help="Targets kept in memory [default: Config.SERVER_MAX_TARGETS]",
+)
+@click.option(
+    "--batch-window",
+    type=click.FloatRange(min=0),
+    default=None,
+    metavar="MS",
+    help="Longest a request waits to be batched with others, in milliseconds "
+    "[default: Config.SERVER_BATCH_WINDOW_MS]",
+)
+@click.option(
+    "--max-batch-size",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Most requests docked and predicted together "
+    "[default: Config.SERVER_MAX_BATCH_SIZE]",
+)
+def serve(socket_path, host, port, preload, max_targets, batch_window, max_batch_size):
+    """
+    Serve predictions from a warm, long-lived process.
+
+    The server keeps the affinity model, prepared receptors and docking
+    maps in memory, so a prediction against a target it has already seen
+    costs little more than docking the ligand. Send requests with
+    `bindigo predict --server`.
+
+    Concurrent requests for the same receptor and box are coalesced into
+    micro-batches: each batch is docked together and its affinities are
+    predicted with one model call. A request waits at most --batch-window
+    milliseconds for others to join its batch.
+
+    \b
+    Examples:
+      $ bindigo serve --preload 1HSG
+      $ bindigo serve --socket /tmp/bindigo.sock --preload protein.pdb
+      $ bindigo predict --server --protein 1HSG --ligand "CCO" --output out.csv
+    """
+    from bindigo.core.config import config
+    from bindigo.core.predictor import BindingPredictor
+    from bindigo.core.server import PredictionServer, format_address
+
+    if socket_path:
+        address = f"unix:{socket_path}"
+    else:
+        address = f"{host or config.SERVER_HOST}:{port or config.SERVER_PORT}"
+
+    with BindingPredictor(
+        max_targets=max_targets,
+        batch_window_ms=batch_window,
+        max_batch_size=max_batch_size,
+    ) as predictor:
+        try:
+            server = PredictionServer(predictor, address)
+        except Exception as e:
+            print_error(str(e))
+            raise click.Abort()
+
+        try:
+            for protein in preload:
+                target = predictor.prepare_target(protein)
+                print_success(
+                    f"Prepared {target['protein']} (box {target['box_size']} A "
+                    f"at {tuple(target['center'])})"
+                )
+            print_success(f"Serving predictions on {format_address(server.address)}")
+            server.serve_forever()
+        except Exception as e:
+            print_error(str(e))
+            raise click.Abort()
+        except KeyboardInterrupt:
+            click.echo("\nShutting down")
+        finally:
+            server.shutdown()
@@ -5,7 +5,7 @@ Defines default parameters for docking, ML models, and other operations.
 """
 
 from pathlib import Path
-from typing import Dict, Any
+from typing import Any, Dict, Optional
 
 
 class Config:
@@ -20,15 +20,23 @@ class Config:
     DOCKING_EXHAUSTIVENESS = 8
     DOCKING_NUM_MODES = 9
     DOCKING_ENERGY_RANGE = 3  # kcal/mol
+    DOCKING_BACKEND = "vina"  # "vina" (in-process AutoDock Vina) or "numpy"
+    DOCKING_GRID_SPACING = 0.375  # Affinity map spacing in Angstroms
+    DOCKING_SEED = 42
+    DOCKING_FUNNEL_EXHAUSTIVENESS = 1  # Coarse stage of funnel screens
 
     # Binding site detection
     BINDING_SITE_AUTO_DETECT = True
     BINDING_SITE_DEFAULT_SIZE = 20.0  # Angstroms
+    POCKET_GRID_SPACING = 1.0  # Pocket search grid spacing in Angstroms
+    POCKET_MIN_VOLUME = 50.0  # Smallest reported pocket in cubic Angstroms
 
     # ML model settings
     DEFAULT_MODEL_NAME = "default"
     MODEL_FILE = "default_model.pkl"
     SCALER_FILE = "scaler.pkl"
+    ML_BATCH_SIZE = 1024  # Feature rows per scaler/model call
+    MODEL_MMAP_MODE = "r"  # joblib mmap mode for model arrays (None disables)
 
     # Confidence thresholds (for applicability domain)
     CONFIDENCE_HIGH_THRESHOLD = 0.8
@@ -43,6 +51,7 @@ class Config:
     LIGAND_ADD_HYDROGENS = True
     LIGAND_GENERATE_3D = True
     LIGAND_CHARGE_METHOD = "gasteiger"
+    LIGAND_RANDOM_SEED = 42  # ETKDG seed for reproducible conformers
 
     # Output settings
     SAVE_POSES = True
@@ -52,10 +61,50 @@ class Config:
     # Database settings
     PDB_BASE_URL = "https://files.rcsb.org/download/"
     PDB_CACHE_DIR = Path.home() / ".bindigo" / "cache" / "pdb"
+    PDB_MIRROR_DIR: Optional[Path] = None  # Local mirror used instead of PDB_BASE_URL
+    PDB_FETCH_WORKERS = 8  # Concurrent downloads
+    PDB_FETCH_TIMEOUT = 30  # Seconds per request
+    PDB_FETCH_RETRIES = 3
+    PDB_CACHE_MAX_MB: Optional[float] = 4096.0  # None disables eviction
+
+    # Structure files at least this large are memory-mapped when parsed
+    STRUCTURE_MMAP_MIN_MB = 64.0
+
+    # Prepared receptor cache (stored alongside the PDB cache)
+    RECEPTOR_CACHE_DIR = PDB_CACHE_DIR.parent / "receptors"
+    RECEPTOR_CACHE_MAX_MB = 1024.0
+
+    # Computed receptor affinity maps, keyed by receptor, box and spacing
+    GRID_MAP_CACHE_DIR = PDB_CACHE_DIR.parent / "grid_maps"
+    GRID_MAP_CACHE_MAX_MB = 2048.0
+
+    # Detected binding pockets, keyed by receptor hash
+    POCKET_CACHE_DIR = PDB_CACHE_DIR.parent / "pockets"
+
+    # Prepared ligand cache (single SQLite file)
+    LIGAND_CACHE_FILE = PDB_CACHE_DIR.parent / "ligands.sqlite"
+
+    # Run metrics file written after each run (.prom: Prometheus text, else JSON)
+    METRICS_FILE: Optional[Path] = None
 
     # Performance settings
-    MAX_MEMORY_GB = 2.0
-    TIMEOUT_SECONDS = 300  # 5 minutes per prediction
+    MAX_MEMORY_GB = 2.0  # Budget for a screen and its workers (None: no limit)
+    TIMEOUT_SECONDS = 300  # Per ligand in screening workers; None disables
+    # Start method of screening workers (None: forkserver, else spawn). "fork"
+    # starts faster but can deadlock on locks held by the parent's threads
+    WORKER_START_METHOD: Optional[str] = None
+
+    # Screening settings
+    SCREEN_CHUNK_SIZE = 16  # Ligands per worker task
+    SCREEN_MAX_PENDING = 4  # In-flight chunks per worker
+    SCREEN_TIMEOUT_RETRIES = 1  # Retries of a ligand whose worker timed out or died
+
+    # Prediction server (bindigo serve)
+    SERVER_HOST = "127.0.0.1"
+    SERVER_PORT = 8765
+    SERVER_MAX_TARGETS = 8  # Prepared receptors and maps kept in memory
+    SERVER_BATCH_WINDOW_MS = 2.0  # Longest a request waits to be batched
+    SERVER_MAX_BATCH_SIZE = 32  # Requests docked and predicted together
 
     @classmethod
     def to_dict(cls) -> Dict[str, Any]:
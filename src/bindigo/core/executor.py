@@ -0,0 +1,187 @@
+"""
+Asynchronous staged executor for Bindigo pipelines.
+
+A pipeline is a chain of stages connected by bounded asyncio queues:
+
+    source -> [prepare] -> [dock] -> [predict] -> sink
+
+Each stage takes items from its input queue, runs its function on them in
+the stage's executor (a thread or process pool, so CPU-bound work never
+blocks the event loop) and puts the results on the next queue. All stages
+run at the same time on different items, so while one chunk of ligands is
+being docked the next is being prepared and the previous one is being
+written, and the wall time of a run approaches that of its slowest stage.
+
+Queues are bounded, so a fast stage stalls instead of buffering the whole
+input ahead of a slow one. The source iterator is advanced in a thread and
+the sink runs on the event loop in the calling thread, so objects owned by
+the caller (open writers, journals) are only ever touched from one thread.
+"""
+
+import asyncio
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+from bindigo.utils.exceptions import InputError
+
+# Marks the end of the items on a queue
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a staged pipeline.
+
+    Attributes:
+        name: Stage name, used in logs and statistics
+        func: Function applied to each item; returns the item for the next
+            stage
+        executor: Executor running ``func`` (None runs it on the event loop,
+            for cheap glue steps only)
+        concurrency: Items processed at the same time
+        queue_size: Capacity of the stage's input queue (default: twice
+            the concurrency)
+        n_items: Items processed so far
+        busy_time: Total seconds spent in ``func`` across all items
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        executor: Optional[Executor] = None,
+        concurrency: int = 1,
+        queue_size: Optional[int] = None,
+    ):
+        if concurrency < 1:
+            raise InputError(f"Stage {name} needs a concurrency of at least 1")
+        self.name = name
+        self.func = func
+        self.executor = executor
+        self.concurrency = concurrency
+        self.queue_size = queue_size or 2 * concurrency
+        self.n_items = 0
+        self.busy_time = 0.0
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, concurrency={self.concurrency})"
+
+
+async def run_stages_async(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    sink: Callable[[Any], None],
+) -> None:
+    """
+    Run items from ``source`` through ``stages`` and pass the results to ``sink``.
+
+    Results reach the sink in completion order, which matches the source
+    order only when every stage has a concurrency of 1.
+
+    Args:
+        source: Input items, consumed lazily as queue space frees up
+        stages: Stages applied in order
+        sink: Called on the event loop with each final result
+
+    Raises:
+        Exception: The first exception raised by the source, a stage or the
+            sink; the rest of the pipeline is cancelled
+    """
+    loop = asyncio.get_running_loop()
+    queues: List[asyncio.Queue] = [
+        asyncio.Queue(maxsize=stage.queue_size) for stage in stages
+    ]
+    queues.append(asyncio.Queue(maxsize=stages[-1].concurrency if stages else 1))
+
+    async def feed() -> None:
+        iterator = iter(source)
+        while True:
+            item = await loop.run_in_executor(None, next, iterator, _DONE)
+            if item is _DONE:
+                break
+            await queues[0].put(item)
+        for _ in range(stages[0].concurrency if stages else 1):
+            await queues[0].put(_DONE)
+
+    async def work(stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue) -> None:
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.perf_counter()
+            if stage.executor is None:
+                result = stage.func(item)
+            else:
+                result = await loop.run_in_executor(stage.executor, stage.func, item)
+            stage.busy_time += time.perf_counter() - start
+            stage.n_items += 1
+            await outbox.put(result)
+
+    async def run_stage(index: int) -> None:
+        stage = stages[index]
+        workers = [
+            asyncio.ensure_future(work(stage, queues[index], queues[index + 1]))
+            for _ in range(stage.concurrency)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+        consumers = stages[index + 1].concurrency if index + 1 < len(stages) else 1
+        for _ in range(consumers):
+            await queues[index + 1].put(_DONE)
+
+    async def drain() -> None:
+        while True:
+            item = await queues[-1].get()
+            if item is _DONE:
+                return
+            sink(item)
+
+    tasks = [asyncio.ensure_future(feed())]
+    tasks += [asyncio.ensure_future(run_stage(i)) for i in range(len(stages))]
+    tasks.append(asyncio.ensure_future(drain()))
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            error = task.exception()
+            if error is not None:
+                raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def run_stages(
+    source: Iterable[Any],
+    stages: Sequence[Stage],
+    sink: Callable[[Any], None],
+) -> None:
+    """
+    Run a staged pipeline to completion from synchronous code.
+
+    When called from a thread that is already running an event loop (an
+    async caller, a Jupyter notebook), the pipeline gets its own loop on a
+    dedicated thread, and the sink runs there while the caller waits.
+
+    Args:
+        source: Input items, consumed lazily as queue space frees up
+        stages: Stages applied in order
+        sink: Called with each final result, in the calling thread unless
+            an event loop is running there
+
+    Raises:
+        Exception: The first exception raised by the source, a stage or the sink
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(run_stages_async(source, stages, sink))
+        return
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="bindigo-stages"
+    ) as thread:
+        thread.submit(asyncio.run, run_stages_async(source, stages, sink)).result()
@@ -0,0 +1,268 @@
+"""
+Checkpoint journal for resumable screening.
+
+An append-only JSON-lines file recording every completed batch of a
+screen: the library indices it covered, its result rows and the size of
+the output file after the batch was written. A restarted screen reads the
+journal to skip finished ligands and truncates the output back to the
+last checkpoint, so a crash loses at most the batch in flight.
+
+Funnel screens also journal their refinement stage: re-docked rows are
+recorded as "refine" entries, which replace the coarse rows of the same
+ligands when rows are read back.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+
+from bindigo.utils.exceptions import InputError
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bytes read at a time when looking for the last complete journal line
+_TAIL_BLOCK_SIZE = 64 * 1024
+
+
+class IndexSet:
+    """Compact bitmap of non-negative integers (one bit per library record)."""
+
+    def __init__(self) -> None:
+        self._bits = bytearray()
+        self._count = 0
+
+    def add(self, index: int) -> None:
+        """Add an index to the set."""
+        byte, bit = divmod(index, 8)
+        if byte >= len(self._bits):
+            self._bits.extend(bytes(byte - len(self._bits) + 1))
+        if not self._bits[byte] & (1 << bit):
+            self._bits[byte] |= 1 << bit
+            self._count += 1
+
+    def __contains__(self, index: int) -> bool:
+        byte, bit = divmod(index, 8)
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << bit))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def first_missing(self, start: int = 0) -> int:
+        """Return the smallest index >= start that is not in the set."""
+        index = start
+        byte = index // 8
+        # Skip whole bytes of completed indices
+        while byte < len(self._bits) and self._bits[byte] == 0xFF and index % 8 == 0:
+            byte += 1
+            index += 8
+        while index in self:
+            index += 1
+        return index
+
+
+class ScreenJournal:
+    """
+    Append-only checkpoint journal for one screening run.
+
+    The first line holds the run parameters, so a journal cannot be resumed
+    against a different protein, library or binding site. Each following
+    line is one completed batch, written and fsynced after the batch's rows
+    reach the output file.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialize the journal.
+
+        Args:
+            path: Journal file path (typically ``<output>.journal``)
+        """
+        self.path = Path(path)
+        self.completed = IndexSet()
+        self.refined = IndexSet()
+        self.output_size: Optional[int] = None
+        self.n_failed = 0
+        self.finished = False
+        self._file: Optional[IO[str]] = None
+
+    @staticmethod
+    def for_output(output_path: Path) -> "ScreenJournal":
+        """Return the journal that accompanies a screening output file."""
+        output_path = Path(output_path)
+        return ScreenJournal(output_path.with_name(output_path.name + ".journal"))
+
+    def _iter_entries(self) -> Iterator[Dict[str, Any]]:
+        """Yield complete journal entries, ignoring a torn final line."""
+        with open(self.path, "r") as f:
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    break
+
+    def load(self, parameters: Dict[str, Any]) -> None:
+        """
+        Read an existing journal to find completed ligands.
+
+        Only indices and the output checkpoint are kept in memory; result
+        rows stay on disk until iter_rows is called.
+
+        Args:
+            parameters: Parameters of the run being resumed
+
+        Raises:
+            InputError: If the journal belongs to a run with other parameters
+        """
+        if not self.path.exists():
+            return
+        for entry in self._iter_entries():
+            kind = entry.get("type")
+            if kind == "header":
+                if entry["parameters"] != _normalize(parameters):
+                    raise InputError(
+                        f"Cannot resume: journal {self.path} was written for a "
+                        "screen with different inputs"
+                    )
+            elif kind == "batch":
+                for index in entry["indices"]:
+                    self.completed.add(index)
+                self.n_failed += sum(
+                    1 for row in entry["rows"] if row.get("status") == "failed"
+                )
+                self.output_size = entry["output_size"]
+            elif kind == "refine":
+                for index in entry["indices"]:
+                    self.refined.add(index)
+            elif kind == "output":
+                self.output_size = entry["output_size"]
+            elif kind == "complete":
+                self.finished = True
+        logger.info(f"Resuming screen: {len(self.completed)} ligands already done")
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the result rows of every journaled batch, in journal order.
+
+        Rows of ligands re-docked by a funnel refinement stage are replaced
+        by their refined rows.
+        """
+        if not self.path.exists():
+            return
+        refined: Dict[str, Dict[str, Any]] = {}
+        if len(self.refined):
+            for entry in self._iter_entries():
+                if entry.get("type") == "refine":
+                    refined.update((row["ligand_id"], row) for row in entry["rows"])
+        for entry in self._iter_entries():
+            if entry.get("type") == "batch":
+                for row in entry["rows"]:
+                    yield refined.get(row.get("ligand_id"), row) if refined else row
+
+    def start(self, parameters: Dict[str, Any], resume: bool) -> None:
+        """
+        Open the journal for appending.
+
+        Args:
+            parameters: Run parameters recorded in the journal header
+            resume: Keep existing entries; otherwise start a fresh journal
+        """
+        if resume and self.path.exists():
+            self._truncate_torn_line()
+            self._file = open(self.path, "a")
+            return
+        self._file = open(self.path, "w")
+        self._append({"type": "header", "parameters": _normalize(parameters)})
+
+    def record_batch(
+        self, indices: List[int], rows: List[Dict[str, Any]], output_size: int
+    ) -> None:
+        """
+        Durably record a completed batch.
+
+        Args:
+            indices: Library indices covered by the batch
+            rows: Result rows of the batch
+            output_size: Output file size in bytes after the batch was written
+        """
+        for index in indices:
+            self.completed.add(index)
+        self.output_size = output_size
+        self._append(
+            {
+                "type": "batch",
+                "indices": indices,
+                "rows": rows,
+                "output_size": output_size,
+            }
+        )
+
+    def record_refined(self, indices: List[int], rows: List[Dict[str, Any]]) -> None:
+        """
+        Durably record a batch of ligands re-docked by the funnel.
+
+        Args:
+            indices: Library indices of the re-docked ligands
+            rows: Their refined result rows
+        """
+        for index in indices:
+            self.refined.add(index)
+        self._append({"type": "refine", "indices": indices, "rows": rows})
+
+    def record_output(self, output_size: int) -> None:
+        """
+        Record the size of an output file rewritten after the last batch.
+
+        Args:
+            output_size: Output file size in bytes
+        """
+        self.output_size = output_size
+        self._append({"type": "output", "output_size": output_size})
+
+    def finish(self) -> None:
+        """Mark the run as complete and close the journal."""
+        self._append({"type": "complete"})
+        self.finished = True
+        self.close()
+
+    def close(self) -> None:
+        """Close the journal file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        assert self._file is not None, "journal not started"
+        self._file.write(json.dumps(entry, default=str) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _truncate_torn_line(self) -> None:
+        """
+        Drop a partially written final line left by a crash.
+
+        Reads backwards from the end in blocks until the last newline, so
+        only the torn line is read however large the journal is.
+        """
+        with open(self.path, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            while end > 0:
+                start = max(end - _TAIL_BLOCK_SIZE, 0)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end != size:
+                f.truncate(end)
+
+
+def _normalize(parameters: Dict[str, Any]) -> Dict[str, Any]:
+    """Round-trip parameters through JSON so tuples compare equal to lists."""
+    normalized: Dict[str, Any] = json.loads(json.dumps(parameters, default=str))
+    return normalized
@@ -4,43 +4,92 @@ Main prediction pipeline for Bindigo.
 Orchestrates the complete workflow from input validation to result output.
 """
 
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 from bindigo.core.config import config
+from bindigo.core.executor import Stage, run_stages
+from bindigo.core.journal import ScreenJournal
+from bindigo.core.workers import WorkerPool
+from bindigo.database.pdb import get_fetcher
+from bindigo.docking.backend import DockingBackend, get_backend
+from bindigo.docking.funnel import funnel_count, funnel_stats, select_top
+from bindigo.docking.pdbqt_converter import parse_pdbqt_atoms
+from bindigo.docking.pose_extraction import save_best_pose
+from bindigo.ml.features import FeatureExtractor
+from bindigo.ml.models import AffinityModel, get_model, model_files, pkd_to_kd_nm
+from bindigo.preprocessing.ligand import LigandCache, load_ligand, prepare_ligands
+from bindigo.preprocessing.pockets import detect_pockets
+from bindigo.preprocessing.protein import ReceptorCache, prepare_receptor
+from bindigo.utils.io import (
+    RESULT_COLUMN_TYPES,
+    RESULT_COLUMNS,
+    CSVResultWriter,
+    LigandLibrary,
+    open_result_writer,
+    output_format_for_path,
+)
 from bindigo.utils.logging import get_logger
+from bindigo.utils.metrics import PipelineMetrics, timed
 from bindigo.utils.validation import (
     validate_protein_input,
     validate_ligand_input,
+    validate_ligand_library,
     validate_binding_site,
     validate_output_path,
 )
-from bindigo.utils.exceptions import BindigoError
+from bindigo.utils.exceptions import (
+    BindigoError,
+    InputError,
+    LigandError,
+    WorkerError,
+)
 
 logger = get_logger(__name__)
 
+# Funnel rankings: result column and sign making lower keys better
+FUNNEL_RANKINGS = {
+    "score": ("docking_score_kcal_mol", 1.0),
+    "pkd": ("predicted_pKd", -1.0),
+}
+
 
 def run_prediction(
     protein: str,
     ligand: str,
     output: str,
     center: Optional[Tuple[float, float, float]] = None,
-    box_size: float = 20.0,
+    box_size: Optional[float] = None,
     save_pose: bool = True,
     verbose: bool = False,
+    metrics_file: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Run complete binding affinity prediction pipeline.
 
+    Per-stage wall and CPU times, cache hit counters and peak memory are
+    collected in a PipelineMetrics object, logged at the end of the run
+    and returned under "metrics".
+
     Args:
         protein: PDB ID or file path
         ligand: SMILES string or SDF file path
         output: Output CSV file path
         center: Optional binding site center (x, y, z)
-        box_size: Binding site box size in Angstroms
+        box_size: Binding site box size in Angstroms (default: fitted to the
+            detected pocket, or Config.BINDING_SITE_DEFAULT_SIZE)
         save_pose: Whether to save docking pose
         verbose: Whether to show detailed output
+        metrics_file: Also write the run metrics to this file, as Prometheus
+            text for .prom files and JSON otherwise (default:
+            Config.METRICS_FILE)
 
     Returns:
         Dictionary containing prediction results and metadata
@@ -49,40 +98,84 @@ def run_prediction(
         BindigoError: If any step of the pipeline fails
     """
     start_time = time.time()
+    metrics = PipelineMetrics("predict")
 
     try:
         # Step 1: Validate inputs
         logger.info("Validating inputs...")
-        protein_type, protein_validated = validate_protein_input(protein)
-        ligand_type, ligand_validated = validate_ligand_input(ligand)
-        validate_binding_site(center, box_size)
-        output_path = validate_output_path(output)
+        with metrics.stage("validation"):
+            protein_type, protein_validated = validate_protein_input(protein)
+            ligand_type, ligand_validated = validate_ligand_input(ligand)
+            validate_binding_site(center, box_size)
+            output_path = validate_output_path(output)
 
         logger.info(f"Protein input type: {protein_type}")
         logger.info(f"Ligand input type: {ligand_type}")
 
-        # TODO: Implement remaining pipeline steps
-        # Step 2: Prepare protein
-        # Step 3: Prepare ligand
-        # Step 4: Detect/validate binding site
+        # Steps 2-4: Prepare the ligand on a second thread while the
+        # protein is fetched and prepared, its binding site resolved and
+        # the docking maps computed
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ligand_future = executor.submit(
+                _load_and_prepare_ligand, ligand_type, ligand_validated, metrics
+            )
+            receptor = prepare_input_receptor(protein_type, protein_validated, metrics)
+            with metrics.stage("site_detection"):
+                center, box_size = resolve_binding_site(receptor, center, box_size)
+            backend = create_backend(receptor, center, box_size, metrics=metrics)
+            mol, prepared_ligand = ligand_future.result()
+
+        row = new_result_row(0, center, box_size)
+        row["ligand_name"] = (
+            mol.GetProp("_Name").strip() if mol.HasProp("_Name") else ""
+        ) or row["ligand_id"]
+        row["smiles"] = prepared_ligand["smiles"]
+
         # Step 5: Run docking
-        # Step 6: Extract features
-        # Step 7: ML prediction
-        # Step 8: Format and save results
+        logger.info("Running docking...")
+        with metrics.stage("docking"):
+            docked = backend.dock_many([prepared_ligand["pdbqt"]])[0]
+        if isinstance(docked, Exception):
+            raise docked
+        row["docking_score_kcal_mol"] = docked["score"]
+
+        # Steps 6-7: Extract features and predict affinity
+        with metrics.stage("ml"):
+            model = load_affinity_model()
+        extractor = FeatureExtractor()
+        predict_affinities([row], extractor, model, metrics)
+        metrics.count("descriptor_cache_hits", extractor.hits)
+        metrics.count("descriptor_cache_misses", extractor.computed)
+
+        # Step 8: Save results
+        with metrics.stage("output"):
+            if save_pose:
+                pose_file = output_path.parent / f"{row['ligand_id']}_pose.pdb"
+                row["pose_file"] = str(save_best_pose(docked["poses"], pose_file))
+            with open_result_writer(output_path, RESULT_COLUMN_TYPES) as writer:
+                writer.write_row(row)
 
-        # Placeholder result
         result = {
             "protein": protein_validated,
             "ligand": ligand_validated,
             "protein_type": protein_type,
             "ligand_type": ligand_type,
+            "receptor_file": receptor.get("pdbqt_file"),
+            "smiles": row["smiles"],
+            "center": center,
+            "box_size": box_size,
+            "docking_score": row["docking_score_kcal_mol"],
+            "pKd": row["predicted_pKd"],
+            "kd_nM": row["predicted_kd_nM"],
+            "confidence": row["confidence"],
             "output": str(output_path),
             "execution_time": time.time() - start_time,
-            "status": "placeholder",
-            "pose_file": None,
+            "status": row["status"],
+            "pose_file": row["pose_file"],
         }
+        result["metrics"] = _finish_metrics(metrics, metrics_file)
 
-        logger.info("Pipeline execution completed (placeholder)")
+        logger.info("Pipeline execution completed")
         return result
 
     except BindigoError as e:
@@ -92,3 +185,935 @@ def run_prediction(
     except Exception as e:
         logger.error(f"Unexpected error in pipeline: {e}")
         raise BindigoError(f"Prediction failed: {e}")
+
+
+def run_screen(
+    protein: str,
+    ligands: str,
+    output: str,
+    center: Optional[Tuple[float, float, float]] = None,
+    box_size: Optional[float] = None,
+    jobs: Optional[int] = None,
+    start: int = 0,
+    stop: Optional[int] = None,
+    resume: bool = False,
+    output_format: Optional[str] = None,
+    funnel: Optional[float] = None,
+    funnel_by: str = "score",
+    verbose: bool = False,
+    metrics_file: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run batch virtual screening of a ligand library against one protein.
+
+    The receptor is prepared once in the parent process and handed to each
+    worker at pool start-up. Ligands are dispatched to a process pool in
+    chunks and result rows are streamed to the output file (CSV, gzipped
+    CSV, Parquet or Arrow IPC) as each chunk finishes, so memory stays
+    bounded by the number of in-flight chunks rather than the library size.
+
+    Every completed chunk is checkpointed in ``<output>.journal``. With
+    ``resume=True`` ligands recorded there are skipped and the output is
+    truncated back to the last checkpoint before new rows are appended.
+
+    With ``funnel`` set, every ligand is first docked at
+    ``DOCKING_FUNNEL_EXHAUSTIVENESS`` with a single pose; the top
+    ``funnel`` fraction (by docking score or predicted pKd) is then
+    re-docked at full exhaustiveness and the output is rewritten with the
+    refined rows.
+
+    Args:
+        protein: PDB ID or file path
+        ligands: Path to a multi-molecule SDF or SMILES (.smi) library,
+            optionally gzipped
+        output: Output file path (.csv, .csv.gz, .parquet or .arrow)
+        center: Optional binding site center (x, y, z)
+        box_size: Binding site box size in Angstroms (default: fitted to the
+            detected pocket, or Config.BINDING_SITE_DEFAULT_SIZE)
+        jobs: Number of worker processes (defaults to the CPU count)
+        start: Index of the first library record to screen
+        stop: Index one past the last record to screen (None screens to the end)
+        resume: Continue an interrupted screen from its checkpoint journal
+        output_format: Output format for paths without an extension
+            (default: Config.OUTPUT_FORMAT)
+        funnel: Fraction of ligands to re-dock at full exhaustiveness after a
+            coarse docking pass (None docks everything at full exhaustiveness)
+        funnel_by: Funnel ranking, "score" (docking score) or "pkd"
+            (predicted pKd; requires an installed model)
+        verbose: Whether to show detailed output
+        metrics_file: Also write the run metrics to this file, as Prometheus
+            text for .prom files and JSON otherwise (default:
+            Config.METRICS_FILE)
+
+    Returns:
+        Dictionary containing screening summary and metadata (with a
+        "funnel" summary including the estimated time saved, if enabled),
+        and the run metrics under "metrics"
+
+    Raises:
+        BindigoError: If validation or receptor preparation fails
+    """
+    start_time = time.time()
+    metrics = PipelineMetrics("screen")
+
+    try:
+        # Step 1: Validate inputs
+        logger.info("Validating screening inputs...")
+        with metrics.stage("validation"):
+            protein_type, protein_validated = validate_protein_input(protein)
+            library_path = validate_ligand_library(ligands)
+            validate_binding_site(center, box_size)
+            output_path = validate_output_path(output, output_format)
+            n_jobs = _resolve_jobs(jobs)
+            if start < 0 or (stop is not None and stop < start):
+                raise InputError(f"Invalid record range: start={start}, stop={stop}")
+            if funnel is not None:
+                funnel_count(1, funnel)
+                if funnel_by not in FUNNEL_RANKINGS:
+                    raise InputError(
+                        f"Unknown funnel ranking: {funnel_by}. "
+                        f"Choose from: {', '.join(FUNNEL_RANKINGS)}"
+                    )
+
+        # Step 2: Prepare protein once for the whole screen
+        receptor = prepare_input_receptor(protein_type, protein_validated, metrics)
+        with metrics.stage("site_detection"):
+            box_center, box_size = resolve_binding_site(receptor, center, box_size)
+
+        # Fail fast on a missing docking engine and compute the affinity
+        # maps once, so workers load them from the map store; load the
+        # model up front too, so workers map its arrays from a warm page
+        # cache (Config.MODEL_MMAP_MODE)
+        create_backend(receptor, box_center, box_size, metrics=metrics)
+        with metrics.stage("ml"):
+            load_affinity_model()
+
+        # Skip ligands completed by an earlier run of this screen
+        journal = ScreenJournal.for_output(output_path)
+        parameters: Dict[str, Any] = {
+            "protein": protein_validated,
+            "ligands": str(library_path),
+            "center": center,
+            "box_size": box_size,
+            "start": start,
+            "stop": stop,
+        }
+        if funnel is not None:
+            parameters["funnel"] = {"fraction": funnel, "by": funnel_by}
+        if resume:
+            journal.load(parameters)
+        n_resumed = len(journal.completed)
+        n_failed = journal.n_failed
+
+        # Steps 3-8 run per ligand inside the workers
+        logger.info(f"Screening {library_path} with {n_jobs} worker(s)")
+        library = LigandLibrary(library_path)
+        first_pending = journal.completed.first_missing(start)
+        if journal.finished or (stop is not None and first_pending >= stop):
+            records: Iterator[Tuple[int, str, str]] = iter(())
+        else:
+            records = (
+                record
+                for record in library.iter_records(start=first_pending, stop=stop)
+                if record[0] not in journal.completed
+            )
+        chunks = _chunked(records, config.SCREEN_CHUNK_SIZE)
+        worker_args: Tuple[Any, ...] = (receptor, box_center, box_size)
+        if funnel is not None:
+            worker_args += (config.DOCKING_FUNNEL_EXHAUSTIVENESS, 1)
+
+        n_succeeded = n_resumed - n_failed
+        stats = {"ligand_cache_hits": 0, "ligand_cache_misses": 0, "ligand_timeouts": 0}
+        journal.start(parameters, resume=resume)
+        funnel_summary = None
+        try:
+            stage_start = time.time()
+            with _open_screen_output(output_path, journal) as writer:
+
+                def write_chunk(indices, rows, chunk_stats):
+                    nonlocal n_failed, n_succeeded
+                    with metrics.stage("output"):
+                        writer.write_rows(rows)
+                        writer.flush(sync=True)
+                        journal.record_batch(indices, rows, writer.tell())
+                    for row in rows:
+                        if row["status"] == "failed":
+                            n_failed += 1
+                        else:
+                            n_succeeded += 1
+                    for name, value in chunk_stats.items():
+                        stats[name] += value
+
+                stages = _run_screen_chunks(chunks, n_jobs, worker_args, write_chunk)
+                _add_stage_metrics(metrics, stages)
+            if funnel is not None and not journal.finished:
+                funnel_summary = _refine_funnel(
+                    output_path,
+                    journal,
+                    library,
+                    n_jobs,
+                    (receptor, box_center, box_size),
+                    funnel,
+                    funnel_by,
+                    n_docked=None if n_resumed else n_succeeded + n_failed,
+                    coarse_time=time.time() - stage_start,
+                    metrics=metrics,
+                )
+            journal.finish()
+        finally:
+            journal.close()
+
+        result = {
+            "protein": protein_validated,
+            "protein_type": protein_type,
+            "ligands": str(library_path),
+            "output": str(output_path),
+            "jobs": n_jobs,
+            "n_ligands": n_succeeded + n_failed,
+            "n_succeeded": n_succeeded,
+            "n_failed": n_failed,
+            "n_resumed": n_resumed,
+            **stats,
+            "execution_time": time.time() - start_time,
+            "status": "completed",
+        }
+        for name, value in stats.items():
+            metrics.count(name, value)
+        result["metrics"] = _finish_metrics(metrics, metrics_file)
+        if funnel_summary is not None:
+            result["funnel"] = funnel_summary
+            message = f"Funnel: re-docked {funnel_summary['n_refined']} ligands"
+            if funnel_summary["time_saved"] is not None:
+                message += (
+                    f", saved ~{funnel_summary['time_saved']:.1f}s versus single-stage"
+                )
+            logger.info(message)
+
+        logger.info(
+            f"Screening completed: {result['n_ligands']} ligands "
+            f"({n_failed} failed) in {result['execution_time']:.1f}s"
+        )
+        return result
+
+    except BindigoError as e:
+        logger.error(f"Screening failed: {e}")
+        raise
+
+    except Exception as e:
+        logger.error(f"Unexpected error in screening: {e}")
+        raise BindigoError(f"Screening failed: {e}")
+
+
+def _refine_funnel(
+    output_path: Path,
+    journal: ScreenJournal,
+    library: LigandLibrary,
+    jobs: int,
+    worker_args: Tuple[Any, ...],
+    fraction: float,
+    rank_by: str,
+    n_docked: Optional[int],
+    coarse_time: float,
+    metrics: Optional[PipelineMetrics] = None,
+) -> Dict[str, Any]:
+    """
+    Re-dock the best coarse-stage ligands and rewrite the output.
+
+    Survivors are read back from the library by index, so they keep the
+    input's coordinates and names, and screened again at full
+    exhaustiveness. Refined rows are journaled, so an interrupted
+    refinement resumes where it stopped. The output is then rewritten from
+    the journal with refined rows replacing coarse ones; a ligand whose
+    refinement fails keeps its coarse row.
+
+    Args:
+        output_path: Screening output file
+        journal: Open journal holding the coarse-stage rows
+        library: Ligand library being screened
+        jobs: Number of worker processes
+        worker_args: (receptor, center, box_size) for full-exhaustiveness workers
+        fraction: Fraction of docked ligands to re-dock
+        rank_by: "score" or "pkd"
+        n_docked: Ligands docked by the coarse stage, or None when the run
+            resumed part of it (the time saved is then not estimated)
+        coarse_time: Wall time of the coarse stage in this run (seconds)
+        metrics: Run metrics to add the refinement stages to
+
+    Returns:
+        Funnel summary from funnel_stats
+    """
+    if rank_by == "pkd" and load_affinity_model() is None:
+        logger.warning("No affinity model for funnel ranking; ranking by score")
+        rank_by = "score"
+    column, sign = FUNNEL_RANKINGS[rank_by]
+
+    def ranked_rows() -> Iterator[Dict[str, Any]]:
+        for row in journal.iter_rows():
+            if row["status"] != "failed" and row.get(column) is not None:
+                yield row
+
+    n_ranked = sum(1 for _ in ranked_rows())
+    survivors = select_top(
+        ranked_rows(), funnel_count(n_ranked, fraction), key=lambda r: sign * r[column]
+    )
+    indices = [_row_index(row) for row in survivors]
+    pending = [index for index in indices if index not in journal.refined]
+    logger.info(
+        f"Funnel: re-docking {len(indices)} of {n_ranked} ligands "
+        f"({len(indices) - len(pending)} already done)"
+    )
+
+    n_failed = 0
+
+    def record_refined(
+        indices: List[int], rows: List[Dict[str, Any]], _: Dict[str, int]
+    ) -> None:
+        nonlocal n_failed
+        refined = [row for row in rows if row["status"] != "failed"]
+        n_failed += len(rows) - len(refined)
+        journal.record_refined(indices, refined)
+
+    stage_start = time.time()
+    chunks = _chunked(library.get_records(pending), config.SCREEN_CHUNK_SIZE)
+    stages = _run_screen_chunks(chunks, jobs, worker_args, record_refined)
+    refine_time = time.time() - stage_start
+    if n_failed:
+        logger.warning(
+            f"Funnel: refinement failed for {n_failed} ligand(s); "
+            "keeping their coarse results"
+        )
+
+    # Rewrite the output with refined rows in place of coarse ones
+    with timed(metrics, "output"):
+        partial_path = output_path.with_name(f".funnel-{output_path.name}")
+        with open_result_writer(partial_path, RESULT_COLUMN_TYPES) as writer:
+            writer.write_rows(journal.iter_rows())
+        os.replace(partial_path, output_path)
+        journal.record_output(output_path.stat().st_size)
+    if metrics is not None:
+        _add_stage_metrics(metrics, stages, prefix="refine_")
+
+    return funnel_stats(n_docked, len(pending), coarse_time, refine_time)
+
+
+def _open_screen_output(output_path: Path, journal: ScreenJournal) -> Any:
+    """
+    Open the screening output for appending result rows.
+
+    A fresh screen starts a new file. A resumed CSV screen truncates the
+    file to the journal's last checkpoint, dropping rows of a batch that
+    was written but never journaled. Columnar outputs, and CSV files that
+    are missing or shorter than the checkpoint, are rebuilt from the
+    journaled rows.
+
+    Args:
+        output_path: Output path (.csv, .csv.gz, .parquet or .arrow)
+        journal: Loaded checkpoint journal
+
+    Returns:
+        Open result writer positioned after the last checkpoint
+    """
+    checkpoint = journal.output_size
+    if (
+        checkpoint is not None
+        and output_format_for_path(output_path) == "csv"
+        and output_path.exists()
+        and output_path.stat().st_size >= checkpoint
+    ):
+        return CSVResultWriter(output_path, RESULT_COLUMNS, resume_from=checkpoint)
+
+    writer = open_result_writer(output_path, RESULT_COLUMN_TYPES)
+    if checkpoint is not None:
+        logger.info(f"Rebuilding {output_path} from checkpoint journal")
+        writer.write_rows(journal.iter_rows())
+    return writer
+
+
+def _load_and_prepare_ligand(
+    ligand_type: str, ligand: str, metrics: Optional[PipelineMetrics] = None
+) -> Tuple[Any, Dict]:
+    """
+    Load a single ligand input and prepare it for docking.
+
+    Returns:
+        Tuple of (RDKit molecule, prepared ligand dictionary)
+
+    Raises:
+        LigandError: If the ligand cannot be loaded or prepared
+    """
+    cache = LigandCache()
+    try:
+        with timed(metrics, "ligand_prep"):
+            mol = load_ligand(ligand_type, ligand)
+            prepared_ligand = prepare_ligands([mol], cache=cache)[0]
+    finally:
+        cache.log_stats()
+        cache.close()
+    if metrics is not None:
+        metrics.count("ligand_cache_hits", cache.hits)
+        metrics.count("ligand_cache_misses", cache.misses)
+    if isinstance(prepared_ligand, Exception):
+        raise prepared_ligand
+    return mol, prepared_ligand
+
+
+def _resolve_jobs(jobs: Optional[int]) -> int:
+    """Return the worker count, defaulting to the number of CPU cores."""
+    if jobs is None:
+        return os.cpu_count() or 1
+    if jobs < 1:
+        raise InputError(f"Number of jobs must be at least 1, got {jobs}")
+    return jobs
+
+
+def prepare_input_receptor(
+    protein_type: str, protein: str, metrics: Optional[PipelineMetrics] = None
+) -> Dict[str, Any]:
+    """
+    Prepare the receptor, reusing the on-disk receptor cache.
+
+    PDB IDs are resolved to a structure file in the local PDB cache,
+    fetching the entry on first use.
+
+    Args:
+        protein_type: "pdb_id" or "file"
+        protein: Validated protein input
+        metrics: Run metrics to record stage times and cache hits in
+
+    Returns:
+        Picklable receptor description (passed to each screening worker)
+    """
+    receptor: Dict[str, Any] = {"type": protein_type, "source": protein}
+    structure_file = protein
+    if protein_type == "pdb_id":
+        fetcher = get_fetcher()
+        with timed(metrics, "fetch"):
+            cached = fetcher.cached_path(protein)
+            structure_file = str(cached or fetcher.fetch(protein))
+        if metrics is not None:
+            metrics.count("pdb_cache_hits" if cached else "pdb_cache_misses")
+        receptor["structure_file"] = structure_file
+
+    cache = ReceptorCache()
+    with timed(metrics, "protein_prep"):
+        receptor.update(prepare_receptor(structure_file, cache=cache))
+    if metrics is not None:
+        metrics.count("receptor_cache_hits", cache.hits)
+        metrics.count("receptor_cache_misses", cache.misses)
+    return receptor
+
+
+def resolve_binding_site(
+    receptor: Dict[str, Any],
+    center: Optional[Tuple[float, float, float]],
+    box_size: Optional[float],
+) -> Tuple[Tuple[float, float, float], float]:
+    """
+    Return the docking box, detecting the largest pocket if no center is given.
+
+    A detected pocket supplies both the center and, unless ``box_size`` is
+    given, a box size fitted to the pocket. Receptors without a detectable
+    pocket fall back to the receptor centroid.
+
+    Args:
+        receptor: Prepared receptor description
+        center: User-supplied center, if any
+        box_size: User-supplied box size, if any
+
+    Returns:
+        Tuple of (box center (x, y, z), box size)
+
+    Raises:
+        InputError: If no center is given and pocket detection is disabled,
+            or the resolved box is invalid
+    """
+    site_center: Tuple[float, float, float]
+    if center is not None:
+        x, y, z = (float(c) for c in center)
+        site_center = (x, y, z)
+    elif not config.BINDING_SITE_AUTO_DETECT:
+        raise InputError(
+            "No binding site center given and automatic pocket detection is "
+            "disabled (Config.BINDING_SITE_AUTO_DETECT); use --center X Y Z"
+        )
+    else:
+        pockets = detect_pockets(receptor["pdbqt_file"])
+        if pockets:
+            pocket = pockets[0]
+            site_center = pocket["center"]
+            box_size = box_size or pocket["size"]
+            logger.info(
+                f"Using largest detected pocket at {site_center} "
+                f"({pocket['volume']:.0f} A^3, box {box_size} A)"
+            )
+        else:
+            coords, _ = parse_pdbqt_atoms(Path(receptor["pdbqt_file"]).read_text())
+            x, y, z = (round(float(c), 3) for c in coords.mean(axis=0))
+            site_center = (x, y, z)
+            logger.warning(f"No pocket detected; using receptor centroid {site_center}")
+
+    box_size = box_size or config.BINDING_SITE_DEFAULT_SIZE
+    validate_binding_site(site_center, box_size)
+    return site_center, box_size
+
+
+def create_backend(
+    receptor: Dict[str, Any],
+    center: Tuple[float, float, float],
+    box_size: float,
+    exhaustiveness: Optional[int] = None,
+    n_poses: Optional[int] = None,
+    metrics: Optional[PipelineMetrics] = None,
+) -> DockingBackend:
+    """
+    Create the configured docking backend with its receptor maps ready.
+
+    Affinity maps are loaded from the grid map store, or computed and
+    stored there on a miss.
+
+    Args:
+        receptor: Prepared receptor description
+        center: Box center (x, y, z)
+        box_size: Box edge length in Angstroms
+        exhaustiveness: Override of Config.DOCKING_EXHAUSTIVENESS
+        n_poses: Override of Config.DOCKING_NUM_MODES
+        metrics: Run metrics to record the "grid_maps" stage in
+
+    Returns:
+        Docking backend with receptor and box set
+    """
+    with timed(metrics, "grid_maps"):
+        backend = get_backend(exhaustiveness=exhaustiveness, n_poses=n_poses)
+        backend.prepare_receptor(receptor["pdbqt_file"])
+        backend.set_box(center, box_size)
+    if metrics is not None:
+        hit = backend.maps_from_store
+        metrics.count("grid_map_cache_hits" if hit else "grid_map_cache_misses")
+    return backend
+
+
+def _finish_metrics(
+    metrics: PipelineMetrics, metrics_file: Optional[str]
+) -> Dict[str, Any]:
+    """Log the run metrics, write them to the metrics file if any, and return them."""
+    metrics.finish()
+    metrics.log(logger)
+    path = Path(metrics_file) if metrics_file else config.METRICS_FILE
+    if path is not None:
+        try:
+            metrics.write(path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
+    return metrics.to_dict()
+
+
+def _add_stage_metrics(
+    metrics: PipelineMetrics, stages: List[Stage], prefix: str = ""
+) -> None:
+    """Record the busy time of executor stages (wall time only)."""
+    for stage in stages:
+        metrics.add_stage_time(
+            prefix + stage.name, stage.busy_time, calls=stage.n_items
+        )
+
+
+def load_affinity_model() -> Optional[AffinityModel]:
+    """
+    Return the default affinity model, or None if no model is installed.
+
+    Without a model, ligands are still docked and their rows get the
+    status "docked" instead of a predicted affinity.
+    """
+    if not model_files(config.DEFAULT_MODEL_NAME)["model"].exists():
+        logger.warning(
+            f"No affinity model installed in {config.MODELS_DIR}; "
+            "skipping affinity prediction"
+        )
+        return None
+    return get_model()
+
+
+def predict_affinities(
+    rows: List[Dict[str, Any]],
+    extractor: FeatureExtractor,
+    model: Optional[AffinityModel],
+    metrics: Optional[PipelineMetrics] = None,
+) -> None:
+    """
+    Fill predicted affinities into docked result rows with one model call.
+
+    Args:
+        rows: Result rows with "smiles" and "docking_score_kcal_mol" set
+        extractor: Feature extractor (holds the descriptor cache)
+        model: Affinity model, or None to only mark rows as docked
+        metrics: Run metrics to record the "features" and "ml" stages in
+    """
+    if not rows:
+        return
+    if model is None:
+        for row in rows:
+            row["status"] = "docked"
+        return
+
+    with timed(metrics, "features"):
+        features = extractor.features(
+            [row["smiles"] for row in rows],
+            [row["docking_score_kcal_mol"] for row in rows],
+        )
+    with timed(metrics, "ml"):
+        pkd = model.predict_batch(features)
+    kd_nm = np.asarray(pkd_to_kd_nm(pkd))
+    for row, row_pkd, row_kd in zip(rows, pkd, kd_nm):
+        if np.isnan(row_pkd):
+            row["status"] = "failed"
+            row["error"] = "Affinity prediction failed: missing features"
+            continue
+        row["predicted_pKd"] = round(float(row_pkd), 3)
+        row["predicted_kd_nM"] = round(float(row_kd), 3)
+        row["status"] = "success"
+
+
+def _chunked(iterable: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Group an iterable into lists of at most ``size`` items."""
+    chunk: List[Any] = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _run_screen_chunks(
+    chunks: Iterable[List[Tuple[int, str, str]]],
+    jobs: int,
+    worker_args: Tuple[Any, ...],
+    handle: Callable[[List[int], List[Dict[str, Any]], Dict[str, int]], None],
+) -> List[Stage]:
+    """
+    Screen ligand chunks through the staged executor.
+
+    With a single job, ligand preparation, docking and affinity prediction
+    are separate stages, each on its own thread, so consecutive chunks
+    overlap (one is prepared while another is docked) and chunks reach
+    ``handle`` in library order. With several jobs, chunks are screened
+    whole in a WorkerPool with at most ``SCREEN_MAX_PENDING`` chunks per
+    worker in flight, so the library is never fully materialised. The pool
+    only runs as many workers as fit in ``MAX_MEMORY_GB``, and a chunk
+    running past ``TIMEOUT_SECONDS`` per ligand has its worker killed and
+    its ligands retried one by one (see _screen_chunk_supervised).
+
+    In both cases ``handle`` runs in the calling thread while the workers
+    carry on, so writing and checkpointing results overlap with screening.
+
+    Args:
+        chunks: Iterable over lists of ligand records
+        jobs: Number of worker processes
+        worker_args: Arguments for the worker initializer
+        handle: Called with (library indices, result rows, counters) for
+            each completed chunk
+
+    Returns:
+        The stages that ran, with their item counts and busy times
+    """
+
+    def sink(result: Tuple[List[Dict[str, Any]], Dict[str, int]]) -> None:
+        rows, stats = result
+        handle([_row_index(row) for row in rows], rows, stats)
+
+    if jobs == 1:
+        _init_screen_worker(*worker_args)
+        executors = [ThreadPoolExecutor(max_workers=1) for _ in range(3)]
+        stages = [
+            Stage("ligand_prep", _prepare_chunk, executors[0]),
+            Stage("docking", _dock_chunk, executors[1]),
+            Stage("prediction", _predict_chunk, executors[2]),
+        ]
+        try:
+            run_stages(chunks, stages, sink)
+        finally:
+            # SQLite connections can only be closed by the thread using them
+            executors[0].submit(_close_screen_worker).result()
+            for executor in executors:
+                executor.shutdown()
+        return stages
+
+    memory_gb = config.MAX_MEMORY_GB
+    pool = WorkerPool(
+        jobs,
+        initializer=_init_screen_worker,
+        initargs=worker_args,
+        finalizer=_close_screen_worker,
+        memory_limit=int(memory_gb * 2**30) if memory_gb else None,
+    )
+    # Each supervisor thread keeps one chunk in a worker and waits for it
+    supervisors = ThreadPoolExecutor(max_workers=jobs)
+    stages = [
+        Stage(
+            "screen_chunk",
+            partial(_screen_chunk_supervised, pool, worker_args),
+            supervisors,
+            concurrency=jobs,
+            queue_size=jobs * (config.SCREEN_MAX_PENDING - 1) or 1,
+        )
+    ]
+    try:
+        run_stages(chunks, stages, sink)
+    finally:
+        supervisors.shutdown()
+        pool.close()
+    logger.info(
+        f"Ran {pool.peak_workers} of {jobs} worker(s) at once "
+        f"({pool.workers_started} started, {pool.workers_killed} killed)"
+    )
+    return stages
+
+
+def _screen_chunk_supervised(
+    pool: WorkerPool,
+    worker_args: Tuple[Any, ...],
+    chunk: List[Tuple[int, str, str]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Screen a chunk in the pool, retrying ligands whose worker was lost.
+
+    The chunk gets ``TIMEOUT_SECONDS`` per ligand. If its worker times out
+    or dies (e.g. is killed for running out of memory), each ligand is
+    retried on its own with ``TIMEOUT_SECONDS``, in up to
+    1 + ``SCREEN_TIMEOUT_RETRIES`` attempts, so one pathological ligand costs
+    only its own row. Ligands that still fail get a failed row with the
+    reason instead of aborting the screen, and are counted under
+    "ligand_timeouts".
+    """
+    timeout = config.TIMEOUT_SECONDS or None
+    try:
+        rows, stats = pool.run(
+            _screen_chunk, (chunk,), timeout=timeout and timeout * len(chunk)
+        )
+        stats["ligand_timeouts"] = 0
+        return rows, stats
+    except WorkerError as e:
+        logger.warning(f"{e} on ligands {chunk[0][0] + 1}-{chunk[-1][0] + 1}")
+        # A single-ligand chunk has had its first attempt
+        attempts = 1 if len(chunk) == 1 else 0
+        error = e
+
+    _, box_center, box_size = worker_args[:3]
+    stats = {"ligand_cache_hits": 0, "ligand_cache_misses": 0, "ligand_timeouts": 0}
+    rows = []
+    for record in chunk:
+        tries = attempts
+        while tries <= config.SCREEN_TIMEOUT_RETRIES:
+            tries += 1
+            try:
+                record_rows, record_stats = pool.run(
+                    _screen_chunk, ([record],), timeout=timeout
+                )
+            except WorkerError as e:
+                logger.warning(f"{e} on ligand {record[0] + 1}")
+                error = e
+                continue
+            for name, value in record_stats.items():
+                stats[name] += value
+            rows.extend(record_rows)
+            break
+        else:
+            row = new_result_row(record[0], box_center, box_size)
+            row["status"] = "failed"
+            row["error"] = f"{error} ({tries} attempts)"
+            stats["ligand_timeouts"] += 1
+            rows.append(row)
+    return rows, stats
+
+
+# Per-process state populated by _init_screen_worker
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_screen_worker(
+    receptor: Dict[str, Any],
+    center: Tuple[float, float, float],
+    box_size: float,
+    exhaustiveness: Optional[int] = None,
+    n_poses: Optional[int] = None,
+) -> None:
+    """
+    Set up the shared receptor, docking maps, model and caches in the worker.
+
+    Receptor affinity maps are computed (or loaded) once here and reused
+    for every ligand the worker docks. ``exhaustiveness`` and ``n_poses``
+    override the configured docking settings (coarse funnel stage).
+    """
+    _WORKER_STATE["receptor"] = receptor
+    _WORKER_STATE["center"] = center
+    _WORKER_STATE["box_size"] = box_size
+    _WORKER_STATE["ligand_cache"] = LigandCache()
+    _WORKER_STATE["backend"] = create_backend(
+        receptor, center, box_size, exhaustiveness, n_poses
+    )
+    _WORKER_STATE["feature_extractor"] = FeatureExtractor()
+    _WORKER_STATE["model"] = load_affinity_model()
+
+
+def _close_screen_worker() -> None:
+    """Report and close the ligand cache opened by _init_screen_worker."""
+    cache = _WORKER_STATE.pop("ligand_cache", None)
+    if cache is not None:
+        cache.log_stats()
+        cache.close()
+
+
+def _screen_chunk(
+    chunk: List[Tuple[int, str, str]],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Screen a chunk of ligand records in the current worker.
+
+    Failures are recorded in the returned rows instead of being raised, so
+    one bad molecule never aborts a screen.
+
+    Args:
+        chunk: List of (index, format, record_text) tuples
+
+    Returns:
+        Tuple of (result rows keyed by RESULT_COLUMNS, counters)
+    """
+    return _predict_chunk(_dock_chunk(_prepare_chunk(chunk)))
+
+
+# Work in progress on a chunk between stages: (result rows, positions in
+# the rows of the ligands still in play with their prepared ligand or
+# docking result, counters)
+ChunkState = Tuple[List[Dict[str, Any]], List[Tuple[int, Any]], Dict[str, int]]
+
+
+def _prepare_chunk(chunk: List[Tuple[int, str, str]]) -> ChunkState:
+    """Parse and prepare a chunk of ligand records (steps 3-4)."""
+    cache: LigandCache = _WORKER_STATE["ligand_cache"]
+    hits, misses = cache.hits, cache.misses
+
+    rows: List[Dict[str, Any]] = []
+    parsed: List[Tuple[int, Any]] = []
+    for index, fmt, record in chunk:
+        row, mol = _parse_ligand_record(index, fmt, record)
+        if mol is not None:
+            parsed.append((len(rows), mol))
+        rows.append(row)
+
+    # One cache lookup per chunk
+    try:
+        prepared = prepare_ligands([mol for _, mol in parsed], cache=cache)
+    except Exception as e:
+        prepared = [e] * len(parsed)
+
+    ready = []
+    for (position, _), ligand in zip(parsed, prepared):
+        if isinstance(ligand, Exception):
+            rows[position]["status"] = "failed"
+            rows[position]["error"] = str(ligand)
+            continue
+        ready.append((position, ligand))
+
+    stats = {
+        "ligand_cache_hits": cache.hits - hits,
+        "ligand_cache_misses": cache.misses - misses,
+    }
+    return rows, ready, stats
+
+
+def _dock_chunk(state: ChunkState) -> ChunkState:
+    """Dock the prepared ligands of a chunk against the shared maps (step 5)."""
+    rows, ready, stats = state
+    backend: DockingBackend = _WORKER_STATE["backend"]
+    docked = backend.dock_many([ligand["pdbqt"] for _, ligand in ready])
+    scored = []
+    for (position, _), result in zip(ready, docked):
+        if isinstance(result, Exception):
+            rows[position]["status"] = "failed"
+            rows[position]["error"] = str(result)
+            continue
+        rows[position]["docking_score_kcal_mol"] = result["score"]
+        scored.append((position, result))
+    return rows, scored, stats
+
+
+def _predict_chunk(
+    state: ChunkState,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """Predict affinities of a chunk's docked ligands in one batch (steps 6-7)."""
+    rows, scored, stats = state
+    scored_rows = [rows[position] for position, _ in scored]
+    try:
+        predict_affinities(
+            scored_rows, _WORKER_STATE["feature_extractor"], _WORKER_STATE["model"]
+        )
+    except Exception as e:
+        for row in scored_rows:
+            row["status"] = "failed"
+            row["error"] = f"Affinity prediction failed: {e}"
+    return rows, stats
+
+
+def _parse_ligand_record(
+    index: int, fmt: str, record: str
+) -> Tuple[Dict[str, Any], Any]:
+    """
+    Parse a raw ligand record and start its result row.
+
+    Args:
+        index: Zero-based position of the record in the library
+        fmt: Record format, "sdf" or "smi"
+        record: Raw record text
+
+    Returns:
+        Tuple of (result row, RDKit molecule or None if parsing failed)
+    """
+    from rdkit import Chem
+
+    row = new_result_row(
+        index, _WORKER_STATE.get("center"), _WORKER_STATE.get("box_size")
+    )
+    try:
+        if fmt == "smi":
+            fields = record.split(None, 1)
+            mol = Chem.MolFromSmiles(fields[0])
+            name = fields[1].strip() if len(fields) > 1 else ""
+        else:
+            mol = Chem.MolFromMolBlock(record, removeHs=False)
+            name = mol.GetProp("_Name").strip() if mol is not None else ""
+        if mol is None:
+            raise LigandError(f"Could not parse {fmt.upper()} record {index + 1}")
+    except Exception as e:
+        row["status"] = "failed"
+        row["error"] = str(e)
+        return row, None
+
+    row["ligand_name"] = name or row["ligand_id"]
+    row["smiles"] = Chem.MolToSmiles(Chem.RemoveHs(mol))
+    return row, mol
+
+
+def _row_index(row: Dict[str, Any]) -> int:
+    """Return the zero-based library index of a result row."""
+    return int(row["ligand_id"].rsplit("_", 1)[1]) - 1
+
+
+def new_result_row(
+    index: int, center: Optional[Tuple[float, float, float]], box_size: Optional[float]
+) -> Dict[str, Any]:
+    """
+    Start a result row for the ligand at ``index`` (zero-based).
+
+    Returns:
+        Row keyed by RESULT_COLUMNS with the ligand ID, box and timestamp
+        set and every result column None
+    """
+    row: Dict[str, Any] = {column: None for column in RESULT_COLUMNS}
+    row["ligand_id"] = f"ligand_{index + 1}"
+    row["binding_site_center"] = (
+        "({:.1f}, {:.1f}, {:.1f})".format(*center) if center else None
+    )
+    row["box_size"] = box_size
+    row["timestamp"] = datetime.now().isoformat(timespec="seconds")
+    return row
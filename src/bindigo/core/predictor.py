@@ -0,0 +1,567 @@
+"""
+Long-lived binding affinity predictor.
+
+``run_prediction`` starts from scratch on every call: it reloads the
+model, reads the prepared receptor back from the receptor cache, resolves
+the binding site and loads the docking maps before docking a single
+ligand. A BindingPredictor keeps all of that in memory between calls.
+Each target (a receptor and docking box) is prepared once and kept in an
+LRU table with its docking backend and maps loaded, and the model and the
+descriptor dictionary stay loaded. A prediction against a warm target
+then costs ligand preparation, docking and one model call.
+
+Requests are served in micro-batches. ``predict`` and ``submit`` put a
+request on a queue; a scheduler thread takes the oldest request, waits at
+most the batch window (measured from when that request arrived) for more,
+groups the batch by target and, per target, prepares the ligands, docks
+them in one ``dock_many`` call and predicts their affinities with one
+model call. Under load, requests queued while a batch is running form
+the next batch without any extra wait, so concurrent clients share the
+batched docking and inference; a lone request waits at most the window.
+
+All work runs on the scheduler thread, so any number of threads (e.g.
+the request handlers of ``bindigo serve``) can submit requests at the
+same time. Docking backends and the SQLite caches are never shared
+between threads.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from bindigo.core.config import config
+from bindigo.core.pipeline import (
+    create_backend,
+    load_affinity_model,
+    new_result_row,
+    predict_affinities,
+    prepare_input_receptor,
+    resolve_binding_site,
+)
+from bindigo.docking.backend import DockingBackend
+from bindigo.ml.features import FeatureExtractor
+from bindigo.preprocessing.ligand import LigandCache, load_ligand, prepare_ligands
+from bindigo.utils.exceptions import BindigoError, InputError
+from bindigo.utils.logging import get_logger
+from bindigo.utils.metrics import PipelineMetrics, timed
+from bindigo.utils.validation import (
+    validate_binding_site,
+    validate_ligand_input,
+    validate_protein_input,
+)
+
+logger = get_logger(__name__)
+
+Center = Tuple[float, float, float]
+
+# Stops the scheduler thread
+_STOP = object()
+
+
+class Target:
+    """
+    A receptor and docking box with the docking backend ready to dock.
+
+    Attributes:
+        key: Key of the target in the predictor's table
+        protein: Validated protein input (PDB ID or absolute path)
+        receptor: Prepared receptor description
+        center: Docking box center
+        box_size: Docking box edge length
+        backend: Docking backend with the receptor maps loaded
+        n_predictions: Predictions served from this target
+    """
+
+    def __init__(
+        self,
+        key: Hashable,
+        protein: str,
+        receptor: Dict[str, Any],
+        center: Center,
+        box_size: float,
+        backend: DockingBackend,
+    ):
+        self.key = key
+        self.protein = protein
+        self.receptor = receptor
+        self.center = center
+        self.box_size = box_size
+        self.backend = backend
+        self.n_predictions = 0
+
+    def describe(self) -> Dict[str, Any]:
+        """Return a JSON-serializable summary of the target."""
+        return {
+            "protein": self.protein,
+            "receptor_file": self.receptor.get("pdbqt_file"),
+            "center": list(self.center),
+            "box_size": self.box_size,
+            "predictions": self.n_predictions,
+        }
+
+
+class _Request:
+    """A prediction request waiting to be batched."""
+
+    def __init__(
+        self,
+        protein: str,
+        ligand: str,
+        center: Optional[Sequence[float]],
+        box_size: Optional[float],
+        save_pose: bool,
+    ):
+        self.protein = protein
+        self.ligand = ligand
+        self.requested_center = center
+        self.box_size = box_size
+        self.save_pose = save_pose
+        self.future: Future = Future()
+        self.submitted = time.time()
+        self.arrived = time.perf_counter()
+        # Filled in by validation on the scheduler thread
+        self.protein_type = ""
+        self.ligand_type = ""
+        self.center: Optional[Center] = None
+        self.validation_time = 0.0
+
+
+class BindingPredictor:
+    """
+    Predictor keeping the model, prepared receptors and docking maps warm.
+
+    Example:
+        with BindingPredictor() as predictor:
+            predictor.prepare_target("1HSG")
+            result = predictor.predict("1HSG", "CC(=O)Nc1ccc(O)cc1")
+    """
+
+    def __init__(
+        self,
+        max_targets: Optional[int] = None,
+        batch_window_ms: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        """
+        Initialize the predictor and start its scheduler thread.
+
+        Args:
+            max_targets: Targets kept in memory; the least recently used is
+                dropped beyond this (default: Config.SERVER_MAX_TARGETS)
+            batch_window_ms: Longest a request waits for others to batch
+                with, in milliseconds; 0 only batches requests that are
+                already queued (default: Config.SERVER_BATCH_WINDOW_MS)
+            max_batch_size: Most requests served in one batch (default:
+                Config.SERVER_MAX_BATCH_SIZE)
+        """
+        self.max_targets = max_targets or config.SERVER_MAX_TARGETS
+        if batch_window_ms is None:
+            batch_window_ms = config.SERVER_BATCH_WINDOW_MS
+        self.batch_window = max(batch_window_ms, 0.0) / 1000.0
+        self.max_batch_size = max(max_batch_size or config.SERVER_MAX_BATCH_SIZE, 1)
+        self.n_predictions = 0
+        self.n_batches = 0
+        self.started = time.time()
+        self._targets: "OrderedDict[Hashable, Target]" = OrderedDict()
+        self._model: Any = None
+        self._model_loaded = False
+        self._extractor: Optional[FeatureExtractor] = None
+        self._ligand_cache = LigandCache()
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._held: Any = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="bindigo-predictor", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "BindingPredictor":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(
+        self,
+        protein: str,
+        ligand: str,
+        center: Optional[Sequence[float]] = None,
+        box_size: Optional[float] = None,
+        save_pose: bool = False,
+    ) -> "Future[Dict[str, Any]]":
+        """
+        Queue a prediction; arguments are as for predict.
+
+        Returns:
+            Future resolving to the result dictionary, or raising the
+            BindigoError of a failed prediction
+        """
+        request = _Request(protein, ligand, center, box_size, save_pose)
+        self._put(request)
+        return request.future
+
+    def predict(
+        self,
+        protein: str,
+        ligand: str,
+        center: Optional[Sequence[float]] = None,
+        box_size: Optional[float] = None,
+        save_pose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Predict the binding affinity of one ligand.
+
+        Args:
+            protein: PDB ID or structure file path
+            ligand: SMILES string or ligand file path
+            center: Binding site center (default: largest detected pocket)
+            box_size: Box edge length in Angstroms (default: fitted to the
+                pocket, or Config.BINDING_SITE_DEFAULT_SIZE)
+            save_pose: Include the docked poses (PDBQT) as "poses"
+
+        Returns:
+            Dictionary with "protein", "ligand", "smiles", "center",
+            "box_size", "docking_score", "pKd", "kd_nM", "status", the
+            full result "row" (RESULT_COLUMNS), "batch_size",
+            "execution_time" and the "metrics" of the batch
+
+        Raises:
+            BindigoError: If any step fails
+        """
+        return self.submit(protein, ligand, center, box_size, save_pose).result()
+
+    def prepare_target(
+        self,
+        protein: str,
+        center: Optional[Sequence[float]] = None,
+        box_size: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Prepare a target ahead of the first prediction against it.
+
+        Args:
+            protein: PDB ID or structure file path
+            center: Binding site center (default: largest detected pocket)
+            box_size: Box edge length in Angstroms
+
+        Returns:
+            Target summary (see Target.describe)
+        """
+
+        def prepare() -> Dict[str, Any]:
+            protein_type, protein_validated = validate_protein_input(protein)
+            target_center = _as_center(center)
+            validate_binding_site(target_center, box_size)
+            target = self._target(
+                protein_type, protein_validated, target_center, box_size
+            )
+            return target.describe()
+
+        future: "Future[Dict[str, Any]]" = Future()
+        self._put((prepare, future))
+        return future.result()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return prediction and batch counts, uptime and warm targets."""
+        with self._lock:
+            targets = [target.describe() for target in self._targets.values()]
+        return {
+            "predictions": self.n_predictions,
+            "batches": self.n_batches,
+            "uptime": time.time() - self.started,
+            "model_loaded": self._model is not None,
+            "targets": targets,
+        }
+
+    def close(self) -> None:
+        """
+        Finish queued predictions, stop the scheduler and drop all targets.
+
+        The ligand cache connection is closed by the scheduler thread, which
+        is the only thread using it.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        with self._lock:
+            self._targets.clear()
+
+    def _put(self, item: Any) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BindingPredictor is closed")
+            self._queue.put(item)
+
+    def _run(self) -> None:
+        """Scheduler loop: serve queued jobs and request batches in order."""
+        while True:
+            item = self._next_item()
+            if item is _STOP:
+                self._ligand_cache.log_stats()
+                self._ligand_cache.close()
+                return
+            if isinstance(item, _Request):
+                self._serve_batch(self._collect_batch(item))
+                continue
+            func, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(func())
+            except Exception as e:
+                future.set_exception(e)
+
+    def _next_item(self) -> Any:
+        item, self._held = self._held, None
+        return item if item is not None else self._queue.get()
+
+    def _collect_batch(self, first: _Request) -> List[_Request]:
+        """
+        Collect requests to batch with ``first``.
+
+        Waits until the batch window since ``first`` arrived has passed or
+        the batch is full. A job (or the stop marker) ends the batch and is
+        held back to run after it.
+        """
+        batch = [first]
+        deadline = first.arrived + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            try:
+                if timeout > 0:
+                    item = self._queue.get(timeout=timeout)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, _Request):
+                self._held = item
+                break
+            batch.append(item)
+        return batch
+
+    def _serve_batch(self, batch: List[_Request]) -> None:
+        """Validate a batch, group it by target and serve each group."""
+        groups: "OrderedDict[Hashable, List[_Request]]" = OrderedDict()
+        for request in batch:
+            if not request.future.set_running_or_notify_cancel():
+                continue
+            start = time.perf_counter()
+            try:
+                request.protein_type, request.protein = validate_protein_input(
+                    request.protein
+                )
+                request.ligand_type, request.ligand = validate_ligand_input(
+                    request.ligand
+                )
+                request.center = _as_center(request.requested_center)
+                validate_binding_site(request.center, request.box_size)
+                key = _target_key(
+                    request.protein_type,
+                    request.protein,
+                    request.center,
+                    request.box_size,
+                )
+            except Exception as e:
+                _fail(request, e)
+                continue
+            request.validation_time = time.perf_counter() - start
+            groups.setdefault(key, []).append(request)
+
+        self.n_batches += 1
+        if len(batch) > 1:
+            logger.debug(f"Serving {len(batch)} requests for {len(groups)} target(s)")
+        for requests in groups.values():
+            try:
+                self._serve_group(requests)
+            except Exception as e:
+                for request in requests:
+                    if not request.future.done():
+                        _fail(request, e)
+
+    def _serve_group(self, requests: List[_Request]) -> None:
+        """Dock and predict requests sharing one target as a batch."""
+        metrics = PipelineMetrics("predict")
+        metrics.add_stage_time(
+            "validation",
+            sum(request.validation_time for request in requests),
+            calls=len(requests),
+        )
+        metrics.count("batched_requests", len(requests))
+        first = requests[0]
+        target = self._target(
+            first.protein_type, first.protein, first.center, first.box_size, metrics
+        )
+
+        # Load and prepare the ligands together, failing requests one by one
+        cache = self._ligand_cache
+        hits, misses = cache.hits, cache.misses
+        with metrics.stage("ligand_prep"):
+            mols = {}
+            for request in requests:
+                try:
+                    mols[request] = load_ligand(request.ligand_type, request.ligand)
+                except Exception as e:
+                    _fail(request, e)
+            prepared = dict(zip(mols, prepare_ligands(list(mols.values()), cache)))
+        metrics.count("ligand_cache_hits", cache.hits - hits)
+        metrics.count("ligand_cache_misses", cache.misses - misses)
+        ready = []
+        for request, ligand in prepared.items():
+            if isinstance(ligand, Exception):
+                _fail(request, ligand)
+            else:
+                ready.append(request)
+
+        with metrics.stage("docking"):
+            docked = target.backend.dock_many(
+                [prepared[request]["pdbqt"] for request in ready]
+            )
+
+        rows = {}
+        for request, result in zip(ready, docked):
+            if isinstance(result, Exception):
+                _fail(request, result)
+                continue
+            mol = mols[request]
+            row = new_result_row(0, target.center, target.box_size)
+            row["ligand_name"] = (
+                mol.GetProp("_Name").strip() if mol.HasProp("_Name") else ""
+            ) or row["ligand_id"]
+            row["smiles"] = prepared[request]["smiles"]
+            row["docking_score_kcal_mol"] = result["score"]
+            rows[request] = (row, result["poses"])
+
+        with metrics.stage("ml"):
+            model = self._load_model()
+        extractor = self._feature_extractor()
+        hits, computed = extractor.hits, extractor.computed
+        predict_affinities([row for row, _ in rows.values()], extractor, model, metrics)
+        metrics.count("descriptor_cache_hits", extractor.hits - hits)
+        metrics.count("descriptor_cache_misses", extractor.computed - computed)
+
+        target.n_predictions += len(rows)
+        self.n_predictions += len(rows)
+        metrics.finish()
+        batch_metrics = metrics.to_dict()
+        for request, (row, poses) in rows.items():
+            result = {
+                "protein": request.protein,
+                "ligand": request.ligand,
+                "protein_type": request.protein_type,
+                "ligand_type": request.ligand_type,
+                "receptor_file": target.receptor.get("pdbqt_file"),
+                "smiles": row["smiles"],
+                "center": target.center,
+                "box_size": target.box_size,
+                "docking_score": row["docking_score_kcal_mol"],
+                "pKd": row["predicted_pKd"],
+                "kd_nM": row["predicted_kd_nM"],
+                "confidence": row["confidence"],
+                "status": row["status"],
+                "row": row,
+                "batch_size": len(requests),
+                "execution_time": time.time() - request.submitted,
+                "metrics": batch_metrics,
+            }
+            if request.save_pose:
+                result["poses"] = poses
+            request.future.set_result(result)
+
+    def _target(
+        self,
+        protein_type: str,
+        protein: str,
+        center: Optional[Center],
+        box_size: Optional[float],
+        metrics: Optional[PipelineMetrics] = None,
+    ) -> Target:
+        """Return the warm target for a request, preparing it if needed."""
+        key = _target_key(protein_type, protein, center, box_size)
+        with self._lock:
+            target = self._targets.get(key)
+            if target is not None:
+                self._targets.move_to_end(key)
+        if metrics is not None:
+            hit = target is not None
+            metrics.count("target_hits" if hit else "target_misses")
+        if target is not None:
+            return target
+
+        logger.info(f"Preparing target {protein}")
+        receptor = prepare_input_receptor(protein_type, protein, metrics)
+        with timed(metrics, "site_detection"):
+            site_center, site_size = resolve_binding_site(receptor, center, box_size)
+        backend = create_backend(receptor, site_center, site_size, metrics=metrics)
+        target = Target(key, protein, receptor, site_center, site_size, backend)
+        with self._lock:
+            self._targets[key] = target
+            while len(self._targets) > self.max_targets:
+                _, dropped = self._targets.popitem(last=False)
+                logger.info(f"Dropped least recently used target {dropped.protein}")
+        return target
+
+    def _load_model(self) -> Any:
+        """Return the affinity model, loading it on first use."""
+        if not self._model_loaded:
+            self._model = load_affinity_model()
+            self._model_loaded = True
+        return self._model
+
+    def _feature_extractor(self) -> FeatureExtractor:
+        """Return the feature extractor, created on the scheduler thread."""
+        if self._extractor is None:
+            self._extractor = FeatureExtractor()
+        return self._extractor
+
+
+def _fail(request: _Request, error: Exception) -> None:
+    """Fail a request, wrapping unexpected errors in BindigoError."""
+    if isinstance(error, BindigoError):
+        logger.error(f"Prediction failed: {error}")
+    else:
+        logger.error(f"Unexpected error in prediction: {error}")
+        error = BindigoError(f"Prediction failed: {error}")
+    request.future.set_exception(error)
+
+
+def _as_center(center: Optional[Sequence[float]]) -> Optional[Center]:
+    """
+    Return a center as a tuple of three floats.
+
+    Raises:
+        InputError: If the center is not three numbers
+    """
+    if center is None:
+        return None
+    try:
+        x, y, z = (float(c) for c in center)
+    except (TypeError, ValueError):
+        raise InputError(
+            f"Binding site center must be 3 numbers (X Y Z), got {center!r}"
+        )
+    return (x, y, z)
+
+
+def _target_key(
+    protein_type: str,
+    protein: str,
+    center: Optional[Center],
+    box_size: Optional[float],
+) -> Hashable:
+    """
+    Key a target by protein, requested box and, for files, modification time.
+
+    Requests without a center share the target of their detected pocket;
+    a structure file that changes on disk gets a new target.
+    """
+    version = os.stat(protein).st_mtime_ns if protein_type == "file" else None
+    return (protein, version, center, box_size)
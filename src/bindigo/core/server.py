@@ -0,0 +1,378 @@
+"""
+Prediction server and client for ``bindigo serve``.
+
+The server wraps a BindingPredictor in a small JSON-over-HTTP interface,
+listening either on localhost TCP or on a Unix domain socket:
+
+    GET  /health    {"status": "ok", "predictions": ..., "targets": [...]}
+    POST /predict   {"protein": ..., "ligand": ..., "center": [x, y, z],
+                     "box_size": ..., "save_pose": false}
+
+Errors are returned as {"error": message, "error_type": exception name}
+with status 400 for Bindigo errors (bad input, failed docking) and 500
+for anything else. PredictionClient raises the matching Bindigo
+exception again on the client side.
+
+Only the standard library is used here, and the predictor is imported
+lazily, so ``bindigo predict --server`` does not load NumPy, RDKit or the
+model in the client process.
+"""
+
+import http.client
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple, Union
+
+from bindigo.__version__ import __version__
+from bindigo.core.config import config
+from bindigo.utils import exceptions
+from bindigo.utils.exceptions import BindigoError, InputError, ServerError
+from bindigo.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from bindigo.core.predictor import BindingPredictor
+
+logger = get_logger(__name__)
+
+# A Unix socket path, or a (host, port) pair
+Address = Union[str, Tuple[str, int]]
+
+PREDICT_FIELDS = ("protein", "ligand", "center", "box_size", "save_pose")
+
+
+def parse_address(address: Optional[str] = None) -> Address:
+    """
+    Parse a server address.
+
+    Args:
+        address: "unix:/path/to.sock" or a path containing "/" for a Unix
+            socket; "host:port", "http://host:port" or ":port" for TCP;
+            None for Config.SERVER_HOST and Config.SERVER_PORT
+
+    Returns:
+        Socket path (str) or (host, port)
+
+    Raises:
+        InputError: If the address cannot be parsed
+    """
+    if not address:
+        return (config.SERVER_HOST, int(config.SERVER_PORT))
+    if address.startswith("unix:"):
+        return os.path.abspath(address[len("unix:") :])
+    if address.startswith("http://"):
+        address = address[len("http://") :].rstrip("/")
+    elif "/" in address:
+        return os.path.abspath(address)
+
+    host, _, port = address.rpartition(":")
+    try:
+        return (host or config.SERVER_HOST, int(port))
+    except ValueError:
+        raise InputError(
+            f"Invalid server address: {address!r} "
+            "(expected HOST:PORT or unix:/path/to.sock)"
+        )
+
+
+def format_address(address: Address) -> str:
+    """Format an address as accepted by parse_address."""
+    if isinstance(address, str):
+        return f"unix:{address}"
+    return f"{address[0]}:{address[1]}"
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy scalars and arrays in JSON responses."""
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP handler calling the server's predictor."""
+
+    server_version = f"bindigo/{__version__}"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def predictor(self) -> "BindingPredictor":
+        """The predictor of the server handling this request."""
+        assert isinstance(self.server, (_TCPServer, _UnixServer))
+        return self.server.predictor
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/health":
+            self._send(200, {"status": "ok", **self.predictor.stats()})
+        else:
+            self._send_error(404, ServerError(f"Unknown path: {self.path}"))
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/predict":
+            self._send_error(404, ServerError(f"Unknown path: {self.path}"))
+            return
+        try:
+            request = self._read_json()
+            unknown = set(request) - set(PREDICT_FIELDS)
+            if unknown:
+                raise InputError(f"Unknown request fields: {sorted(unknown)}")
+            if "protein" not in request or "ligand" not in request:
+                raise InputError("Requests need 'protein' and 'ligand'")
+            result = self.predictor.predict(**request)
+        except BindigoError as e:
+            self._send_error(400, e)
+        except Exception as e:
+            logger.exception("Unexpected error serving prediction")
+            self._send_error(500, e)
+        else:
+            self._send(200, result)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            raise InputError(f"Request body is not valid JSON: {e}")
+        if not isinstance(request, dict):
+            raise InputError("Request body must be a JSON object")
+        return request
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, default=_json_default).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, error: Exception) -> None:
+        self._send(status, {"error": str(error), "error_type": type(error).__name__})
+
+    def address_string(self) -> str:
+        # Unix socket peers have no (host, port) address
+        if isinstance(self.client_address, tuple) and self.client_address:
+            return str(self.client_address[0])
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(f"{self.address_string()} {format % args}")
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    predictor: "BindingPredictor"
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    predictor: "BindingPredictor"
+
+
+class PredictionServer:
+    """
+    HTTP server answering prediction requests with a BindingPredictor.
+
+    Example:
+        with BindingPredictor() as predictor:
+            server = PredictionServer(predictor, "unix:/tmp/bindigo.sock")
+            server.serve_forever()
+    """
+
+    def __init__(self, predictor: "BindingPredictor", address: Optional[str] = None):
+        """
+        Bind the server.
+
+        Args:
+            predictor: Predictor answering the requests
+            address: Address to listen on (see parse_address); port 0 binds
+                a free port
+
+        Raises:
+            ServerError: If the address is in use or cannot be bound
+        """
+        self.predictor = predictor
+        bind_address = parse_address(address)
+        self._server: Union[_TCPServer, _UnixServer]
+        try:
+            if isinstance(bind_address, str):
+                _remove_stale_socket(bind_address)
+                self._server = _UnixServer(bind_address, _RequestHandler)
+                os.chmod(bind_address, 0o600)
+            else:
+                self._server = _TCPServer(bind_address, _RequestHandler)
+        except OSError as e:
+            raise ServerError(f"Cannot listen on {format_address(bind_address)}: {e}")
+        self._server.predictor = predictor
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> Address:
+        """The bound address (with the actual port for port 0)."""
+        bound = self._server.server_address
+        if isinstance(bound, tuple):
+            return (str(bound[0]), bound[1])
+        if isinstance(bound, str):
+            return bound
+        return os.fsdecode(bytes(bound))
+
+    def serve_forever(self) -> None:
+        """Serve requests until shutdown() is called."""
+        logger.info(f"Serving predictions on {format_address(self.address)}")
+        self._server.serve_forever()
+
+    def start(self) -> "PredictionServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="bindigo-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def shutdown(self) -> None:
+        """Stop serving and release the address."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def __enter__(self) -> "PredictionServer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket file left behind by a server that is no longer running."""
+    if not os.path.exists(path):
+        return
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        raise ServerError(f"{path} exists and is not a socket")
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+    else:
+        raise ServerError(f"A server is already listening on {path}")
+    finally:
+        probe.close()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, path: str, timeout: Optional[float] = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if self.timeout is not None:
+            self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class PredictionClient:
+    """
+    Client for a running ``bindigo serve``.
+
+    Example:
+        client = PredictionClient("unix:/tmp/bindigo.sock")
+        result = client.predict("1HSG", "CC(=O)Nc1ccc(O)cc1")
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: Optional[float] = None):
+        """
+        Initialize the client.
+
+        Args:
+            address: Server address (see parse_address)
+            timeout: Seconds to wait for a response (default:
+                Config.TIMEOUT_SECONDS)
+        """
+        self.address = parse_address(address)
+        self.timeout = timeout or config.TIMEOUT_SECONDS
+
+    def health(self) -> Dict[str, Any]:
+        """Return the server status, served prediction count and warm targets."""
+        return self._request("GET", "/health")
+
+    def predict(
+        self,
+        protein: str,
+        ligand: str,
+        center: Optional[Sequence[float]] = None,
+        box_size: Optional[float] = None,
+        save_pose: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Predict the binding affinity of one ligand on the server.
+
+        Local file paths are sent as absolute paths, so the server must see
+        the same filesystem. Arguments and result are as for
+        BindingPredictor.predict.
+
+        Raises:
+            ServerError: If the server cannot be reached
+            BindigoError: The error raised by the server's predictor
+        """
+        request = {
+            "protein": _absolute_if_file(protein),
+            "ligand": _absolute_if_file(ligand),
+            "center": list(center) if center else None,
+            "box_size": box_size,
+            "save_pose": save_pose,
+        }
+        return self._request("POST", "/predict", request)
+
+    def _request(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        connection: http.client.HTTPConnection
+        if isinstance(self.address, str):
+            connection = _UnixHTTPConnection(self.address, timeout=self.timeout)
+        else:
+            connection = http.client.HTTPConnection(*self.address, timeout=self.timeout)
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+        except OSError as e:
+            raise ServerError(
+                f"Cannot reach the Bindigo server at "
+                f"{format_address(self.address)}: {e}"
+            )
+        finally:
+            connection.close()
+
+        try:
+            result = json.loads(data)
+        except ValueError:
+            result = None
+        if not isinstance(result, dict):
+            raise ServerError(f"Invalid response from server (HTTP {response.status})")
+        if response.status != 200:
+            error_class = getattr(exceptions, result.get("error_type", ""), None)
+            if not (
+                isinstance(error_class, type) and issubclass(error_class, BindigoError)
+            ):
+                error_class = BindigoError
+            raise error_class(result.get("error", f"HTTP {response.status}"))
+        return result
+
+
+def _absolute_if_file(value: str) -> str:
+    """Return an existing file path made absolute, or the value unchanged."""
+    return os.path.abspath(value) if os.path.isfile(value) else value
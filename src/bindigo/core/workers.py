@@ -0,0 +1,379 @@
+"""
+Supervised worker processes with task timeouts and a memory budget.
+
+``ProcessPoolExecutor`` cannot stop a task that hangs, and a worker killed
+by the kernel's OOM killer breaks the whole pool. WorkerPool runs each
+worker as its own process on a pipe, so the parent can:
+
+- kill a worker whose task runs past its timeout and start a fresh one,
+  while the other workers carry on (the caller decides whether to retry)
+- measure each worker's memory (see ``process_memory_bytes``) and only
+  start another worker while the parent, the running workers and one
+  more worker of the largest size seen so far fit in the memory budget
+- retire a worker after its task when the run as a whole has grown past
+  the budget, so concurrency shrinks instead of the node running out of
+  memory
+
+Tasks are submitted with the blocking ``run`` method from any number of
+threads; each call waits for a free worker, sends it the task and waits
+for the result.
+
+Workers are started with ``forkserver`` (``spawn`` where it is not
+available) rather than ``fork``: they are started from supervisor threads
+while other threads of the parent (the pipeline feeder, result writers)
+hold locks, and a forked child would inherit those locks held. The
+forkserver preloads the initializer's module, so each worker starts from
+a process that has already imported it, and every worker receives the
+parent's current Config values.
+"""
+
+import multiprocessing
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from bindigo.core.config import Config, config
+from bindigo.utils.exceptions import BindigoError, WorkerError
+from bindigo.utils.logging import get_logger
+from bindigo.utils.metrics import process_memory_bytes
+
+logger = get_logger(__name__)
+
+
+def _worker_main(
+    conn: Any,
+    settings: Dict[str, Any],
+    initializer: Optional[Callable[..., None]],
+    initargs: Sequence[Any],
+    finalizer: Optional[Callable[[], None]],
+) -> None:
+    """Worker process loop: initialize, then run tasks until told to stop."""
+    try:
+        Config.update(**settings)
+        if initializer is not None:
+            initializer(*initargs)
+    except Exception as e:
+        conn.send(("error", _picklable(e)))
+        return
+    conn.send(("ready", None))
+    try:
+        while True:
+            try:
+                task = conn.recv()
+            except EOFError:
+                return
+            if task is None:
+                return
+            fn, args = task
+            try:
+                conn.send(("ok", fn(*args)))
+            except Exception as e:
+                conn.send(("error", _picklable(e)))
+    finally:
+        if finalizer is not None:
+            finalizer()
+
+
+def _picklable(error: Exception) -> Exception:
+    """Return an exception that survives pickling to the parent."""
+    import pickle
+
+    try:
+        pickle.loads(pickle.dumps(error))
+        return error
+    except Exception:
+        return BindigoError(f"{type(error).__name__}: {error}")
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(
+        self,
+        context: Any,
+        initializer: Any,
+        initargs: Sequence[Any],
+        finalizer: Any = None,
+    ):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(
+                child_conn,
+                Config.to_dict(),
+                initializer,
+                tuple(initargs),
+                finalizer,
+            ),
+            name="bindigo-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.memory: Optional[int] = None
+
+    def receive(self, timeout: Optional[float]) -> Any:
+        """
+        Wait for the worker's next message.
+
+        Raises:
+            WorkerError: If the worker dies or ``timeout`` seconds pass
+        """
+        try:
+            if self.conn.poll(timeout):
+                return self.conn.recv()
+            died = False
+        except (EOFError, OSError):
+            died = True
+        self.kill()
+        if not died:
+            raise WorkerError(f"Worker timed out after {timeout:g} s and was killed")
+        raise WorkerError(
+            f"Worker process died (exit code {self.process.exitcode}), "
+            "possibly killed for running out of memory"
+        )
+
+    def measure(self) -> Optional[int]:
+        """Update and return the worker's current memory use."""
+        self.memory = process_memory_bytes(self.process.pid)
+        return self.memory
+
+    def stop(self) -> None:
+        """Ask the worker to exit, killing it if it does not."""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=5)
+        self.kill()
+
+    def kill(self) -> None:
+        """Kill the worker immediately."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    Pool of worker processes bounded by a worker count and a memory budget.
+
+    Example:
+        with WorkerPool(4, initializer=init, memory_limit=2 * 2**30) as pool:
+            result = pool.run(work, (item,), timeout=300)
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Sequence[Any] = (),
+        memory_limit: Optional[int] = None,
+        finalizer: Optional[Callable[[], None]] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize the pool; workers are started as tasks need them.
+
+        Args:
+            max_workers: Most workers running at once
+            initializer: Called with ``initargs`` in each new worker
+            initargs: Arguments for the initializer
+            memory_limit: Memory budget in bytes for the parent and its
+                workers together (None for no limit)
+            finalizer: Called in a worker when it is stopped (not when it
+                is killed), e.g. to close its connections
+            start_method: multiprocessing start method (default:
+                Config.WORKER_START_METHOD, else forkserver where available
+                and spawn otherwise)
+        """
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.initargs = tuple(initargs)
+        self.finalizer = finalizer
+        self.memory_limit = memory_limit
+        self.workers_started = 0
+        self.workers_killed = 0
+        self.peak_workers = 0
+        self.worker_memory: Optional[int] = None
+        self._context = _worker_context(start_method, initializer)
+        self._workers: List[_Worker] = []
+        self._idle: List[_Worker] = []
+        self._starting = 0
+        self._limited = False
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def __enter__(self) -> "WorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        args: Sequence[Any] = (),
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Run ``fn(*args)`` in a worker and return its result.
+
+        Args:
+            fn: Picklable module-level function
+            args: Picklable arguments
+            timeout: Seconds before the worker is killed (None waits forever)
+
+        Raises:
+            WorkerError: If the task timed out or its worker died; the
+                worker is replaced for later tasks
+            Exception: Whatever ``fn`` raised in the worker
+        """
+        worker = self._acquire()
+        try:
+            try:
+                worker.conn.send((fn, tuple(args)))
+            except OSError as e:
+                raise WorkerError(f"Worker process died before its task: {e}")
+            status, value = worker.receive(timeout)
+        except BaseException:
+            self._discard(worker)
+            raise
+        self._release(worker)
+        if status == "error":
+            raise value
+        return value
+
+    def close(self) -> None:
+        """Stop all workers."""
+        with self._condition:
+            self._closed = True
+            workers, self._workers, self._idle = self._workers, [], []
+            self._condition.notify_all()
+        for worker in workers:
+            worker.stop()
+
+    def _acquire(self) -> _Worker:
+        """Return an idle worker, starting one if the limits allow."""
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise WorkerError("Worker pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._can_start():
+                    self._starting += 1
+                    break
+                self._condition.wait()
+
+        try:
+            worker = _Worker(
+                self._context, self.initializer, self.initargs, self.finalizer
+            )
+            status, value = worker.receive(None)
+        except BaseException:
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+            raise
+        if status != "ready":
+            worker.kill()
+            with self._condition:
+                self._starting -= 1
+                self._condition.notify_all()
+            raise BindigoError(f"Worker initialization failed: {value}")
+
+        self._record_memory(worker)
+        with self._condition:
+            self._starting -= 1
+            self._workers.append(worker)
+            self.workers_started += 1
+            self.peak_workers = max(self.peak_workers, len(self._workers))
+            # Its measured size may let waiting callers start workers
+            self._condition.notify_all()
+        return worker
+
+    def _can_start(self) -> bool:
+        """
+        Whether another worker fits the worker count and memory budget.
+
+        The first worker starts alone so its size can be measured; after
+        that, as many workers start together as the budget allows for
+        workers of that size.
+        """
+        running = len(self._workers) + self._starting
+        if running >= self.max_workers:
+            return False
+        limit = self.memory_limit
+        if running == 0 or limit is None:
+            return True
+        if self.worker_memory is None:
+            # Size the first worker before starting more
+            return False
+        starting = (self._starting + 1) * self.worker_memory
+        if self._total_memory() + starting <= limit:
+            return True
+        if not self._limited and not self._starting:
+            self._limited = True
+            logger.warning(
+                f"Memory budget of {limit / 2**30:.1f} GB allows "
+                f"{running} worker(s) of ~{self.worker_memory / 2**20:.0f} MB; "
+                "not starting more (Config.MAX_MEMORY_GB)"
+            )
+        return False
+
+    def _total_memory(self) -> int:
+        """Memory of the parent and the workers, as last measured."""
+        total = process_memory_bytes() or 0
+        return total + sum(worker.memory or 0 for worker in self._workers)
+
+    def _record_memory(self, worker: _Worker) -> None:
+        memory = worker.measure()
+        if memory is not None:
+            self.worker_memory = max(self.worker_memory or 0, memory)
+
+    def _release(self, worker: _Worker) -> None:
+        """Return a worker after a task, retiring it if over the budget."""
+        self._record_memory(worker)
+        limit = self.memory_limit
+        with self._condition:
+            over_budget = (
+                limit is not None
+                and len(self._workers) > 1
+                and self._total_memory() > limit
+            )
+            if over_budget:
+                self._workers.remove(worker)
+            else:
+                self._idle.append(worker)
+            self._condition.notify_all()
+        if over_budget and limit is not None:
+            logger.warning(
+                f"Over the memory budget of {limit / 2**30:.1f} GB; "
+                f"retiring a worker ({len(self._workers)} left)"
+            )
+            worker.stop()
+
+    def _discard(self, worker: _Worker) -> None:
+        """Kill and drop a worker that timed out or failed mid-task."""
+        worker.kill()
+        with self._condition:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            self.workers_killed += 1
+            self._condition.notify_all()
+
+
+def _worker_context(
+    start_method: Optional[str], initializer: Optional[Callable[..., None]]
+) -> Any:
+    """Return the multiprocessing context for new workers."""
+    method = start_method or config.WORKER_START_METHOD
+    if method is None:
+        available = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in available else "spawn"
+    context = multiprocessing.get_context(method)
+    if method == "forkserver" and initializer is not None:
+        # Takes effect if the forkserver is not running yet
+        context.set_forkserver_preload([initializer.__module__])
+    return context
@@ -0,0 +1,395 @@
+"""
+PDB structure fetching for Bindigo.
+
+Structures are downloaded once into ``Config.PDB_CACHE_DIR`` and read
+from there afterwards. Downloads go through one pooled HTTP session
+(keep-alive connections are reused across requests) and ``fetch_many``
+runs up to ``Config.PDB_FETCH_WORKERS`` downloads concurrently, so
+fetching a panel of targets is bounded by bandwidth rather than
+per-request round trips.
+
+The source is RCSB (``Config.PDB_BASE_URL``) by default. Pointing the base
+URL at a local HTTP server, or ``Config.PDB_MIRROR_DIR`` at a local
+directory (flat ``1HSG.pdb`` files or a wwPDB-style divided mirror with
+gzipped entries), avoids the public network entirely.
+
+Cached entries are tracked in a ``PDBCacheIndex``: a cached ID is resolved
+by one index query without touching the network, and entries beyond
+``Config.PDB_CACHE_MAX_MB`` are evicted least recently used first.
+"""
+
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Union
+
+from bindigo.core.config import config
+from bindigo.database.pdb_cache import PDBCacheIndex
+from bindigo.utils.exceptions import DatabaseError, InputError
+from bindigo.utils.logging import get_logger
+from bindigo.utils.validation import is_pdb_id
+
+if TYPE_CHECKING:
+    import requests
+
+logger = get_logger(__name__)
+
+# Formats tried in order; large assemblies are only distributed as mmCIF
+PDB_FORMATS = ("pdb", "cif")
+
+# HTTP statuses retried with backoff
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_CHUNK_SIZE = 1 << 16
+
+
+def normalize_pdb_id(pdb_id: str) -> str:
+    """
+    Validate a PDB ID and return it upper-cased.
+
+    Raises:
+        InputError: If the ID is not a valid 4-character PDB ID
+    """
+    if not is_pdb_id(pdb_id):
+        raise InputError(f"Invalid PDB ID: '{pdb_id}'")
+    return pdb_id.upper()
+
+
+def mirror_candidates(mirror_dir: Path, pdb_id: str, fmt: str) -> List[Path]:
+    """
+    List the files a local mirror may hold an entry in.
+
+    Both flat directories (``1HSG.pdb``, ``1hsg.cif.gz``) and the wwPDB
+    divided layout (``pdb/hs/pdb1hsg.ent.gz``, ``mmCIF/hs/1hsg.cif.gz``)
+    are supported.
+
+    Args:
+        mirror_dir: Mirror root directory
+        pdb_id: Upper-case PDB ID
+        fmt: "pdb" or "cif"
+
+    Returns:
+        Candidate paths, most specific first
+    """
+    lower = pdb_id.lower()
+    names = [f"{pdb_id}.{fmt}", f"{lower}.{fmt}"]
+    if fmt == "pdb":
+        names += [f"pdb{lower}.ent", f"{lower}.ent"]
+        divided = mirror_dir / "pdb" / lower[1:3] / f"pdb{lower}.ent"
+    else:
+        divided = mirror_dir / "mmCIF" / lower[1:3] / f"{lower}.cif"
+    candidates = [mirror_dir / name for name in names] + [divided]
+    return [p for path in candidates for p in (path, Path(f"{path}.gz"))]
+
+
+class _HashingWriter:
+    """File wrapper that checksums and counts the bytes written through it."""
+
+    def __init__(self, f: Any):
+        self.f = f
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        written: int = self.f.write(data)
+        return written
+
+
+class PDBFetcher:
+    """
+    Fetches PDB entries into the local structure cache.
+
+    One fetcher owns one pooled ``requests.Session`` and the cache index;
+    it is safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        base_url: Optional[str] = None,
+        mirror_dir: Optional[Path] = None,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        max_size_mb: Optional[float] = None,
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            cache_dir: Structure cache directory (default: Config.PDB_CACHE_DIR)
+            base_url: Download URL prefix (default: Config.PDB_BASE_URL)
+            mirror_dir: Local mirror to copy entries from instead of
+                downloading (default: Config.PDB_MIRROR_DIR)
+            max_workers: Concurrent downloads in fetch_many
+                (default: Config.PDB_FETCH_WORKERS)
+            timeout: Per-request timeout in seconds
+                (default: Config.PDB_FETCH_TIMEOUT)
+            retries: Retries of failed requests, with exponential backoff
+                (default: Config.PDB_FETCH_RETRIES)
+            max_size_mb: Cache size limit in MB, enforced after each fetch
+                (default: Config.PDB_CACHE_MAX_MB; None disables eviction)
+        """
+        self.cache_dir = Path(cache_dir or config.PDB_CACHE_DIR)
+        self.base_url = base_url or config.PDB_BASE_URL
+        mirror_dir = mirror_dir or config.PDB_MIRROR_DIR
+        self.mirror_dir = Path(mirror_dir) if mirror_dir else None
+        self.max_workers = max_workers or config.PDB_FETCH_WORKERS
+        self.timeout = timeout or config.PDB_FETCH_TIMEOUT
+        self.retries = config.PDB_FETCH_RETRIES if retries is None else retries
+        self.max_size_mb = max_size_mb or config.PDB_CACHE_MAX_MB
+        self.index = PDBCacheIndex(self.cache_dir)
+        self._session: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> "requests.Session":
+        """Pooled HTTP session, created on first use."""
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retry = Retry(
+                    total=self.retries,
+                    backoff_factor=0.5,
+                    status_forcelist=RETRY_STATUSES,
+                    allowed_methods=["GET"],
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.max_workers, max_retries=retry
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
+
+    def close(self) -> None:
+        """Close the HTTP session, its pooled connections and the index."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+        self.index.close()
+
+    def cached_path(self, pdb_id: str) -> Optional[Path]:
+        """
+        Return the cached structure file of an entry, if present.
+
+        The index is consulted first. Files in the cache directory that are
+        not indexed yet (written by an older version) are indexed on their
+        first lookup.
+
+        Args:
+            pdb_id: PDB ID
+
+        Returns:
+            Path of the cached file, or None on a miss
+        """
+        pdb_id = normalize_pdb_id(pdb_id)
+        path = self.index.lookup(pdb_id)
+        if path is not None:
+            return path
+        for fmt in PDB_FORMATS:
+            path = self.cache_dir / f"{pdb_id}.{fmt}"
+            if path.exists():
+                self.index.record(pdb_id, path)
+                return path
+        return None
+
+    def fetch(self, pdb_id: str, force: bool = False) -> Path:
+        """
+        Return the local structure file of an entry, fetching it if needed.
+
+        Args:
+            pdb_id: PDB ID (e.g. "1HSG")
+            force: Fetch again even if the entry is cached
+
+        Returns:
+            Path of the cached .pdb or .cif file
+
+        Raises:
+            InputError: If the ID is invalid
+            DatabaseError: If the entry cannot be fetched
+        """
+        pdb_id = normalize_pdb_id(pdb_id)
+        if not force:
+            cached = self.cached_path(pdb_id)
+            if cached is not None:
+                return cached
+
+        errors = []
+        for fmt in PDB_FORMATS:
+            target = self.cache_dir / f"{pdb_id}.{fmt}"
+            try:
+                if self.mirror_dir is not None:
+                    found = self._copy_from_mirror(pdb_id, fmt, target)
+                else:
+                    found = self._download(pdb_id, fmt, target)
+            except OSError as e:
+                raise DatabaseError(f"Could not fetch PDB entry {pdb_id}: {e}")
+            if found:
+                logger.info(f"Fetched PDB entry {pdb_id} ({fmt})")
+                if self.max_size_mb is not None:
+                    self.index.prune(max_size_mb=self.max_size_mb, keep=pdb_id)
+                return target
+            errors.append(fmt)
+
+        source = self.mirror_dir or self.base_url
+        raise DatabaseError(
+            f"PDB entry {pdb_id} not found at {source} "
+            f"(tried formats: {', '.join(errors)})"
+        )
+
+    def fetch_many(
+        self, pdb_ids: Iterable[str], force: bool = False
+    ) -> List[Union[Path, Exception]]:
+        """
+        Fetch several entries concurrently.
+
+        At most ``max_workers`` downloads run at a time, sharing the pooled
+        session. Cached entries are returned without network access.
+
+        Args:
+            pdb_ids: PDB IDs
+            force: Fetch again even if entries are cached
+
+        Returns:
+            List aligned with ``pdb_ids`` holding the cached file path or
+            the InputError/DatabaseError raised for that entry
+        """
+        pdb_ids = list(pdb_ids)
+
+        def fetch_one(pdb_id: str) -> Union[Path, Exception]:
+            try:
+                return self.fetch(pdb_id, force=force)
+            except (InputError, DatabaseError) as e:
+                return e
+
+        if len(pdb_ids) <= 1:
+            return [fetch_one(pdb_id) for pdb_id in pdb_ids]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return list(pool.map(fetch_one, pdb_ids))
+
+    def _download(self, pdb_id: str, fmt: str, target: Path) -> bool:
+        """Stream one entry into the cache; return False if it does not exist."""
+        import requests
+
+        url = f"{self.base_url.rstrip('/')}/{pdb_id}.{fmt}"
+        try:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                if response.status_code == 404:
+                    return False
+                response.raise_for_status()
+                self._write_atomic(target, lambda f: self._copy_chunks(response, f))
+        except requests.RequestException as e:
+            raise DatabaseError(f"Could not download {url}: {e}")
+        return True
+
+    @staticmethod
+    def _copy_chunks(response: Any, f: Any) -> None:
+        for chunk in response.iter_content(chunk_size=_CHUNK_SIZE):
+            f.write(chunk)
+
+    def _copy_from_mirror(self, pdb_id: str, fmt: str, target: Path) -> bool:
+        """Copy one entry from the local mirror; return False if it is absent."""
+        if self.mirror_dir is None:
+            return False
+        for source in mirror_candidates(self.mirror_dir, pdb_id, fmt):
+            if source.exists():
+                opener = gzip.open if source.suffix == ".gz" else open
+                with opener(source, "rb") as src:
+                    self._write_atomic(target, lambda f: shutil.copyfileobj(src, f))
+                return True
+        return False
+
+    def _write_atomic(self, target: Path, write: Any) -> None:
+        """
+        Write a cache file through a temporary file and rename it into place.
+
+        Readers never see a partial file, and concurrent fetches of the same
+        entry are harmless. The file is checksummed while it is written and
+        recorded in the index.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{target.name}-", dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer = _HashingWriter(f)
+                write(writer)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.index.record(
+            target.stem, target, sha256=writer.digest.hexdigest(), size=writer.size
+        )
+
+
+_DEFAULT_FETCHER: Optional[PDBFetcher] = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_fetcher() -> PDBFetcher:
+    """
+    Return the process-wide fetcher for the current configuration.
+
+    The fetcher (and its connection pool) is reused until the cache
+    directory, base URL or mirror directory in the configuration changes.
+    """
+    global _DEFAULT_FETCHER
+    with _DEFAULT_LOCK:
+        fetcher = _DEFAULT_FETCHER
+        mirror = Path(config.PDB_MIRROR_DIR) if config.PDB_MIRROR_DIR else None
+        if fetcher is None or (
+            fetcher.cache_dir != Path(config.PDB_CACHE_DIR)
+            or fetcher.base_url != config.PDB_BASE_URL
+            or fetcher.mirror_dir != mirror
+        ):
+            if fetcher is not None:
+                fetcher.close()
+            fetcher = _DEFAULT_FETCHER = PDBFetcher()
+        return fetcher
+
+
+def fetch_pdb(pdb_id: str, force: bool = False) -> Path:
+    """
+    Return the local structure file of a PDB entry, fetching it if needed.
+
+    Args:
+        pdb_id: PDB ID (e.g. "1HSG")
+        force: Fetch again even if the entry is cached
+
+    Returns:
+        Path of the cached .pdb or .cif file
+
+    Raises:
+        InputError: If the ID is invalid
+        DatabaseError: If the entry cannot be fetched
+    """
+    return get_fetcher().fetch(pdb_id, force=force)
+
+
+def fetch_pdbs(
+    pdb_ids: Iterable[str], force: bool = False
+) -> List[Union[Path, Exception]]:
+    """
+    Fetch several PDB entries concurrently.
+
+    Args:
+        pdb_ids: PDB IDs
+        force: Fetch again even if entries are cached
+
+    Returns:
+        List aligned with ``pdb_ids`` holding a path or an exception
+    """
+    return get_fetcher().fetch_many(pdb_ids, force=force)
@@ -0,0 +1,305 @@
+"""
+Index of the local PDB structure cache.
+
+Every structure file fetched into ``Config.PDB_CACHE_DIR`` is recorded in
+a SQLite index (``index.sqlite`` in the same directory) with its format,
+size, SHA-256 checksum and last access time. Looking up a cached entry is
+one primary-key query plus one ``stat``, so cached IDs are resolved
+without listing the directory and without any network access.
+
+The index also backs the ``bindigo cache`` command: checksums are used to
+verify entries, and sizes and access times to prune the cache by total
+size (least recently used first) or by age.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from bindigo.core.config import config
+from bindigo.utils.hashing import file_digest
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "index.sqlite"
+
+# Structure file suffixes tracked by the index
+STRUCTURE_SUFFIXES = (".pdb", ".cif")
+
+# Access times are only rewritten when older than this (seconds), so
+# repeated lookups do not turn into a write each
+ACCESS_RESOLUTION = 60.0
+
+
+class PDBCacheIndex:
+    """
+    SQLite index of the structure files in a PDB cache directory.
+
+    File names are stored relative to the cache directory. Connections are
+    opened lazily per process and shared between threads under a lock, so
+    an index can be used from ``PDBFetcher.fetch_many`` worker threads and
+    forked worker processes.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None):
+        """
+        Initialize the index.
+
+        Args:
+            cache_dir: Structure cache directory (default: Config.PDB_CACHE_DIR)
+        """
+        self.cache_dir = Path(cache_dir or config.PDB_CACHE_DIR)
+        self.index_file = self.cache_dir / INDEX_FILENAME
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.RLock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection for the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                str(self.index_file), timeout=60.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " pdb_id TEXT PRIMARY KEY,"
+                " format TEXT NOT NULL,"
+                " file TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " sha256 TEXT NOT NULL,"
+                " fetched REAL NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def lookup(self, pdb_id: str) -> Optional[Path]:
+        """
+        Return the cached file of an entry and mark it as accessed.
+
+        Entries whose file has disappeared are dropped from the index.
+
+        Args:
+            pdb_id: Upper-case PDB ID
+
+        Returns:
+            Path of the cached file, or None if the entry is not indexed
+        """
+        with self._lock:
+            row: Optional[Tuple[str, float]] = self.connection.execute(
+                "SELECT file, last_access FROM entries WHERE pdb_id = ?", (pdb_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            path = self.cache_dir / row[0]
+            if not path.exists():
+                logger.warning(f"Cached file of {pdb_id} is missing; dropping entry")
+                with self.connection:
+                    self.connection.execute(
+                        "DELETE FROM entries WHERE pdb_id = ?", (pdb_id,)
+                    )
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] > ACCESS_RESOLUTION:
+                with self.connection:
+                    self.connection.execute(
+                        "UPDATE entries SET last_access = ? WHERE pdb_id = ?",
+                        (now, pdb_id),
+                    )
+            self.hits += 1
+            return path
+
+    def record(
+        self,
+        pdb_id: str,
+        path: Path,
+        sha256: Optional[str] = None,
+        size: Optional[int] = None,
+    ) -> None:
+        """
+        Add or replace the entry for a file in the cache directory.
+
+        A file previously indexed for the same ID under another name (e.g.
+        a .pdb file replaced by a .cif download) is deleted.
+
+        Args:
+            pdb_id: Upper-case PDB ID
+            path: Structure file inside the cache directory
+            sha256: Checksum of the file, computed if not given
+            size: Size of the file in bytes, read if not given
+        """
+        path = Path(path)
+        sha256 = sha256 or file_digest(path)
+        size = path.stat().st_size if size is None else size
+        now = time.time()
+        with self._lock, self.connection:
+            previous = self.connection.execute(
+                "SELECT file FROM entries WHERE pdb_id = ?", (pdb_id,)
+            ).fetchone()
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (pdb_id, path.suffix[1:], path.name, size, sha256, now, now),
+            )
+        if previous is not None and previous[0] != path.name:
+            (self.cache_dir / previous[0]).unlink(missing_ok=True)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List indexed entries, most recently accessed first.
+
+        Returns:
+            Dictionaries with "pdb_id", "format", "file" (Path), "size",
+            "sha256", "fetched" and "last_access" (Unix timestamps)
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT pdb_id, format, file, size, sha256, fetched, last_access"
+                " FROM entries ORDER BY last_access DESC, pdb_id"
+            ).fetchall()
+        return [
+            {
+                "pdb_id": pdb_id,
+                "format": fmt,
+                "file": self.cache_dir / name,
+                "size": size,
+                "sha256": sha256,
+                "fetched": fetched,
+                "last_access": last_access,
+            }
+            for pdb_id, fmt, name, size, sha256, fetched, last_access in rows
+        ]
+
+    def size_bytes(self) -> int:
+        """Return the total size of all indexed files in bytes."""
+        with self._lock:
+            row: Tuple[int] = self.connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return row[0]
+
+    def remove(self, pdb_id: str) -> bool:
+        """
+        Delete an entry and its file.
+
+        Returns:
+            True if the entry was indexed
+        """
+        with self._lock, self.connection:
+            row = self.connection.execute(
+                "SELECT file FROM entries WHERE pdb_id = ?", (pdb_id,)
+            ).fetchone()
+            if row is None:
+                return False
+            self.connection.execute("DELETE FROM entries WHERE pdb_id = ?", (pdb_id,))
+        (self.cache_dir / row[0]).unlink(missing_ok=True)
+        return True
+
+    def verify(self, fix: bool = False) -> Dict[str, List[str]]:
+        """
+        Check every indexed file against its recorded size and checksum.
+
+        Structure files in the cache directory that are not indexed yet
+        (e.g. written by an older version) are added to the index.
+
+        Args:
+            fix: Remove missing and corrupt entries (and their files)
+
+        Returns:
+            Dictionary with the PDB IDs that are "ok", "missing", "corrupt"
+            and newly "indexed"
+        """
+        report: Dict[str, List[str]] = {
+            "ok": [],
+            "missing": [],
+            "corrupt": [],
+            "indexed": [],
+        }
+        indexed = set()
+        for entry in self.entries():
+            path = entry["file"]
+            indexed.add(path.name)
+            if not path.exists():
+                report["missing"].append(entry["pdb_id"])
+            elif (
+                path.stat().st_size != entry["size"]
+                or file_digest(path) != entry["sha256"]
+            ):
+                report["corrupt"].append(entry["pdb_id"])
+            else:
+                report["ok"].append(entry["pdb_id"])
+
+        if fix:
+            for pdb_id in report["missing"] + report["corrupt"]:
+                self.remove(pdb_id)
+
+        for path in sorted(self.cache_dir.iterdir()):
+            if path.suffix in STRUCTURE_SUFFIXES and path.name not in indexed:
+                pdb_id = path.stem.upper()
+                if self.lookup(pdb_id) is None:
+                    self.record(pdb_id, path)
+                    report["indexed"].append(pdb_id)
+        return report
+
+    def prune(
+        self,
+        max_size_mb: Optional[float] = None,
+        max_age_days: Optional[float] = None,
+        keep: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Remove entries by age and then by total size.
+
+        Entries not accessed for ``max_age_days`` are removed first; then the
+        least recently used entries are removed until the cache holds at
+        most ``max_size_mb``.
+
+        Args:
+            max_size_mb: Size limit in MB (None: no size limit)
+            max_age_days: Maximum days since last access (None: no age limit)
+            keep: PDB ID that must not be removed (e.g. the entry just fetched)
+
+        Returns:
+            Removed PDB IDs
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry["last_access"])
+        cutoff = (
+            time.time() - max_age_days * 86400 if max_age_days is not None else None
+        )
+        limit = max_size_mb * 1024 * 1024 if max_size_mb is not None else None
+        total = sum(entry["size"] for entry in entries)
+        removed = []
+        for entry in entries:
+            if entry["pdb_id"] == keep:
+                continue
+            expired = cutoff is not None and entry["last_access"] < cutoff
+            oversize = limit is not None and total > limit
+            if not (expired or oversize):
+                continue
+            self.remove(entry["pdb_id"])
+            total -= entry["size"]
+            removed.append(entry["pdb_id"])
+        if removed:
+            logger.info(f"Pruned {len(removed)} entries from the PDB cache")
+        return removed
+
+    def close(self) -> None:
+        """Close the connection of the current process."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+            self._pid = None
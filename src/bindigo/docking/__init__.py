@@ -1,3 +1,23 @@
-"""Molecular docking integration (AutoDock Vina)."""
+"""
+Molecular docking integration (AutoDock Vina).
 
-__all__ = []
+The names below are imported from their submodules on first access, so
+importing ``bindigo.docking`` does not load NumPy, RDKit or Vina.
+"""
+
+from bindigo.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "DockingBackend": "backend",
+    "available_backends": "backend",
+    "get_backend": "backend",
+    "GridMapStore": "grid_maps",
+    "ligand_to_pdbqt": "pdbqt_converter",
+    "receptor_to_pdbqt": "pdbqt_converter",
+    "save_best_pose": "pose_extraction",
+    "split_poses": "pose_extraction",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, exports=_EXPORTS)
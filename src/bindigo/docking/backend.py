@@ -0,0 +1,263 @@
+"""
+Docking backend interface for Bindigo.
+
+A backend is configured once per receptor and box and then docks many
+ligands against it:
+
+    backend = get_backend()
+    backend.prepare_receptor(receptor_pdbqt_file)
+    backend.set_box(center, size)          # affinity maps computed here
+    results = backend.dock_many(ligand_pdbqts)
+
+Receptor affinity maps are computed in ``set_box`` and reused by every
+``dock_many`` call until the receptor or box changes, so their cost is
+amortized across a whole screen. Computed maps are also persisted in a
+GridMapStore and loaded from it by later runs against the same box.
+
+Two backends are available (``Config.DOCKING_BACKEND``): "vina", the
+in-process AutoDock Vina engine, and "numpy", a deterministic pure-NumPy
+stand-in for tests and benchmarks.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from bindigo.core.config import config
+from bindigo.docking.grid_maps import GridMapStore, grid_map_key
+from bindigo.utils.exceptions import DockingError, InputError
+from bindigo.utils.hashing import file_digest
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+Center = Tuple[float, float, float]
+
+
+class DockingBackend:
+    """
+    Base class for docking engines.
+
+    Subclasses implement ``_load_receptor``, ``_compute_maps`` and
+    ``_dock_one``, and ``_save_maps``/``_load_maps`` to support the
+    persistent map store. Each ``dock_many`` result is a dictionary with:
+
+    - ``score``: best pose score in kcal/mol
+    - ``energies``: scores of all returned poses, best first
+    - ``poses``: PDBQT text with one MODEL per pose
+    """
+
+    name = "base"
+
+    def __init__(
+        self,
+        exhaustiveness: Optional[int] = None,
+        n_poses: Optional[int] = None,
+        spacing: Optional[float] = None,
+        seed: Optional[int] = None,
+        map_store: Optional[GridMapStore] = None,
+        use_map_cache: bool = True,
+    ):
+        """
+        Initialize the backend.
+
+        Args:
+            exhaustiveness: Search effort (default: Config.DOCKING_EXHAUSTIVENESS)
+            n_poses: Poses returned per ligand (default: Config.DOCKING_NUM_MODES)
+            spacing: Affinity map spacing in Angstroms
+                (default: Config.DOCKING_GRID_SPACING)
+            seed: Random seed (default: Config.DOCKING_SEED)
+            map_store: Store for computed maps (default: one at
+                Config.GRID_MAP_CACHE_DIR)
+            use_map_cache: Whether to load and save maps in the store
+        """
+        self.exhaustiveness = exhaustiveness or config.DOCKING_EXHAUSTIVENESS
+        self.n_poses = n_poses or config.DOCKING_NUM_MODES
+        self.spacing = spacing or config.DOCKING_GRID_SPACING
+        self.seed = config.DOCKING_SEED if seed is None else seed
+        if map_store is None and use_map_cache:
+            map_store = GridMapStore()
+        self.map_store = map_store if use_map_cache else None
+        self.receptor: Optional[Path] = None
+        self.receptor_hash: Optional[str] = None
+        self.box: Optional[Tuple[Center, float]] = None
+        self.maps_from_store = False
+
+    def prepare_receptor(self, receptor_pdbqt: Union[str, Path]) -> None:
+        """
+        Load the receptor to dock against.
+
+        Args:
+            receptor_pdbqt: Prepared receptor PDBQT file
+
+        Raises:
+            DockingError: If the receptor cannot be loaded
+        """
+        path = Path(receptor_pdbqt)
+        if not path.exists():
+            raise DockingError(f"Receptor PDBQT file not found: {path}")
+        if path == self.receptor:
+            return
+        try:
+            self._load_receptor(path)
+        except DockingError:
+            raise
+        except Exception as e:
+            raise DockingError(f"Could not load receptor {path}: {e}")
+        self.receptor = path
+        self.receptor_hash = file_digest(path)
+        self.box = None
+
+    def set_box(self, center: Sequence[float], size: float) -> None:
+        """
+        Set the search box and compute receptor affinity maps for it.
+
+        Maps are only recomputed when the box changes, and are loaded from
+        the map store when an earlier run computed them.
+
+        Args:
+            center: Box center (x, y, z) in Angstroms
+            size: Cubic box edge length in Angstroms
+
+        Raises:
+            DockingError: If no receptor is loaded or map computation fails
+        """
+        if self.receptor is None or self.receptor_hash is None:
+            raise DockingError("prepare_receptor must be called before set_box")
+        if len(center) != 3 or size <= 0:
+            raise InputError(f"Invalid docking box: center={center}, size={size}")
+        x, y, z = (float(c) for c in center)
+        box: Tuple[Center, float] = ((x, y, z), float(size))
+        if box == self.box:
+            return
+
+        map_store = self.map_store
+        key = None
+        if map_store is not None:
+            key = grid_map_key(
+                self.receptor_hash, self.name, box[0], box[1], self.spacing
+            )
+            entry = map_store.get(key)
+            if entry is not None:
+                try:
+                    self._load_maps(entry, box[0], box[1])
+                    self.box = box
+                    self.maps_from_store = True
+                    logger.info(f"Loaded affinity maps from {entry}")
+                    return
+                except Exception as e:
+                    logger.warning(f"Recomputing unreadable maps in {entry}: {e}")
+
+        start = time.time()
+        try:
+            self._compute_maps(box[0], box[1])
+        except DockingError:
+            raise
+        except Exception as e:
+            raise DockingError(f"Affinity map computation failed: {e}")
+        self.box = box
+        self.maps_from_store = False
+        logger.info(f"Computed affinity maps in {time.time() - start:.1f}s")
+
+        if map_store is not None and key is not None:
+            try:
+                map_store.put(
+                    key,
+                    self._save_maps,
+                    metadata={
+                        "backend": self.name,
+                        "receptor": str(self.receptor),
+                        "center": list(box[0]),
+                        "size": box[1],
+                        "spacing": self.spacing,
+                    },
+                )
+            except Exception as e:
+                logger.warning(f"Could not store affinity maps: {e}")
+
+    def dock_many(
+        self,
+        ligands: Sequence[str],
+        exhaustiveness: Optional[int] = None,
+        n_poses: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Dock a batch of ligands against the current receptor and box.
+
+        Args:
+            ligands: Ligand PDBQT texts
+            exhaustiveness: Search effort (default: the backend's setting)
+            n_poses: Poses returned per ligand (default: the backend's setting)
+
+        Returns:
+            List aligned with ``ligands`` holding a result dictionary or the
+            DockingError raised while docking that ligand
+
+        Raises:
+            DockingError: If no box has been set
+        """
+        if self.box is None:
+            raise DockingError("set_box must be called before docking")
+        exhaustiveness = exhaustiveness or self.exhaustiveness
+        n_poses = n_poses or self.n_poses
+
+        results: List[Any] = []
+        for pdbqt in ligands:
+            try:
+                results.append(self._dock_one(pdbqt, exhaustiveness, n_poses))
+            except DockingError as e:
+                results.append(e)
+            except Exception as e:
+                results.append(DockingError(f"Docking failed: {e}"))
+        return results
+
+    def _load_receptor(self, path: Path) -> None:
+        raise NotImplementedError
+
+    def _compute_maps(self, center: Center, size: float) -> None:
+        raise NotImplementedError
+
+    def _save_maps(self, directory: Path) -> None:
+        raise NotImplementedError
+
+    def _load_maps(self, directory: Path, center: Center, size: float) -> None:
+        raise NotImplementedError
+
+    def _dock_one(self, pdbqt: str, exhaustiveness: int, n_poses: int) -> Dict:
+        raise NotImplementedError
+
+
+def available_backends() -> List[str]:
+    """Return the names accepted by get_backend."""
+    return ["vina", "numpy"]
+
+
+def get_backend(name: Optional[str] = None, **kwargs: Any) -> DockingBackend:
+    """
+    Create a docking backend by name.
+
+    Args:
+        name: "vina" or "numpy" (default: Config.DOCKING_BACKEND)
+        **kwargs: Backend options (exhaustiveness, n_poses, spacing, seed,
+            map_store, use_map_cache)
+
+    Returns:
+        New DockingBackend instance
+
+    Raises:
+        InputError: If the backend name is unknown
+        DependencyError: If the backend's engine is not installed
+    """
+    name = name or config.DOCKING_BACKEND
+    if name == "vina":
+        from bindigo.docking.vina_wrapper import VinaBackend
+
+        return VinaBackend(**kwargs)
+    if name == "numpy":
+        from bindigo.docking.numpy_backend import NumpyBackend
+
+        return NumpyBackend(**kwargs)
+    raise InputError(
+        f"Unknown docking backend: {name}. "
+        f"Available backends: {', '.join(available_backends())}"
+    )
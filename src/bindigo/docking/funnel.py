@@ -0,0 +1,86 @@
+"""
+Two-stage docking funnel for Bindigo.
+
+Most compounds in a screen are clear non-binders, so docking every one at
+full exhaustiveness wastes most of the run. The funnel docks everything
+at low exhaustiveness with a single pose, then re-docks only the top
+fraction (by coarse docking score, or by another ranking key such as the
+ML-predicted pKd) at full exhaustiveness.
+"""
+
+import heapq
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from bindigo.utils.exceptions import InputError
+
+
+def funnel_count(n_items: int, fraction: float) -> int:
+    """
+    Return how many of ``n_items`` pass the funnel.
+
+    Args:
+        n_items: Number of successfully docked items
+        fraction: Fraction to re-dock, in (0, 1]
+
+    Returns:
+        ceil(fraction * n_items), at least 1 when there is any item
+
+    Raises:
+        InputError: If the fraction is outside (0, 1]
+    """
+    if not 0 < fraction <= 1:
+        raise InputError(f"Funnel fraction must be in (0, 1], got {fraction}")
+    return min(n_items, math.ceil(fraction * n_items))
+
+
+def select_top(
+    items: Iterable[Any], count: int, key: Callable[[Any], float]
+) -> List[Any]:
+    """
+    Return the ``count`` items with the lowest key, holding only those in memory.
+
+    Args:
+        items: Items to rank (consumed once)
+        count: Number of items to keep
+        key: Ranking key; lower is better (negate for "higher is better")
+
+    Returns:
+        Selected items, best first
+    """
+    return heapq.nsmallest(count, items, key=key)
+
+
+def funnel_stats(
+    n_ligands: Optional[int], n_refined: int, coarse_time: float, refine_time: float
+) -> Dict[str, Any]:
+    """
+    Summarize a funnel run and estimate the time saved.
+
+    The single-stage estimate assumes every ligand would have cost as much
+    as the average re-docked ligand. It is left out (None) when the coarse
+    stage ran partly in an earlier, resumed run, whose time is unknown.
+
+    Args:
+        n_ligands: Ligands docked in the coarse stage, or None if part of
+            the coarse stage ran in an earlier run
+        n_refined: Ligands re-docked at full exhaustiveness
+        coarse_time: Wall time of the coarse stage in seconds
+        refine_time: Wall time of the refinement stage in seconds
+
+    Returns:
+        Dictionary of funnel statistics
+    """
+    estimate: Optional[float] = None
+    time_saved: Optional[float] = None
+    if n_ligands is not None:
+        per_ligand = refine_time / n_refined if n_refined else 0.0
+        estimate = per_ligand * n_ligands
+        time_saved = estimate - coarse_time - refine_time
+    return {
+        "n_refined": n_refined,
+        "coarse_time": coarse_time,
+        "refine_time": refine_time,
+        "estimated_single_stage_time": estimate,
+        "time_saved": time_saved,
+    }
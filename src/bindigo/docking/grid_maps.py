@@ -0,0 +1,114 @@
+"""
+Persistent receptor affinity map store for Bindigo.
+
+Computing affinity maps for a 20 Å box takes seconds to minutes, yet
+depends only on the receptor, the box and the grid spacing. Computed maps
+are stored under ``Config.GRID_MAP_CACHE_DIR``, one directory per map
+set, keyed by the receptor PDBQT hash, docking backend, box center, box
+size and spacing. Backends write their native map files (``.npy`` arrays,
+loaded with ``np.memmap``, or Vina ``.map`` files), so repeat screens
+against the same pocket start docking immediately.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from bindigo.core.config import config
+from bindigo.utils.store import DirectoryStore
+
+# Bump when map contents change so stale entries are ignored
+GRID_MAP_VERSION = 1
+
+
+def grid_map_key(
+    receptor_hash: str,
+    backend: str,
+    center: Sequence[float],
+    size: float,
+    spacing: float,
+) -> str:
+    """
+    Compute the store key for a set of affinity maps.
+
+    Coordinates are rounded to 1/1000 Å so that equal boxes given with
+    different float noise share an entry.
+
+    Args:
+        receptor_hash: SHA-256 digest of the receptor PDBQT file
+        backend: Docking backend name
+        center: Box center (x, y, z)
+        size: Box edge length in Angstroms
+        spacing: Grid spacing in Angstroms
+
+    Returns:
+        Hex SHA-256 digest identifying the map set
+    """
+    description = {
+        "version": GRID_MAP_VERSION,
+        "receptor": receptor_hash,
+        "backend": backend,
+        "center": [round(float(c), 3) for c in center],
+        "size": round(float(size), 3),
+        "spacing": round(float(spacing), 4),
+    }
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+
+class GridMapStore(DirectoryStore):
+    """
+    On-disk store of computed affinity maps with size-based LRU eviction.
+
+    Each entry is a directory named by its key holding the backend's map
+    files plus a metadata file whose modification time records the last
+    access and drives eviction.
+    """
+
+    entry_description = "grid map set"
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, max_size_mb: Optional[float] = None
+    ):
+        """
+        Initialize the map store.
+
+        Args:
+            cache_dir: Store directory (default: Config.GRID_MAP_CACHE_DIR)
+            max_size_mb: Size limit in MB (default: Config.GRID_MAP_CACHE_MAX_MB)
+        """
+        super().__init__(
+            Path(cache_dir or config.GRID_MAP_CACHE_DIR),
+            config.GRID_MAP_CACHE_MAX_MB if max_size_mb is None else max_size_mb,
+        )
+
+    def get(self, key: str) -> Optional[Path]:
+        """
+        Look up a map set and mark it as recently used.
+
+        Args:
+            key: Key from grid_map_key
+
+        Returns:
+            Entry directory holding the map files, or None on a miss
+        """
+        return self.get_dir(key)
+
+    def put(
+        self,
+        key: str,
+        write_maps: Callable[[Path], None],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        """
+        Store a map set and evict old entries if over the limit.
+
+        Args:
+            key: Key from grid_map_key
+            write_maps: Callable writing the map files into a directory
+            metadata: Optional extra information to record with the entry
+
+        Returns:
+            Entry directory holding the map files
+        """
+        return self.put_dir(key, write_maps, metadata)
@@ -0,0 +1,218 @@
+"""
+Deterministic pure-NumPy docking stand-in for Bindigo.
+
+Scores rigid ligand placements against a single precomputed receptor
+grid: every grid point holds a smooth contact term (attraction around
+4 Å, quadratic clash penalty below 3.2 Å) summed over nearby receptor
+atoms. Poses are sampled with a random generator seeded from the ligand
+text, so results are reproducible across runs and processes. The scores
+are not physically meaningful; the backend exists so that tests and
+benchmarks exercise the full pipeline without AutoDock Vina installed.
+"""
+
+import re
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from bindigo.docking.backend import Center, DockingBackend
+from bindigo.docking.pdbqt_converter import (
+    parse_pdbqt_atoms,
+    replace_pdbqt_coordinates,
+)
+from bindigo.utils.exceptions import DockingError
+
+# Receptor atoms farther than this from a grid point do not contribute
+CONTACT_CUTOFF = 8.0
+
+# Vina-style penalty per active torsion
+TORSION_WEIGHT = 0.0585
+
+# Energy added per ligand atom placed outside the box
+OUT_OF_BOX_PENALTY = 1.0
+
+# Random placements evaluated per unit of exhaustiveness
+SAMPLES_PER_EXHAUSTIVENESS = 32
+
+# Distance-matrix elements evaluated per vectorized block
+_BLOCK_ELEMENTS = 4_000_000
+
+
+def contact_energy(distances: np.ndarray) -> np.ndarray:
+    """Pairwise contact energy for an array of atom distances."""
+    attraction = -0.3 * np.exp(-(((distances - 4.0) / 1.2) ** 2))
+    clash = np.clip(3.2 - distances, 0.0, None) ** 2
+    return attraction + clash
+
+
+def grid_axes(center: Center, size: float, spacing: float) -> List[np.ndarray]:
+    """Return the x, y and z coordinates of the grid points of a box."""
+    n_points = int(np.ceil(size / spacing)) + 1
+    offsets = spacing * np.arange(n_points) - spacing * (n_points - 1) / 2
+    return [c + offsets for c in center]
+
+
+def compute_grid(
+    receptor_coords: np.ndarray, center: Center, size: float, spacing: float
+) -> np.ndarray:
+    """
+    Compute the contact-energy grid of a receptor over a box.
+
+    Args:
+        receptor_coords: Receptor atom coordinates, shape (n_atoms, 3)
+        center: Box center
+        size: Box edge length in Angstroms
+        spacing: Grid spacing in Angstroms
+
+    Returns:
+        float32 array of shape (n, n, n) indexed by (x, y, z) grid point
+    """
+    axes = grid_axes(center, size, spacing)
+    half = size / 2 + CONTACT_CUTOFF
+    nearby = receptor_coords[
+        np.all(np.abs(receptor_coords - np.asarray(center)) <= half, axis=1)
+    ]
+    points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    energy = np.zeros(len(points), dtype=np.float64)
+    if len(nearby):
+        block = max(1, _BLOCK_ELEMENTS // len(nearby))
+        for start in range(0, len(points), block):
+            chunk = points[start : start + block]
+            distances = np.linalg.norm(chunk[:, None, :] - nearby[None, :, :], axis=2)
+            contacts = np.where(
+                distances <= CONTACT_CUTOFF, contact_energy(distances), 0.0
+            )
+            energy[start : start + block] = contacts.sum(axis=1)
+    shape = tuple(len(axis) for axis in axes)
+    return energy.reshape(shape).astype(np.float32)
+
+
+def random_rotations(rng: np.random.Generator, count: int) -> np.ndarray:
+    """Return ``count`` uniformly random rotation matrices, shape (count, 3, 3)."""
+    q = rng.normal(size=(count, 4))
+    q /= np.linalg.norm(q, axis=1, keepdims=True)
+    w, x, y, z = q.T
+    return np.stack(
+        [
+            np.stack(
+                [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)], 1
+            ),
+            np.stack(
+                [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)], 1
+            ),
+            np.stack(
+                [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)], 1
+            ),
+        ],
+        axis=1,
+    )
+
+
+class NumpyBackend(DockingBackend):
+    """Deterministic rigid-body docking against a NumPy contact grid."""
+
+    name = "numpy"
+
+    def __init__(self, **kwargs: Any):
+        """
+        Initialize the backend.
+
+        Args:
+            **kwargs: Options for DockingBackend
+        """
+        super().__init__(**kwargs)
+        self.receptor_coords = np.empty((0, 3))
+        self.grid = np.empty((0, 0, 0), dtype=np.float32)
+        self.origin = np.zeros(3)
+
+    def _load_receptor(self, path: Path) -> None:
+        coords, _ = parse_pdbqt_atoms(path.read_text())
+        if len(coords) == 0:
+            raise DockingError(f"No atoms found in receptor {path}")
+        self.receptor_coords = coords
+
+    def _compute_maps(self, center: Center, size: float) -> None:
+        self.grid = compute_grid(self.receptor_coords, center, size, self.spacing)
+        self.origin = np.array(
+            [axis[0] for axis in grid_axes(center, size, self.spacing)]
+        )
+
+    def _save_maps(self, directory: Path) -> None:
+        np.save(directory / "grid.npy", self.grid)
+
+    def _load_maps(self, directory: Path, center: Center, size: float) -> None:
+        grid = np.load(directory / "grid.npy", mmap_mode="r")
+        expected = tuple(len(axis) for axis in grid_axes(center, size, self.spacing))
+        if grid.shape != expected:
+            raise DockingError(f"Grid shape {grid.shape} does not match the box")
+        self.grid = grid
+        self.origin = np.array(
+            [axis[0] for axis in grid_axes(center, size, self.spacing)]
+        )
+
+    def score_poses(self, poses: np.ndarray) -> np.ndarray:
+        """
+        Score ligand placements against the current grid.
+
+        Args:
+            poses: Atom coordinates, shape (n_poses, n_atoms, 3)
+
+        Returns:
+            Raw (torsion-unweighted) energy of each pose
+        """
+        index = np.rint((poses - self.origin) / self.spacing).astype(np.int64)
+        upper = np.array(self.grid.shape) - 1
+        outside = np.any((index < 0) | (index > upper), axis=2)
+        index = np.clip(index, 0, upper)
+        energy: np.ndarray = self.grid[index[..., 0], index[..., 1], index[..., 2]]
+        penalty = OUT_OF_BOX_PENALTY * outside.sum(axis=1)
+        scores: np.ndarray = energy.sum(axis=1) + penalty
+        return scores
+
+    def _dock_one(
+        self, pdbqt: str, exhaustiveness: int, n_poses: int
+    ) -> Dict[str, Any]:
+        coords, _ = parse_pdbqt_atoms(pdbqt)
+        if len(coords) == 0:
+            raise DockingError("Ligand PDBQT contains no atoms")
+        match = re.search(r"^TORSDOF\s+(\d+)", pdbqt, re.MULTILINE)
+        torsions = int(match.group(1)) if match else 0
+
+        if self.box is None:
+            raise DockingError("set_box must be called before docking")
+        center, size = self.box
+        rng = np.random.default_rng([self.seed, zlib.crc32(pdbqt.encode())])
+        local = coords - coords.mean(axis=0)
+        reach = max(size / 2 - np.linalg.norm(local, axis=1).max(), 0.0)
+
+        # Global random search, then local perturbation of the best placements
+        count = SAMPLES_PER_EXHAUSTIVENESS * exhaustiveness
+        rotations = random_rotations(rng, count)
+        shifts = np.asarray(center) + rng.uniform(-reach, reach, size=(count, 3))
+        poses = np.einsum("aj,nij->nai", local, rotations) + shifts[:, None, :]
+        energies = self.score_poses(poses)
+
+        best = np.argsort(energies)[: max(n_poses, 1)]
+        jitter = rng.normal(scale=0.5, size=(len(best), count // len(best) or 1, 3))
+        refined = poses[best][:, None] + jitter[:, :, None, :]
+        refined = refined.reshape(-1, len(local), 3)
+        poses = np.concatenate([poses, refined])
+        energies = np.concatenate([energies, self.score_poses(refined)])
+
+        order = np.argsort(energies, kind="stable")[:n_poses]
+        scores = np.round(energies[order] / (1.0 + TORSION_WEIGHT * torsions), 3)
+        models = []
+        for rank, (index, score) in enumerate(zip(order, scores), start=1):
+            models.append(
+                f"MODEL {rank}\n"
+                f"REMARK VINA RESULT: {score:9.3f}      0.000      0.000\n"
+                f"{replace_pdbqt_coordinates(pdbqt, poses[index])}"
+                "ENDMDL\n"
+            )
+        return {
+            "score": float(scores[0]),
+            "energies": [float(score) for score in scores],
+            "poses": "".join(models),
+        }
@@ -0,0 +1,298 @@
+"""
+PDBQT conversion for Bindigo.
+
+Converts prepared RDKit molecules into the PDBQT format used by AutoDock
+Vina: AutoDock 4 atom types, Gasteiger partial charges, merged non-polar
+hydrogens and, for ligands, a ROOT/BRANCH torsion tree.
+"""
+
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from bindigo.utils.exceptions import LigandError
+
+# Single, acyclic, non-terminal bonds are candidate torsions
+ROTATABLE_BOND_SMARTS = "[!$(*#*)&!D1]-&!@[!$(*#*)&!D1]"
+
+# Amide C-N bonds are treated as rigid
+AMIDE_BOND_SMARTS = "C(=O)-N"
+
+
+def autodock_type(atom) -> str:
+    """
+    Return the AutoDock 4 atom type for an RDKit atom.
+
+    Args:
+        atom: RDKit atom
+
+    Returns:
+        AutoDock atom type (e.g. "C", "A", "NA", "OA", "HD")
+    """
+    symbol: str = atom.GetSymbol()
+    if symbol == "C":
+        return "A" if atom.GetIsAromatic() else "C"
+    if symbol == "N":
+        # Nitrogens without hydrogens that are not cationic can accept H-bonds
+        if atom.GetTotalNumHs() == 0 and atom.GetFormalCharge() <= 0:
+            if atom.GetDegree() < 3 or atom.GetIsAromatic():
+                return "NA"
+        return "N"
+    if symbol == "O":
+        return "OA"
+    if symbol == "S":
+        return "SA"
+    if symbol == "H":
+        neighbors = atom.GetNeighbors()
+        if neighbors and neighbors[0].GetSymbol() in ("N", "O", "S"):
+            return "HD"
+        return "H"
+    return symbol[:2]
+
+
+def gasteiger_charge(atom) -> float:
+    """Return an atom's Gasteiger charge, or 0.0 when undefined."""
+    try:
+        charge = float(atom.GetProp("_GasteigerCharge"))
+    except KeyError:
+        return 0.0
+    return 0.0 if math.isnan(charge) or math.isinf(charge) else charge
+
+
+def _merged_charge(atom) -> float:
+    """Return an atom's charge including its merged non-polar hydrogens."""
+    charge = gasteiger_charge(atom)
+    for neighbor in atom.GetNeighbors():
+        if neighbor.GetSymbol() == "H" and autodock_type(neighbor) == "H":
+            charge += gasteiger_charge(neighbor)
+    return charge
+
+
+def format_pdbqt_atom(atom, serial: int, position) -> str:
+    """
+    Format one atom as a PDBQT ATOM/HETATM record.
+
+    Args:
+        atom: RDKit atom (with Gasteiger charges computed on its molecule)
+        serial: Atom serial number
+        position: Point3D coordinates of the atom
+
+    Returns:
+        PDBQT record line (without newline)
+    """
+    info = atom.GetPDBResidueInfo()
+    if info is not None:
+        record = "HETATM" if info.GetIsHeteroAtom() else "ATOM"
+        name = info.GetName()
+        res_name = info.GetResidueName()
+        chain = info.GetChainId() or " "
+        res_num = info.GetResidueNumber()
+        icode = info.GetInsertionCode() or " "
+    else:
+        record = "ATOM"
+        name = f" {atom.GetSymbol():<3}"
+        res_name, chain, res_num, icode = "UNL", " ", 1, " "
+
+    ad_type = autodock_type(atom)
+    charge = gasteiger_charge(atom) if ad_type == "HD" else _merged_charge(atom)
+    return (
+        f"{record:<6}{serial:>5} {name:<4} {res_name:>3} {chain}{res_num:>4}{icode}"
+        f"   {position.x:8.3f}{position.y:8.3f}{position.z:8.3f}{1.0:6.2f}{0.0:6.2f}"
+        f"    {charge:6.3f} {ad_type:<2}"
+    )
+
+
+def _is_written(atom) -> bool:
+    """Non-polar hydrogens are merged into their heavy atom and not written."""
+    return autodock_type(atom) != "H"
+
+
+def receptor_to_pdbqt(mol) -> str:
+    """
+    Convert a prepared receptor molecule to rigid PDBQT text.
+
+    Args:
+        mol: RDKit molecule with 3D coordinates and Gasteiger charges
+
+    Returns:
+        PDBQT text
+    """
+    conformer = mol.GetConformer()
+    lines = []
+    serial = 0
+    for atom in mol.GetAtoms():
+        if not _is_written(atom):
+            continue
+        serial += 1
+        lines.append(
+            format_pdbqt_atom(atom, serial, conformer.GetAtomPosition(atom.GetIdx()))
+        )
+    return "\n".join(lines) + "\n"
+
+
+def rotatable_bonds(mol) -> List[Tuple[int, int]]:
+    """
+    Find rotatable bonds between heavy atoms.
+
+    Args:
+        mol: RDKit molecule
+
+    Returns:
+        List of (atom_index, atom_index) pairs
+    """
+    from rdkit import Chem
+
+    pattern = Chem.MolFromSmarts(ROTATABLE_BOND_SMARTS)
+    amides = {
+        (min(c, n), max(c, n))
+        for c, _, n in mol.GetSubstructMatches(Chem.MolFromSmarts(AMIDE_BOND_SMARTS))
+    }
+    bonds = set()
+    for i, j in mol.GetSubstructMatches(pattern):
+        bond = (min(i, j), max(i, j))
+        if bond in amides:
+            continue
+        # Bonds to a heavy atom whose only other neighbours are hydrogens
+        # (e.g. methyl groups) do not move any written atom
+        if any(_heavy_degree(mol.GetAtomWithIdx(idx)) < 2 for idx in bond):
+            continue
+        bonds.add(bond)
+    return sorted(bonds)
+
+
+def _heavy_degree(atom) -> int:
+    """Return the number of non-hydrogen neighbours of an atom."""
+    return sum(1 for neighbor in atom.GetNeighbors() if neighbor.GetAtomicNum() > 1)
+
+
+def ligand_to_pdbqt(mol) -> str:
+    """
+    Convert a prepared ligand molecule to flexible PDBQT text.
+
+    Rigid fragments are found by cutting rotatable bonds; the largest
+    fragment becomes the ROOT and the others are written as nested
+    BRANCH blocks.
+
+    Args:
+        mol: RDKit molecule with hydrogens, a 3D conformer and Gasteiger charges
+
+    Returns:
+        PDBQT text with torsion tree and TORSDOF record
+
+    Raises:
+        LigandError: If the molecule has no conformer
+    """
+    if mol.GetNumConformers() == 0:
+        raise LigandError("Ligand has no 3D coordinates; cannot write PDBQT")
+
+    conformer = mol.GetConformer()
+    torsions = rotatable_bonds(mol)
+    torsion_set = set(torsions)
+
+    # Rigid fragments: connected components after cutting rotatable bonds
+    fragment_of: Dict[int, int] = {}
+    fragments: List[List[int]] = []
+    for start in range(mol.GetNumAtoms()):
+        if start in fragment_of:
+            continue
+        fragment = []
+        stack = [start]
+        fragment_of[start] = len(fragments)
+        while stack:
+            idx = stack.pop()
+            fragment.append(idx)
+            for neighbor in mol.GetAtomWithIdx(idx).GetNeighbors():
+                n_idx = neighbor.GetIdx()
+                if n_idx in fragment_of:
+                    continue
+                if (min(idx, n_idx), max(idx, n_idx)) in torsion_set:
+                    continue
+                fragment_of[n_idx] = len(fragments)
+                stack.append(n_idx)
+        fragments.append(fragment)
+
+    root = max(range(len(fragments)), key=lambda f: len(fragments[f]))
+    lines: List[str] = ["ROOT"]
+    serials: Dict[int, int] = {}
+    visited: Set[int] = {root}
+
+    def write_fragment(fragment: int, first_atom: Optional[int]) -> None:
+        atoms = sorted(fragments[fragment])
+        if first_atom is not None:
+            atoms.remove(first_atom)
+            atoms.insert(0, first_atom)
+        for idx in atoms:
+            atom = mol.GetAtomWithIdx(idx)
+            if not _is_written(atom):
+                continue
+            serials[idx] = len(serials) + 1
+            lines.append(
+                format_pdbqt_atom(atom, serials[idx], conformer.GetAtomPosition(idx))
+            )
+
+    def write_branches(fragment: int) -> None:
+        for i, j in torsions:
+            if fragment_of[i] == fragment and fragment_of[j] not in visited:
+                parent, child = i, j
+            elif fragment_of[j] == fragment and fragment_of[i] not in visited:
+                parent, child = j, i
+            else:
+                continue
+            child_fragment = fragment_of[child]
+            visited.add(child_fragment)
+            branch_line = f"{serials[parent]:>4}{len(serials) + 1:>4}"
+            lines.append(f"BRANCH {branch_line}")
+            write_fragment(child_fragment, child)
+            write_branches(child_fragment)
+            lines.append(f"ENDBRANCH {branch_line}")
+
+    write_fragment(root, None)
+    lines.append("ENDROOT")
+    write_branches(root)
+    lines.append(f"TORSDOF {len(torsions)}")
+    return "\n".join(lines) + "\n"
+
+
+def parse_pdbqt_atoms(pdbqt: str) -> Tuple[np.ndarray, List[str]]:
+    """
+    Read atom coordinates and AutoDock types from PDBQT text.
+
+    Only the first MODEL is read when the text holds several poses.
+
+    Args:
+        pdbqt: PDBQT text
+
+    Returns:
+        Tuple of (coordinates array of shape (n_atoms, 3), AutoDock types)
+    """
+    coords = []
+    types = []
+    for line in pdbqt.splitlines():
+        if line.startswith(("ATOM", "HETATM")):
+            coords.append((float(line[30:38]), float(line[38:46]), float(line[46:54])))
+            types.append(line[77:79].strip())
+        elif line.startswith("ENDMDL"):
+            break
+    return np.array(coords, dtype=np.float64).reshape(-1, 3), types
+
+
+def replace_pdbqt_coordinates(pdbqt: str, coords: np.ndarray) -> str:
+    """
+    Return PDBQT text with its atom coordinates replaced.
+
+    Args:
+        pdbqt: PDBQT text of a single molecule
+        coords: New coordinates, one row per ATOM/HETATM record
+
+    Returns:
+        PDBQT text with the same records and new coordinates
+    """
+    lines = []
+    positions = iter(coords)
+    for line in pdbqt.splitlines():
+        if line.startswith(("ATOM", "HETATM")):
+            x, y, z = next(positions)
+            line = f"{line[:30]}{x:8.3f}{y:8.3f}{z:8.3f}{line[54:]}"
+        lines.append(line)
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,73 @@
+"""
+Docking pose extraction for Bindigo.
+
+Splits multi-model docking output into individual poses and converts
+PDBQT poses to plain PDB for visualization.
+"""
+
+import re
+from pathlib import Path
+from typing import List, Union
+
+from bindigo.utils.exceptions import DockingError
+
+# AutoDock atom types that are not plain element symbols
+_AUTODOCK_ELEMENTS = {"A": "C", "NA": "N", "OA": "O", "SA": "S", "HD": "H", "HS": "H"}
+
+
+def split_poses(poses: str) -> List[str]:
+    """
+    Split multi-model PDBQT docking output into single poses.
+
+    Args:
+        poses: PDBQT text with MODEL/ENDMDL blocks (or a single pose)
+
+    Returns:
+        List of PDBQT texts, best pose first
+    """
+    models = re.findall(r"^MODEL.*?^ENDMDL[^\n]*\n?", poses, re.MULTILINE | re.DOTALL)
+    return models or ([poses] if poses.strip() else [])
+
+
+def pose_to_pdb(pose: str) -> str:
+    """
+    Convert one PDBQT pose to PDB text.
+
+    Args:
+        pose: PDBQT text of a single pose
+
+    Returns:
+        PDB text with HETATM records and element symbols
+    """
+    lines = []
+    for line in pose.splitlines():
+        if line.startswith("REMARK"):
+            lines.append(line)
+        elif line.startswith(("ATOM", "HETATM")):
+            ad_type = line[77:79].strip()
+            element = _AUTODOCK_ELEMENTS.get(ad_type, ad_type)
+            lines.append(f"HETATM{line[6:66]:<60}          {element:>2}")
+    lines.append("END")
+    return "\n".join(lines) + "\n"
+
+
+def save_best_pose(poses: str, output_file: Union[str, Path]) -> Path:
+    """
+    Write the best docking pose as a PDB file.
+
+    Args:
+        poses: Multi-model PDBQT docking output
+        output_file: PDB file to write
+
+    Returns:
+        Path of the written file
+
+    Raises:
+        DockingError: If the docking output holds no pose
+    """
+    models = split_poses(poses)
+    if not models:
+        raise DockingError("Docking output contains no poses")
+    output_file = Path(output_file)
+    output_file.write_text(pose_to_pdb(models[0]))
+    return output_file
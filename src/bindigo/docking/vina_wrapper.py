@@ -0,0 +1,80 @@
+"""
+In-process AutoDock Vina backend for Bindigo.
+
+Drives the ``vina`` Python bindings directly instead of running the Vina
+executable per ligand: the receptor is loaded and its affinity maps are
+computed once per box (or loaded from the map store in Vina's ``.map``
+format), then every ligand is docked against the same in-memory maps.
+"""
+
+from pathlib import Path
+from typing import Any, Dict
+
+from bindigo.core.config import config
+from bindigo.docking.backend import Center, DockingBackend
+from bindigo.utils.exceptions import DependencyError, DockingError
+
+# File name prefix of the Vina map files in a map store entry
+MAP_PREFIX = "receptor"
+
+
+class VinaBackend(DockingBackend):
+    """AutoDock Vina docking through the ``vina`` Python package."""
+
+    name = "vina"
+
+    def __init__(self, cpu: int = 1, **kwargs: Any):
+        """
+        Initialize the Vina engine.
+
+        Args:
+            cpu: Threads used by Vina per docking run (0 uses all cores); the
+                screening pool already runs one engine per worker process
+            **kwargs: Options for DockingBackend
+
+        Raises:
+            DependencyError: If the vina package is not installed
+        """
+        super().__init__(**kwargs)
+        try:
+            from vina import Vina
+        except ImportError:
+            raise DependencyError(
+                "AutoDock Vina docking requires the 'vina' package. "
+                "Install it with: pip install bindigo[docking]"
+            )
+        self._vina = Vina(sf_name="vina", cpu=cpu, seed=self.seed, verbosity=0)
+
+    def _load_receptor(self, path: Path) -> None:
+        self._vina.set_receptor(rigid_pdbqt_filename=str(path))
+
+    def _compute_maps(self, center: Center, size: float) -> None:
+        self._vina.compute_vina_maps(
+            center=list(center), box_size=[size] * 3, spacing=self.spacing
+        )
+
+    def _save_maps(self, directory: Path) -> None:
+        self._vina.write_maps(map_prefix_filename=str(directory / MAP_PREFIX))
+
+    def _load_maps(self, directory: Path, center: Center, size: float) -> None:
+        self._vina.load_maps(map_prefix_filename=str(directory / MAP_PREFIX))
+
+    def _dock_one(
+        self, pdbqt: str, exhaustiveness: int, n_poses: int
+    ) -> Dict[str, Any]:
+        self._vina.set_ligand_from_string(pdbqt)
+        self._vina.dock(exhaustiveness=exhaustiveness, n_poses=max(n_poses, 1))
+        energy_range = config.DOCKING_ENERGY_RANGE
+        energies = self._vina.energies(n_poses=n_poses, energy_range=energy_range)
+        if len(energies) == 0:
+            raise DockingError("Vina returned no poses")
+        return {
+            "score": float(energies[0][0]),
+            "energies": [float(row[0]) for row in energies],
+            "poses": self._vina.poses(n_poses=n_poses, energy_range=energy_range),
+        }
+
+    @property
+    def engine(self) -> Any:
+        """The underlying ``vina.Vina`` object."""
+        return self._vina
@@ -1,3 +1,25 @@
-"""Machine learning models and feature extraction."""
+"""
+Machine learning models and feature extraction.
 
-__all__ = []
+The names below are imported from their submodules on first access, so
+importing ``bindigo.ml`` does not load NumPy or scikit-learn.
+"""
+
+from bindigo.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "FEATURE_NAMES": "features",
+    "DescriptorCache": "features",
+    "FeatureExtractor": "features",
+    "extract_features": "features",
+    "AffinityModel": "models",
+    "get_model": "models",
+    "list_available_models": "models",
+    "pkd_to_kd_nm": "models",
+    "predict_batch": "models",
+    "save_model": "models",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, exports=_EXPORTS)
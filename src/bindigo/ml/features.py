@@ -0,0 +1,301 @@
+"""
+Feature extraction for Bindigo's affinity model.
+
+The model input (FEATURE_NAMES) is one docking-derived column followed by
+ligand-only RDKit descriptors. Ligand descriptors do not depend on the
+target, so they are computed once per canonical SMILES and stored in a
+``descriptors`` table inside the ligand cache file
+(``Config.LIGAND_CACHE_FILE``); re-screening a library against a new
+target does no descriptor work for known ligands. Per pair, only the
+docking columns are filled in.
+
+NumPy is imported inside the functions that use it, so importing this
+module (e.g. for FEATURE_NAMES) stays cheap.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence, Tuple
+
+from bindigo.core.config import config
+from bindigo.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
+
+# Bump when descriptor definitions change so stale cache entries are ignored
+DESCRIPTOR_VERSION = 1
+
+# Docking-derived columns, computed per protein-ligand pair
+DOCKING_FEATURE_NAMES = ["docking_score"]
+
+# Ligand-only columns, cached by canonical SMILES
+LIGAND_FEATURE_NAMES = [
+    "molecular_weight",
+    "logp",
+    "hbd",
+    "hba",
+    "rotatable_bonds",
+    "tpsa",
+    "aromatic_rings",
+]
+
+# Model input columns, in the order the model was trained on
+# (see src/bindigo/models/README.md)
+FEATURE_NAMES = DOCKING_FEATURE_NAMES + LIGAND_FEATURE_NAMES
+
+# Descriptor vectors kept in memory per extractor before the dictionary is reset
+MEMORY_CACHE_SIZE = 100_000
+
+
+def compute_descriptors(mol: Any) -> np.ndarray:
+    """
+    Compute the ligand-only descriptors of one molecule.
+
+    Args:
+        mol: RDKit molecule (explicit hydrogens are ignored)
+
+    Returns:
+        Float array of LIGAND_FEATURE_NAMES values
+    """
+    import numpy as np
+    from rdkit import Chem
+    from rdkit.Chem import Crippen, Descriptors, Lipinski, rdMolDescriptors
+
+    mol = Chem.RemoveHs(mol)
+    return np.array(
+        [
+            Descriptors.MolWt(mol),
+            Crippen.MolLogP(mol),
+            Lipinski.NumHDonors(mol),
+            Lipinski.NumHAcceptors(mol),
+            rdMolDescriptors.CalcNumRotatableBonds(mol),
+            rdMolDescriptors.CalcTPSA(mol),
+            rdMolDescriptors.CalcNumAromaticRings(mol),
+        ],
+        dtype=np.float64,
+    )
+
+
+class DescriptorCache:
+    """
+    SQLite cache of ligand descriptors keyed by canonical SMILES.
+
+    Descriptors are stored as raw float64 bytes in the ligand cache file.
+    Connections are opened lazily per process, so a cache object can be
+    shared with forked worker processes.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """
+        Initialize the descriptor cache.
+
+        Args:
+            cache_file: SQLite file (default: Config.LIGAND_CACHE_FILE)
+        """
+        self.cache_file = Path(cache_file or config.LIGAND_CACHE_FILE)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection for the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.cache_file), timeout=60.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS descriptors ("
+                " smiles TEXT NOT NULL,"
+                " version INTEGER NOT NULL,"
+                " vector BLOB NOT NULL,"
+                " created REAL NOT NULL,"
+                " PRIMARY KEY (smiles, version))"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get_many(self, smiles: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up descriptors in one query per 500 SMILES.
+
+        Args:
+            smiles: Canonical SMILES strings
+
+        Returns:
+            Dictionary mapping each cached SMILES to its descriptor vector
+        """
+        import numpy as np
+
+        unique = list(dict.fromkeys(smiles))
+        found: Dict[str, np.ndarray] = {}
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                "SELECT smiles, vector FROM descriptors"
+                f" WHERE version = ? AND smiles IN ({placeholders})",
+                [DESCRIPTOR_VERSION, *batch],
+            )
+            for smi, vector in rows:
+                found[smi] = np.frombuffer(vector, dtype=np.float64)
+        return found
+
+    def put_many(self, descriptors: Dict[str, np.ndarray]) -> None:
+        """
+        Store descriptor vectors in one transaction.
+
+        Args:
+            descriptors: Dictionary mapping canonical SMILES to vectors
+        """
+        import numpy as np
+
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO descriptors VALUES (?, ?, ?, ?)",
+                [
+                    (smi, DESCRIPTOR_VERSION, vector.astype(np.float64).tobytes(), now)
+                    for smi, vector in descriptors.items()
+                ],
+            )
+
+    def __len__(self) -> int:
+        row: Tuple[int] = self.connection.execute(
+            "SELECT COUNT(*) FROM descriptors WHERE version = ?", [DESCRIPTOR_VERSION]
+        ).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        """Close the connection opened by this process."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+class FeatureExtractor:
+    """
+    Batched model feature extraction with cached ligand descriptors.
+
+    Descriptors are looked up in an in-process dictionary first, then in
+    the on-disk DescriptorCache; only SMILES missing from both are parsed
+    and computed with RDKit.
+    """
+
+    def __init__(self, cache: Optional[DescriptorCache] = None, use_cache: bool = True):
+        """
+        Initialize the extractor.
+
+        Args:
+            cache: On-disk descriptor cache (default: one at
+                Config.LIGAND_CACHE_FILE)
+            use_cache: Whether to read from and write to the on-disk cache
+        """
+        if cache is None and use_cache:
+            cache = DescriptorCache()
+        self.cache = cache if use_cache else None
+        self.computed = 0
+        self.hits = 0
+        self._memory: Dict[str, np.ndarray] = {}
+
+    def ligand_descriptors(self, smiles: Sequence[str]) -> np.ndarray:
+        """
+        Return ligand descriptors for a batch of canonical SMILES.
+
+        Args:
+            smiles: Canonical SMILES strings (duplicates are computed once)
+
+        Returns:
+            Array of shape (len(smiles), len(LIGAND_FEATURE_NAMES)); rows of
+            SMILES that RDKit cannot parse are NaN
+        """
+        import numpy as np
+        from rdkit import Chem
+
+        if len(self._memory) > MEMORY_CACHE_SIZE:
+            self._memory.clear()
+        unique = [smi for smi in dict.fromkeys(smiles) if smi not in self._memory]
+        self.hits += len(dict.fromkeys(smiles)) - len(unique)
+        if unique and self.cache is not None:
+            cached = self.cache.get_many(unique)
+            self._memory.update(cached)
+            self.hits += len(cached)
+            unique = [smi for smi in unique if smi not in cached]
+
+        computed: Dict[str, np.ndarray] = {}
+        for smi in unique:
+            mol = Chem.MolFromSmiles(smi)
+            if mol is None:
+                self._memory[smi] = np.full(len(LIGAND_FEATURE_NAMES), np.nan)
+                continue
+            computed[smi] = compute_descriptors(mol)
+        self._memory.update(computed)
+        self.computed += len(computed)
+        if computed and self.cache is not None:
+            self.cache.put_many(computed)
+
+        matrix = np.empty((len(smiles), len(LIGAND_FEATURE_NAMES)))
+        for row, smi in enumerate(smiles):
+            matrix[row] = self._memory[smi]
+        return matrix
+
+    def features(
+        self, smiles: Sequence[str], docking_scores: Sequence[Optional[float]]
+    ) -> np.ndarray:
+        """
+        Build the model feature matrix for a batch of protein-ligand pairs.
+
+        Args:
+            smiles: Canonical SMILES of each docked ligand
+            docking_scores: Best docking score of each pair (None if docking
+                failed)
+
+        Returns:
+            Array of shape (len(smiles), len(FEATURE_NAMES)) in FEATURE_NAMES
+            order; rows with a missing value contain NaN
+        """
+        import numpy as np
+
+        if len(smiles) != len(docking_scores):
+            raise ValueError(
+                f"Got {len(smiles)} SMILES but {len(docking_scores)} docking scores"
+            )
+        matrix = np.empty((len(smiles), len(FEATURE_NAMES)))
+        matrix[:, 0] = [np.nan if s is None else s for s in docking_scores]
+        matrix[:, len(DOCKING_FEATURE_NAMES) :] = self.ligand_descriptors(smiles)
+        return matrix
+
+    def clear(self) -> None:
+        """Drop the in-process descriptor dictionary."""
+        self._memory.clear()
+
+
+def extract_features(
+    smiles: Sequence[str],
+    docking_scores: Sequence[Optional[float]],
+    extractor: Optional[FeatureExtractor] = None,
+) -> np.ndarray:
+    """
+    Build the model feature matrix for a batch of protein-ligand pairs.
+
+    Args:
+        smiles: Canonical SMILES of each docked ligand
+        docking_scores: Best docking score of each pair
+        extractor: Extractor to use (default: a new one backed by the
+            on-disk descriptor cache)
+
+    Returns:
+        Array of shape (len(smiles), len(FEATURE_NAMES))
+    """
+    if extractor is None:
+        extractor = FeatureExtractor()
+    return extractor.features(smiles, docking_scores)
@@ -0,0 +1,363 @@
+"""
+Affinity model inference for Bindigo.
+
+Wraps the pre-trained scikit-learn regressor (``Config.MODEL_FILE``) and
+its feature scaler (``Config.SCALER_FILE``). Features are stacked into a
+NumPy matrix and scaled/predicted in batches of ``Config.ML_BATCH_SIZE``
+rows, so per-call scikit-learn overhead is paid once per batch instead of
+once per ligand. Single predictions and screens share ``predict_batch``.
+
+Loaded models are kept in a per-process registry, so each model is
+unpickled at most once per process. Artifacts are loaded with joblib
+memory-mapping (``Config.MODEL_MMAP_MODE``): the tree arrays of an
+uncompressed model file are mapped read-only from disk and shared through
+the page cache by every worker process instead of being copied into each.
+
+NumPy, joblib and scikit-learn are imported when a model is loaded or
+used, so listing installed models (``bindigo info``) stays cheap.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Union
+
+from bindigo.core.config import config
+from bindigo.ml.features import FEATURE_NAMES
+from bindigo.utils.exceptions import PredictionError
+from bindigo.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = get_logger(__name__)
+
+FeatureInput = Union["np.ndarray", Sequence[Sequence[float]]]
+
+
+class AffinityModel:
+    """
+    Pre-trained affinity regressor with its feature scaler.
+
+    The model predicts pKd (-log10 of Kd in molar) from the features in
+    FEATURE_NAMES.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        scaler: Any = None,
+        name: str = "default",
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Initialize the model.
+
+        Args:
+            estimator: Fitted regressor with a ``predict`` method
+            scaler: Fitted scaler with a ``transform`` method (optional)
+            name: Model name
+            metadata: Model information (algorithm, training set, ...)
+        """
+        self.estimator = estimator
+        self.scaler = scaler
+        self.name = name
+        self.metadata = metadata or {}
+        self.n_features = getattr(estimator, "n_features_in_", len(FEATURE_NAMES))
+
+    @classmethod
+    def load(
+        cls,
+        model_file: Optional[Path] = None,
+        scaler_file: Optional[Path] = None,
+        name: str = "default",
+        mmap_mode: Optional[str] = None,
+    ) -> "AffinityModel":
+        """
+        Load a model and scaler saved with joblib.
+
+        Most callers should use get_model, which caches the loaded model.
+
+        Args:
+            model_file: Model path (default: Config.MODELS_DIR / Config.MODEL_FILE)
+            scaler_file: Scaler path (default: Config.MODELS_DIR / Config.SCALER_FILE)
+            name: Model name
+            mmap_mode: joblib memory-map mode for array data (default:
+                Config.MODEL_MMAP_MODE)
+
+        Returns:
+            Loaded AffinityModel
+
+        Raises:
+            PredictionError: If the files are missing or cannot be loaded
+        """
+        import joblib
+
+        model_file = Path(model_file or Path(config.MODELS_DIR) / config.MODEL_FILE)
+        scaler_file = Path(scaler_file or Path(config.MODELS_DIR) / config.SCALER_FILE)
+        for path in (model_file, scaler_file):
+            if not path.exists():
+                raise PredictionError(f"Model file not found: {path}")
+        if mmap_mode is None:
+            mmap_mode = config.MODEL_MMAP_MODE
+
+        try:
+            estimator = joblib.load(model_file, mmap_mode=mmap_mode)
+            scaler = joblib.load(scaler_file, mmap_mode=mmap_mode)
+        except Exception as e:
+            raise PredictionError(f"Could not load model '{name}': {e}")
+
+        logger.info(f"Loaded model '{name}' from {model_file}")
+        metadata = _read_metadata(Path(model_file).parent, name)
+        return cls(estimator, scaler, name=name, metadata=metadata)
+
+    def predict_batch(
+        self, features: FeatureInput, batch_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Predict pKd for a matrix of feature rows.
+
+        Rows are scaled and predicted ``batch_size`` at a time. Rows
+        containing NaN (e.g. a ligand whose docking failed) are skipped and
+        get a NaN prediction.
+
+        Args:
+            features: Array of shape (n_ligands, n_features)
+            batch_size: Rows per scaler/model call (default: Config.ML_BATCH_SIZE)
+
+        Returns:
+            Float array of predicted pKd values, one per row
+
+        Raises:
+            PredictionError: If the feature matrix has the wrong shape
+        """
+        import numpy as np
+
+        matrix = np.asarray(features, dtype=np.float64)
+        if matrix.ndim == 1:
+            matrix = matrix.reshape(1, -1)
+        if matrix.ndim != 2 or matrix.shape[1] != self.n_features:
+            raise PredictionError(
+                f"Expected features of shape (n, {self.n_features}), "
+                f"got {matrix.shape}"
+            )
+
+        if batch_size is None:
+            batch_size = config.ML_BATCH_SIZE
+        if batch_size < 1:
+            raise PredictionError(f"Batch size must be at least 1, got {batch_size}")
+
+        predictions = np.full(len(matrix), np.nan)
+        valid = np.flatnonzero(np.isfinite(matrix).all(axis=1))
+        for begin in range(0, len(valid), batch_size):
+            rows = valid[begin : begin + batch_size]
+            batch = matrix[rows]
+            if self.scaler is not None:
+                batch = self.scaler.transform(batch)
+            predictions[rows] = self.estimator.predict(batch)
+        return predictions
+
+
+def predict_batch(
+    features: FeatureInput,
+    model: Optional[AffinityModel] = None,
+    batch_size: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Predict pKd for a matrix of feature rows with the default model.
+
+    Args:
+        features: Array of shape (n_ligands, len(FEATURE_NAMES))
+        model: Model to use (default: loaded from Config.MODELS_DIR)
+        batch_size: Rows per scaler/model call (default: Config.ML_BATCH_SIZE)
+
+    Returns:
+        Float array of predicted pKd values (NaN for rows with missing features)
+
+    Raises:
+        PredictionError: If the model cannot be loaded or features are invalid
+    """
+    if model is None:
+        model = get_model()
+    return model.predict_batch(features, batch_size=batch_size)
+
+
+# Models loaded in this process, keyed by (models directory, model name)
+_MODEL_REGISTRY: Dict[Any, AffinityModel] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def model_files(name: str, models_dir: Optional[Path] = None) -> Dict[str, Path]:
+    """
+    Return the artifact paths of a named model.
+
+    The default model uses Config.MODEL_FILE and Config.SCALER_FILE; any
+    other model ``name`` uses ``<name>_model.pkl`` and ``<name>_scaler.pkl``.
+    Metadata is read from ``<name>_metadata.json`` (``model_metadata.json``
+    for the default model).
+
+    Args:
+        name: Model name
+        models_dir: Directory holding the artifacts (default: Config.MODELS_DIR)
+
+    Returns:
+        Dictionary with "model", "scaler" and "metadata" paths
+    """
+    models_dir = Path(models_dir or config.MODELS_DIR)
+    if name == config.DEFAULT_MODEL_NAME:
+        return {
+            "model": models_dir / config.MODEL_FILE,
+            "scaler": models_dir / config.SCALER_FILE,
+            "metadata": models_dir / "model_metadata.json",
+        }
+    return {
+        "model": models_dir / f"{name}_model.pkl",
+        "scaler": models_dir / f"{name}_scaler.pkl",
+        "metadata": models_dir / f"{name}_metadata.json",
+    }
+
+
+def get_model(
+    name: Optional[str] = None, models_dir: Optional[Path] = None
+) -> AffinityModel:
+    """
+    Return a named model, loading it on first use in this process.
+
+    Args:
+        name: Model name (default: Config.DEFAULT_MODEL_NAME)
+        models_dir: Directory holding the artifacts (default: Config.MODELS_DIR)
+
+    Returns:
+        Loaded AffinityModel shared by all callers in this process
+
+    Raises:
+        PredictionError: If the model cannot be loaded
+    """
+    name = name or config.DEFAULT_MODEL_NAME
+    models_dir = Path(models_dir or config.MODELS_DIR)
+    key = (str(models_dir.resolve()), name)
+    with _REGISTRY_LOCK:
+        model = _MODEL_REGISTRY.get(key)
+        if model is None:
+            paths = model_files(name, models_dir)
+            model = AffinityModel.load(paths["model"], paths["scaler"], name=name)
+            _MODEL_REGISTRY[key] = model
+    return model
+
+
+def clear_model_registry() -> None:
+    """Drop all models loaded in this process."""
+    with _REGISTRY_LOCK:
+        _MODEL_REGISTRY.clear()
+
+
+def save_model(
+    estimator: Any,
+    scaler: Any,
+    name: Optional[str] = None,
+    models_dir: Optional[Path] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Path]:
+    """
+    Save a trained model, its scaler and metadata for use with get_model.
+
+    Artifacts are written uncompressed so they can be memory-mapped.
+
+    Args:
+        estimator: Fitted regressor predicting pKd from FEATURE_NAMES
+        scaler: Fitted feature scaler
+        name: Model name (default: Config.DEFAULT_MODEL_NAME)
+        models_dir: Target directory (default: Config.MODELS_DIR)
+        metadata: Model information (algorithm, training_set, ...)
+
+    Returns:
+        Dictionary of written artifact paths (see model_files)
+    """
+    import joblib
+
+    name = name or config.DEFAULT_MODEL_NAME
+    paths = model_files(name, models_dir)
+    paths["model"].parent.mkdir(parents=True, exist_ok=True)
+    joblib.dump(estimator, paths["model"])
+    joblib.dump(scaler, paths["scaler"])
+
+    info = {
+        "algorithm": type(estimator).__name__,
+        "n_features": getattr(estimator, "n_features_in_", len(FEATURE_NAMES)),
+        "features": FEATURE_NAMES,
+        **(metadata or {}),
+    }
+    with open(paths["metadata"], "w") as f:
+        json.dump(info, f, indent=2)
+    return paths
+
+
+def list_available_models(models_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    List the models installed in the models directory.
+
+    Only metadata files are read; no model is loaded.
+
+    Args:
+        models_dir: Directory to scan (default: Config.MODELS_DIR)
+
+    Returns:
+        List of metadata dictionaries with at least "name", "file",
+        "size_mb", "n_features" and "loaded"
+    """
+    models_dir = Path(models_dir or config.MODELS_DIR)
+    names = []
+    if (models_dir / config.MODEL_FILE).exists():
+        names.append(config.DEFAULT_MODEL_NAME)
+    for path in sorted(models_dir.glob("*_model.pkl")):
+        name = path.name[: -len("_model.pkl")]
+        if path.name != config.MODEL_FILE and name not in names:
+            names.append(name)
+
+    loaded = {
+        name
+        for directory, name in _MODEL_REGISTRY
+        if directory == str(models_dir.resolve())
+    }
+    models = []
+    for name in names:
+        model_file = model_files(name, models_dir)["model"]
+        models.append(
+            {
+                "n_features": len(FEATURE_NAMES),
+                **_read_metadata(models_dir, name),
+                "name": name,
+                "file": str(model_file),
+                "size_mb": model_file.stat().st_size / 1024**2,
+                "loaded": name in loaded,
+            }
+        )
+    return models
+
+
+def _read_metadata(models_dir: Path, name: str) -> Dict[str, Any]:
+    """Read a model's metadata file, returning {} if missing or invalid."""
+    path = model_files(name, models_dir)["metadata"]
+    try:
+        with open(path) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def pkd_to_kd_nm(pkd: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Convert pKd to a dissociation constant in nanomolar.
+
+    Args:
+        pkd: pKd value(s), -log10(Kd in M)
+
+    Returns:
+        Kd in nM
+    """
+    import numpy as np
+
+    return np.power(10.0, 9.0 - np.asarray(pkd, dtype=np.float64))
@@ -1,3 +1,29 @@
-"""Protein and ligand preprocessing modules."""
+"""
+Protein and ligand preprocessing modules.
 
-__all__ = []
+The names below are imported from their submodules on first access, so
+importing ``bindigo.preprocessing`` does not load NumPy, RDKit or SciPy.
+"""
+
+from bindigo.utils.lazy import lazy_exports
+
+_EXPORTS = {
+    "LigandCache": "ligand",
+    "load_ligand": "ligand",
+    "prepare_ligand": "ligand",
+    "prepare_ligands": "ligand",
+    "detect_pockets": "pockets",
+    "find_pockets": "pockets",
+    "ReceptorCache": "protein",
+    "prepare_protein": "protein",
+    "prepare_receptor": "protein",
+    "Structure": "structure",
+    "clean_structure": "structure",
+    "parse_mmcif": "structure",
+    "parse_pdb": "structure",
+    "read_structure": "structure",
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, exports=_EXPORTS)
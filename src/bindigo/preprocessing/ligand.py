@@ -0,0 +1,365 @@
+"""
+Ligand preparation for Bindigo.
+
+Converts ligands to docking-ready form (SMILES -> 3D -> PDBQT): hydrogens,
+ETKDG embedding with MMFF refinement, Gasteiger charges and a PDBQT
+torsion tree. Prepared ligands are stored in a single-file SQLite cache
+keyed by canonical SMILES and preparation settings, so re-screening a
+library against a new target skips 3D embedding entirely.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bindigo.core.config import config
+from bindigo.docking.pdbqt_converter import ligand_to_pdbqt, rotatable_bonds
+from bindigo.utils.exceptions import LigandError
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the preparation algorithm changes so stale cache entries are ignored
+PREPARATION_VERSION = 1
+
+SUPPORTED_CHARGE_METHODS = {"gasteiger"}
+
+
+def load_ligand(ligand_type: str, ligand: str):
+    """
+    Load a validated ligand input as an RDKit molecule.
+
+    Args:
+        ligand_type: "smiles" or "file" (from validate_ligand_input)
+        ligand: SMILES string or file path
+
+    Returns:
+        RDKit molecule (first molecule for multi-molecule files)
+
+    Raises:
+        LigandError: If the ligand cannot be parsed
+    """
+    from rdkit import Chem
+
+    if ligand_type == "smiles":
+        mol = Chem.MolFromSmiles(ligand)
+        if mol is None:
+            raise LigandError(f"Invalid SMILES string '{ligand}'")
+        return mol
+
+    path = Path(ligand)
+    suffix = path.suffix.lower()
+    if suffix == ".sdf":
+        mol = next(iter(Chem.SDMolSupplier(str(path), removeHs=False)), None)
+    elif suffix == ".mol":
+        mol = Chem.MolFromMolFile(str(path), removeHs=False)
+    elif suffix == ".mol2":
+        mol = Chem.MolFromMol2File(str(path), removeHs=False)
+    elif suffix == ".pdb":
+        mol = Chem.MolFromPDBFile(str(path), removeHs=False)
+    else:
+        raise LigandError(f"Unsupported ligand file format: {suffix}")
+
+    if mol is None:
+        raise LigandError(f"Could not read ligand from {path}")
+    return mol
+
+
+def _resolve_settings(
+    generate_3d: Optional[bool],
+    add_hydrogens: Optional[bool],
+    charge_method: Optional[str],
+) -> Dict[str, Any]:
+    """Fill unset preparation options from the global configuration."""
+    settings = {
+        "generate_3d": (
+            config.LIGAND_GENERATE_3D if generate_3d is None else generate_3d
+        ),
+        "add_hydrogens": (
+            config.LIGAND_ADD_HYDROGENS if add_hydrogens is None else add_hydrogens
+        ),
+        "charge_method": (
+            config.LIGAND_CHARGE_METHOD if charge_method is None else charge_method
+        ).lower(),
+        "random_seed": config.LIGAND_RANDOM_SEED,
+    }
+    if settings["charge_method"] not in SUPPORTED_CHARGE_METHODS:
+        raise LigandError(
+            f"Unsupported charge method: {settings['charge_method']}. "
+            f"Supported methods: {', '.join(sorted(SUPPORTED_CHARGE_METHODS))}"
+        )
+    return settings
+
+
+def settings_key(settings: Dict[str, Any]) -> str:
+    """Return a short, stable digest of ligand preparation settings."""
+    payload = json.dumps({"version": PREPARATION_VERSION, **settings}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def prepare_ligand(
+    mol,
+    generate_3d: Optional[bool] = None,
+    add_hydrogens: Optional[bool] = None,
+    charge_method: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Prepare a ligand for docking.
+
+    Args:
+        mol: RDKit molecule
+        generate_3d: Embed new 3D coordinates (default: Config.LIGAND_GENERATE_3D)
+        add_hydrogens: Add hydrogens (default: Config.LIGAND_ADD_HYDROGENS)
+        charge_method: Partial charge method (default: Config.LIGAND_CHARGE_METHOD)
+
+    Returns:
+        Dictionary with "smiles", "molblock", "pdbqt" and "n_torsions"
+
+    Raises:
+        LigandError: If the ligand cannot be prepared
+    """
+    from rdkit import Chem
+    from rdkit.Chem import AllChem, rdPartialCharges
+
+    settings = _resolve_settings(generate_3d, add_hydrogens, charge_method)
+    smiles = Chem.MolToSmiles(Chem.RemoveHs(mol))
+
+    if settings["add_hydrogens"]:
+        mol = Chem.AddHs(mol, addCoords=mol.GetNumConformers() > 0)
+
+    if settings["generate_3d"]:
+        params = AllChem.ETKDGv3()
+        params.randomSeed = settings["random_seed"]
+        if AllChem.EmbedMolecule(mol, params) != 0:
+            params.useRandomCoords = True
+            if AllChem.EmbedMolecule(mol, params) != 0:
+                raise LigandError(f"Failed to generate 3D coordinates for {smiles}")
+        if AllChem.MMFFHasAllMoleculeParams(mol):
+            AllChem.MMFFOptimizeMolecule(mol, maxIters=200)
+        else:
+            AllChem.UFFOptimizeMolecule(mol, maxIters=200)
+    elif mol.GetNumConformers() == 0 or not mol.GetConformer().Is3D():
+        raise LigandError(
+            f"Ligand {smiles} has no 3D coordinates and 3D generation is disabled"
+        )
+
+    rdPartialCharges.ComputeGasteigerCharges(mol, throwOnParamFailure=False)
+
+    return {
+        "smiles": smiles,
+        "molblock": Chem.MolToMolBlock(mol),
+        "pdbqt": ligand_to_pdbqt(mol),
+        "n_torsions": len(rotatable_bonds(mol)),
+    }
+
+
+class LigandCache:
+    """
+    Single-file SQLite cache of prepared ligands.
+
+    Entries are keyed by (canonical SMILES, settings digest) and store the
+    prepared MOL block and PDBQT text zlib-compressed. Connections are
+    opened lazily per process, so a cache object can be shared with
+    forked worker processes.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """
+        Initialize the ligand cache.
+
+        Args:
+            cache_file: SQLite file (default: Config.LIGAND_CACHE_FILE)
+        """
+        self.cache_file = Path(cache_file or config.LIGAND_CACHE_FILE)
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """SQLite connection for the current process."""
+        if self._connection is None or self._pid != os.getpid():
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.cache_file), timeout=60.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ligands ("
+                " smiles TEXT NOT NULL,"
+                " settings TEXT NOT NULL,"
+                " molblock BLOB NOT NULL,"
+                " pdbqt BLOB NOT NULL,"
+                " n_torsions INTEGER NOT NULL,"
+                " created REAL NOT NULL,"
+                " PRIMARY KEY (smiles, settings))"
+            )
+            connection.commit()
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def get_many(
+        self, smiles: Sequence[str], settings: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up prepared ligands in one query.
+
+        Args:
+            smiles: Canonical SMILES strings
+            settings: Settings digest from settings_key
+
+        Returns:
+            Dictionary mapping each cached SMILES to its prepared ligand
+        """
+        unique = list(dict.fromkeys(smiles))
+        found: Dict[str, Dict[str, Any]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(unique), 500):
+            batch = unique[start : start + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                "SELECT smiles, molblock, pdbqt, n_torsions FROM ligands"
+                f" WHERE settings = ? AND smiles IN ({placeholders})",
+                [settings, *batch],
+            )
+            for smi, molblock, pdbqt, n_torsions in rows:
+                found[smi] = {
+                    "smiles": smi,
+                    "molblock": zlib.decompress(molblock).decode(),
+                    "pdbqt": zlib.decompress(pdbqt).decode(),
+                    "n_torsions": n_torsions,
+                }
+        self.hits += len(found)
+        self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, prepared: Sequence[Dict[str, Any]], settings: str) -> None:
+        """
+        Store prepared ligands in one transaction.
+
+        Args:
+            prepared: Prepared ligand dictionaries from prepare_ligand
+            settings: Settings digest from settings_key
+        """
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO ligands VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        item["smiles"],
+                        settings,
+                        zlib.compress(item["molblock"].encode()),
+                        zlib.compress(item["pdbqt"].encode()),
+                        item["n_torsions"],
+                        now,
+                    )
+                    for item in prepared
+                ],
+            )
+
+    def __len__(self) -> int:
+        row: Tuple[int] = self.connection.execute(
+            "SELECT COUNT(*) FROM ligands"
+        ).fetchone()
+        return row[0]
+
+    def log_stats(self) -> None:
+        """Report hit/miss counts through the logger."""
+        total = self.hits + self.misses
+        rate = 100.0 * self.hits / total if total else 0.0
+        logger.info(
+            f"Ligand cache: {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+        )
+
+    def close(self) -> None:
+        """Close the connection opened by this process."""
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+
+def prepare_ligands(
+    mols: Sequence[Any],
+    cache: Optional[LigandCache] = None,
+    use_cache: bool = True,
+    generate_3d: Optional[bool] = None,
+    add_hydrogens: Optional[bool] = None,
+    charge_method: Optional[str] = None,
+) -> List[Any]:
+    """
+    Prepare a batch of ligands, reusing cached preparations.
+
+    Only ligands with generated 3D coordinates are cached, since with
+    ``generate_3d=False`` the result depends on the input coordinates and
+    not just on the SMILES.
+
+    Args:
+        mols: RDKit molecules
+        cache: Ligand cache (default: a cache at Config.LIGAND_CACHE_FILE)
+        use_cache: Whether to read from and write to the cache
+        generate_3d: Embed new 3D coordinates (default: Config.LIGAND_GENERATE_3D)
+        add_hydrogens: Add hydrogens (default: Config.LIGAND_ADD_HYDROGENS)
+        charge_method: Partial charge method (default: Config.LIGAND_CHARGE_METHOD)
+
+    Returns:
+        List aligned with ``mols`` holding a prepared ligand dictionary or
+        the LigandError raised while preparing that molecule
+    """
+    from rdkit import Chem
+
+    if use_cache and cache is None:
+        # Close the connection of a cache opened just for this call
+        cache = LigandCache()
+        try:
+            return prepare_ligands(
+                mols, cache, True, generate_3d, add_hydrogens, charge_method
+            )
+        finally:
+            cache.log_stats()
+            cache.close()
+
+    settings = _resolve_settings(generate_3d, add_hydrogens, charge_method)
+    use_cache = use_cache and settings["generate_3d"]
+    key = settings_key(settings)
+    smiles = [Chem.MolToSmiles(Chem.RemoveHs(mol)) for mol in mols]
+
+    cached: Dict[str, Dict[str, Any]] = {}
+    if use_cache and cache is not None:
+        cached = cache.get_many(smiles, key)
+
+    results: List[Any] = []
+    new_entries: Dict[str, Dict[str, Any]] = {}
+    for mol, smi in zip(mols, smiles):
+        if smi in cached:
+            results.append(cached[smi])
+            continue
+        if smi in new_entries:
+            results.append(new_entries[smi])
+            continue
+        try:
+            prepared = prepare_ligand(
+                mol,
+                generate_3d=settings["generate_3d"],
+                add_hydrogens=settings["add_hydrogens"],
+                charge_method=settings["charge_method"],
+            )
+        except LigandError as e:
+            results.append(e)
+            continue
+        except Exception as e:
+            results.append(LigandError(f"Ligand preparation failed for {smi}: {e}"))
+            continue
+        new_entries[smi] = prepared
+        results.append(prepared)
+
+    if use_cache and cache is not None and new_entries:
+        cache.put_many(list(new_entries.values()), key)
+
+    return results
@@ -0,0 +1,250 @@
+"""
+Geometric binding pocket detection for Bindigo.
+
+A LIGSITE-style grid search: the receptor's bounding box is sampled on a
+regular grid, grid points within ``PROBE_CLEARANCE`` of a heavy atom are
+marked as protein (one KD-tree query for all points), and each empty point
+is scored by how many of seven directions (three axes and four body
+diagonals) are blocked by protein on both sides within ``RAY_LENGTH``.
+Buried points are clustered into pockets by grid connectivity and ranked
+by volume. Every step is a whole-grid array operation, so a 10,000-atom
+receptor is searched in a fraction of a second.
+
+Detected pockets are cached per receptor PDBQT hash under
+``Config.POCKET_CACHE_DIR``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from bindigo.core.config import config
+from bindigo.docking.pdbqt_converter import parse_pdbqt_atoms
+from bindigo.utils.exceptions import ProteinError
+from bindigo.utils.hashing import file_digest
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the detection algorithm changes so stale cache entries are ignored
+POCKET_VERSION = 1
+
+# Grid points closer than this to an atom center are inside the protein
+PROBE_CLEARANCE = 3.0
+
+# Maximum distance searched for protein along each direction
+RAY_LENGTH = 8.0
+
+# Minimum number of enclosed direction pairs (of 7) for a buried point
+MIN_BURIEDNESS = 5
+
+# Margin added around a pocket's extent to give the docking box edge length
+BOX_PADDING = 8.0
+
+# Smallest docking box suggested for a pocket
+MIN_BOX_SIZE = 12.0
+
+# Grid steps of the seven LIGSITE scan directions
+SCAN_DIRECTIONS = [
+    (1, 0, 0),
+    (0, 1, 0),
+    (0, 0, 1),
+    (1, 1, 1),
+    (1, 1, -1),
+    (1, -1, 1),
+    (-1, 1, 1),
+]
+
+HYDROGEN_TYPES = {"H", "HD", "HS"}
+
+
+def _shift(grid: np.ndarray, step: np.ndarray) -> np.ndarray:
+    """Return ``grid`` moved by ``step`` voxels: out[p] = grid[p + step]."""
+    out = np.zeros_like(grid)
+    source = []
+    target = []
+    for offset, length in zip(step, grid.shape):
+        offset = int(offset)
+        if abs(offset) >= length:
+            return out
+        source.append(slice(max(offset, 0), length + min(offset, 0)))
+        target.append(slice(max(-offset, 0), length - max(offset, 0)))
+    out[tuple(target)] = grid[tuple(source)]
+    return out
+
+
+def _blocked(occupied: np.ndarray, direction: np.ndarray, n_steps: int) -> np.ndarray:
+    """Return points that see protein within ``n_steps`` along ``direction``."""
+    hit = np.zeros_like(occupied)
+    for k in range(1, n_steps + 1):
+        hit |= _shift(occupied, k * direction)
+    return hit
+
+
+def buriedness_grid(occupied: np.ndarray, spacing: float) -> np.ndarray:
+    """
+    Count the direction pairs enclosing each grid point.
+
+    Args:
+        occupied: Boolean protein occupancy grid
+        spacing: Grid spacing in Angstroms
+
+    Returns:
+        uint8 array with the same shape, values 0-7
+    """
+    buriedness = np.zeros(occupied.shape, dtype=np.uint8)
+    for offsets in SCAN_DIRECTIONS:
+        direction = np.array(offsets)
+        n_steps = int(np.ceil(RAY_LENGTH / (spacing * np.linalg.norm(direction))))
+        enclosed = _blocked(occupied, direction, n_steps)
+        enclosed &= _blocked(occupied, -direction, n_steps)
+        buriedness += enclosed
+    return buriedness
+
+
+def find_pockets(
+    coords: np.ndarray,
+    spacing: Optional[float] = None,
+    min_volume: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Detect pockets in a set of receptor heavy-atom coordinates.
+
+    Args:
+        coords: Atom coordinates, shape (n_atoms, 3)
+        spacing: Grid spacing in Angstroms (default: Config.POCKET_GRID_SPACING)
+        min_volume: Smallest pocket kept in cubic Angstroms
+            (default: Config.POCKET_MIN_VOLUME)
+
+    Returns:
+        Pockets sorted by decreasing volume. Each is a dictionary with
+        "rank", "center" (x, y, z), "size" (suggested cubic box edge),
+        "volume" (cubic Angstroms), "n_points" and "buriedness" (mean
+        enclosed direction pairs).
+    """
+    from scipy import ndimage
+    from scipy.spatial import cKDTree
+
+    spacing = spacing or config.POCKET_GRID_SPACING
+    min_volume = config.POCKET_MIN_VOLUME if min_volume is None else min_volume
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+    if len(coords) == 0:
+        return []
+
+    # Protein occupancy grid over the padded bounding box
+    origin = coords.min(axis=0) - PROBE_CLEARANCE
+    shape = (
+        np.ceil((coords.max(axis=0) + PROBE_CLEARANCE - origin) / spacing).astype(int)
+        + 1
+    )
+    axes = [origin[i] + spacing * np.arange(shape[i]) for i in range(3)]
+    points = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+    distances, _ = cKDTree(coords).query(points, distance_upper_bound=PROBE_CLEARANCE)
+    occupied = np.isfinite(distances).reshape(tuple(shape))
+
+    buriedness = buriedness_grid(occupied, spacing)
+    candidates = ~occupied & (buriedness >= MIN_BURIEDNESS)
+
+    labels, n_clusters = ndimage.label(candidates, structure=np.ones((3, 3, 3)))
+    if n_clusters == 0:
+        return []
+    index = np.arange(1, n_clusters + 1)
+    counts = np.bincount(labels.ravel(), minlength=n_clusters + 1)[1:]
+    centers = np.array(ndimage.center_of_mass(candidates, labels, index))
+    mean_buriedness = ndimage.mean(buriedness, labels, index)
+    extents = np.array(
+        [
+            [(s.stop - s.start) * spacing for s in slices]
+            for slices in ndimage.find_objects(labels)
+        ]
+    )
+
+    volumes = counts * spacing**3
+    order = np.lexsort((-mean_buriedness, -volumes))
+    pockets: List[Dict[str, Any]] = []
+    for i in order:
+        if volumes[i] < min_volume:
+            continue
+        center = origin + centers[i] * spacing
+        pockets.append(
+            {
+                "rank": len(pockets) + 1,
+                "center": tuple(round(float(c), 3) for c in center),
+                "size": round(
+                    max(float(extents[i].max()) + BOX_PADDING, MIN_BOX_SIZE), 1
+                ),
+                "volume": round(float(volumes[i]), 1),
+                "n_points": int(counts[i]),
+                "buriedness": round(float(mean_buriedness[i]), 2),
+            }
+        )
+    return pockets
+
+
+def _cache_file(cache_dir: Path, receptor_hash: str, spacing: float) -> Path:
+    description = {
+        "version": POCKET_VERSION,
+        "receptor": receptor_hash,
+        "spacing": spacing,
+        "min_volume": config.POCKET_MIN_VOLUME,
+    }
+    key = hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+    return cache_dir / f"{key}.json"
+
+
+def detect_pockets(
+    receptor_pdbqt: Union[str, Path],
+    cache_dir: Optional[Path] = None,
+    use_cache: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Detect pockets in a prepared receptor, reusing cached results.
+
+    Args:
+        receptor_pdbqt: Prepared receptor PDBQT file
+        cache_dir: Pocket cache directory (default: Config.POCKET_CACHE_DIR)
+        use_cache: If False, always re-detect and overwrite the cache entry
+
+    Returns:
+        Pockets as returned by find_pockets, largest first
+
+    Raises:
+        ProteinError: If the receptor has no heavy atoms
+    """
+    path = Path(receptor_pdbqt)
+    cache_dir = Path(cache_dir or config.POCKET_CACHE_DIR)
+    spacing = config.POCKET_GRID_SPACING
+    cache_file = _cache_file(cache_dir, file_digest(path), spacing)
+
+    if use_cache and cache_file.exists():
+        try:
+            cached: List[Dict[str, Any]] = json.loads(cache_file.read_text())
+            for pocket in cached:
+                pocket["center"] = tuple(pocket["center"])
+            logger.info(f"Pocket cache hit for {path.name}")
+            return cached
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Re-detecting pockets, unreadable cache entry: {e}")
+
+    coords, types = parse_pdbqt_atoms(path.read_text())
+    heavy = np.array([t not in HYDROGEN_TYPES for t in types], dtype=bool)
+    if not heavy.any():
+        raise ProteinError(f"No heavy atoms found in receptor {path}")
+    pockets = find_pockets(coords[heavy], spacing)
+    logger.info(f"Detected {len(pockets)} pocket(s) in {path.name}")
+
+    # Write to a temporary file and rename, so readers never see a partial entry
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=".pockets-", dir=cache_dir)
+        with os.fdopen(fd, "w") as f:
+            json.dump(pockets, f)
+        os.replace(tmp, cache_file)
+    except OSError as e:
+        logger.warning(f"Could not cache detected pockets: {e}")
+    return pockets
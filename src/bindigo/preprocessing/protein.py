@@ -0,0 +1,277 @@
+"""
+Protein preparation for Bindigo.
+
+Cleans a receptor structure (water removal, chain selection, hydrogens),
+assigns Gasteiger charges and AutoDock atom types, and writes PDB and
+PDBQT files. Prepared receptors are stored in an on-disk cache keyed by
+the input structure content and the preprocessing settings, so repeated
+runs against the same target skip preparation entirely.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from bindigo.core.config import config
+from bindigo.docking.pdbqt_converter import receptor_to_pdbqt
+from bindigo.preprocessing.structure import clean_structure, read_structure
+from bindigo.utils.exceptions import ProteinError
+from bindigo.utils.logging import get_logger
+from bindigo.utils.store import DirectoryStore
+
+logger = get_logger(__name__)
+
+# Bump when the preparation algorithm changes so stale cache entries are ignored
+PREPARATION_VERSION = 1
+
+RECEPTOR_PDB = "receptor.pdb"
+RECEPTOR_PDBQT = "receptor.pdbqt"
+
+
+def _resolve_settings(
+    remove_water: Optional[bool],
+    add_hydrogens: Optional[bool],
+    select_chain: Optional[str],
+) -> Dict[str, Any]:
+    """Fill unset preprocessing options from the global configuration."""
+    return {
+        "remove_water": config.REMOVE_WATER if remove_water is None else remove_water,
+        "add_hydrogens": (
+            config.ADD_HYDROGENS if add_hydrogens is None else add_hydrogens
+        ),
+        "select_chain": config.SELECT_CHAIN if select_chain is None else select_chain,
+    }
+
+
+def receptor_cache_key(structure_file: Path, settings: Dict[str, Any]) -> str:
+    """
+    Compute the cache key for a prepared receptor.
+
+    Args:
+        structure_file: Input protein structure file
+        settings: Resolved preprocessing settings
+
+    Returns:
+        Hex SHA-256 digest of the structure bytes and settings
+    """
+    digest = hashlib.sha256()
+    with open(structure_file, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    digest.update(
+        json.dumps(
+            {"version": PREPARATION_VERSION, **settings}, sort_keys=True
+        ).encode()
+    )
+    return digest.hexdigest()
+
+
+def _clean_structure(
+    structure_file: Path, remove_water: bool, select_chain: Optional[str]
+) -> str:
+    """
+    Load a structure and return a cleaned PDB block.
+
+    Keeps the first model and the first alternate location of each atom,
+    optionally drops waters and restricts multi-chain structures to one
+    chain.
+
+    Args:
+        structure_file: PDB/ENT/CIF file
+        remove_water: Whether to drop water residues
+        select_chain: Chain to keep for multi-chain structures (None keeps all)
+
+    Returns:
+        PDB-format text of the cleaned structure
+
+    Raises:
+        ProteinError: If the structure cannot be parsed or the chain is missing
+    """
+    structure = read_structure(structure_file)
+    if len(structure) == 0:
+        raise ProteinError(f"No atoms found in protein structure {structure_file}")
+    try:
+        structure = clean_structure(structure, remove_water, select_chain)
+    except ProteinError as e:
+        raise ProteinError(f"{e} ({structure_file.name})")
+    return structure.to_pdb()
+
+
+def prepare_protein(
+    structure_file: Path,
+    remove_water: Optional[bool] = None,
+    add_hydrogens: Optional[bool] = None,
+    select_chain: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    Prepare a protein structure for docking.
+
+    Args:
+        structure_file: PDB/ENT/CIF file
+        remove_water: Drop water molecules (default: Config.REMOVE_WATER)
+        add_hydrogens: Add hydrogens (default: Config.ADD_HYDROGENS)
+        select_chain: Chain to keep (default: Config.SELECT_CHAIN)
+
+    Returns:
+        Tuple of (pdb_text, pdbqt_text) for the prepared receptor
+
+    Raises:
+        ProteinError: If the structure cannot be prepared
+    """
+    from rdkit import Chem
+    from rdkit.Chem import rdPartialCharges
+
+    settings = _resolve_settings(remove_water, add_hydrogens, select_chain)
+    pdb_block = _clean_structure(
+        Path(structure_file), settings["remove_water"], settings["select_chain"]
+    )
+
+    mol = Chem.MolFromPDBBlock(pdb_block, removeHs=False, sanitize=False)
+    if mol is None or mol.GetNumAtoms() == 0:
+        raise ProteinError(f"No atoms left after cleaning {structure_file}")
+
+    # Full sanitization fails on many real structures (ligands, missing atoms),
+    # so sanitize what we can and keep going
+    mol.UpdatePropertyCache(strict=False)
+    Chem.SanitizeMol(
+        mol,
+        Chem.SanitizeFlags.SANITIZE_ALL ^ Chem.SanitizeFlags.SANITIZE_PROPERTIES,
+        catchErrors=True,
+    )
+    Chem.FastFindRings(mol)
+
+    if settings["add_hydrogens"]:
+        mol = Chem.AddHs(mol, addCoords=True, addResidueInfo=True)
+
+    rdPartialCharges.ComputeGasteigerCharges(mol, throwOnParamFailure=False)
+
+    pdb_text = Chem.MolToPDBBlock(mol, flavor=4)
+    pdbqt_text = receptor_to_pdbqt(mol)
+    return pdb_text, pdbqt_text
+
+
+class ReceptorCache(DirectoryStore):
+    """
+    On-disk cache of prepared receptors with size-based LRU eviction.
+
+    Each entry is a directory named by its cache key containing the
+    prepared PDB and PDBQT files plus a metadata file. The metadata file's
+    modification time records the last access and drives eviction.
+    """
+
+    entry_description = "prepared receptor"
+
+    def __init__(
+        self, cache_dir: Optional[Path] = None, max_size_mb: Optional[float] = None
+    ):
+        """
+        Initialize the receptor cache.
+
+        Args:
+            cache_dir: Cache directory (default: Config.RECEPTOR_CACHE_DIR)
+            max_size_mb: Size limit in MB (default: Config.RECEPTOR_CACHE_MAX_MB)
+        """
+        super().__init__(
+            Path(cache_dir or config.RECEPTOR_CACHE_DIR),
+            config.RECEPTOR_CACHE_MAX_MB if max_size_mb is None else max_size_mb,
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, key: str) -> Dict[str, Any]:
+        entry_dir = self.cache_dir / key
+        return {
+            "cache_key": key,
+            "pdb_file": str(entry_dir / RECEPTOR_PDB),
+            "pdbqt_file": str(entry_dir / RECEPTOR_PDBQT),
+        }
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a prepared receptor and mark it as recently used.
+
+        Args:
+            key: Cache key from receptor_cache_key
+
+        Returns:
+            Receptor dictionary with file paths, or None on a miss
+        """
+        if self.get_dir(key) is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return self._entry(key)
+
+    def put(
+        self,
+        key: str,
+        pdb_text: str,
+        pdbqt_text: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Store a prepared receptor and evict old entries if over the limit.
+
+        Args:
+            key: Cache key from receptor_cache_key
+            pdb_text: Prepared receptor in PDB format
+            pdbqt_text: Prepared receptor in PDBQT format
+            metadata: Optional extra information to record with the entry
+
+        Returns:
+            Receptor dictionary with file paths
+        """
+
+        def write_entry(entry_dir: Path) -> None:
+            (entry_dir / RECEPTOR_PDB).write_text(pdb_text)
+            (entry_dir / RECEPTOR_PDBQT).write_text(pdbqt_text)
+
+        self.put_dir(key, write_entry, metadata)
+        return self._entry(key)
+
+
+def prepare_receptor(
+    structure_file: Union[str, Path],
+    cache: Optional[ReceptorCache] = None,
+    use_cache: bool = True,
+    remove_water: Optional[bool] = None,
+    add_hydrogens: Optional[bool] = None,
+    select_chain: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Prepare a receptor, reusing a cached preparation when available.
+
+    Args:
+        structure_file: PDB/ENT/CIF file
+        cache: Receptor cache (default: a cache in Config.RECEPTOR_CACHE_DIR)
+        use_cache: If False, always re-prepare and overwrite the cache entry
+        remove_water: Drop water molecules (default: Config.REMOVE_WATER)
+        add_hydrogens: Add hydrogens (default: Config.ADD_HYDROGENS)
+        select_chain: Chain to keep (default: Config.SELECT_CHAIN)
+
+    Returns:
+        Dictionary with "cache_key", "pdb_file" and "pdbqt_file"
+
+    Raises:
+        ProteinError: If the structure cannot be prepared
+    """
+    path = Path(structure_file)
+    cache = cache or ReceptorCache()
+    settings = _resolve_settings(remove_water, add_hydrogens, select_chain)
+    key = receptor_cache_key(path, settings)
+
+    if use_cache:
+        receptor = cache.get(key)
+        if receptor is not None:
+            logger.info(f"Receptor cache hit for {path.name} ({key[:12]})")
+            return receptor
+
+    logger.info(f"Preparing receptor {path.name}...")
+    pdb_text, pdbqt_text = prepare_protein(path, **settings)
+    return cache.put(
+        key,
+        pdb_text,
+        pdbqt_text,
+        metadata={"source": str(path.absolute()), "settings": settings},
+    )
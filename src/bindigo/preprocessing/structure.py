@@ -0,0 +1,522 @@
+"""
+Array-backed protein structures for Bindigo.
+
+``Structure`` stores one model of a macromolecular structure as parallel
+NumPy arrays (struct-of-arrays) instead of a tree of per-atom Python
+objects: coordinates, atom and residue names, elements, chain IDs,
+residue numbers and a per-atom residue index. A structure costs roughly
+a hundred bytes per atom, and cleaning steps (chain selection, water
+removal, alternate location filtering) are boolean-mask slices.
+
+PDB and mmCIF files are parsed straight into a ``Structure`` with
+``read_structure``: PDB records by fixed-column slicing of a byte block,
+mmCIF by tokenizing only the ``_atom_site`` loop. Large files are
+memory-mapped rather than read into memory.
+"""
+
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import DTypeLike
+
+from bindigo.core.config import config
+from bindigo.utils.exceptions import ProteinError
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+WATER_RESIDUES = {"HOH", "WAT", "DOD", "H2O"}
+
+# Alternate locations kept when filtering to a single conformer
+PRIMARY_ALTLOCS = (b"", b"A", b"1")
+
+# Per-atom arrays and their dtypes
+FIELDS: Dict[str, DTypeLike] = {
+    "coords": np.float32,
+    "names": "S4",
+    "elements": "S2",
+    "res_names": "S5",
+    "chain_ids": "S4",
+    "res_seq": np.int32,
+    "icodes": "S1",
+    "altlocs": "S1",
+    "occupancy": np.float32,
+    "b_factors": np.float32,
+    "hetero": np.bool_,
+}
+
+
+class Structure:
+    """
+    One model of a macromolecular structure as parallel per-atom arrays.
+
+    Attributes:
+        coords: float32 coordinates, shape (n_atoms, 3)
+        names: Atom names (bytes, e.g. b"CA")
+        elements: Element symbols (bytes, upper case)
+        res_names: Residue names
+        chain_ids: Chain identifiers
+        res_seq: Residue sequence numbers
+        icodes: Residue insertion codes
+        altlocs: Alternate location indicators (b"" when absent)
+        occupancy: Occupancies
+        b_factors: Temperature factors
+        hetero: True for HETATM records
+        residue_index: Zero-based residue ordinal of each atom
+    """
+
+    coords: np.ndarray
+    names: np.ndarray
+    elements: np.ndarray
+    res_names: np.ndarray
+    chain_ids: np.ndarray
+    res_seq: np.ndarray
+    icodes: np.ndarray
+    altlocs: np.ndarray
+    occupancy: np.ndarray
+    b_factors: np.ndarray
+    hetero: np.ndarray
+    residue_index: np.ndarray
+
+    def __init__(self, **arrays: Any):
+        """
+        Initialize a structure from per-atom arrays.
+
+        Args:
+            **arrays: One array per name in FIELDS, all of the same length
+
+        Raises:
+            ValueError: If an array is missing or lengths differ
+        """
+        n_atoms = len(arrays["coords"])
+        for name, dtype in FIELDS.items():
+            array = np.asarray(arrays[name], dtype=dtype)
+            if len(array) != n_atoms:
+                raise ValueError(
+                    f"Field {name} has {len(array)} rows, expected {n_atoms}"
+                )
+            setattr(self, name, array)
+        self.coords = self.coords.reshape(-1, 3)
+        self.residue_index = _residue_index(self.chain_ids, self.res_seq, self.icodes)
+
+    def __len__(self) -> int:
+        return len(self.coords)
+
+    def __repr__(self) -> str:
+        return (
+            f"Structure({len(self)} atoms, {self.n_residues} residues, "
+            f"chains {', '.join(self.chains)})"
+        )
+
+    @property
+    def n_residues(self) -> int:
+        """Number of residues."""
+        return int(self.residue_index[-1]) + 1 if len(self) else 0
+
+    @property
+    def chains(self) -> List[str]:
+        """Chain IDs in order of first appearance."""
+        unique, first = np.unique(self.chain_ids, return_index=True)
+        return [chain.decode() for chain in unique[np.argsort(first)]]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the per-atom arrays in bytes."""
+        arrays = [getattr(self, name) for name in FIELDS] + [self.residue_index]
+        return sum(int(array.nbytes) for array in arrays)
+
+    def select(self, mask: np.ndarray) -> "Structure":
+        """
+        Return the atoms selected by a boolean mask or index array.
+
+        Args:
+            mask: Boolean mask of length n_atoms, or integer indices
+
+        Returns:
+            New Structure holding copies of the selected rows
+        """
+        return Structure(**{name: getattr(self, name)[mask] for name in FIELDS})
+
+    def select_chain(self, chain: str) -> "Structure":
+        """
+        Return the atoms of one chain.
+
+        Raises:
+            ProteinError: If the chain does not exist
+        """
+        mask = self.chain_ids == chain.encode()
+        if not mask.any():
+            raise ProteinError(
+                f"Chain '{chain}' not found. Available chains: {', '.join(self.chains)}"
+            )
+        return self.select(mask)
+
+    def remove_water(self) -> "Structure":
+        """Return the structure without water residues."""
+        waters = np.isin(self.res_names, [name.encode() for name in WATER_RESIDUES])
+        return self.select(~waters)
+
+    def primary_altloc(self) -> "Structure":
+        """Return the structure with only the first alternate location kept."""
+        return self.select(np.isin(self.altlocs, PRIMARY_ALTLOCS))
+
+    def to_pdb(self) -> str:
+        """
+        Format the structure as PDB ATOM/HETATM records.
+
+        PDB records hold one-character chain IDs. Longer (mmCIF) chain IDs
+        are cut to their first character with a warning, unless that would
+        merge two chains.
+
+        Returns:
+            PDB text ending with an END record
+
+        Raises:
+            ProteinError: If cutting chain IDs to one character would merge
+                distinct chains
+        """
+        chain_ids = _pdb_chain_ids(self.chains)
+        lines = []
+        for i in range(len(self)):
+            name = self.names[i].decode()
+            element = self.elements[i].decode()
+            if len(name) < 4 and len(element) < 2:
+                name = " " + name
+            x, y, z = self.coords[i]
+            lines.append(
+                f"{'HETATM' if self.hetero[i] else 'ATOM  '}{(i + 1) % 100000:5d} "
+                f"{name:<4s}{self.altlocs[i].decode():1s}"
+                f"{self.res_names[i].decode():>3s} {chain_ids[self.chain_ids[i]]:1s}"
+                f"{self.res_seq[i] % 10000:4d}{self.icodes[i].decode():1s}   "
+                f"{x:8.3f}{y:8.3f}{z:8.3f}{self.occupancy[i]:6.2f}"
+                f"{self.b_factors[i]:6.2f}          {element:>2s}\n"
+            )
+        lines.append("END\n")
+        return "".join(lines)
+
+
+def _pdb_chain_ids(chains: List[str]) -> Dict[bytes, str]:
+    """Map chain IDs to the one-character IDs written to PDB records."""
+    mapping = {chain.encode(): chain[:1] for chain in chains}
+    long_ids = [chain for chain in chains if len(chain) > 1]
+    if long_ids:
+        if len(set(mapping.values())) < len(mapping):
+            raise ProteinError(
+                f"Chain IDs {', '.join(long_ids)} do not fit the one-character "
+                "chain field of PDB format without merging chains; "
+                "select a single chain"
+            )
+        logger.warning(
+            f"Chain IDs {', '.join(long_ids)} cut to one character for PDB output"
+        )
+    return mapping
+
+
+def _residue_index(
+    chain_ids: np.ndarray, res_seq: np.ndarray, icodes: np.ndarray
+) -> np.ndarray:
+    """Number residues by changes of (chain, number, insertion code)."""
+    if len(res_seq) == 0:
+        return np.zeros(0, dtype=np.int32)
+    changed = (
+        (chain_ids[1:] != chain_ids[:-1])
+        | (res_seq[1:] != res_seq[:-1])
+        | (icodes[1:] != icodes[:-1])
+    )
+    return np.concatenate([[0], np.cumsum(changed)]).astype(np.int32)
+
+
+# Input accepted by the parsers: text, bytes or a buffer such as an mmap
+StructureData = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+# Fixed PDB record width; shorter lines are padded with spaces
+PDB_LINE_WIDTH = 80
+
+_SPACE = ord(" ")
+
+
+def _to_buffer(data: StructureData) -> Any:
+    """Return a bytes-like view of parser input without copying buffers."""
+    return data.encode() if isinstance(data, str) else data
+
+
+def _line_bounds(buf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return start and end offsets of every line in a byte array."""
+    ends = np.flatnonzero(buf == ord("\n"))
+    if len(buf) and buf[-1] != ord("\n"):
+        ends = np.append(ends, len(buf))
+    starts = np.concatenate([[0], ends[:-1] + 1]) if len(ends) else ends
+    return starts, ends
+
+
+def _gather_columns(
+    buf: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int
+) -> np.ndarray:
+    """Copy the first ``width`` bytes of each line into a space-padded block."""
+    index = starts[:, None] + np.arange(width)
+    block = buf[np.minimum(index, len(buf) - 1)]
+    block[index >= ends[:, None]] = _SPACE
+    block[block == ord("\r")] = _SPACE
+    return block
+
+
+def _pdb_field(block: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Return one fixed-width column of a record block as stripped bytes."""
+    column = np.ascontiguousarray(block[:, start:stop])
+    return np.char.strip(column.view(f"S{stop - start}").ravel())
+
+
+def _elements_from_names(names: np.ndarray) -> np.ndarray:
+    """Guess elements from atom names: the first letter of each name."""
+    letters = np.ascontiguousarray(names, dtype="S4").view(np.uint8).reshape(-1, 4)
+    upper = letters & 0xDF
+    is_alpha = (upper >= ord("A")) & (upper <= ord("Z"))
+    first = upper[np.arange(len(letters)), is_alpha.argmax(axis=1)]
+    first[~is_alpha.any(axis=1)] = _SPACE
+    return np.char.strip(first.view("S1"))
+
+
+def parse_pdb(data: StructureData) -> Structure:
+    """
+    Parse the first model of PDB data by fixed-column slicing.
+
+    Coordinate records are located and copied into an (n_atoms, 80) byte
+    block with array operations; each field is then one column slice of
+    that block converted in a single NumPy call.
+
+    Args:
+        data: PDB file contents (text, bytes or a memory-mapped file)
+
+    Returns:
+        Structure with the ATOM/HETATM records of the first model
+
+    Raises:
+        ProteinError: If a coordinate record is malformed
+    """
+    buf = np.frombuffer(_to_buffer(data), dtype=np.uint8)
+    starts, ends = _line_bounds(buf)
+    if len(starts) == 0:
+        return Structure(**{name: [] for name in FIELDS})
+
+    records = _gather_columns(buf, starts, ends, 6).view("S6").ravel()
+    endmdl = np.flatnonzero(records == b"ENDMDL")
+    if len(endmdl):
+        records = records[: endmdl[0]]
+    atoms = np.flatnonzero((records == b"ATOM  ") | (records == b"HETATM"))
+    block = _gather_columns(buf, starts[atoms], ends[atoms], PDB_LINE_WIDTH)
+
+    try:
+        coords = np.stack(
+            [_pdb_field(block, start, start + 8) for start in (30, 38, 46)], axis=1
+        ).astype(np.float64)
+        res_seq = _pdb_field(block, 22, 26).astype(np.int64)
+        occupancy = _pdb_field(block, 54, 60)
+        b_factors = _pdb_field(block, 60, 66)
+        occupancy = np.where(occupancy == b"", b"1", occupancy).astype(np.float64)
+        b_factors = np.where(b_factors == b"", b"0", b_factors).astype(np.float64)
+    except ValueError as e:
+        raise ProteinError(f"Malformed coordinate record: {e}")
+
+    names = _pdb_field(block, 12, 16)
+    elements = np.char.upper(_pdb_field(block, 76, 78))
+    missing = elements == b""
+    if missing.any():
+        elements[missing] = _elements_from_names(names[missing])
+    return Structure(
+        coords=coords,
+        names=names,
+        elements=elements,
+        res_names=_pdb_field(block, 17, 20),
+        chain_ids=_pdb_field(block, 21, 22),
+        res_seq=res_seq,
+        icodes=_pdb_field(block, 26, 27),
+        altlocs=_pdb_field(block, 16, 17),
+        occupancy=occupancy,
+        b_factors=b_factors,
+        hetero=records[atoms] == b"HETATM",
+    )
+
+
+# mmCIF value tokens: quoted strings or bare words
+_CIF_TOKEN = re.compile(rb"'(.*?)'(?=\s|$)|\"(.*?)\"(?=\s|$)|(\S+)")
+
+# atom_site items read into each Structure field, in order of preference
+_CIF_ITEMS = {
+    "names": ("auth_atom_id", "label_atom_id"),
+    "elements": ("type_symbol",),
+    "res_names": ("auth_comp_id", "label_comp_id"),
+    "chain_ids": ("auth_asym_id", "label_asym_id"),
+    "res_seq": ("auth_seq_id", "label_seq_id"),
+    "icodes": ("pdbx_PDB_ins_code",),
+    "altlocs": ("label_alt_id",),
+    "occupancy": ("occupancy",),
+    "b_factors": ("B_iso_or_equiv",),
+}
+
+# Values of the numeric items when unknown ("?") or not applicable (".")
+_CIF_DEFAULTS = {"res_seq": b"0", "occupancy": b"1", "b_factors": b"0"}
+
+
+def _tokenize_cif(values: bytes) -> List[bytes]:
+    """Split mmCIF loop values into tokens, honouring quoted strings."""
+    if b"'" not in values and b'"' not in values:
+        return values.split()
+    tokens: List[bytes] = []
+    for line in values.splitlines():
+        if b"'" in line or b'"' in line:
+            tokens.extend(a or b or c for a, b, c in _CIF_TOKEN.findall(line))
+        else:
+            tokens.extend(line.split())
+    return tokens
+
+
+def parse_mmcif(data: StructureData) -> Structure:
+    """
+    Parse the first model of the ``_atom_site`` loop of mmCIF data.
+
+    Only the atom_site loop is read: its values are split into tokens
+    (a plain whitespace split unless a line holds quoted values) and
+    reshaped into a (n_atoms, n_items) byte-string table whose columns are
+    converted with single NumPy calls.
+
+    Args:
+        data: mmCIF file contents (text, bytes or a memory-mapped file)
+
+    Returns:
+        Structure with the atoms of the first model
+
+    Raises:
+        ProteinError: If the file has no readable atom_site loop
+    """
+    buf = _to_buffer(data)
+    start = buf.find(b"\n_atom_site.")
+    if start < 0:
+        raise ProteinError("No _atom_site loop found in mmCIF data")
+
+    # Item names, one per header line
+    items = []
+    position = start + 1
+    while buf[position : position + 11] == b"_atom_site.":
+        eol = buf.find(b"\n", position)
+        eol = len(buf) if eol < 0 else eol
+        items.append(bytes(buf[position + 11 : eol]).split()[0].decode())
+        position = eol + 1
+
+    # Values run until the next comment, loop or data item
+    end = len(buf)
+    for marker in (b"\n#", b"\nloop_", b"\n_", b"\ndata_"):
+        found = buf.find(marker, position)
+        if found >= 0:
+            end = min(end, found)
+    tokens = _tokenize_cif(bytes(buf[position:end]))
+
+    n_items = len(items)
+    if n_items == 0 or len(tokens) % n_items:
+        raise ProteinError("Malformed _atom_site loop in mmCIF data")
+    table = np.array(tokens, dtype=bytes).reshape(-1, n_items)
+    if "pdbx_PDB_model_num" in items and len(table):
+        models = table[:, items.index("pdbx_PDB_model_num")]
+        table = table[models == models[0]]
+
+    def column(name: str, candidates: Tuple[str, ...]) -> np.ndarray:
+        default = _CIF_DEFAULTS.get(name, b"")
+        for item in candidates:
+            if item in items:
+                values = table[:, items.index(item)]
+                return np.where(np.isin(values, [b".", b"?"]), default, values)
+        return np.full(len(table), default)
+
+    try:
+        coords = np.stack(
+            [column("coords", (f"Cartn_{axis}",)) for axis in "xyz"], axis=1
+        ).astype(np.float64)
+        fields = {name: column(name, items_) for name, items_ in _CIF_ITEMS.items()}
+        for name in _CIF_DEFAULTS:
+            fields[name] = fields[name].astype(np.float64)
+    except ValueError as e:
+        raise ProteinError(f"Malformed _atom_site values in mmCIF data: {e}")
+    fields["elements"] = np.char.upper(fields["elements"])
+    fields["hetero"] = column("hetero", ("group_PDB",)) == b"HETATM"
+    return Structure(coords=coords, **fields)
+
+
+def _parse_mapped(
+    parse: Callable[[StructureData], Structure], data: mmap.mmap
+) -> Structure:
+    """
+    Parse a memory-mapped file, leaving no views of the map behind on error.
+
+    A parser error's traceback keeps the parser frames, and their NumPy
+    views of the map, alive; the map then cannot be closed while the error
+    propagates. The error is re-raised only after the original is dropped.
+    """
+    try:
+        return parse(data)
+    except (ProteinError, ValueError, IndexError) as e:
+        message = str(e)
+    raise ProteinError(message)
+
+
+def read_structure(
+    path: Union[str, Path], use_mmap: Optional[bool] = None
+) -> Structure:
+    """
+    Read the first model of a PDB (.pdb/.ent) or mmCIF (.cif) file.
+
+    Args:
+        path: Structure file
+        use_mmap: Memory-map the file instead of reading it into memory
+            (default: for files of at least Config.STRUCTURE_MMAP_MIN_MB)
+
+    Returns:
+        Parsed Structure
+
+    Raises:
+        ProteinError: If the file cannot be read or parsed
+    """
+    path = Path(path)
+    parse = parse_mmcif if path.suffix.lower() == ".cif" else parse_pdb
+    try:
+        size = path.stat().st_size
+        if use_mmap is None:
+            use_mmap = size >= config.STRUCTURE_MMAP_MIN_MB * 1024 * 1024
+        with open(path, "rb") as f:
+            if use_mmap and size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    return _parse_mapped(parse, data)
+            return parse(f.read())
+    except OSError as e:
+        raise ProteinError(f"Could not read protein structure {path}: {e}")
+    except ProteinError as e:
+        raise ProteinError(f"Failed to parse protein structure {path}: {e}")
+
+
+def clean_structure(
+    structure: Structure, remove_water: bool, select_chain: Optional[str]
+) -> Structure:
+    """
+    Apply receptor cleaning to a structure.
+
+    Keeps the first alternate location of each atom, optionally drops
+    waters and restricts multi-chain structures to one chain.
+
+    Args:
+        structure: Parsed structure
+        remove_water: Whether to drop water residues
+        select_chain: Chain to keep for multi-chain structures (None keeps all)
+
+    Returns:
+        Cleaned Structure
+
+    Raises:
+        ProteinError: If the selected chain does not exist
+    """
+    structure = structure.primary_altloc()
+    if select_chain and len(structure.chains) > 1:
+        structure = structure.select_chain(select_chain)
+    if remove_water:
+        structure = structure.remove_water()
+    return structure
@@ -63,3 +63,15 @@ class DependencyError(BindigoError):
     """Raised when a required dependency is missing or incompatible."""
 
     pass
+
+
+class ServerError(BindigoError):
+    """Raised when the prediction server cannot be started or reached."""
+
+    pass
+
+
+class WorkerError(BindigoError):
+    """Raised when a worker process times out or dies."""
+
+    pass
@@ -0,0 +1,18 @@
+"""
+File content hashing for Bindigo.
+
+Content digests key the on-disk caches (affinity maps, detected pockets)
+and verify the files held in the PDB structure cache.
+"""
+
+import hashlib
+from pathlib import Path
+
+
+def file_digest(path: Path) -> str:
+    """Return the hex SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
@@ -1,57 +1,461 @@
 """
 I/O utilities for Bindigo.
 
-Provides functions for reading and writing files.
+Provides functions for reading and writing files, including streaming
+access to multi-molecule ligand libraries.
 """
 
 import csv
+import gzip
+import io
+import os
+import struct
+from array import array
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 import json
 
+from bindigo.utils.exceptions import DependencyError, FileFormatError
 
-def write_csv(filepath: Path, data: List[Dict[str, Any]], headers: List[str]) -> None:
+# Result output formats and their default file extensions
+OUTPUT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+_FORMAT_BY_SUFFIX = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow"}
+
+# Prediction result columns and their types in columnar output, in output
+# order (see docs/design.md, "Output File Formats")
+RESULT_COLUMN_TYPES = {
+    "ligand_id": "string",
+    "ligand_name": "string",
+    "smiles": "string",
+    "predicted_kd_nM": "float64",
+    "predicted_pKd": "float64",
+    "confidence": "string",
+    "docking_score_kcal_mol": "float64",
+    "binding_site_center": "string",
+    "box_size": "float64",
+    "pose_file": "string",
+    "timestamp": "string",
+    "status": "string",
+    "error": "string",
+}
+RESULT_COLUMNS = list(RESULT_COLUMN_TYPES)
+
+
+class CSVResultWriter:
     """
-    Write data to CSV file.
+    Incremental CSV writer for result rows.
+
+    Rows are buffered and written in batches, so memory use is bounded by
+    the buffer size rather than the number of rows. Paths ending in
+    ``.gz`` are gzip-compressed; each ``flush(sync=True)`` closes the
+    current gzip member, so every synced offset reported by ``tell`` is a
+    valid truncation point for resuming.
+
+    Example:
+        with CSVResultWriter(path, headers) as writer:
+            for row in rows:
+                writer.write_row(row)
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        headers: List[str],
+        buffer_rows: int = 1000,
+        compress: Optional[bool] = None,
+        resume_from: Optional[int] = None,
+    ):
+        """
+        Open a result file for writing.
+
+        Args:
+            filepath: Output file path
+            headers: List of column headers
+            buffer_rows: Number of rows buffered before writing to the file
+            compress: Gzip the output (default: when the path ends in .gz)
+            resume_from: Truncate an existing file to this byte offset and
+                append after it instead of starting a new file
+
+        Raises:
+            IOError: If the file cannot be opened
+        """
+        self.filepath = Path(filepath)
+        self.headers = list(headers)
+        self.buffer_rows = max(1, buffer_rows)
+        self.compress = (
+            self.filepath.suffix.lower() == ".gz" if compress is None else compress
+        )
+        self._buffer: List[Dict[str, Any]] = []
+        self._gzip: Optional[gzip.GzipFile] = None
+        self._text: Optional[io.TextIOWrapper] = None
+        self._writer: Any = None
+
+        self._raw: BinaryIO
+        try:
+            if resume_from is not None:
+                self._raw = open(self.filepath, "r+b")
+                self._raw.truncate(resume_from)
+                self._raw.seek(resume_from)
+            else:
+                self._raw = open(self.filepath, "wb")
+        except OSError as e:
+            raise IOError(f"Failed to open CSV file {self.filepath}: {e}")
+
+        if resume_from is None:
+            self._open_stream().writeheader()
+
+    def _open_stream(self) -> Any:
+        """
+        Return the csv writer, opening the text stream on first use.
+
+        For gzip output each stream is a new gzip member. Members are only
+        started when there is data to write, so the offset after a synced
+        flush never includes the header of an empty trailing member.
+        """
+        if self._writer is None:
+            stream: Union[BinaryIO, gzip.GzipFile] = self._raw
+            if self.compress:
+                self._gzip = gzip.GzipFile(fileobj=self._raw, mode="wb")
+                stream = self._gzip
+            self._text = io.TextIOWrapper(stream, newline="", write_through=True)
+            self._writer = csv.DictWriter(
+                self._text, fieldnames=self.headers, extrasaction="ignore"
+            )
+        return self._writer
+
+    def _close_stream(self) -> None:
+        """Flush and detach the text stream, ending the gzip member."""
+        if self._text is not None:
+            self._text.flush()
+            self._text.detach()
+        if self._gzip is not None:
+            self._gzip.close()
+        self._text = None
+        self._gzip = None
+        self._writer = None
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Buffer one row, writing the buffer out when it is full."""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.buffer_rows:
+            self._write_buffer()
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Buffer rows from any iterable, writing them out in batches."""
+        for row in rows:
+            self.write_row(row)
+
+    def _write_buffer(self) -> None:
+        if self._buffer:
+            self._open_stream().writerows(self._buffer)
+            self._buffer = []
+
+    def flush(self, sync: bool = False) -> None:
+        """
+        Write buffered rows and flush them to the operating system.
+
+        Args:
+            sync: Also end the current gzip member and fsync the file, making
+                the current ``tell()`` offset a durable checkpoint
+        """
+        self._write_buffer()
+        if sync and self.compress:
+            self._close_stream()
+        elif self._text is not None:
+            self._text.flush()
+        self._raw.flush()
+        if sync:
+            os.fsync(self._raw.fileno())
+
+    def tell(self) -> int:
+        """Return the number of bytes written to the underlying file."""
+        return self._raw.tell()
+
+    def close(self) -> None:
+        """Flush remaining rows and close the file."""
+        if self._raw.closed:
+            return
+        self._write_buffer()
+        self._close_stream()
+        self._raw.close()
+
+    def __enter__(self) -> "CSVResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+class ArrowResultWriter:
+    """
+    Row-group-batched writer for columnar result files (Parquet, Arrow IPC).
+
+    Rows are buffered and converted to one typed Arrow record batch per
+    row group, so memory use is bounded by ``row_group_rows``. Columnar
+    files are only readable once closed; ``flush`` therefore never forces
+    small row groups, and resumable screens rely on the checkpoint journal
+    rather than on the partial file.
+
+    Requires the optional ``pyarrow`` dependency.
+    """
+
+    def __init__(
+        self,
+        filepath: Path,
+        column_types: Dict[str, str],
+        file_format: str = "parquet",
+        row_group_rows: int = 65536,
+        compression: str = "zstd",
+    ):
+        """
+        Open a columnar result file for writing.
+
+        Args:
+            filepath: Output file path
+            column_types: Ordered mapping of column name to Arrow type alias
+                (e.g. "string", "float64", "int64")
+            file_format: "parquet" or "arrow" (Arrow IPC file)
+            row_group_rows: Number of rows per row group / record batch
+            compression: Compression codec for the columnar file
+
+        Raises:
+            DependencyError: If pyarrow is not installed
+            IOError: If the file cannot be opened
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise DependencyError(
+                "Parquet/Arrow output requires pyarrow. "
+                "Install with: pip install 'bindigo[parquet]'"
+            )
+
+        self._pa = pa
+        self.filepath = Path(filepath)
+        self.file_format = file_format
+        self.row_group_rows = max(1, row_group_rows)
+        self.headers = list(column_types)
+        self.schema = pa.schema(
+            [(name, pa.type_for_alias(alias)) for name, alias in column_types.items()]
+        )
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.headers}
+        self._n_buffered = 0
+
+        try:
+            self._sink = pa.OSFile(str(self.filepath), "wb")
+            if file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(
+                    self._sink, self.schema, compression=compression
+                )
+            elif file_format == "arrow":
+                options = pa.ipc.IpcWriteOptions(compression=compression)
+                self._writer = pa.ipc.new_file(self._sink, self.schema, options=options)
+            else:
+                raise ValueError(f"Unsupported columnar format: {file_format}")
+        except (OSError, pa.ArrowException) as e:
+            raise IOError(f"Failed to open {file_format} file {self.filepath}: {e}")
+
+    def write_row(self, row: Dict[str, Any]) -> None:
+        """Buffer one row, writing a row group when the buffer is full."""
+        for name in self.headers:
+            self._columns[name].append(row.get(name))
+        self._n_buffered += 1
+        if self._n_buffered >= self.row_group_rows:
+            self._write_row_group()
+
+    def write_rows(self, rows: Iterable[Dict[str, Any]]) -> None:
+        """Buffer rows from any iterable, writing full row groups."""
+        for row in rows:
+            self.write_row(row)
+
+    def _write_row_group(self) -> None:
+        if not self._n_buffered:
+            return
+        arrays = [
+            self._pa.array(
+                [_coerce(value, field.type) for value in self._columns[field.name]],
+                type=field.type,
+            )
+            for field in self.schema
+        ]
+        batch = self._pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.file_format == "parquet":
+            self._writer.write_batch(batch, row_group_size=self.row_group_rows)
+        else:
+            self._writer.write_batch(batch)
+        self._columns = {name: [] for name in self.headers}
+        self._n_buffered = 0
+
+    def flush(self, sync: bool = False) -> None:
+        """Accepted for interface compatibility; rows are written per row group."""
+
+    def tell(self) -> int:
+        """Return the number of bytes written so far."""
+        position: int = self._sink.tell()
+        return position
+
+    def close(self) -> None:
+        """Write remaining rows and the file footer."""
+        if self._sink.closed:
+            return
+        self._write_row_group()
+        self._writer.close()
+        self._sink.close()
+
+    def __enter__(self) -> "ArrowResultWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _coerce(value: Any, arrow_type: Any) -> Any:
+    """Convert a row value (possibly a string read back from CSV) to a column type."""
+    import pyarrow as pa
+
+    if value is None or value == "":
+        return None
+    if pa.types.is_floating(arrow_type):
+        return float(value)
+    if pa.types.is_integer(arrow_type):
+        return int(value)
+    if pa.types.is_string(arrow_type) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def output_format_for_path(filepath: Path) -> Optional[str]:
+    """
+    Determine the result format from a file extension.
 
     Args:
         filepath: Output file path
-        data: List of dictionaries containing row data
+
+    Returns:
+        "csv", "parquet" or "arrow", or None if the extension is unknown
+    """
+    suffixes = [suffix.lower() for suffix in Path(filepath).suffixes]
+    if suffixes[-2:] == [".csv", ".gz"]:
+        return "csv"
+    return _FORMAT_BY_SUFFIX.get(suffixes[-1] if suffixes else "")
+
+
+def open_result_writer(
+    filepath: Path, column_types: Dict[str, str], **kwargs: Any
+) -> Any:
+    """
+    Open a result writer for the format implied by the file extension.
+
+    Args:
+        filepath: Output path (.csv, .csv.gz, .parquet or .arrow)
+        column_types: Ordered mapping of column name to Arrow type alias
+        **kwargs: Extra options passed to the writer
+
+    Returns:
+        CSVResultWriter or ArrowResultWriter (both support write_row,
+        write_rows, flush, tell, close and the context manager protocol)
+
+    Raises:
+        FileFormatError: If the extension is not a supported result format
+    """
+    fmt = output_format_for_path(filepath)
+    if fmt == "csv":
+        return CSVResultWriter(filepath, list(column_types), **kwargs)
+    if fmt in ("parquet", "arrow"):
+        return ArrowResultWriter(filepath, column_types, file_format=fmt, **kwargs)
+    raise FileFormatError(f"Unsupported result file format: {filepath}")
+
+
+def _open_csv_text(filepath: Path):
+    """Open a plain or gzipped CSV file for reading text."""
+    if Path(filepath).suffix.lower() == ".gz":
+        return gzip.open(filepath, "rt", newline="")
+    return open(filepath, "r", newline="")
+
+
+def write_csv(
+    filepath: Path, data: Iterable[Dict[str, Any]], headers: List[str]
+) -> None:
+    """
+    Write data to CSV file.
+
+    Rows are streamed through CSVResultWriter, so ``data`` may be any
+    iterable (including a generator) and is never held in memory at once.
+
+    Args:
+        filepath: Output file path (gzip-compressed if it ends in .gz)
+        data: Iterable of dictionaries containing row data
         headers: List of column headers
 
     Raises:
         IOError: If writing fails
     """
     try:
-        with open(filepath, "w", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=headers)
-            writer.writeheader()
-            writer.writerows(data)
+        with CSVResultWriter(filepath, headers) as writer:
+            writer.write_rows(data)
     except Exception as e:
         raise IOError(f"Failed to write CSV file {filepath}: {e}")
 
 
-def read_csv(filepath: Path) -> List[Dict[str, Any]]:
+def iter_csv(filepath: Path, chunk_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
     """
-    Read CSV file into list of dictionaries.
+    Read a CSV file in chunks of rows.
 
     Args:
-        filepath: Input file path
+        filepath: Input file path (plain or .gz)
+        chunk_size: Maximum number of rows per chunk
 
-    Returns:
-        List of dictionaries, one per row
+    Yields:
+        Lists of at most ``chunk_size`` row dictionaries
 
     Raises:
         IOError: If reading fails
     """
     try:
-        with open(filepath, "r") as f:
+        with _open_csv_text(filepath) as f:
             reader = csv.DictReader(f)
-            return list(reader)
+            chunk: List[Dict[str, Any]] = []
+            for row in reader:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
     except Exception as e:
         raise IOError(f"Failed to read CSV file {filepath}: {e}")
 
 
+def read_csv(filepath: Path) -> List[Dict[str, Any]]:
+    """
+    Read CSV file into list of dictionaries.
+
+    For large files prefer iter_csv, which keeps only one chunk in memory.
+
+    Args:
+        filepath: Input file path (plain or .gz)
+
+    Returns:
+        List of dictionaries, one per row
+
+    Raises:
+        IOError: If reading fails
+    """
+    return [row for chunk in iter_csv(filepath) for row in chunk]
+
+
 def write_json(filepath: Path, data: Dict[str, Any], indent: int = 2) -> None:
     """
     Write data to JSON file.
@@ -105,3 +509,220 @@ def ensure_directory(dirpath: Path) -> None:
         dirpath.mkdir(parents=True, exist_ok=True)
     except Exception as e:
         raise IOError(f"Failed to create directory {dirpath}: {e}")
+
+
+LIGAND_LIBRARY_FORMATS = {".sdf": "sdf", ".smi": "smi"}
+
+# Sidecar index layout: magic, source size, source mtime (ns), record count,
+# followed by one unsigned 64-bit byte offset per record
+_INDEX_MAGIC = b"BDGIDX01"
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+
+
+def ligand_library_format(filepath: Path) -> Tuple[str, bool]:
+    """
+    Determine the record format of a ligand library file.
+
+    Args:
+        filepath: Library path (optionally ending in .gz)
+
+    Returns:
+        Tuple of (format, compressed) where format is "sdf" or "smi"
+
+    Raises:
+        FileFormatError: If the extension is not a supported library format
+    """
+    suffixes = [suffix.lower() for suffix in Path(filepath).suffixes]
+    compressed = bool(suffixes) and suffixes[-1] == ".gz"
+    if compressed:
+        suffixes = suffixes[:-1]
+    fmt = LIGAND_LIBRARY_FORMATS.get(suffixes[-1] if suffixes else "")
+    if fmt is None:
+        supported = sorted(LIGAND_LIBRARY_FORMATS)
+        raise FileFormatError(
+            f"Unsupported ligand library format: {''.join(Path(filepath).suffixes)}. "
+            f"Supported formats: {', '.join(supported)} (optionally gzipped)"
+        )
+    return fmt, compressed
+
+
+class LigandLibrary:
+    """
+    Streaming reader for multi-molecule SDF and SMILES libraries.
+
+    Records are read one at a time as raw text, so memory use does not
+    depend on library size. A byte-offset index (built on demand and
+    stored next to the library when possible) allows jumping straight to
+    record N for sharding or resuming. Offsets of gzipped libraries refer
+    to the decompressed stream, so seeking there still decompresses the
+    skipped data.
+    """
+
+    def __init__(self, filepath: Path):
+        """
+        Initialize the library reader.
+
+        Args:
+            filepath: Path to a .sdf, .smi, .sdf.gz or .smi.gz file
+        """
+        self.path = Path(filepath)
+        self.format, self.compressed = ligand_library_format(self.path)
+        self._offsets: Optional[array] = None
+
+    @property
+    def index_path(self) -> Path:
+        """Path of the sidecar byte-offset index."""
+        return self.path.with_name(self.path.name + ".idx")
+
+    def _open(self) -> Union[BinaryIO, gzip.GzipFile]:
+        if self.compressed:
+            return gzip.open(self.path, "rb")
+        return open(self.path, "rb")
+
+    def _scan(self, f: Union[BinaryIO, gzip.GzipFile]) -> Iterator[Tuple[int, bytes]]:
+        """Yield (byte_offset, record_bytes) from the current file position."""
+        offset = f.tell()
+        if self.format == "smi":
+            for line in f:
+                stripped = line.strip()
+                if stripped and not stripped.startswith(b"#"):
+                    yield offset, stripped
+                offset += len(line)
+            return
+
+        start = offset
+        lines: List[bytes] = []
+        for line in f:
+            lines.append(line)
+            offset += len(line)
+            if line.startswith(b"$$$$"):
+                yield start, b"".join(lines)
+                start = offset
+                lines = []
+        if any(line.strip() for line in lines):
+            yield start, b"".join(lines)
+
+    def iter_records(
+        self, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[Tuple[int, str, str]]:
+        """
+        Stream raw records from the library.
+
+        Args:
+            start: Index of the first record to yield
+            stop: Index one past the last record to yield (None reads to the end)
+
+        Yields:
+            Tuples of (index, format, record_text)
+        """
+        if stop is not None and stop <= start:
+            return
+        with self._open() as f:
+            index = 0
+            if start > 0:
+                offsets = self.offsets()
+                if start >= len(offsets):
+                    return
+                f.seek(offsets[start])
+                index = start
+            for _, record in self._scan(f):
+                if stop is not None and index >= stop:
+                    return
+                yield index, self.format, record.decode("utf-8", errors="replace")
+                index += 1
+
+    def get_records(self, indices: Iterable[int]) -> Iterator[Tuple[int, str, str]]:
+        """
+        Read selected records by index through the offset index.
+
+        Args:
+            indices: Record indices; read in ascending order
+
+        Yields:
+            Tuples of (index, format, record_text)
+        """
+        offsets = self.offsets()
+        with self._open() as f:
+            for index in sorted(set(indices)):
+                if not 0 <= index < len(offsets):
+                    raise IndexError(f"Record {index} is not in {self.path}")
+                f.seek(offsets[index])
+                _, record = next(self._scan(f))
+                yield index, self.format, record.decode("utf-8", errors="replace")
+
+    def __iter__(self) -> Iterator[Tuple[int, str, str]]:
+        return self.iter_records()
+
+    def __len__(self) -> int:
+        return len(self.offsets())
+
+    def offsets(self) -> array:
+        """
+        Return the byte offset of every record, building the index if needed.
+
+        Returns:
+            Array of unsigned 64-bit offsets, one per record
+        """
+        if self._offsets is None:
+            self._offsets = self._load_index()
+        if self._offsets is None:
+            offsets = array("Q")
+            with self._open() as f:
+                for offset, _ in self._scan(f):
+                    offsets.append(offset)
+            self._offsets = offsets
+            self._save_index(offsets)
+        return self._offsets
+
+    def _source_signature(self) -> Tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _load_index(self) -> Optional[array]:
+        """Load the sidecar index if it matches the current library file."""
+        try:
+            with open(self.index_path, "rb") as f:
+                magic, size, mtime_ns, count = _INDEX_HEADER.unpack(
+                    f.read(_INDEX_HEADER.size)
+                )
+                if (
+                    magic != _INDEX_MAGIC
+                    or (size, mtime_ns) != self._source_signature()
+                ):
+                    return None
+                offsets = array("Q")
+                offsets.fromfile(f, count)
+                return offsets
+        except (OSError, EOFError, struct.error):
+            return None
+
+    def _save_index(self, offsets: array) -> None:
+        """Write the sidecar index; an unwritable location is not an error."""
+        size, mtime_ns = self._source_signature()
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(_INDEX_HEADER.pack(_INDEX_MAGIC, size, mtime_ns, len(offsets)))
+                offsets.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+
+    def shard(self, shard_index: int, n_shards: int) -> Tuple[int, int]:
+        """
+        Compute the record range of one shard of the library.
+
+        Args:
+            shard_index: Zero-based shard number
+            n_shards: Total number of shards
+
+        Returns:
+            Tuple of (start, stop) record indices for iter_records
+        """
+        if n_shards < 1 or not 0 <= shard_index < n_shards:
+            raise ValueError(f"Invalid shard {shard_index} of {n_shards}")
+        total = len(self)
+        return (total * shard_index // n_shards, total * (shard_index + 1) // n_shards)
@@ -0,0 +1,60 @@
+"""
+Lazy loading of package attributes.
+
+Bindigo's packages export their main classes and functions, but importing
+a package must stay cheap: ``bindigo --help``, ``bindigo info`` and the
+``bindigo cache`` commands never touch NumPy, RDKit or scikit-learn and
+should not pay for importing them. ``lazy_exports`` builds a module-level
+``__getattr__`` (PEP 562) that imports the submodule defining a name the
+first time the name is accessed:
+
+    __getattr__, __dir__ = lazy_exports(
+        __name__, exports={"AffinityModel": "models"}
+    )
+
+``from bindigo.ml import AffinityModel`` then imports ``bindigo.ml.models``
+only at that point, and later accesses find the attribute in the package
+namespace without going through ``__getattr__`` again.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def lazy_exports(
+    package: str,
+    submodules: Iterable[str] = (),
+    exports: Optional[Dict[str, str]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package with lazy attributes.
+
+    Args:
+        package: The package's ``__name__``
+        submodules: Submodule names made available as attributes, e.g.
+            "ml" so that ``bindigo.ml`` works after ``import bindigo``
+        exports: Attribute name to the name of the submodule (relative to
+            the package) defining it
+
+    Returns:
+        (__getattr__, __dir__) to assign at module level in the package
+    """
+    submodules = frozenset(submodules)
+    exports = dict(exports or {})
+
+    def __getattr__(name: str) -> Any:
+        if name in submodules:
+            value = importlib.import_module(f"{package}.{name}")
+        elif name in exports:
+            module = importlib.import_module(f"{package}.{exports[name]}")
+            value = getattr(module, name)
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | submodules | set(exports))
+
+    return __getattr__, __dir__
@@ -0,0 +1,328 @@
+"""
+Run metrics for Bindigo pipelines.
+
+A PipelineMetrics object collects, for one run:
+
+- per-stage wall time, CPU time and call counts (``with metrics.stage(...)``)
+- counters such as cache hits and misses (``metrics.count(...)``)
+- the peak resident set size of the process and of finished worker
+  processes
+
+``process_memory_bytes`` measures the current memory of a running process
+(used to fit screening workers into ``Config.MAX_MEMORY_GB``).
+
+Metrics are logged through the Bindigo logger at the end of a run and can
+be written to a JSON file or to a Prometheus text-format file (e.g. for
+the node exporter's textfile collector).
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+
+from bindigo.utils.exceptions import InputError
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+METRICS_FORMATS = ("json", "prometheus")
+
+
+def peak_rss_bytes(children: bool = False) -> Optional[int]:
+    """
+    Return the peak resident set size, or None where it cannot be measured.
+
+    Args:
+        children: Report the largest finished child process instead of the
+            current process
+
+    Returns:
+        Peak RSS in bytes
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    peak = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def process_memory_bytes(pid: Optional[int] = None) -> Optional[int]:
+    """
+    Return the current memory use of a process, or None where it cannot be
+    measured (outside Linux).
+
+    This is the proportional set size (PSS) where the kernel reports it:
+    pages shared between processes, such as a forked worker's copy of the
+    parent's receptor and model, are split between them, so the memory of
+    a parent and its workers adds up without double counting. Older
+    kernels fall back to the resident set size.
+
+    Args:
+        pid: Process ID (default: the current process)
+
+    Returns:
+        Memory use in bytes
+    """
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def metrics_format_for_path(path: Path) -> str:
+    """Return "prometheus" for .prom files and "json" otherwise."""
+    return "prometheus" if Path(path).suffix == ".prom" else "json"
+
+
+def timed(metrics: Optional["PipelineMetrics"], name: str) -> Any:
+    """Return ``metrics.stage(name)``, or a no-op context if metrics is None."""
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+class PipelineMetrics:
+    """
+    Timers and counters for one pipeline run.
+
+    Stage timers may be used from several threads. CPU time is the CPU
+    time of the thread running the stage, so stages overlapping on
+    different threads are not charged for each other's work.
+    """
+
+    def __init__(self, pipeline: str):
+        """
+        Initialize empty metrics.
+
+        Args:
+            pipeline: Pipeline name, e.g. "predict" or "screen"
+        """
+        self.pipeline = pipeline
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.counters: Dict[str, int] = {}
+        self.wall_time: Optional[float] = None
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._peak_rss: Optional[Tuple[Optional[int], Optional[int]]] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PipelineMetrics":
+        """
+        Rebuild finished metrics from ``to_dict`` output.
+
+        Used for metrics of a run in another process (e.g. a prediction
+        served by ``bindigo serve``); the peak memory reported is that of
+        the other process.
+        """
+        metrics = cls(data["pipeline"])
+        metrics.stages = {name: dict(stage) for name, stage in data["stages"].items()}
+        metrics.counters = dict(data["counters"])
+        metrics.wall_time = data["wall_time"]
+        metrics._peak_rss = (
+            data.get("peak_rss_bytes"),
+            data.get("peak_worker_rss_bytes"),
+        )
+        return metrics
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block of work as (part of) a stage."""
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add_stage_time(
+                name, time.perf_counter() - wall, time.thread_time() - cpu
+            )
+
+    def add_stage_time(
+        self,
+        name: str,
+        wall_time: float,
+        cpu_time: Optional[float] = None,
+        calls: int = 1,
+    ) -> None:
+        """
+        Add time measured elsewhere (e.g. by worker processes) to a stage.
+
+        Args:
+            name: Stage name
+            wall_time: Wall time in seconds
+            cpu_time: CPU time in seconds, None if not measured
+            calls: Number of calls the time covers
+        """
+        with self._lock:
+            stage = self.stages.setdefault(
+                name, {"wall_time": 0.0, "cpu_time": None, "calls": 0}
+            )
+            stage["wall_time"] += wall_time
+            if cpu_time is not None:
+                stage["cpu_time"] = (stage["cpu_time"] or 0.0) + cpu_time
+            stage["calls"] += calls
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + int(value)
+
+    def finish(self) -> None:
+        """Record the total wall time of the run."""
+        self.wall_time = time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the metrics as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with "pipeline", "wall_time", "stages" (name to
+            wall_time/cpu_time/calls), "counters", "peak_rss_bytes" and
+            "peak_worker_rss_bytes"
+        """
+        wall_time = self.wall_time
+        if wall_time is None:
+            wall_time = time.perf_counter() - self._start
+        with self._lock:
+            stages = {name: dict(stage) for name, stage in self.stages.items()}
+            counters = dict(self.counters)
+        if self._peak_rss is not None:
+            peak_rss, peak_worker_rss = self._peak_rss
+        else:
+            peak_rss = peak_rss_bytes()
+            peak_worker_rss = peak_rss_bytes(children=True) or None
+        return {
+            "pipeline": self.pipeline,
+            "wall_time": wall_time,
+            "stages": stages,
+            "counters": counters,
+            "peak_rss_bytes": peak_rss,
+            "peak_worker_rss_bytes": peak_worker_rss,
+        }
+
+    def to_prometheus(self) -> str:
+        """Return the metrics in the Prometheus text exposition format."""
+        data = self.to_dict()
+        label = f'pipeline="{data["pipeline"]}"'
+        lines = []
+
+        def metric(
+            name: str, help_text: str, samples: Dict[str, Any], kind: str = "gauge"
+        ) -> None:
+            samples = {k: v for k, v in samples.items() if v is not None}
+            if not samples:
+                return
+            lines.append(f"# HELP bindigo_{name} {help_text}")
+            lines.append(f"# TYPE bindigo_{name} {kind}")
+            for labels, value in samples.items():
+                text = str(value) if isinstance(value, int) else f"{value:.6f}"
+                lines.append(f"bindigo_{name}{{{labels}}} {text}")
+
+        metric("run_wall_seconds", "Wall time of the run", {label: data["wall_time"]})
+        for field, help_text in (
+            ("wall_time", "Wall time spent in each stage"),
+            ("cpu_time", "CPU time spent in each stage"),
+        ):
+            metric(
+                f"stage_{field.split('_')[0]}_seconds",
+                help_text,
+                {
+                    f'{label},stage="{name}"': stage[field]
+                    for name, stage in data["stages"].items()
+                },
+            )
+        metric(
+            "stage_calls",
+            "Calls of each stage",
+            {
+                f'{label},stage="{name}"': stage["calls"]
+                for name, stage in data["stages"].items()
+            },
+        )
+        metric(
+            "peak_rss_bytes", "Peak resident set size", {label: data["peak_rss_bytes"]}
+        )
+        metric(
+            "peak_worker_rss_bytes",
+            "Peak resident set size of finished worker processes",
+            {label: data["peak_worker_rss_bytes"]},
+        )
+        for name, value in sorted(data["counters"].items()):
+            metric(
+                re.sub(r"[^a-zA-Z0-9_]", "_", name) + "_total",
+                name.replace("_", " ").capitalize(),
+                {label: value},
+                kind="counter",
+            )
+        return "\n".join(lines) + "\n"
+
+    def log(self, log: Optional[logging.Logger] = None) -> None:
+        """Log a summary of stage times, counters and peak memory."""
+        log = log or logger
+        data = self.to_dict()
+        log.info(f"{self.pipeline} metrics: {data['wall_time']:.2f}s wall time")
+        for name, stage in data["stages"].items():
+            cpu = stage["cpu_time"]
+            cpu_text = f", {cpu:.2f}s CPU" if cpu is not None else ""
+            log.info(
+                f"  stage {name}: {stage['wall_time']:.2f}s wall{cpu_text} "
+                f"({stage['calls']} call(s))"
+            )
+        for name, value in data["counters"].items():
+            log.info(f"  {name}: {value}")
+        if data["peak_rss_bytes"] is not None:
+            log.info(f"  peak RSS: {data['peak_rss_bytes'] / 2**20:.1f} MB")
+
+    def write(self, path: Union[str, Path], fmt: Optional[str] = None) -> Path:
+        """
+        Write the metrics to a file, replacing it atomically.
+
+        Args:
+            path: Output file
+            fmt: "json" or "prometheus" (default: by extension, .prom for
+                Prometheus text and JSON otherwise)
+
+        Returns:
+            Path of the written file
+
+        Raises:
+            InputError: If the format is unknown
+        """
+        path = Path(path)
+        fmt = fmt or metrics_format_for_path(path)
+        if fmt == "json":
+            text = json.dumps(self.to_dict(), indent=2) + "\n"
+        elif fmt == "prometheus":
+            text = self.to_prometheus()
+        else:
+            raise InputError(
+                f"Unknown metrics format: {fmt}. "
+                f"Choose from: {', '.join(METRICS_FORMATS)}"
+            )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}-", dir=path.parent)
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return path
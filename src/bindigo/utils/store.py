@@ -0,0 +1,168 @@
+"""
+On-disk LRU store of entry directories.
+
+Shared by the prepared receptor cache and the grid map store. Each entry
+is a directory named by its key holding the entry's files plus a
+metadata file whose modification time records the last access and
+drives size-based eviction. Entries are written to a temporary directory
+and renamed into place, so readers never see a partial entry and
+concurrent writers of the same key are harmless.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from bindigo.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+METADATA_FILE = "metadata.json"
+
+
+class DirectoryStore:
+    """
+    Directory-per-entry store with size-based LRU eviction.
+
+    Subclasses set ``entry_description`` for log messages and wrap
+    get_dir/put_dir with their own entry types.
+    """
+
+    # What an entry holds, for log messages (e.g. "prepared receptor")
+    entry_description = "entry"
+
+    def __init__(self, cache_dir: Path, max_size_mb: float):
+        """
+        Initialize the store.
+
+        Args:
+            cache_dir: Store directory
+            max_size_mb: Size limit in MB
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_mb = max_size_mb
+
+    def get_dir(self, key: str) -> Optional[Path]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Entry directory, or None on a miss
+        """
+        entry_dir = self.cache_dir / key
+        metadata = entry_dir / METADATA_FILE
+        if not metadata.exists():
+            return None
+        try:
+            os.utime(metadata)
+        except OSError:
+            # Entry evicted concurrently
+            return None
+        return entry_dir
+
+    def put_dir(
+        self,
+        key: str,
+        write_entry: Callable[[Path], None],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Path:
+        """
+        Store an entry and evict old entries if over the limit.
+
+        ``write_entry`` writes the entry's files into a temporary directory,
+        which is then renamed into place. The temporary directory is
+        removed if anything fails, whatever ``write_entry`` raises.
+
+        Args:
+            key: Entry key
+            write_entry: Callable writing the entry files into a directory
+            metadata: Optional extra information to record with the entry
+
+        Returns:
+            Entry directory
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_dir = self.cache_dir / key
+        tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key[:16]}-", dir=self.cache_dir))
+        try:
+            write_entry(tmp_dir)
+            (tmp_dir / METADATA_FILE).write_text(
+                json.dumps({"created": time.time(), **(metadata or {})}, indent=2)
+            )
+            if entry_dir.exists():
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            # A concurrent writer of the same key got there first
+            if not (entry_dir / METADATA_FILE).exists():
+                raise
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self.evict(keep=key)
+        return entry_dir
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """
+        List store entries.
+
+        Returns:
+            List of (key, last_access_time, size_bytes) tuples
+        """
+        if not self.cache_dir.exists():
+            return []
+        result = []
+        for entry_dir in self.cache_dir.iterdir():
+            metadata = entry_dir / METADATA_FILE
+            if entry_dir.name.startswith(".") or not metadata.exists():
+                continue
+            try:
+                size = sum(f.stat().st_size for f in entry_dir.iterdir())
+                result.append((entry_dir.name, metadata.stat().st_mtime, size))
+            except OSError:
+                continue
+        return result
+
+    def size_bytes(self) -> int:
+        """Return the total size of all entries in bytes."""
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """
+        Remove least recently used entries until under the size limit.
+
+        Args:
+            keep: Key that must not be evicted (e.g. the entry just written)
+
+        Returns:
+            Number of entries removed
+        """
+        entries = sorted(self.entries(), key=lambda entry: entry[1])
+        limit = self.max_size_mb * 1024 * 1024
+        total = sum(size for _, _, size in entries)
+        removed = 0
+        for key, _, size in entries:
+            if total <= limit:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.info(f"Evicted {removed} {self.entry_description}(s) from cache")
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
@@ -8,7 +8,13 @@ import re
 from pathlib import Path
 from typing import Optional, Tuple
 
+from bindigo.core.config import config
 from bindigo.utils.exceptions import InputError, FileFormatError
+from bindigo.utils.io import (
+    OUTPUT_FORMATS,
+    ligand_library_format,
+    output_format_for_path,
+)
 
 
 def is_pdb_id(protein: str) -> bool:
@@ -124,15 +130,39 @@ def validate_ligand_input(ligand: str) -> Tuple[str, str]:
         )
 
 
+def validate_ligand_library(ligands: str) -> Path:
+    """
+    Validate a multi-molecule ligand library for screening.
+
+    Args:
+        ligands: Path to an SDF or SMILES (.smi) library, optionally gzipped
+
+    Returns:
+        Absolute Path to the library file
+
+    Raises:
+        InputError: If the path does not exist or is a directory
+        FileFormatError: If the file format is unsupported
+    """
+    library_path = Path(ligands)
+    if not library_path.exists():
+        raise InputError(f"Ligand library not found: {ligands}")
+    if not library_path.is_file():
+        raise InputError(f"Ligand library path is a directory, not a file: {ligands}")
+
+    ligand_library_format(library_path)
+    return library_path.absolute()
+
+
 def validate_binding_site(
-    center: Optional[Tuple[float, float, float]], size: float
+    center: Optional[Tuple[float, float, float]], size: Optional[float]
 ) -> None:
     """
     Validate binding site parameters.
 
     Args:
-        center: Optional (x, y, z) coordinates
-        size: Box size in Angstroms
+        center: Optional (x, y, z) coordinates (None: detect the pocket)
+        size: Optional box size in Angstroms (None: fit to the pocket)
 
     Raises:
         InputError: If parameters are invalid
@@ -149,6 +179,9 @@ def validate_binding_site(
                     f"Binding site coordinates must be numeric, got {type(coord)}"
                 )
 
+    if size is None:
+        return
+
     if size <= 0:
         raise InputError(f"Binding site box size must be positive, got {size}")
 
@@ -159,18 +192,23 @@ def validate_binding_site(
         )
 
 
-def validate_output_path(output: str) -> Path:
+def validate_output_path(output: str, output_format: Optional[str] = None) -> Path:
     """
     Validate output file path.
 
+    The format is taken from the file extension (.csv, .csv.gz, .parquet,
+    .arrow). A path without an extension gets the extension of
+    ``output_format``, defaulting to Config.OUTPUT_FORMAT.
+
     Args:
         output: Output file path
+        output_format: Expected format ("csv", "parquet" or "arrow")
 
     Returns:
         Validated Path object
 
     Raises:
-        InputError: If path is invalid
+        InputError: If path is invalid or does not match ``output_format``
     """
     output_path = Path(output)
 
@@ -184,15 +222,28 @@ def validate_output_path(output: str) -> Path:
         # Will be overwritten - CLI can handle confirmation
         pass
 
-    # Validate extension
-    if output_path.suffix.lower() not in {".csv", ""}:
+    if output_format is not None and output_format not in OUTPUT_FORMATS:
         raise InputError(
-            f"Output file must be CSV format (got {output_path.suffix}). "
-            "Use .csv extension."
+            f"Unsupported output format: {output_format}. "
+            f"Supported formats: {', '.join(OUTPUT_FORMATS)}"
         )
 
-    # Add .csv extension if missing
+    # Add the format's extension if missing
     if not output_path.suffix:
-        output_path = output_path.with_suffix(".csv")
+        fmt = output_format or config.OUTPUT_FORMAT
+        return output_path.with_suffix(OUTPUT_FORMATS[fmt])
+
+    # Validate extension
+    detected = output_format_for_path(output_path)
+    if detected is None:
+        raise InputError(
+            f"Unsupported output file extension: {output_path.suffix}. "
+            "Use .csv, .csv.gz, .parquet or .arrow extension."
+        )
+    if output_format is not None and detected != output_format:
+        raise InputError(
+            f"Output file extension {output_path.suffix} does not match "
+            f"requested format '{output_format}'"
+        )
 
     return output_path
@@ -5,6 +5,26 @@ Pytest configuration and fixtures for Bindigo tests.
 import pytest
 from pathlib import Path
 
+from bindigo.core.config import Config
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dirs(tmp_path, monkeypatch):
+    """Redirect all on-disk caches into a per-test temporary directory."""
+    cache_root = tmp_path / "cache"
+    monkeypatch.setattr(Config, "PDB_CACHE_DIR", cache_root / "pdb")
+    monkeypatch.setattr(Config, "RECEPTOR_CACHE_DIR", cache_root / "receptors")
+    monkeypatch.setattr(Config, "LIGAND_CACHE_FILE", cache_root / "ligands.sqlite")
+    monkeypatch.setattr(Config, "GRID_MAP_CACHE_DIR", cache_root / "grid_maps")
+    monkeypatch.setattr(Config, "POCKET_CACHE_DIR", cache_root / "pockets")
+    return cache_root
+
+
+@pytest.fixture(autouse=True)
+def numpy_docking_backend(monkeypatch):
+    """Dock with the deterministic NumPy stand-in instead of AutoDock Vina."""
+    monkeypatch.setattr(Config, "DOCKING_BACKEND", "numpy")
+
 
 @pytest.fixture
 def fixtures_dir():
@@ -42,3 +62,80 @@ def temp_output_dir(tmp_path):
     output_dir = tmp_path / "output"
     output_dir.mkdir()
     return output_dir
+
+
+@pytest.fixture
+def smiles_library(tmp_path):
+    """Return a small SMILES library file with one invalid entry."""
+    library = tmp_path / "library.smi"
+    library.write_text(
+        "# small test library\n"
+        "CC(=O)Nc1ccc(O)cc1 acetaminophen\n"
+        "CC(=O)Oc1ccccc1C(=O)O aspirin\n"
+        "\n"
+        "C1CC invalid_ring\n"
+        "Cn1cnc2c1c(=O)n(C)c(=O)n2C caffeine\n"
+        "CCO\n"
+    )
+    return library
+
+
+@pytest.fixture
+def sdf_library(tmp_path):
+    """Return a small multi-molecule SDF library file."""
+    from rdkit import Chem
+
+    library = tmp_path / "library.sdf"
+    writer = Chem.SDWriter(str(library))
+    for name, smiles in [
+        ("ethanol", "CCO"),
+        ("benzene", "c1ccccc1"),
+        ("acetic_acid", "CC(=O)O"),
+    ]:
+        mol = Chem.MolFromSmiles(smiles)
+        mol.SetProp("_Name", name)
+        writer.write(mol)
+    writer.close()
+    return library
+
+
+@pytest.fixture
+def protein_pdb_file(tmp_path):
+    """Return a minimal two-chain PDB file with a water molecule."""
+    pdb = tmp_path / "protein.pdb"
+    pdb.write_text(
+        "ATOM      1  N   GLY A   1      10.000  10.000  10.000  1.00  0.00           N\n"
+        "ATOM      2  CA  GLY A   1      11.450  10.000  10.000  1.00  0.00           C\n"
+        "ATOM      3  C   GLY A   1      12.000  11.420  10.000  1.00  0.00           C\n"
+        "ATOM      4  O   GLY A   1      11.300  12.400  10.000  1.00  0.00           O\n"
+        "ATOM      5  N   ALA B   1      20.000  10.000  10.000  1.00  0.00           N\n"
+        "ATOM      6  CA  ALA B   1      21.450  10.000  10.000  1.00  0.00           C\n"
+        "HETATM    7  O   HOH A 101      15.000  15.000  15.000  1.00  0.00           O\n"
+        "END\n"
+    )
+    return pdb
+
+
+@pytest.fixture
+def trained_model_dir(tmp_path, monkeypatch):
+    """Train a small affinity model and point Config.MODELS_DIR at it."""
+    import joblib
+    import numpy as np
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import StandardScaler
+
+    from bindigo.ml.models import FEATURE_NAMES
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(64, len(FEATURE_NAMES)))
+    target = 6.0 - features[:, 0] + 0.1 * features[:, 1]
+    scaler = StandardScaler().fit(features)
+    model = RandomForestRegressor(n_estimators=5, random_state=0)
+    model.fit(scaler.transform(features), target)
+
+    models_dir = tmp_path / "models"
+    models_dir.mkdir()
+    joblib.dump(model, models_dir / Config.MODEL_FILE)
+    joblib.dump(scaler, models_dir / Config.SCALER_FILE)
+    monkeypatch.setattr(Config, "MODELS_DIR", models_dir)
+    return models_dir
@@ -6,6 +6,7 @@ import pytest
 from click.testing import CliRunner
 
 from bindigo.cli.main import cli
+from bindigo.core.config import Config
 
 
 @pytest.fixture
@@ -29,6 +30,7 @@ class TestMainCLI:
         assert result.exit_code == 0
         assert "Bindigo" in result.output
         assert "predict" in result.output
+        assert "screen" in result.output
         assert "info" in result.output
 
     def test_no_command_shows_help(self, runner):
@@ -74,6 +76,106 @@ class TestPredictCommand:
         # Should fail validation
         assert result.exit_code != 0
 
+    def test_predict_on_server(
+        self, runner, protein_pdb_file, valid_smiles, trained_model_dir, tmp_path
+    ):
+        """Test predict --server against a running server."""
+        from bindigo.core.predictor import BindingPredictor
+        from bindigo.core.server import PredictionServer
+
+        socket_path = tmp_path / "bindigo.sock"
+        output = tmp_path / "results.csv"
+        args = [
+            "predict",
+            "--server",
+            f"unix:{socket_path}",
+            "--protein",
+            str(protein_pdb_file),
+            "--ligand",
+            valid_smiles,
+            "--center",
+            "11",
+            "11",
+            "10",
+            "--output",
+            str(output),
+        ]
+        with BindingPredictor() as predictor:
+            with PredictionServer(predictor, f"unix:{socket_path}").start():
+                result = runner.invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        assert output.exists()
+        assert (tmp_path / "ligand_1_pose.pdb").exists()
+
+    def test_predict_server_unreachable(self, runner, tmp_path):
+        """Test predict --server without a running server."""
+        result = runner.invoke(
+            cli,
+            [
+                "predict",
+                "--server",
+                f"unix:{tmp_path / 'missing.sock'}",
+                "--protein",
+                "1HSG",
+                "--ligand",
+                "CCO",
+                "--output",
+                str(tmp_path / "results.csv"),
+            ],
+        )
+        assert result.exit_code != 0
+        assert "Cannot reach" in result.output
+
+
+class TestScreenCommand:
+    """Test screen command."""
+
+    def test_screen_help(self, runner):
+        """Test screen --help."""
+        result = runner.invoke(cli, ["screen", "--help"])
+        assert result.exit_code == 0
+        assert "--ligands" in result.output
+        assert "--jobs" in result.output
+
+    def test_screen_smiles_library(
+        self, runner, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test screening a SMILES library end to end."""
+        output = tmp_path / "screen.csv"
+        result = runner.invoke(
+            cli,
+            [
+                "screen",
+                "--protein",
+                str(protein_pdb_file),
+                "--ligands",
+                str(smiles_library),
+                "--output",
+                str(output),
+                "--jobs",
+                "1",
+            ],
+        )
+        assert result.exit_code == 0
+        assert "Screened 5 ligands" in result.output
+        assert output.exists()
+
+    def test_screen_missing_library(self, runner, tmp_path):
+        """Test screen with a nonexistent ligand library."""
+        result = runner.invoke(
+            cli,
+            [
+                "screen",
+                "--protein",
+                "1HSG",
+                "--ligands",
+                str(tmp_path / "missing.sdf"),
+                "--output",
+                str(tmp_path / "screen.csv"),
+            ],
+        )
+        assert result.exit_code != 0
+
 
 class TestInfoCommand:
     """Test info command."""
@@ -91,6 +193,13 @@ class TestInfoCommand:
         assert result.exit_code == 0
         assert "Available ML Models" in result.output
 
+    def test_info_models_lists_installed(self, runner, trained_model_dir):
+        """Test info --models with an installed model."""
+        result = runner.invoke(cli, ["info", "--models"])
+        assert result.exit_code == 0
+        assert "• default" in result.output
+        assert "Size:" in result.output
+
     def test_info_cite(self, runner):
         """Test info --cite."""
         result = runner.invoke(cli, ["info", "--cite"])
@@ -105,3 +214,56 @@ class TestInfoCommand:
         assert "Version" in result.output
         assert "Available ML Models" in result.output
         assert "Citation" in result.output
+
+
+class TestCacheCommand:
+    """Test cache command."""
+
+    @pytest.fixture
+    def mirror(self, tmp_path, monkeypatch, protein_pdb_file):
+        """Serve PDB entries from a local mirror directory."""
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        for pdb_id in ("1ABC", "2ABC"):
+            (mirror / f"{pdb_id}.pdb").write_text(protein_pdb_file.read_text())
+        monkeypatch.setattr(Config, "PDB_MIRROR_DIR", mirror)
+        return mirror
+
+    def test_prefetch_and_list(self, runner, mirror, tmp_path):
+        """Test prefetching from arguments and a file, then listing."""
+        id_file = tmp_path / "ids.txt"
+        id_file.write_text("2abc\n")
+        result = runner.invoke(
+            cli, ["cache", "prefetch", "1ABC", "--file", str(id_file)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "2 of 2 entries cached" in result.output
+
+        result = runner.invoke(cli, ["cache", "list"])
+        assert result.exit_code == 0
+        assert "1ABC" in result.output and "2ABC" in result.output
+        assert "2 entries" in result.output
+
+    def test_prefetch_missing_entry(self, runner, mirror):
+        """Test that entries that cannot be fetched give a failing exit code."""
+        result = runner.invoke(cli, ["cache", "prefetch", "1ABC", "9ZZZ"])
+        assert result.exit_code == 1
+        assert "1 of 2 entries cached" in result.output
+
+    def test_verify_and_prune(self, runner, mirror):
+        """Test verifying a corrupted entry and pruning the cache."""
+        runner.invoke(cli, ["cache", "prefetch", "1ABC", "2ABC"])
+        (Config.PDB_CACHE_DIR / "1ABC.pdb").write_text("corrupted")
+
+        result = runner.invoke(cli, ["cache", "verify"])
+        assert result.exit_code == 1
+        assert "1ABC: checksum mismatch" in result.output
+        result = runner.invoke(cli, ["cache", "verify", "--fix"])
+        assert result.exit_code == 0
+        assert not (Config.PDB_CACHE_DIR / "1ABC.pdb").exists()
+
+        result = runner.invoke(cli, ["cache", "prune", "--max-size", "0"])
+        assert result.exit_code == 0
+        assert "Removed 1 entries" in result.output
+        result = runner.invoke(cli, ["cache", "list"])
+        assert "No cached entries" in result.output
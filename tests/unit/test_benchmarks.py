@@ -0,0 +1,59 @@
+"""
+Test the benchmark runner.
+"""
+
+import json
+
+from benchmarks import run
+
+
+def test_discover_covers_every_module():
+    """Test that every benchmark module contributes benchmarks."""
+    names = [name for name, *_ in run.discover()]
+    modules = {name.split(".")[0] for name in names}
+    assert modules >= {
+        "validation",
+        "structure",
+        "ligands",
+        "pockets",
+        "docking",
+        "ml",
+        "output",
+        "pipeline",
+        "cli",
+    }
+    assert "output.TimeResultWriting.time_write_results(csv)" in names
+
+
+def test_quick_run_writes_results(tmp_path):
+    """Test a quick run and the JSON results file."""
+    output = tmp_path / "results.json"
+    status = run.main(["-b", "validation", "--quick", "-o", str(output)])
+    assert status == 0
+    results = json.loads(output.read_text())
+    assert results["environment"]["bindigo_version"]
+    assert not results["errors"]
+    result = results["benchmarks"][
+        "validation.TimeValidation.time_validate_ligand_input"
+    ]
+    assert result["items"] == 256
+    assert result["items_per_second"] > 0
+
+
+def test_compare_flags_regressions(tmp_path):
+    """Test that a slowdown over the baseline fails the run."""
+    output = tmp_path / "results.json"
+    run.main(["-b", "validate_output_path", "--quick", "-o", str(output)])
+    results = json.loads(output.read_text())
+
+    baseline = tmp_path / "baseline.json"
+    for result in results["benchmarks"].values():
+        result["median"] /= 10
+    baseline.write_text(json.dumps(results))
+    argv = ["-b", "validate_output_path", "--quick", "-o", str(output)]
+    assert run.main(argv + ["--compare", str(baseline)]) == 1
+
+    for result in results["benchmarks"].values():
+        result["median"] *= 1000
+    baseline.write_text(json.dumps(results))
+    assert run.main(argv + ["--compare", str(baseline)]) == 0
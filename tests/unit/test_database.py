@@ -0,0 +1,254 @@
+"""
+Test PDB fetching into the local structure cache.
+"""
+
+import functools
+import gzip
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from bindigo.core.config import Config
+from bindigo.database.pdb import PDBFetcher, fetch_pdb, get_fetcher
+from bindigo.database.pdb_cache import PDBCacheIndex
+from bindigo.utils.exceptions import DatabaseError, InputError
+from bindigo.utils.hashing import file_digest
+
+
+class _CountingHandler(SimpleHTTPRequestHandler):
+    """Static file handler that records requested paths."""
+
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.path)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pdb_server(tmp_path, protein_pdb_file):
+    """Serve a directory of PDB files over local HTTP; yield (url, requests)."""
+    root = tmp_path / "server"
+    root.mkdir()
+    (root / "1ABC.pdb").write_text(protein_pdb_file.read_text())
+    (root / "2XYZ.cif").write_text("data_2XYZ\n")
+    requests = []
+    handler = type("Handler", (_CountingHandler,), {"requests": requests})
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(handler, directory=str(root))
+    )
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", requests
+    server.shutdown()
+    server.server_close()
+
+
+class TestHTTPFetch:
+    """Test fetching from an HTTP server."""
+
+    def test_fetch_and_cache(self, pdb_server, tmp_path):
+        """Test that an entry is downloaded once and then read from cache."""
+        url, requests = pdb_server
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", base_url=url)
+        path = fetcher.fetch("1abc")
+        assert path == tmp_path / "cache" / "1ABC.pdb"
+        assert "GLY A" in path.read_text()
+        assert fetcher.fetch("1ABC") == path
+        assert requests == ["/1ABC.pdb"]
+        # No temporary files are left behind
+        files = [
+            p.name for p in path.parent.iterdir() if not p.name.startswith("index")
+        ]
+        assert files == ["1ABC.pdb"]
+
+    def test_falls_back_to_mmcif(self, pdb_server, tmp_path):
+        """Test that entries without PDB format are fetched as mmCIF."""
+        url, requests = pdb_server
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", base_url=url)
+        assert fetcher.fetch("2xyz").name == "2XYZ.cif"
+        assert requests == ["/2XYZ.pdb", "/2XYZ.cif"]
+
+    def test_fetch_many(self, pdb_server, tmp_path):
+        """Test concurrent fetching with per-entry errors."""
+        url, requests = pdb_server
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", base_url=url, max_workers=4)
+        results = fetcher.fetch_many(["1ABC", "9ZZZ", "2XYZ", "bad"])
+        assert results[0].name == "1ABC.pdb"
+        assert isinstance(results[1], DatabaseError)
+        assert results[2].name == "2XYZ.cif"
+        assert isinstance(results[3], InputError)
+
+    def test_force_refetch(self, pdb_server, tmp_path):
+        """Test that force downloads a cached entry again."""
+        url, requests = pdb_server
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", base_url=url)
+        fetcher.fetch("1ABC")
+        fetcher.fetch("1ABC", force=True)
+        assert requests == ["/1ABC.pdb", "/1ABC.pdb"]
+
+    def test_unreachable_server(self, tmp_path):
+        """Test that connection failures raise a DatabaseError."""
+        fetcher = PDBFetcher(
+            cache_dir=tmp_path / "cache",
+            base_url="http://127.0.0.1:9/",
+            timeout=1,
+            retries=0,
+        )
+        with pytest.raises(DatabaseError):
+            fetcher.fetch("1ABC")
+
+
+class TestMirrorFetch:
+    """Test copying entries from a local mirror directory."""
+
+    def test_flat_mirror(self, tmp_path, protein_pdb_file):
+        """Test a directory of plain structure files."""
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        (mirror / "1abc.pdb").write_text(protein_pdb_file.read_text())
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        assert fetcher.fetch("1ABC").read_text() == protein_pdb_file.read_text()
+
+    def test_divided_gzipped_mirror(self, tmp_path, protein_pdb_file):
+        """Test a wwPDB-style divided mirror with gzipped entries."""
+        mirror = tmp_path / "mirror"
+        entry = mirror / "mmCIF" / "ab" / "1abc.cif.gz"
+        entry.parent.mkdir(parents=True)
+        entry.write_bytes(gzip.compress(b"data_1ABC\n"))
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        path = fetcher.fetch("1ABC")
+        assert path.name == "1ABC.cif"
+        assert path.read_text() == "data_1ABC\n"
+
+    def test_missing_entry(self, tmp_path):
+        """Test that entries absent from the mirror raise a DatabaseError."""
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=tmp_path)
+        with pytest.raises(DatabaseError):
+            fetcher.fetch("1ABC")
+
+
+class TestCacheIndex:
+    """Test the index of cached entries."""
+
+    @pytest.fixture
+    def mirror(self, tmp_path, protein_pdb_file):
+        """Flat mirror holding three entries."""
+        mirror = tmp_path / "mirror"
+        mirror.mkdir()
+        for pdb_id in ("1ABC", "2ABC", "3ABC"):
+            (mirror / f"{pdb_id}.pdb").write_text(protein_pdb_file.read_text())
+        return mirror
+
+    def test_fetch_records_entry(self, tmp_path, mirror, protein_pdb_file):
+        """Test that fetched entries are indexed with size and checksum."""
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        path = fetcher.fetch("1ABC")
+        (entry,) = fetcher.index.entries()
+        assert entry["pdb_id"] == "1ABC"
+        assert entry["format"] == "pdb"
+        assert entry["file"] == path
+        assert entry["size"] == path.stat().st_size
+        assert entry["sha256"] == file_digest(path)
+
+    def test_cached_lookup_is_offline(self, pdb_server, tmp_path):
+        """Test that indexed entries are returned without network access."""
+        url, requests = pdb_server
+        PDBFetcher(cache_dir=tmp_path / "cache", base_url=url).fetch("1ABC")
+        offline = PDBFetcher(
+            cache_dir=tmp_path / "cache", base_url="http://127.0.0.1:9/", retries=0
+        )
+        assert offline.fetch("1ABC").name == "1ABC.pdb"
+        assert offline.index.hits == 1
+        assert requests == ["/1ABC.pdb"]
+
+    def test_untracked_file_is_indexed(self, tmp_path, protein_pdb_file):
+        """Test that cache files from before the index are adopted on lookup."""
+        cache_dir = tmp_path / "cache"
+        cache_dir.mkdir()
+        (cache_dir / "1ABC.pdb").write_text(protein_pdb_file.read_text())
+        fetcher = PDBFetcher(cache_dir=cache_dir, mirror_dir=tmp_path / "none")
+        assert fetcher.cached_path("1ABC") == cache_dir / "1ABC.pdb"
+        assert [e["pdb_id"] for e in fetcher.index.entries()] == ["1ABC"]
+
+    def test_deleted_file_is_a_miss(self, tmp_path, mirror):
+        """Test that entries whose file was deleted are dropped."""
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        fetcher.fetch("1ABC").unlink()
+        assert fetcher.cached_path("1ABC") is None
+        assert fetcher.index.entries() == []
+
+    def test_verify(self, tmp_path, mirror, protein_pdb_file):
+        """Test detecting and removing corrupt, missing and untracked files."""
+        cache_dir = tmp_path / "cache"
+        fetcher = PDBFetcher(cache_dir=cache_dir, mirror_dir=mirror)
+        for pdb_id in ("1ABC", "2ABC", "3ABC"):
+            fetcher.fetch(pdb_id)
+        (cache_dir / "2ABC.pdb").write_text("corrupted")
+        (cache_dir / "3ABC.pdb").unlink()
+        (cache_dir / "4ABC.cif").write_text("data_4ABC\n")
+
+        report = fetcher.index.verify()
+        assert report == {
+            "ok": ["1ABC"],
+            "missing": ["3ABC"],
+            "corrupt": ["2ABC"],
+            "indexed": ["4ABC"],
+        }
+        report = fetcher.index.verify(fix=True)
+        assert sorted(report["ok"]) == ["1ABC", "4ABC"]
+        assert not (cache_dir / "2ABC.pdb").exists()
+        assert sorted(e["pdb_id"] for e in fetcher.index.entries()) == ["1ABC", "4ABC"]
+
+    def test_prune_by_age_and_size(self, tmp_path, mirror):
+        """Test removing old entries and least recently used entries."""
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        for pdb_id in ("1ABC", "2ABC", "3ABC"):
+            fetcher.fetch(pdb_id)
+        size = fetcher.index.entries()[0]["size"]
+        now = time.time()
+        with fetcher.index.connection:
+            for pdb_id, days in (("1ABC", 40), ("2ABC", 20), ("3ABC", 1)):
+                fetcher.index.connection.execute(
+                    "UPDATE entries SET last_access = ? WHERE pdb_id = ?",
+                    (now - days * 86400, pdb_id),
+                )
+
+        assert fetcher.index.prune(max_age_days=30) == ["1ABC"]
+        assert fetcher.index.prune(max_size_mb=size / 1024 / 1024) == ["2ABC"]
+        assert [e["pdb_id"] for e in fetcher.index.entries()] == ["3ABC"]
+        assert not (tmp_path / "cache" / "2ABC.pdb").exists()
+
+    def test_fetch_evicts_over_limit(self, tmp_path, mirror):
+        """Test that fetching beyond the size limit evicts older entries."""
+        fetcher = PDBFetcher(
+            cache_dir=tmp_path / "cache", mirror_dir=mirror, max_size_mb=1e-6
+        )
+        fetcher.fetch("1ABC")
+        fetcher.fetch("2ABC")
+        assert [e["pdb_id"] for e in fetcher.index.entries()] == ["2ABC"]
+
+    def test_index_shared_between_instances(self, tmp_path, mirror):
+        """Test that a new index on the same directory sees recorded entries."""
+        fetcher = PDBFetcher(cache_dir=tmp_path / "cache", mirror_dir=mirror)
+        fetcher.fetch("1ABC")
+        index = PDBCacheIndex(tmp_path / "cache")
+        assert index.lookup("1ABC") == tmp_path / "cache" / "1ABC.pdb"
+        assert index.size_bytes() == fetcher.index.size_bytes() > 0
+
+
+def test_default_fetcher_follows_config(tmp_path, monkeypatch, protein_pdb_file):
+    """Test that the shared fetcher is rebuilt when the configuration changes."""
+    first = get_fetcher()
+    assert get_fetcher() is first
+    monkeypatch.setattr(Config, "PDB_MIRROR_DIR", tmp_path)
+    (tmp_path / "1ABC.pdb").write_text(protein_pdb_file.read_text())
+    assert get_fetcher() is not first
+    assert fetch_pdb("1ABC") == Config.PDB_CACHE_DIR / "1ABC.pdb"
@@ -0,0 +1,249 @@
+"""
+Test the docking backend interface and the NumPy stand-in backend.
+"""
+
+import numpy as np
+import pytest
+from rdkit import Chem
+
+from bindigo.docking import numpy_backend
+from bindigo.docking.backend import get_backend
+from bindigo.docking.funnel import funnel_count, funnel_stats, select_top
+from bindigo.docking.grid_maps import GridMapStore, grid_map_key
+from bindigo.docking.pose_extraction import pose_to_pdb, save_best_pose, split_poses
+from bindigo.preprocessing.ligand import prepare_ligand
+from bindigo.preprocessing.protein import prepare_receptor
+from bindigo.utils.exceptions import DependencyError, DockingError, InputError
+
+CENTER = (11.0, 11.0, 10.0)
+
+
+@pytest.fixture
+def receptor_pdbqt(protein_pdb_file):
+    """Return the prepared receptor PDBQT file of the test protein."""
+    return prepare_receptor(str(protein_pdb_file))["pdbqt_file"]
+
+
+@pytest.fixture
+def ligand_pdbqts():
+    """Return PDBQT texts of three small ligands."""
+    return [
+        prepare_ligand(Chem.MolFromSmiles(smiles))["pdbqt"]
+        for smiles in ["CCO", "c1ccccc1", "CC(=O)Oc1ccccc1C(=O)O"]
+    ]
+
+
+@pytest.fixture
+def backend(receptor_pdbqt):
+    """Return a NumPy backend with maps computed for a 10 A box."""
+    backend = get_backend("numpy", exhaustiveness=2, n_poses=3)
+    backend.prepare_receptor(receptor_pdbqt)
+    backend.set_box(CENTER, 10.0)
+    return backend
+
+
+class TestNumpyBackend:
+    """Test the deterministic NumPy backend."""
+
+    def test_dock_many(self, backend, ligand_pdbqts):
+        """Test result structure for a batch of ligands."""
+        results = backend.dock_many(ligand_pdbqts)
+        assert len(results) == 3
+        for result in results:
+            assert result["score"] == result["energies"][0]
+            assert result["energies"] == sorted(result["energies"])
+            assert len(split_poses(result["poses"])) == 3
+
+    def test_deterministic(self, backend, receptor_pdbqt, ligand_pdbqts):
+        """Test that a fresh backend reproduces the same scores and poses."""
+        other = get_backend("numpy", exhaustiveness=2, n_poses=3)
+        other.prepare_receptor(receptor_pdbqt)
+        other.set_box(CENTER, 10.0)
+        assert other.dock_many(ligand_pdbqts) == backend.dock_many(ligand_pdbqts)
+
+    def test_contacts_score_better_than_empty_space(self, backend, ligand_pdbqts):
+        """Test that a box around the receptor beats an empty box."""
+        near = backend.dock_many(ligand_pdbqts[:1])[0]["score"]
+        backend.set_box((60.0, 60.0, 60.0), 10.0)
+        far = backend.dock_many(ligand_pdbqts[:1])[0]["score"]
+        assert near < far == 0.0
+
+    def test_maps_computed_once_per_box(self, backend, monkeypatch):
+        """Test that setting the same box again reuses the maps."""
+        calls = []
+        real = numpy_backend.compute_grid
+        monkeypatch.setattr(
+            numpy_backend,
+            "compute_grid",
+            lambda *a: calls.append(a) or real(*a),
+        )
+        backend.set_box(CENTER, 10.0)
+        assert calls == []
+        backend.set_box(CENTER, 12.0)
+        assert len(calls) == 1
+
+    def test_bad_ligand_recorded_as_error(self, backend, ligand_pdbqts):
+        """Test that a failing ligand does not abort the batch."""
+        results = backend.dock_many(["REMARK empty\n", ligand_pdbqts[0]])
+        assert isinstance(results[0], DockingError)
+        assert results[1]["score"] <= 0.0
+
+
+class TestBackendInterface:
+    """Test backend set-up errors."""
+
+    def test_unknown_backend(self):
+        """Test that unknown backend names are rejected."""
+        with pytest.raises(InputError):
+            get_backend("gnina")
+
+    def test_call_order_enforced(self, receptor_pdbqt, ligand_pdbqts):
+        """Test that docking requires a receptor and a box."""
+        backend = get_backend("numpy")
+        with pytest.raises(DockingError):
+            backend.set_box(CENTER, 10.0)
+        backend.prepare_receptor(receptor_pdbqt)
+        with pytest.raises(DockingError):
+            backend.dock_many(ligand_pdbqts)
+        with pytest.raises(InputError):
+            backend.set_box(CENTER, -1.0)
+
+    def test_missing_receptor_file(self, tmp_path):
+        """Test that a missing receptor file raises DockingError."""
+        with pytest.raises(DockingError):
+            get_backend("numpy").prepare_receptor(tmp_path / "missing.pdbqt")
+
+    def test_vina_backend(self, receptor_pdbqt, ligand_pdbqts):
+        """Test the Vina backend, or its dependency error if not installed."""
+        try:
+            import vina  # noqa: F401
+        except ImportError:
+            with pytest.raises(DependencyError):
+                get_backend("vina")
+            return
+
+        backend = get_backend("vina", exhaustiveness=1, n_poses=1)
+        backend.prepare_receptor(receptor_pdbqt)
+        backend.set_box(CENTER, 10.0)
+        assert len(backend.dock_many(ligand_pdbqts[:1])) == 1
+
+
+def test_save_best_pose(backend, ligand_pdbqts, tmp_path):
+    """Test writing the best pose as PDB."""
+    poses = backend.dock_many(ligand_pdbqts[1:2])[0]["poses"]
+    pose_file = save_best_pose(poses, tmp_path / "pose.pdb")
+    mol = Chem.MolFromPDBFile(str(pose_file))
+    assert mol.GetNumAtoms() == 6
+    assert pose_to_pdb(split_poses(poses)[0]) == pose_file.read_text()
+    with pytest.raises(DockingError):
+        save_best_pose("", tmp_path / "empty.pdb")
+
+
+class TestGridMapStore:
+    """Test persisted affinity maps."""
+
+    def test_second_backend_loads_memmapped_maps(
+        self, backend, receptor_pdbqt, ligand_pdbqts, monkeypatch
+    ):
+        """Test that maps computed once are reused by later backends."""
+        assert not backend.maps_from_store
+        assert len(GridMapStore().entries()) == 1
+
+        monkeypatch.setattr(
+            numpy_backend,
+            "compute_grid",
+            lambda *a: pytest.fail("maps recomputed"),
+        )
+        other = get_backend("numpy", exhaustiveness=2, n_poses=3)
+        other.prepare_receptor(receptor_pdbqt)
+        other.set_box(CENTER, 10.0)
+        assert other.maps_from_store
+        assert isinstance(other.grid, np.memmap)
+        assert other.dock_many(ligand_pdbqts) == backend.dock_many(ligand_pdbqts)
+
+    def test_key_depends_on_box_and_spacing(self):
+        """Test that each receptor/box/spacing combination has its own key."""
+        key = grid_map_key("abc", "numpy", CENTER, 10.0, 0.375)
+        assert key == grid_map_key(
+            "abc", "numpy", (11.0, 11.0, 10.0000001), 10.0, 0.375
+        )
+        others = [
+            grid_map_key("abd", "numpy", CENTER, 10.0, 0.375),
+            grid_map_key("abc", "vina", CENTER, 10.0, 0.375),
+            grid_map_key("abc", "numpy", (11.0, 11.0, 10.5), 10.0, 0.375),
+            grid_map_key("abc", "numpy", CENTER, 12.0, 0.375),
+            grid_map_key("abc", "numpy", CENTER, 10.0, 0.5),
+        ]
+        assert key not in others
+        assert len(set(others)) == len(others)
+
+    def test_unreadable_entry_is_recomputed(self, backend, receptor_pdbqt):
+        """Test that a damaged map file falls back to recomputation."""
+        ((key, _, _),) = GridMapStore().entries()
+        (GridMapStore().cache_dir / key / "grid.npy").write_bytes(b"garbage")
+
+        other = get_backend("numpy")
+        other.prepare_receptor(receptor_pdbqt)
+        other.set_box(CENTER, 10.0)
+        assert not other.maps_from_store
+        assert other.grid.shape == backend.grid.shape
+
+    def test_map_cache_disabled(self, receptor_pdbqt):
+        """Test docking without the map store."""
+        backend = get_backend("numpy", use_map_cache=False)
+        backend.prepare_receptor(receptor_pdbqt)
+        backend.set_box(CENTER, 10.0)
+        assert GridMapStore().entries() == []
+
+    def test_eviction(self, tmp_path):
+        """Test size-based LRU eviction."""
+        store = GridMapStore(tmp_path / "maps", max_size_mb=0.001)
+
+        def write(directory):
+            (directory / "grid.npy").write_bytes(b"x" * 800)
+
+        store.put("old", write)
+        store.put("new", write)
+        assert store.get("old") is None
+        assert store.get("new") is not None
+
+    def test_failed_write_leaves_no_temp_dir(self, tmp_path):
+        """Test that a map writer failing with any error is cleaned up."""
+        store = GridMapStore(tmp_path / "maps")
+
+        def write(directory):
+            (directory / "grid.npy").write_bytes(b"x")
+            raise RuntimeError("map computation failed")
+
+        with pytest.raises(RuntimeError):
+            store.put("key", write)
+        assert list(store.cache_dir.iterdir()) == []
+
+
+class TestFunnel:
+    """Test the two-stage docking funnel."""
+
+    def test_funnel_count(self):
+        """Test survivor counts and fraction validation."""
+        assert funnel_count(100, 0.05) == 5
+        assert funnel_count(10, 0.01) == 1
+        assert funnel_count(0, 0.5) == 0
+        assert funnel_count(3, 1.0) == 3
+        with pytest.raises(InputError):
+            funnel_count(10, 0.0)
+        with pytest.raises(InputError):
+            funnel_count(10, 1.5)
+
+    def test_select_top(self):
+        """Test that the lowest-keyed items are kept, best first."""
+        assert select_top(iter([5, 1, 4, 2, 3]), 2, key=float) == [1, 2]
+        assert select_top([5, 1, 4], 2, key=lambda x: -x) == [5, 4]
+
+    def test_funnel_stats(self):
+        """Test the time-saved estimate and its omission on resumed runs."""
+        stats = funnel_stats(100, 10, coarse_time=20.0, refine_time=10.0)
+        assert stats["estimated_single_stage_time"] == 100.0
+        assert stats["time_saved"] == 70.0
+        resumed = funnel_stats(None, 10, coarse_time=0.1, refine_time=10.0)
+        assert resumed["estimated_single_stage_time"] is None
+        assert resumed["time_saved"] is None
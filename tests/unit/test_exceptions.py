@@ -14,6 +14,8 @@ from bindigo.utils.exceptions import (
     BindingSiteError,
     FileFormatError,
     DependencyError,
+    ServerError,
+    WorkerError,
 )
 
 
@@ -36,6 +38,8 @@ def test_all_exceptions_inherit_from_base():
         BindingSiteError,
         FileFormatError,
         DependencyError,
+        ServerError,
+        WorkerError,
     ]
 
     for exc_class in exception_classes:
@@ -0,0 +1,138 @@
+"""
+Test the asynchronous staged executor.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from bindigo.core.executor import Stage, run_stages
+from bindigo.utils.exceptions import InputError
+
+
+def _square(x):
+    return x * x
+
+
+@pytest.fixture
+def threads():
+    """Three single-thread executors, one per stage."""
+    executors = [ThreadPoolExecutor(max_workers=1) for _ in range(3)]
+    yield executors
+    for executor in executors:
+        executor.shutdown()
+
+
+def test_items_pass_through_stages_in_order(threads):
+    """Test that single-concurrency stages keep the source order."""
+    results = []
+    stages = [
+        Stage("add", lambda x: x + 1, threads[0]),
+        Stage("double", lambda x: 2 * x, threads[1]),
+    ]
+    run_stages(range(10), stages, results.append)
+    assert results == [2 * (x + 1) for x in range(10)]
+    assert [stage.n_items for stage in stages] == [10, 10]
+
+
+def test_stages_overlap(threads):
+    """Test that wall time approaches the slowest stage, not the sum."""
+
+    def slow(x):
+        time.sleep(0.05)
+        return x
+
+    stages = [Stage(name, slow, executor) for name, executor in zip("abc", threads)]
+    start = time.perf_counter()
+    run_stages(range(8), stages, lambda _: None)
+    elapsed = time.perf_counter() - start
+    # Sequential: 8 items x 3 stages x 0.05 s = 1.2 s; pipelined: ~0.5 s
+    assert elapsed < 0.9
+
+
+def test_source_is_consumed_lazily(threads):
+    """Test that bounded queues stop the source running ahead of the sink."""
+    pulled = []
+    max_ahead = []
+    done = []
+
+    def source():
+        for i in range(50):
+            pulled.append(i)
+            yield i
+
+    def slow(x):
+        time.sleep(0.002)
+        return x
+
+    def sink(x):
+        done.append(x)
+        max_ahead.append(len(pulled) - len(done))
+
+    stages = [Stage("slow", slow, threads[0], queue_size=2)]
+    run_stages(source(), stages, sink)
+    assert done == list(range(50))
+    # At most: queue (2) + in the stage (1) + result queue (1) + being pulled (1)
+    assert max(max_ahead) <= 5
+
+
+def test_concurrent_process_stage():
+    """Test a stage running on a process pool with several workers."""
+    results = []
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        stages = [Stage("square", _square, executor, concurrency=2)]
+        run_stages(range(20), stages, results.append)
+    assert sorted(results) == [x * x for x in range(20)]
+
+
+def test_stage_error_propagates(threads):
+    """Test that an exception in a stage aborts the run and is re-raised."""
+
+    def fail_on_three(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    results = []
+    stages = [Stage("check", fail_on_three, threads[0])]
+    with pytest.raises(ValueError, match="bad item"):
+        run_stages(range(100), stages, results.append)
+    assert results == [0, 1, 2]
+
+
+def test_sink_error_propagates(threads):
+    """Test that an exception in the sink aborts the run."""
+
+    def sink(x):
+        raise OSError("disk full")
+
+    with pytest.raises(OSError, match="disk full"):
+        run_stages(range(5), [Stage("noop", lambda x: x, threads[0])], sink)
+
+
+def test_inline_stage_and_empty_source():
+    """Test stages without an executor and a source with no items."""
+    results = []
+    run_stages([1, 2], [Stage("inline", lambda x: -x)], results.append)
+    assert results == [-1, -2]
+    run_stages([], [Stage("inline", lambda x: -x)], results.append)
+    assert results == [-1, -2]
+
+
+def test_called_from_running_event_loop(threads):
+    """Test running a pipeline from async code, as in a notebook."""
+    results = []
+
+    async def main():
+        run_stages(range(3), [Stage("square", _square, threads[0])], results.append)
+
+    asyncio.run(main())
+    assert results == [0, 1, 4]
+
+
+def test_invalid_concurrency():
+    """Test that a stage needs at least one worker."""
+    with pytest.raises(InputError):
+        Stage("none", _square, concurrency=0)
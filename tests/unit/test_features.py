@@ -0,0 +1,97 @@
+"""
+Test model feature extraction and the descriptor cache.
+"""
+
+import numpy as np
+import pytest
+from rdkit import Chem
+
+from bindigo.ml import features as features_module
+from bindigo.ml.features import (
+    FEATURE_NAMES,
+    LIGAND_FEATURE_NAMES,
+    DescriptorCache,
+    FeatureExtractor,
+    compute_descriptors,
+    extract_features,
+)
+
+ASPIRIN = "CC(=O)Oc1ccccc1C(=O)O"
+
+
+def test_compute_descriptors():
+    """Test descriptor values for aspirin."""
+    values = dict(
+        zip(LIGAND_FEATURE_NAMES, compute_descriptors(Chem.MolFromSmiles(ASPIRIN)))
+    )
+    assert values["molecular_weight"] == pytest.approx(180.16, abs=0.01)
+    assert values["hbd"] == 1
+    assert values["hba"] == 3
+    assert values["aromatic_rings"] == 1
+    assert values["tpsa"] == pytest.approx(63.6, abs=0.1)
+
+
+def test_explicit_hydrogens_ignored():
+    """Test that descriptors do not depend on explicit hydrogens."""
+    mol = Chem.MolFromSmiles(ASPIRIN)
+    np.testing.assert_allclose(
+        compute_descriptors(Chem.AddHs(mol)), compute_descriptors(mol)
+    )
+
+
+class TestFeatureExtractor:
+    """Test batched feature matrices."""
+
+    def test_feature_matrix(self):
+        """Test the docking column and descriptor columns."""
+        matrix = extract_features([ASPIRIN, "CCO"], [-7.5, None])
+        assert matrix.shape == (2, len(FEATURE_NAMES))
+        assert matrix[0, 0] == -7.5
+        assert np.isnan(matrix[1, 0])
+        np.testing.assert_allclose(
+            matrix[0, 1:], compute_descriptors(Chem.MolFromSmiles(ASPIRIN))
+        )
+
+    def test_duplicates_computed_once(self):
+        """Test that repeated SMILES in a batch are computed once."""
+        extractor = FeatureExtractor(use_cache=False)
+        matrix = extractor.ligand_descriptors([ASPIRIN, "CCO", ASPIRIN])
+        assert extractor.computed == 2
+        np.testing.assert_array_equal(matrix[0], matrix[2])
+
+    def test_invalid_smiles_gives_nan_row(self):
+        """Test that unparsable SMILES produce a NaN row."""
+        extractor = FeatureExtractor(use_cache=False)
+        matrix = extractor.ligand_descriptors(["C1CC", "CCO"])
+        assert np.isnan(matrix[0]).all()
+        assert np.isfinite(matrix[1]).all()
+
+    def test_length_mismatch_raises_error(self):
+        """Test that SMILES and docking scores must align."""
+        with pytest.raises(ValueError):
+            extract_features([ASPIRIN], [-7.0, -6.0])
+
+    def test_known_ligands_not_recomputed(self, monkeypatch):
+        """Test that a second run reads all descriptors from disk."""
+        library = [ASPIRIN, "CCO", "c1ccccc1"]
+        first = FeatureExtractor()
+        expected = first.ligand_descriptors(library)
+        assert first.computed == 3
+
+        def fail(mol):
+            raise AssertionError("descriptor recomputed")
+
+        monkeypatch.setattr(features_module, "compute_descriptors", fail)
+        second = FeatureExtractor()
+        np.testing.assert_array_equal(second.ligand_descriptors(library), expected)
+        assert second.computed == 0
+        assert second.hits == 3
+
+    def test_stale_version_ignored(self, monkeypatch):
+        """Test that entries from older descriptor versions are ignored."""
+        FeatureExtractor().ligand_descriptors([ASPIRIN])
+        monkeypatch.setattr(features_module, "DESCRIPTOR_VERSION", 2)
+        assert len(DescriptorCache()) == 0
+        extractor = FeatureExtractor()
+        extractor.ligand_descriptors([ASPIRIN])
+        assert extractor.computed == 1
@@ -2,8 +2,42 @@
 Test package imports.
 """
 
+import json
+import subprocess
+import sys
+
 import pytest
 
+# Modules that commands without chemistry must not import
+HEAVY_MODULES = [
+    "numpy",
+    "rdkit",
+    "sklearn",
+    "scipy",
+    "joblib",
+    "pandas",
+    "pyarrow",
+    "requests",
+    "Bio",
+    "vina",
+]
+
+
+def _run_python(code):
+    """Run code in a fresh interpreter and return its JSON output."""
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _heavy_modules_after(code):
+    """Return the heavy modules imported by running code in a fresh interpreter."""
+    return _run_python(
+        f"import json, sys\n{code}\n"
+        f"print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    )
+
 
 def test_import_bindigo():
     """Test that bindigo package can be imported."""
@@ -63,3 +97,59 @@ def test_all_submodules_importable():
     for module_name in submodules:
         module = __import__(module_name, fromlist=[""])
         assert module is not None
+
+
+def test_package_imports_are_lazy():
+    """Test that importing the packages does not load heavy dependencies."""
+    code = (
+        "import bindigo, bindigo.cli.main, bindigo.core, bindigo.database, "
+        "bindigo.docking, bindigo.ml, bindigo.preprocessing\n"
+        "from bindigo.ml.models import list_available_models, FEATURE_NAMES"
+    )
+    assert _heavy_modules_after(code) == []
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["--version"],
+        ["info"],
+        ["predict", "--help"],
+        ["screen", "--help"],
+        ["cache", "--help"],
+        ["serve", "--help"],
+    ],
+)
+def test_cli_commands_without_chemistry_stay_light(args):
+    """Test that commands not needing chemistry do not import it."""
+    code = (
+        "from click.testing import CliRunner\n"
+        "from bindigo.cli.main import cli\n"
+        f"assert CliRunner().invoke(cli, {args!r}).exit_code == 0"
+    )
+    assert _heavy_modules_after(code) == []
+
+
+def test_cli_import_skips_heavy_modules():
+    """
+    Test that importing the CLI loads no heavy dependency.
+
+    Import time itself is tracked by the CLI startup benchmarks.
+    """
+    assert _heavy_modules_after("import bindigo.cli.main") == []
+
+
+def test_lazy_exports():
+    """Test that package attributes resolve to their submodule definitions."""
+    import bindigo
+    import bindigo.ml
+    from bindigo.ml import models
+    from bindigo.core import pipeline
+
+    assert bindigo.ml.AffinityModel is models.AffinityModel
+    assert bindigo.run_screen is pipeline.run_screen
+    assert "AffinityModel" in dir(bindigo.ml)
+    assert "preprocessing" in dir(bindigo)
+    with pytest.raises(AttributeError):
+        bindigo.ml.no_such_name
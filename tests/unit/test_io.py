@@ -0,0 +1,230 @@
+"""
+Test I/O utilities.
+"""
+
+import gzip
+
+import pytest
+
+from bindigo.utils.exceptions import DependencyError, FileFormatError
+from bindigo.utils.io import (
+    ArrowResultWriter,
+    CSVResultWriter,
+    LigandLibrary,
+    iter_csv,
+    ligand_library_format,
+    open_result_writer,
+    output_format_for_path,
+    read_csv,
+    write_csv,
+)
+
+
+class TestLigandLibraryFormat:
+    """Test library format detection."""
+
+    def test_supported_formats(self, tmp_path):
+        """Test plain and gzipped SDF/SMILES extensions."""
+        assert ligand_library_format(tmp_path / "lib.sdf") == ("sdf", False)
+        assert ligand_library_format(tmp_path / "lib.SMI") == ("smi", False)
+        assert ligand_library_format(tmp_path / "lib.sdf.gz") == ("sdf", True)
+        assert ligand_library_format(tmp_path / "lib.v2.smi.gz") == ("smi", True)
+
+    def test_unsupported_format(self, tmp_path):
+        """Test that other extensions are rejected."""
+        with pytest.raises(FileFormatError):
+            ligand_library_format(tmp_path / "lib.mol2")
+        with pytest.raises(FileFormatError):
+            ligand_library_format(tmp_path / "lib.gz")
+
+
+class TestLigandLibrary:
+    """Test streaming ligand library reader."""
+
+    def test_iterates_smiles_records(self, smiles_library):
+        """Test that blank and comment lines are skipped."""
+        records = list(LigandLibrary(smiles_library))
+        assert len(records) == 5
+        assert records[0] == (0, "smi", "CC(=O)Nc1ccc(O)cc1 acetaminophen")
+        assert records[4] == (4, "smi", "CCO")
+
+    def test_iterates_sdf_records(self, sdf_library):
+        """Test that SDF records are split on $$$$."""
+        records = list(LigandLibrary(sdf_library))
+        assert [record[0] for record in records] == [0, 1, 2]
+        assert records[1][2].startswith("benzene")
+        assert all(record[2].rstrip().endswith("$$$$") for record in records)
+
+    def test_gzipped_library(self, sdf_library, tmp_path):
+        """Test reading a gzipped SDF library."""
+        gz_path = tmp_path / "library.sdf.gz"
+        gz_path.write_bytes(gzip.compress(sdf_library.read_bytes()))
+        plain = list(LigandLibrary(sdf_library))
+        assert list(LigandLibrary(gz_path)) == plain
+        assert [r[2] for r in LigandLibrary(gz_path).iter_records(start=2)] == [
+            plain[2][2]
+        ]
+
+    def test_start_stop_uses_index(self, smiles_library):
+        """Test resuming from record N and stopping early."""
+        library = LigandLibrary(smiles_library)
+        records = list(library.iter_records(start=2, stop=4))
+        assert [record[0] for record in records] == [2, 3]
+        assert records[0][2].startswith("C1CC")
+        assert library.index_path.exists()
+        assert list(library.iter_records(start=10)) == []
+
+    def test_get_records_by_index(self, sdf_library):
+        """Test reading selected records through the offset index."""
+        library = LigandLibrary(sdf_library)
+        plain = list(library)
+        assert list(library.get_records([2, 0])) == [plain[0], plain[2]]
+        with pytest.raises(IndexError):
+            list(library.get_records([3]))
+
+    def test_index_is_reused_and_invalidated(self, smiles_library):
+        """Test the sidecar index is reloaded and rebuilt on change."""
+        assert len(LigandLibrary(smiles_library)) == 5
+        reloaded = LigandLibrary(smiles_library)
+        assert reloaded._load_index() is not None
+
+        with open(smiles_library, "a") as f:
+            f.write("CCN ethylamine\n")
+        assert len(LigandLibrary(smiles_library)) == 6
+
+    def test_shards_cover_library(self, smiles_library):
+        """Test that shards partition the library without overlap."""
+        library = LigandLibrary(smiles_library)
+        shards = [library.shard(i, 3) for i in range(3)]
+        indices = [
+            record[0]
+            for start, stop in shards
+            for record in library.iter_records(start, stop)
+        ]
+        assert indices == list(range(5))
+        with pytest.raises(ValueError):
+            library.shard(3, 3)
+
+
+class TestCSVResultWriter:
+    """Test the incremental result writer."""
+
+    def test_buffered_rows_are_written_on_flush(self, tmp_path):
+        """Test that rows are buffered until flushed."""
+        path = tmp_path / "results.csv"
+        writer = CSVResultWriter(path, ["a", "b"], buffer_rows=10)
+        writer.write_row({"a": 1, "b": 2})
+        assert "1,2" not in path.read_text()
+        writer.flush()
+        assert path.read_bytes() == b"a,b\r\n1,2\r\n"
+        writer.close()
+
+    def test_extra_keys_are_ignored(self, tmp_path):
+        """Test that keys outside the header are dropped."""
+        path = tmp_path / "results.csv"
+        with CSVResultWriter(path, ["a"]) as writer:
+            writer.write_rows([{"a": 1, "extra": 2}])
+        assert read_csv(path) == [{"a": "1"}]
+
+    @pytest.mark.parametrize("name", ["results.csv", "results.csv.gz"])
+    def test_resume_from_checkpoint(self, tmp_path, name):
+        """Test truncating to a synced offset and appending."""
+        path = tmp_path / name
+        writer = CSVResultWriter(path, ["a"], buffer_rows=1)
+        writer.write_rows([{"a": 1}, {"a": 2}])
+        writer.flush(sync=True)
+        checkpoint = writer.tell()
+        writer.write_row({"a": "lost"})
+        writer.close()
+
+        with CSVResultWriter(path, ["a"], resume_from=checkpoint) as writer:
+            writer.write_row({"a": 3})
+        assert [row["a"] for row in read_csv(path)] == ["1", "2", "3"]
+
+    def test_gzip_output(self, tmp_path):
+        """Test that .gz paths are compressed."""
+        path = tmp_path / "results.csv.gz"
+        write_csv(path, ({"a": i} for i in range(100)), ["a"])
+        assert gzip.decompress(path.read_bytes()).startswith(b"a\r\n0\r\n")
+        assert len(read_csv(path)) == 100
+
+
+def test_iter_csv_chunks(tmp_path):
+    """Test reading a CSV file in fixed-size chunks."""
+    path = tmp_path / "results.csv"
+    write_csv(path, ({"a": i} for i in range(5)), ["a"])
+    chunks = list(iter_csv(path, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2][0]["a"] == "4"
+
+
+class TestArrowResultWriter:
+    """Test columnar result output."""
+
+    COLUMN_TYPES = {"ligand_id": "string", "score": "float64", "n": "int64"}
+
+    @pytest.fixture(autouse=True)
+    def require_pyarrow(self):
+        pytest.importorskip("pyarrow")
+
+    def _rows(self, count):
+        return (
+            {"ligand_id": f"l{i}", "score": str(-i / 2), "n": i} for i in range(count)
+        )
+
+    def test_parquet_row_groups_and_types(self, tmp_path):
+        """Test typed columns and row-group batching in Parquet output."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = tmp_path / "results.parquet"
+        with open_result_writer(path, self.COLUMN_TYPES, row_group_rows=4) as writer:
+            assert isinstance(writer, ArrowResultWriter)
+            writer.write_rows(self._rows(10))
+            writer.write_row({"ligand_id": "failed", "score": None})
+
+        parquet = pq.ParquetFile(path)
+        assert parquet.metadata.num_rows == 11
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.schema.field("score").type == pa.float64()
+        assert table.column("score")[3].as_py() == -1.5
+        assert table.column("n")[10].as_py() is None
+
+    def test_arrow_ipc_output(self, tmp_path):
+        """Test Arrow IPC file output."""
+        import pyarrow as pa
+
+        path = tmp_path / "results.arrow"
+        with open_result_writer(path, self.COLUMN_TYPES) as writer:
+            writer.write_rows(self._rows(3))
+
+        with pa.memory_map(str(path)) as source:
+            table = pa.ipc.open_file(source).read_all()
+        assert table.column("ligand_id").to_pylist() == ["l0", "l1", "l2"]
+
+    def test_missing_pyarrow_raises_dependency_error(self, tmp_path, monkeypatch):
+        """Test a clear error when pyarrow is unavailable."""
+        import builtins
+
+        real_import = builtins.__import__
+
+        def fake_import(name, *args, **kwargs):
+            if name.startswith("pyarrow"):
+                raise ImportError(name)
+            return real_import(name, *args, **kwargs)
+
+        monkeypatch.setattr(builtins, "__import__", fake_import)
+        with pytest.raises(DependencyError):
+            ArrowResultWriter(tmp_path / "results.parquet", self.COLUMN_TYPES)
+
+
+def test_output_format_for_path(tmp_path):
+    """Test result format detection from file extensions."""
+    assert output_format_for_path(tmp_path / "a.csv") == "csv"
+    assert output_format_for_path(tmp_path / "a.csv.gz") == "csv"
+    assert output_format_for_path(tmp_path / "a.PARQUET") == "parquet"
+    assert output_format_for_path(tmp_path / "a.arrow") == "arrow"
+    assert output_format_for_path(tmp_path / "a.txt") is None
+    with pytest.raises(FileFormatError):
+        open_result_writer(tmp_path / "a.txt", {"a": "string"})
@@ -0,0 +1,278 @@
+"""
+Test the screening checkpoint journal and resumable screens.
+"""
+
+import csv
+
+import pytest
+
+from bindigo.core import journal as journal_module
+from bindigo.core.config import Config
+from bindigo.core.journal import IndexSet, ScreenJournal
+from bindigo.core.pipeline import run_screen
+from bindigo.utils.exceptions import InputError
+from bindigo.utils.io import read_csv
+
+
+def _read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestIndexSet:
+    """Test the completed-index bitmap."""
+
+    def test_add_and_contains(self):
+        """Test membership and counting."""
+        indices = IndexSet()
+        for index in [0, 3, 3, 17]:
+            indices.add(index)
+        assert len(indices) == 3
+        assert 3 in indices
+        assert 4 not in indices
+        assert 1000 not in indices
+
+    def test_first_missing(self):
+        """Test finding the first index that is not done."""
+        indices = IndexSet()
+        for index in range(20):
+            indices.add(index)
+        indices.add(21)
+        assert indices.first_missing() == 20
+        assert indices.first_missing(21) == 22
+        assert IndexSet().first_missing(5) == 5
+
+
+class TestScreenJournal:
+    """Test journal reading and writing."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that recorded batches are loaded back."""
+        params = {"protein": "1HSG", "center": (1.0, 2.0, 3.0)}
+        journal = ScreenJournal(tmp_path / "out.csv.journal")
+        journal.start(params, resume=False)
+        journal.record_batch([0, 1], [{"status": "ok"}, {"status": "failed"}], 100)
+        journal.close()
+
+        loaded = ScreenJournal(journal.path)
+        loaded.load(params)
+        assert len(loaded.completed) == 2
+        assert loaded.n_failed == 1
+        assert loaded.output_size == 100
+        assert len(list(loaded.iter_rows())) == 2
+
+    def test_torn_line_is_ignored(self, tmp_path):
+        """Test that a partially written final entry is discarded."""
+        journal = ScreenJournal(tmp_path / "out.csv.journal")
+        journal.start({}, resume=False)
+        journal.record_batch([0], [{}], 10)
+        journal.close()
+        with open(journal.path, "a") as f:
+            f.write('{"type": "batch", "indices": [1')
+
+        loaded = ScreenJournal(journal.path)
+        loaded.load({})
+        assert len(loaded.completed) == 1
+        loaded.start({}, resume=True)
+        loaded.record_batch([1], [{}], 20)
+        loaded.close()
+        assert journal.path.read_text().count("\n") == 3
+
+    def test_torn_line_longer_than_read_block(self, tmp_path, monkeypatch):
+        """Test truncation when the torn line spans several read blocks."""
+        monkeypatch.setattr(journal_module, "_TAIL_BLOCK_SIZE", 8)
+        journal = ScreenJournal(tmp_path / "out.csv.journal")
+        journal.start({}, resume=False)
+        journal.record_batch([0], [{}], 10)
+        journal.close()
+        complete = journal.path.read_bytes()
+        with open(journal.path, "a") as f:
+            f.write('{"type": "batch", "indices": [1, 2, 3, 4, 5')
+
+        resumed = ScreenJournal(journal.path)
+        resumed.start({}, resume=True)
+        resumed.close()
+        assert journal.path.read_bytes() == complete
+
+    def test_refined_rows_replace_coarse_rows(self, tmp_path):
+        """Test that funnel refine entries override batch rows when read back."""
+        journal = ScreenJournal(tmp_path / "out.csv.journal")
+        journal.start({}, resume=False)
+        rows = [{"ligand_id": "ligand_1", "score": -1}, {"ligand_id": "ligand_2"}]
+        journal.record_batch([0, 1], rows, 100)
+        journal.record_refined([1], [{"ligand_id": "ligand_2", "score": -5}])
+        journal.record_output(120)
+        journal.close()
+
+        loaded = ScreenJournal(journal.path)
+        loaded.load({})
+        assert 1 in loaded.refined and 0 not in loaded.refined
+        assert loaded.output_size == 120
+        assert list(loaded.iter_rows()) == [
+            rows[0],
+            {"ligand_id": "ligand_2", "score": -5},
+        ]
+
+    def test_parameter_mismatch_raises_error(self, tmp_path):
+        """Test that a journal cannot be resumed with other inputs."""
+        journal = ScreenJournal(tmp_path / "out.csv.journal")
+        journal.start({"protein": "1HSG"}, resume=False)
+        journal.close()
+        with pytest.raises(InputError):
+            ScreenJournal(journal.path).load({"protein": "3ERT"})
+
+
+class TestResumableScreen:
+    """Test resuming interrupted screens."""
+
+    @pytest.fixture(autouse=True)
+    def small_chunks(self, monkeypatch):
+        monkeypatch.setattr(Config, "SCREEN_CHUNK_SIZE", 2)
+
+    def _truncate_journal(self, output):
+        """Keep only the header and first batch of the journal."""
+        journal_path = output.with_name(output.name + ".journal")
+        lines = journal_path.read_text().splitlines(keepends=True)
+        journal_path.write_text("".join(lines[:2]))
+
+    def _simulate_crash(self, output):
+        """Keep only the first journaled batch and leave a stray row."""
+        self._truncate_journal(output)
+        with open(output, "a") as f:
+            f.write("ligand_99,unjournaled\n")
+
+    def test_resume_skips_finished_ligands(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test that a resumed screen only processes the remaining work."""
+        reference = tmp_path / "reference.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(reference), jobs=1)
+
+        output = tmp_path / "screen.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        self._simulate_crash(output)
+
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1, resume=True
+        )
+        assert result["n_resumed"] == 2
+        assert result["n_ligands"] == 5
+        assert result["n_failed"] == 1
+        assert result["ligand_cache_hits"] + result["ligand_cache_misses"] == 2
+
+        rows = _read_rows(output)
+        assert [row["ligand_id"] for row in rows] == [
+            row["ligand_id"] for row in _read_rows(reference)
+        ]
+
+    def test_resume_funnel_refinement(self, protein_pdb_file, smiles_library, tmp_path):
+        """Test that a funnel screen interrupted before refining resumes."""
+        reference = tmp_path / "reference.csv"
+        run_screen(
+            str(protein_pdb_file),
+            str(smiles_library),
+            str(reference),
+            jobs=1,
+            funnel=0.5,
+        )
+
+        output = tmp_path / "screen.csv"
+        run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1, funnel=0.5
+        )
+        # Keep the header and the three coarse batches
+        journal_path = output.with_name(output.name + ".journal")
+        lines = journal_path.read_text().splitlines(keepends=True)
+        journal_path.write_text("".join(lines[:4]))
+
+        result = run_screen(
+            str(protein_pdb_file),
+            str(smiles_library),
+            str(output),
+            jobs=1,
+            funnel=0.5,
+            resume=True,
+        )
+        assert result["n_resumed"] == 5
+        assert result["funnel"]["n_refined"] == 2
+        # The coarse stage ran earlier, so no time saving is estimated
+        assert result["funnel"]["time_saved"] is None
+        # Rows match apart from their timestamps
+        rows, expected = _read_rows(output), _read_rows(reference)
+        assert len(rows) == len(expected)
+        for row, reference_row in zip(rows, expected):
+            assert {**row, "timestamp": None} == {**reference_row, "timestamp": None}
+
+    def test_resume_gzipped_output(self, protein_pdb_file, smiles_library, tmp_path):
+        """Test resuming a screen that writes gzipped CSV."""
+        output = tmp_path / "screen.csv.gz"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        self._truncate_journal(output)
+
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1, resume=True
+        )
+        assert result["n_resumed"] == 2
+        assert [row["ligand_id"] for row in read_csv(output)] == [
+            f"ligand_{i}" for i in range(1, 6)
+        ]
+
+    def test_resume_parquet_output(self, protein_pdb_file, smiles_library, tmp_path):
+        """Test that columnar output is rebuilt from the journal on resume."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        output = tmp_path / "screen.parquet"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        self._truncate_journal(output)
+
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1, resume=True
+        )
+        assert result["n_resumed"] == 2
+        table = pq.read_table(output)
+        assert table.column("ligand_id").to_pylist() == [
+            f"ligand_{i}" for i in range(1, 6)
+        ]
+
+    def test_resume_rebuilds_missing_output(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test that a lost output file is rebuilt from the journal."""
+        output = tmp_path / "screen.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        self._simulate_crash(output)
+        output.unlink()
+
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=2, resume=True
+        )
+        assert result["n_ligands"] == 5
+        assert sorted(row["ligand_id"] for row in _read_rows(output)) == [
+            f"ligand_{i}" for i in range(1, 6)
+        ]
+
+    def test_resume_completed_screen_is_noop(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test that resuming a finished screen does no work."""
+        output = tmp_path / "screen.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        before = output.read_text()
+
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1, resume=True
+        )
+        assert result["n_resumed"] == 5
+        assert result["ligand_cache_misses"] == 0
+        assert output.read_text() == before
+
+    def test_without_resume_starts_over(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test that a new run ignores an existing journal."""
+        output = tmp_path / "screen.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1
+        )
+        assert result["n_resumed"] == 0
+        assert len(_read_rows(output)) == 5
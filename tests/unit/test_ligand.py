@@ -0,0 +1,125 @@
+"""
+Test ligand preparation and the ligand preparation cache.
+"""
+
+import logging
+
+import pytest
+from rdkit import Chem
+
+from bindigo.docking.pdbqt_converter import ligand_to_pdbqt, rotatable_bonds
+from bindigo.preprocessing.ligand import (
+    LigandCache,
+    load_ligand,
+    prepare_ligand,
+    prepare_ligands,
+)
+from bindigo.utils.exceptions import LigandError
+
+
+class TestPrepareLigand:
+    """Test SMILES -> 3D -> PDBQT preparation."""
+
+    def test_prepare_from_smiles(self, valid_smiles):
+        """Test preparation of a drug-like molecule."""
+        prepared = prepare_ligand(Chem.MolFromSmiles(valid_smiles))
+        assert prepared["smiles"] == Chem.CanonSmiles(valid_smiles)
+        assert prepared["pdbqt"].startswith("ROOT")
+        assert "TORSDOF 1" in prepared["pdbqt"]
+        mol = Chem.MolFromMolBlock(prepared["molblock"], removeHs=False)
+        assert mol.GetConformer().Is3D()
+
+    def test_preparation_is_deterministic(self):
+        """Test that the seeded embedding gives identical coordinates."""
+        mol = Chem.MolFromSmiles("CC(=O)Oc1ccccc1C(=O)O")
+        assert prepare_ligand(mol)["pdbqt"] == prepare_ligand(mol)["pdbqt"]
+
+    def test_unsupported_charge_method(self):
+        """Test that unknown charge methods are rejected."""
+        with pytest.raises(LigandError):
+            prepare_ligand(Chem.MolFromSmiles("CCO"), charge_method="am1bcc")
+
+    def test_no_3d_without_generation_raises_error(self):
+        """Test that 2D input is rejected when 3D generation is disabled."""
+        with pytest.raises(LigandError):
+            prepare_ligand(Chem.MolFromSmiles("CCO"), generate_3d=False)
+
+    def test_load_ligand_from_sdf(self, sdf_library):
+        """Test loading the first molecule of an SDF file."""
+        mol = load_ligand("file", str(sdf_library))
+        assert mol.GetProp("_Name") == "ethanol"
+
+    def test_load_invalid_smiles(self, invalid_smiles):
+        """Test that invalid SMILES raise LigandError."""
+        with pytest.raises(LigandError):
+            load_ligand("smiles", invalid_smiles)
+
+
+class TestPDBQTTorsionTree:
+    """Test ligand PDBQT torsion trees."""
+
+    def test_rotatable_bonds_exclude_amides_and_methyls(self):
+        """Test rotatable bond detection."""
+        mol = Chem.AddHs(Chem.MolFromSmiles("CC(=O)Nc1ccc(O)cc1"))
+        assert len(rotatable_bonds(mol)) == 1
+
+    def test_branches_are_balanced(self):
+        """Test BRANCH/ENDBRANCH pairing for a flexible chain."""
+        mol = Chem.AddHs(Chem.MolFromSmiles("CCCCCC"))
+        mol.AddConformer(Chem.Conformer(mol.GetNumAtoms()))
+        pdbqt = ligand_to_pdbqt(mol)
+        branches = [line for line in pdbqt.splitlines() if line.startswith("BRANCH")]
+        ends = [line for line in pdbqt.splitlines() if line.startswith("ENDBRANCH")]
+        assert len(branches) == len(ends) == 3
+        assert "TORSDOF 3" in pdbqt
+
+
+class TestLigandCache:
+    """Test the SQLite ligand cache."""
+
+    def test_second_run_hits_cache(self, tmp_path, monkeypatch):
+        """Test that re-preparing known ligands skips embedding."""
+        cache = LigandCache(tmp_path / "ligands.sqlite")
+        mols = [Chem.MolFromSmiles(smi) for smi in ["CCO", "OCC", "c1ccccc1"]]
+
+        first = prepare_ligands(mols, cache=cache)
+        assert cache.hits == 0
+        assert cache.misses == 2
+        assert len(cache) == 2
+        assert first[0]["pdbqt"] == first[1]["pdbqt"]
+
+        def fail(*args, **kwargs):
+            raise AssertionError("ligand was prepared again")
+
+        monkeypatch.setattr("bindigo.preprocessing.ligand.prepare_ligand", fail)
+        second = prepare_ligands(mols, cache=LigandCache(cache.cache_file))
+        assert [item["pdbqt"] for item in second] == [item["pdbqt"] for item in first]
+
+    def test_settings_change_misses(self, tmp_path):
+        """Test that different preparation settings do not share entries."""
+        cache = LigandCache(tmp_path / "ligands.sqlite")
+        mols = [Chem.MolFromSmiles("CCO")]
+        prepare_ligands(mols, cache=cache)
+        prepare_ligands(mols, cache=cache, add_hydrogens=False)
+        assert cache.misses == 2
+        assert len(cache) == 2
+
+    def test_failures_are_returned_not_cached(self, tmp_path):
+        """Test that per-molecule failures are returned in place."""
+        cache = LigandCache(tmp_path / "ligands.sqlite")
+        mols = [Chem.MolFromSmiles("CCO"), Chem.MolFromSmiles("CCO")]
+        results = prepare_ligands(mols, cache=cache, charge_method="gasteiger")
+        assert all(isinstance(item, dict) for item in results)
+        assert len(cache) == 1
+
+    def test_log_stats(self, tmp_path, caplog, monkeypatch):
+        """Test that hit/miss counts are reported through the logger."""
+        cache = LigandCache(tmp_path / "ligands.sqlite")
+        prepare_ligands([Chem.MolFromSmiles("CCO")], cache=cache)
+        prepare_ligands([Chem.MolFromSmiles("CCO")], cache=cache)
+
+        logger = logging.getLogger("bindigo.preprocessing.ligand")
+        monkeypatch.setattr(logger, "propagate", True)
+        with caplog.at_level(logging.INFO, logger=logger.name):
+            cache.log_stats()
+        assert "1 hits, 1 misses" in caplog.text
@@ -0,0 +1,101 @@
+"""
+Test run metrics collection and export.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from bindigo.utils.exceptions import InputError
+from bindigo.utils.metrics import PipelineMetrics, peak_rss_bytes, timed
+
+
+def test_stage_timers_accumulate():
+    """Test that repeated stages add up wall time and calls."""
+    metrics = PipelineMetrics("predict")
+    for _ in range(2):
+        with metrics.stage("docking"):
+            time.sleep(0.01)
+    stage = metrics.to_dict()["stages"]["docking"]
+    assert stage["calls"] == 2
+    assert stage["wall_time"] >= 0.02
+    # Sleeping uses (almost) no CPU
+    assert stage["cpu_time"] < stage["wall_time"]
+
+
+def test_cpu_time_is_per_thread():
+    """Test that a stage is not charged for CPU used by other threads."""
+    metrics = PipelineMetrics("predict")
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            sum(range(1000))
+
+    thread = threading.Thread(target=spin)
+    thread.start()
+    try:
+        with metrics.stage("idle"):
+            time.sleep(0.05)
+    finally:
+        stop.set()
+        thread.join()
+    assert metrics.stages["idle"]["cpu_time"] < 0.02
+
+
+def test_counters_and_external_stage_times():
+    """Test counters and stage times measured elsewhere."""
+    metrics = PipelineMetrics("screen")
+    metrics.count("ligand_cache_hits", 3)
+    metrics.count("ligand_cache_hits")
+    metrics.add_stage_time("screen_chunk", 1.5, calls=4)
+    metrics.finish()
+    data = metrics.to_dict()
+    assert data["counters"] == {"ligand_cache_hits": 4}
+    assert data["stages"]["screen_chunk"] == {
+        "wall_time": 1.5,
+        "cpu_time": None,
+        "calls": 4,
+    }
+    assert data["wall_time"] == metrics.wall_time
+
+
+def test_write_json_and_prometheus(tmp_path):
+    """Test both export formats."""
+    metrics = PipelineMetrics("predict")
+    with metrics.stage("docking"):
+        pass
+    metrics.count("pdb_cache_hits")
+    metrics.add_stage_time("screen_chunk", 2.0)
+
+    data = json.loads(metrics.write(tmp_path / "run.json").read_text())
+    assert data["pipeline"] == "predict"
+    assert data["stages"]["docking"]["calls"] == 1
+
+    text = metrics.write(tmp_path / "run.prom").read_text()
+    assert "# TYPE bindigo_pdb_cache_hits_total counter" in text
+    assert 'bindigo_pdb_cache_hits_total{pipeline="predict"} 1' in text
+    assert 'bindigo_stage_calls{pipeline="predict",stage="docking"} 1' in text
+    # Stages without CPU time only report wall time
+    assert 'stage_cpu_seconds{pipeline="predict",stage="screen_chunk"}' not in text
+    assert 'stage_wall_seconds{pipeline="predict",stage="screen_chunk"} 2.0' in text
+    assert [p.name for p in tmp_path.iterdir() if p.name.startswith(".")] == []
+
+
+def test_unknown_format(tmp_path):
+    """Test that unknown export formats are rejected."""
+    with pytest.raises(InputError):
+        PipelineMetrics("predict").write(tmp_path / "run.txt", fmt="xml")
+
+
+def test_timed_without_metrics():
+    """Test that timing is optional."""
+    with timed(None, "docking"):
+        pass
+
+
+def test_peak_rss():
+    """Test that the peak RSS of this process is measured."""
+    assert peak_rss_bytes() > 1024 * 1024
@@ -0,0 +1,162 @@
+"""
+Test batched affinity model inference.
+"""
+
+import numpy as np
+import pytest
+
+from bindigo.core.config import Config
+from bindigo.ml.models import (
+    FEATURE_NAMES,
+    AffinityModel,
+    clear_model_registry,
+    get_model,
+    list_available_models,
+    pkd_to_kd_nm,
+    predict_batch,
+    save_model,
+)
+from bindigo.utils.exceptions import PredictionError
+
+
+class CountingEstimator:
+    """Linear stand-in estimator that records its batch sizes."""
+
+    n_features_in_ = len(FEATURE_NAMES)
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict(self, features):
+        self.batch_sizes.append(len(features))
+        return features.sum(axis=1)
+
+
+@pytest.fixture
+def features():
+    """Return a random feature matrix."""
+    return np.random.default_rng(1).normal(size=(10, len(FEATURE_NAMES)))
+
+
+class TestAffinityModel:
+    """Test AffinityModel.predict_batch."""
+
+    def test_batches_rows(self, features):
+        """Test that rows are predicted in batch_size chunks."""
+        estimator = CountingEstimator()
+        model = AffinityModel(estimator)
+        predictions = model.predict_batch(features, batch_size=4)
+        assert estimator.batch_sizes == [4, 4, 2]
+        np.testing.assert_allclose(predictions, features.sum(axis=1))
+
+    def test_default_batch_size(self, features, monkeypatch):
+        """Test that Config.ML_BATCH_SIZE is the default batch size."""
+        monkeypatch.setattr(Config, "ML_BATCH_SIZE", 3)
+        estimator = CountingEstimator()
+        AffinityModel(estimator).predict_batch(features)
+        assert estimator.batch_sizes == [3, 3, 3, 1]
+
+    def test_nan_rows_are_skipped(self, features):
+        """Test that rows with missing features predict NaN."""
+        features[2, 0] = np.nan
+        estimator = CountingEstimator()
+        predictions = AffinityModel(estimator).predict_batch(features)
+        assert estimator.batch_sizes == [9]
+        assert np.isnan(predictions[2])
+        assert np.isfinite(np.delete(predictions, 2)).all()
+
+    def test_single_row(self, features):
+        """Test that a 1-D feature vector is treated as one row."""
+        predictions = AffinityModel(CountingEstimator()).predict_batch(features[0])
+        assert predictions.shape == (1,)
+
+    def test_wrong_shape_raises_error(self):
+        """Test that feature matrices of the wrong width are rejected."""
+        model = AffinityModel(CountingEstimator())
+        with pytest.raises(PredictionError):
+            model.predict_batch(np.zeros((2, 3)))
+        with pytest.raises(PredictionError):
+            model.predict_batch(np.zeros((2, len(FEATURE_NAMES))), batch_size=0)
+
+
+class TestLoading:
+    """Test loading the pre-trained model from Config.MODELS_DIR."""
+
+    def test_load_and_predict(self, trained_model_dir, features):
+        """Test that batched and per-row predictions agree."""
+        model = AffinityModel.load()
+        batched = model.predict_batch(features)
+        single = np.concatenate([model.predict_batch(row) for row in features])
+        np.testing.assert_allclose(batched, single)
+        np.testing.assert_allclose(predict_batch(features, model=model), batched)
+
+    def test_missing_model_raises_error(self, tmp_path, monkeypatch):
+        """Test that a missing model file raises PredictionError."""
+        monkeypatch.setattr(Config, "MODELS_DIR", tmp_path)
+        with pytest.raises(PredictionError, match="not found"):
+            predict_batch(np.zeros((1, len(FEATURE_NAMES))))
+
+
+class TestModelRegistry:
+    """Test the per-process model registry."""
+
+    def test_model_loaded_once(self, trained_model_dir, monkeypatch):
+        """Test that repeated lookups reuse the loaded model."""
+        import joblib
+
+        calls = []
+        real_load = joblib.load
+        monkeypatch.setattr(
+            joblib, "load", lambda *a, **k: calls.append(a) or real_load(*a, **k)
+        )
+        model = get_model()
+        assert get_model() is model
+        assert get_model(Config.DEFAULT_MODEL_NAME, trained_model_dir) is model
+        assert len(calls) == 2  # model and scaler
+
+        clear_model_registry()
+        assert get_model() is not model
+
+    def test_arrays_are_memory_mapped(self, trained_model_dir):
+        """Test that model arrays are mapped from disk."""
+        model = get_model()
+        tree = model.estimator.estimators_[0].tree_
+        assert isinstance(model.scaler.mean_, np.memmap)
+        assert tree.node_count > 0
+
+    def test_mmap_can_be_disabled(self, trained_model_dir, monkeypatch):
+        """Test that MODEL_MMAP_MODE=None loads arrays into memory."""
+        monkeypatch.setattr(Config, "MODEL_MMAP_MODE", None)
+        model = AffinityModel.load()
+        assert not isinstance(model.scaler.mean_, np.memmap)
+
+    def test_named_models_and_metadata(self, trained_model_dir):
+        """Test saving a second model and listing installed models."""
+        default = get_model()
+        save_model(
+            default.estimator,
+            default.scaler,
+            name="gbm",
+            metadata={"training_set": "PDBbind v2020"},
+        )
+
+        models = {model["name"]: model for model in list_available_models()}
+        assert set(models) == {"default", "gbm"}
+        assert models["default"]["loaded"]
+        assert not models["gbm"]["loaded"]
+        assert models["gbm"]["algorithm"] == "RandomForestRegressor"
+        assert models["gbm"]["training_set"] == "PDBbind v2020"
+        assert models["gbm"]["n_features"] == len(FEATURE_NAMES)
+
+        gbm = get_model("gbm")
+        assert gbm is not default
+        assert gbm.metadata["training_set"] == "PDBbind v2020"
+
+    def test_no_models_installed(self, tmp_path):
+        """Test listing an empty models directory."""
+        assert list_available_models(tmp_path) == []
+
+
+def test_pkd_to_kd_nm():
+    """Test pKd to nanomolar conversion."""
+    np.testing.assert_allclose(pkd_to_kd_nm(np.array([9.0, 6.0])), [1.0, 1000.0])
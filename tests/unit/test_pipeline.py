@@ -0,0 +1,386 @@
+"""
+Test the batch screening pipeline.
+"""
+
+import csv
+import json
+import logging
+
+import pytest
+
+from bindigo.core.pipeline import RESULT_COLUMNS, run_prediction, run_screen, _chunked
+from bindigo.core.config import Config
+from bindigo.utils.exceptions import DatabaseError, FileFormatError, InputError
+
+
+def _read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+class TestRunScreen:
+    """Test run_screen batch engine."""
+
+    def test_screen_smiles_library_single_job(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test screening a SMILES library in-process."""
+        output = tmp_path / "screen.csv"
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=1
+        )
+
+        assert result["n_ligands"] == 5
+        assert result["n_failed"] == 1
+        rows = _read_rows(output)
+        assert list(rows[0].keys()) == RESULT_COLUMNS
+        assert [row["ligand_id"] for row in rows] == [
+            f"ligand_{i}" for i in range(1, 6)
+        ]
+        assert rows[0]["ligand_name"] == "acetaminophen"
+        assert rows[4]["ligand_name"] == "ligand_5"
+
+    def test_invalid_record_is_recorded_not_raised(
+        self, protein_pdb_file, smiles_library, tmp_path
+    ):
+        """Test that unparsable molecules become failed rows."""
+        output = tmp_path / "screen.csv"
+        run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+
+        failed = [row for row in _read_rows(output) if row["status"] == "failed"]
+        assert len(failed) == 1
+        assert failed[0]["ligand_name"] == ""
+        assert failed[0]["error"]
+
+    def test_screen_sdf_library_process_pool(
+        self, protein_pdb_file, sdf_library, tmp_path
+    ):
+        """Test screening an SDF library with multiple workers."""
+        output = tmp_path / "screen.csv"
+        result = run_screen(
+            str(protein_pdb_file),
+            str(sdf_library),
+            str(output),
+            center=(1.0, 2.0, 3.0),
+            jobs=2,
+        )
+
+        assert result["jobs"] == 2
+        assert result["n_failed"] == 0
+        rows = sorted(_read_rows(output), key=lambda row: row["ligand_id"])
+        assert [row["ligand_name"] for row in rows] == [
+            "ethanol",
+            "benzene",
+            "acetic_acid",
+        ]
+        assert rows[0]["binding_site_center"] == "(1.0, 2.0, 3.0)"
+
+    def test_timed_out_ligands_recorded_as_failures(
+        self, protein_pdb_file, smiles_library, tmp_path, monkeypatch
+    ):
+        """Test that a hanging ligand is killed, retried and recorded."""
+        import time
+
+        from bindigo.core import pipeline
+
+        dock_chunk = pipeline._dock_chunk
+
+        def hanging_dock_chunk(state):
+            if any(row["smiles"] == "CCO" for row in state[0]):
+                time.sleep(60)
+            return dock_chunk(state)
+
+        monkeypatch.setattr(pipeline, "_dock_chunk", hanging_dock_chunk)
+        # Only forked workers see the patched function
+        monkeypatch.setattr(Config, "WORKER_START_METHOD", "fork")
+        monkeypatch.setattr(Config, "TIMEOUT_SECONDS", 1)
+        monkeypatch.setattr(Config, "SCREEN_CHUNK_SIZE", 2)
+        output = tmp_path / "screen.csv"
+        result = run_screen(
+            str(protein_pdb_file), str(smiles_library), str(output), jobs=2
+        )
+
+        assert result["n_ligands"] == 5
+        assert result["ligand_timeouts"] == 1
+        assert result["metrics"]["counters"]["ligand_timeouts"] == 1
+        rows = {row["ligand_id"]: row for row in _read_rows(output)}
+        assert rows["ligand_5"]["status"] == "failed"
+        assert "timed out" in rows["ligand_5"]["error"]
+        assert "2 attempts" in rows["ligand_5"]["error"]
+        assert rows["ligand_4"]["status"] != "failed"
+
+    def test_unsupported_library_format(self, tmp_path):
+        """Test that unsupported library formats are rejected."""
+        library = tmp_path / "library.txt"
+        library.write_text("CCO\n")
+        with pytest.raises(FileFormatError):
+            run_screen("1HSG", str(library), str(tmp_path / "out.csv"))
+
+    def test_invalid_jobs(self, smiles_library, tmp_path):
+        """Test that a non-positive job count is rejected."""
+        with pytest.raises(InputError):
+            run_screen("1HSG", str(smiles_library), str(tmp_path / "out.csv"), jobs=0)
+
+
+def test_chunked():
+    """Test grouping of records into fixed-size chunks."""
+    assert list(_chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    assert list(_chunked([], 3)) == []
+
+
+def test_rescreen_hits_ligand_cache(protein_pdb_file, smiles_library, tmp_path):
+    """Test that re-screening a library reuses prepared ligands."""
+    first = run_screen(
+        str(protein_pdb_file), str(smiles_library), str(tmp_path / "a.csv"), jobs=1
+    )
+    second = run_screen(
+        str(protein_pdb_file), str(smiles_library), str(tmp_path / "b.csv"), jobs=2
+    )
+
+    assert first["ligand_cache_misses"] == 4
+    assert second["ligand_cache_hits"] == 4
+    assert second["ligand_cache_misses"] == 0
+
+
+def test_screen_logs_ligand_cache_stats(
+    protein_pdb_file, smiles_library, tmp_path, caplog, monkeypatch
+):
+    """Test that a screen reports ligand cache hits and misses when it ends."""
+    logger = logging.getLogger("bindigo.preprocessing.ligand")
+    monkeypatch.setattr(logger, "propagate", True)
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        run_screen(
+            str(protein_pdb_file), str(smiles_library), str(tmp_path / "a.csv"), jobs=1
+        )
+    assert "Ligand cache: 0 hits, 4 misses" in caplog.text
+
+
+def test_screen_record_range(protein_pdb_file, smiles_library, tmp_path):
+    """Test screening a slice of the library."""
+    output = tmp_path / "shard.csv"
+    result = run_screen(
+        str(protein_pdb_file), str(smiles_library), str(output), jobs=1, start=1, stop=3
+    )
+    assert result["n_ligands"] == 2
+    assert [row["ligand_id"] for row in _read_rows(output)] == [
+        "ligand_2",
+        "ligand_3",
+    ]
+
+
+def test_screen_predicts_affinities(
+    protein_pdb_file, smiles_library, trained_model_dir, tmp_path
+):
+    """Test that docked ligands get a docking score and predicted affinity."""
+    output = tmp_path / "screen.csv"
+    run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+
+    rows = [row for row in _read_rows(output) if row["status"] != "failed"]
+    assert len(rows) == 4
+    for row in rows:
+        assert row["status"] == "success"
+        assert float(row["docking_score_kcal_mol"]) <= 0.0
+        pkd = float(row["predicted_pKd"])
+        assert float(row["predicted_kd_nM"]) == pytest.approx(10 ** (9 - pkd), rel=1e-2)
+
+
+def test_screen_without_model_marks_docked(
+    protein_pdb_file, smiles_library, tmp_path, monkeypatch
+):
+    """Test that screens without an installed model still dock."""
+    monkeypatch.setattr("bindigo.core.config.Config.MODELS_DIR", tmp_path)
+    output = tmp_path / "screen.csv"
+    run_screen(str(protein_pdb_file), str(smiles_library), str(output), jobs=1)
+
+    statuses = [row["status"] for row in _read_rows(output)]
+    assert statuses.count("docked") == 4
+    assert all(row["predicted_pKd"] == "" for row in _read_rows(output))
+
+
+def test_screen_funnel(protein_pdb_file, smiles_library, tmp_path):
+    """Test that the funnel re-docks the top fraction at full exhaustiveness."""
+    full = tmp_path / "full.csv"
+    funneled = tmp_path / "funnel.csv"
+    run_screen(str(protein_pdb_file), str(smiles_library), str(full), jobs=1)
+    result = run_screen(
+        str(protein_pdb_file),
+        str(smiles_library),
+        str(funneled),
+        jobs=1,
+        funnel=0.5,
+    )
+
+    assert result["funnel"]["n_refined"] == 2
+    assert "time_saved" in result["funnel"]
+    full_rows = {row["ligand_id"]: row for row in _read_rows(full)}
+    rows = _read_rows(funneled)
+    assert [row["ligand_id"] for row in rows] == list(full_rows)
+    # Re-docked rows carry the full-exhaustiveness result
+    docked = [row for row in rows if row["status"] != "failed"]
+    best = sorted(docked, key=lambda row: float(row["docking_score_kcal_mol"]))[:2]
+    for row in best:
+        expected = full_rows[row["ligand_id"]]
+        assert {**row, "timestamp": None} == {**expected, "timestamp": None}
+
+
+def test_screen_funnel_keeps_input_coordinates(protein_pdb_file, tmp_path, monkeypatch):
+    """Test that survivors are re-read from the library with their 3D poses."""
+    from rdkit import Chem
+    from rdkit.Chem import AllChem
+
+    library = tmp_path / "library3d.sdf"
+    writer = Chem.SDWriter(str(library))
+    for name, smiles in [("ethanol", "CCO"), ("phenol", "c1ccccc1O")]:
+        mol = Chem.AddHs(Chem.MolFromSmiles(smiles))
+        AllChem.EmbedMolecule(mol, randomSeed=42)
+        mol.SetProp("_Name", name)
+        writer.write(mol)
+    writer.close()
+    monkeypatch.setattr(Config, "LIGAND_GENERATE_3D", False)
+
+    output = tmp_path / "out.csv"
+    result = run_screen(
+        str(protein_pdb_file), str(library), str(output), jobs=1, funnel=0.5
+    )
+
+    assert result["funnel"]["n_refined"] == 1
+    rows = _read_rows(output)
+    assert [row["ligand_name"] for row in rows] == ["ethanol", "phenol"]
+    assert all(row["status"] != "failed" for row in rows)
+
+
+def test_screen_funnel_invalid(protein_pdb_file, smiles_library, tmp_path):
+    """Test validation of funnel options."""
+    output = str(tmp_path / "out.csv")
+    with pytest.raises(InputError):
+        run_screen(str(protein_pdb_file), str(smiles_library), output, funnel=0.0)
+    with pytest.raises(InputError):
+        run_screen(
+            str(protein_pdb_file),
+            str(smiles_library),
+            output,
+            funnel=0.5,
+            funnel_by="x",
+        )
+
+
+def test_screen_pdb_id_from_mirror(
+    protein_pdb_file, smiles_library, tmp_path, monkeypatch
+):
+    """Test that PDB IDs are fetched into the PDB cache and screened."""
+    mirror = tmp_path / "mirror"
+    mirror.mkdir()
+    (mirror / "1ABC.pdb").write_text(protein_pdb_file.read_text())
+    monkeypatch.setattr(Config, "PDB_MIRROR_DIR", mirror)
+
+    result = run_screen("1abc", str(smiles_library), str(tmp_path / "out.csv"))
+    assert result["n_succeeded"] == 4
+    assert (Config.PDB_CACHE_DIR / "1ABC.pdb").exists()
+
+
+def test_screen_unknown_pdb_id(smiles_library, tmp_path, monkeypatch):
+    """Test that a missing PDB entry raises a DatabaseError."""
+    monkeypatch.setattr(Config, "PDB_MIRROR_DIR", tmp_path)
+    with pytest.raises(DatabaseError):
+        run_screen("9ZZZ", str(smiles_library), str(tmp_path / "out.csv"))
+
+
+class TestRunPrediction:
+    """Test the single-ligand prediction pipeline."""
+
+    def test_prediction_end_to_end(
+        self, protein_pdb_file, valid_smiles, trained_model_dir, tmp_path
+    ):
+        """Test docking, prediction, result CSV and pose output."""
+        output = tmp_path / "result.csv"
+        result = run_prediction(str(protein_pdb_file), valid_smiles, str(output))
+
+        assert result["status"] == "success"
+        assert result["pKd"] is not None
+        assert result["docking_score"] <= 0.0
+        rows = _read_rows(output)
+        assert len(rows) == 1
+        assert rows[0]["smiles"] == valid_smiles
+        assert float(rows[0]["predicted_pKd"]) == result["pKd"]
+        assert (tmp_path / "ligand_1_pose.pdb").exists()
+        assert rows[0]["pose_file"] == result["pose_file"]
+
+    def test_prediction_matches_screen(
+        self, protein_pdb_file, trained_model_dir, tmp_path
+    ):
+        """Test that single predictions and screens share one code path."""
+        library = tmp_path / "one.smi"
+        library.write_text("CC(=O)Oc1ccccc1C(=O)O aspirin\n")
+        screen_output = tmp_path / "screen.csv"
+        run_screen(
+            str(protein_pdb_file),
+            str(library),
+            str(screen_output),
+            center=(11.0, 11.0, 10.0),
+            jobs=1,
+        )
+        result = run_prediction(
+            str(protein_pdb_file),
+            "CC(=O)Oc1ccccc1C(=O)O",
+            str(tmp_path / "single.csv"),
+            center=(11.0, 11.0, 10.0),
+            save_pose=False,
+        )
+        row = _read_rows(screen_output)[0]
+        assert float(row["docking_score_kcal_mol"]) == result["docking_score"]
+        assert float(row["predicted_pKd"]) == result["pKd"]
+        assert result["pose_file"] is None
+
+    def test_prediction_metrics(
+        self, protein_pdb_file, valid_smiles, trained_model_dir, tmp_path
+    ):
+        """Test per-stage timings, cache counters and the metrics file."""
+        metrics_file = tmp_path / "run.prom"
+        first = run_prediction(
+            str(protein_pdb_file), valid_smiles, str(tmp_path / "first.csv")
+        )["metrics"]
+        second = run_prediction(
+            str(protein_pdb_file),
+            valid_smiles,
+            str(tmp_path / "second.csv"),
+            metrics_file=str(metrics_file),
+        )["metrics"]
+
+        assert set(first["stages"]) == {
+            "validation",
+            "protein_prep",
+            "ligand_prep",
+            "site_detection",
+            "grid_maps",
+            "docking",
+            "features",
+            "ml",
+            "output",
+        }
+        assert first["stages"]["docking"]["cpu_time"] >= 0.0
+        assert first["counters"]["receptor_cache_misses"] == 1
+        assert second["counters"]["receptor_cache_hits"] == 1
+        assert second["counters"]["grid_map_cache_hits"] == 1
+        assert second["counters"]["ligand_cache_hits"] == 1
+        assert first["peak_rss_bytes"] > 0
+        assert 'bindigo_stage_wall_seconds{pipeline="predict",stage="docking"}' in (
+            metrics_file.read_text()
+        )
+
+
+def test_screen_metrics(protein_pdb_file, smiles_library, tmp_path):
+    """Test that screens report executor stage times and cache counters."""
+    metrics_file = tmp_path / "metrics.json"
+    result = run_screen(
+        str(protein_pdb_file),
+        str(smiles_library),
+        str(tmp_path / "out.csv"),
+        jobs=1,
+        metrics_file=str(metrics_file),
+    )
+    stages = result["metrics"]["stages"]
+    assert stages["docking"]["calls"] == 1
+    assert stages["ligand_prep"]["cpu_time"] is None
+    assert stages["output"]["calls"] == 1
+    assert result["metrics"]["counters"]["ligand_cache_misses"] == 4
+    assert json.loads(metrics_file.read_text())["pipeline"] == "screen"
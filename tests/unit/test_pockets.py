@@ -0,0 +1,130 @@
+"""
+Test geometric pocket detection.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from bindigo.core.config import Config
+from bindigo.core.pipeline import resolve_binding_site
+from bindigo.preprocessing import pockets
+from bindigo.preprocessing.pockets import detect_pockets, find_pockets
+from bindigo.utils.exceptions import InputError
+
+CAVITY = np.array([12.0, 20.0, 14.0])
+
+
+def _block_with_cavity(extent=33.0, radius=6.0):
+    """Return jittered lattice atoms filling a cube, minus a spherical cavity."""
+    rng = np.random.default_rng(0)
+    axis = np.arange(0.0, extent, 1.5)
+    coords = np.stack(np.meshgrid(axis, axis, axis, indexing="ij"), -1).reshape(-1, 3)
+    coords += rng.normal(scale=0.2, size=coords.shape)
+    return coords[np.linalg.norm(coords - CAVITY, axis=1) > radius]
+
+
+def _write_pdbqt(path, coords):
+    lines = [
+        f"ATOM  {i % 100000:5d}  C   UNL A   1    "
+        f"{x:8.3f}{y:8.3f}{z:8.3f}  1.00  0.00     0.000 C \n"
+        for i, (x, y, z) in enumerate(coords, start=1)
+    ]
+    path.write_text("".join(lines))
+    return path
+
+
+class TestFindPockets:
+    """Test pocket detection on atom coordinates."""
+
+    def test_finds_buried_cavity(self):
+        """Test that a cavity inside a protein-like block is the top pocket."""
+        found = find_pockets(_block_with_cavity())
+        assert len(found) == 1
+        pocket = found[0]
+        assert pocket["rank"] == 1
+        assert np.allclose(pocket["center"], CAVITY, atol=0.5)
+        assert pocket["buriedness"] == 7.0
+        assert pocket["size"] >= pockets.MIN_BOX_SIZE
+
+    def test_ranked_by_volume(self):
+        """Test that the larger of two cavities comes first."""
+        coords = _block_with_cavity(extent=45.0, radius=7.0)
+        small = np.array([32.0, 32.0, 32.0])
+        coords = coords[np.linalg.norm(coords - small, axis=1) > 5.5]
+        found = find_pockets(coords)
+        assert [p["rank"] for p in found] == [1, 2]
+        assert found[0]["volume"] > found[1]["volume"]
+        assert np.allclose(found[0]["center"], CAVITY, atol=0.5)
+        assert np.allclose(found[1]["center"], small, atol=0.5)
+
+    def test_no_pocket_in_small_or_empty_structures(self):
+        """Test structures without buried space."""
+        assert find_pockets(np.empty((0, 3))) == []
+        assert find_pockets(np.array([[0.0, 0.0, 0.0], [1.5, 0.0, 0.0]])) == []
+
+    def test_ten_thousand_atoms_under_a_second(self):
+        """Test detection speed on a 10k-atom receptor."""
+        coords = _block_with_cavity()
+        assert len(coords) > 10_000
+        start = time.perf_counter()
+        find_pockets(coords)
+        assert time.perf_counter() - start < 1.0
+
+
+class TestDetectPockets:
+    """Test pocket detection on receptor files and its cache."""
+
+    def test_cached_per_receptor(self, tmp_path, monkeypatch):
+        """Test that a second detection is served from the cache."""
+        receptor = _write_pdbqt(tmp_path / "receptor.pdbqt", _block_with_cavity())
+        first = detect_pockets(receptor)
+        assert len(list(Config.POCKET_CACHE_DIR.glob("*.json"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("pockets recomputed")
+
+        monkeypatch.setattr(pockets, "find_pockets", fail)
+        assert detect_pockets(receptor) == first
+        with pytest.raises(AssertionError):
+            detect_pockets(receptor, use_cache=False)
+
+
+class TestResolveBindingSite:
+    """Test how the pipeline picks the docking box."""
+
+    def test_uses_largest_pocket(self, tmp_path):
+        """Test that a missing center is filled from the detected pocket."""
+        receptor = {
+            "pdbqt_file": str(
+                _write_pdbqt(tmp_path / "receptor.pdbqt", _block_with_cavity())
+            )
+        }
+        pocket = detect_pockets(receptor["pdbqt_file"])[0]
+        assert resolve_binding_site(receptor, None, None) == (
+            pocket["center"],
+            pocket["size"],
+        )
+        assert resolve_binding_site(receptor, None, 25.0)[1] == 25.0
+        assert resolve_binding_site(receptor, (1, 2, 3), None) == (
+            (1.0, 2.0, 3.0),
+            Config.BINDING_SITE_DEFAULT_SIZE,
+        )
+
+    def test_falls_back_to_centroid(self, tmp_path):
+        """Test receptors without a pocket are boxed around their centroid."""
+        receptor = {
+            "pdbqt_file": str(
+                _write_pdbqt(tmp_path / "receptor.pdbqt", [(0, 0, 0), (2, 0, 0)])
+            )
+        }
+        center, size = resolve_binding_site(receptor, None, None)
+        assert center == (1.0, 0.0, 0.0)
+        assert size == Config.BINDING_SITE_DEFAULT_SIZE
+
+    def test_auto_detect_disabled(self, tmp_path, monkeypatch):
+        """Test that a center is required when detection is disabled."""
+        monkeypatch.setattr(Config, "BINDING_SITE_AUTO_DETECT", False)
+        with pytest.raises(InputError):
+            resolve_binding_site({"pdbqt_file": "unused"}, None, None)
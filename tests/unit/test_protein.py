@@ -0,0 +1,106 @@
+"""
+Test protein preparation and the prepared-receptor cache.
+"""
+
+import os
+
+import pytest
+
+from bindigo.core.config import Config
+from bindigo.preprocessing.protein import (
+    ReceptorCache,
+    prepare_protein,
+    prepare_receptor,
+    receptor_cache_key,
+)
+from bindigo.utils.exceptions import ProteinError
+
+
+class TestPrepareProtein:
+    """Test protein cleaning and PDBQT conversion."""
+
+    def test_removes_water_and_selects_chain(self, protein_pdb_file):
+        """Test that waters and other chains are dropped."""
+        pdb_text, pdbqt_text = prepare_protein(protein_pdb_file)
+        assert "HOH" not in pdb_text
+        assert "ALA" not in pdb_text
+        assert "GLY A" in pdb_text
+
+    def test_keeps_water_when_disabled(self, protein_pdb_file):
+        """Test that waters are kept when water removal is disabled."""
+        pdb_text, _ = prepare_protein(protein_pdb_file, remove_water=False)
+        assert "HOH" in pdb_text
+
+    def test_adds_polar_hydrogens_to_pdbqt(self, protein_pdb_file):
+        """Test hydrogens are added and typed in the PDBQT output."""
+        pdb_text, pdbqt_text = prepare_protein(protein_pdb_file)
+        types = [line[77:79].strip() for line in pdbqt_text.splitlines()]
+        assert "HD" in types
+        assert "OA" in types
+        # Non-polar hydrogens are merged into heavy atoms
+        assert "H" not in types
+
+    def test_no_hydrogens(self, protein_pdb_file):
+        """Test preparation without hydrogen addition."""
+        _, pdbqt_text = prepare_protein(protein_pdb_file, add_hydrogens=False)
+        assert len(pdbqt_text.splitlines()) == 4
+
+    def test_missing_chain_raises_error(self, protein_pdb_file):
+        """Test that selecting a nonexistent chain raises an error."""
+        with pytest.raises(ProteinError):
+            prepare_protein(protein_pdb_file, select_chain="Z")
+
+
+class TestReceptorCache:
+    """Test the prepared-receptor cache."""
+
+    def test_cache_key_depends_on_settings(self, protein_pdb_file):
+        """Test that different settings produce different keys."""
+        base = {"remove_water": True, "add_hydrogens": True, "select_chain": "A"}
+        key = receptor_cache_key(protein_pdb_file, base)
+        assert key == receptor_cache_key(protein_pdb_file, dict(base))
+        assert key != receptor_cache_key(
+            protein_pdb_file, {**base, "remove_water": False}
+        )
+
+    def test_cache_hit_skips_preparation(self, protein_pdb_file, monkeypatch):
+        """Test that a warm cache returns the stored receptor."""
+        first = prepare_receptor(str(protein_pdb_file))
+        assert first["pdbqt_file"].startswith(str(Config.RECEPTOR_CACHE_DIR))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("receptor was prepared again")
+
+        monkeypatch.setattr("bindigo.preprocessing.protein.prepare_protein", fail)
+        assert prepare_receptor(str(protein_pdb_file)) == first
+
+    def test_content_change_invalidates(self, protein_pdb_file):
+        """Test that editing the structure produces a new entry."""
+        first = prepare_receptor(str(protein_pdb_file))
+        protein_pdb_file.write_text(
+            protein_pdb_file.read_text().replace("10.000  10.000", "10.500  10.000")
+        )
+        second = prepare_receptor(str(protein_pdb_file))
+        assert first["cache_key"] != second["cache_key"]
+
+    def test_lru_eviction(self, tmp_path):
+        """Test that least recently used entries are evicted first."""
+        cache = ReceptorCache(tmp_path / "receptors", max_size_mb=0.01)
+        payload = "x" * 3000
+        for index, key in enumerate(["a", "b", "c"]):
+            cache.put(key, payload, "")
+            metadata = cache.cache_dir / key / "metadata.json"
+            os.utime(metadata, (1000 + index, 1000 + index))
+
+        # Touch "a" so that "b" is now the least recently used entry
+        assert cache.get("a") is not None
+        cache.put("d", payload, "")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("d") is not None
+        assert cache.size_bytes() <= 0.01 * 1024 * 1024
+
+    def test_miss_returns_none(self, tmp_path):
+        """Test lookup of an unknown key."""
+        assert ReceptorCache(tmp_path).get("missing") is None
@@ -0,0 +1,198 @@
+"""
+Test the long-lived predictor and the prediction server.
+"""
+
+import pytest
+
+from bindigo.core.pipeline import RESULT_COLUMNS, run_prediction
+from bindigo.core.predictor import BindingPredictor
+from bindigo.core.server import (
+    PredictionClient,
+    PredictionServer,
+    format_address,
+    parse_address,
+)
+from bindigo.utils.exceptions import InputError, LigandError, ServerError
+
+CENTER = (11.0, 11.0, 10.0)
+
+
+@pytest.fixture
+def predictor():
+    with BindingPredictor(batch_window_ms=0) as predictor:
+        yield predictor
+
+
+class TestBindingPredictor:
+    """Test BindingPredictor."""
+
+    def test_matches_run_prediction(
+        self, predictor, protein_pdb_file, valid_smiles, trained_model_dir, tmp_path
+    ):
+        """Test that warm predictions give the same results as the pipeline."""
+        expected = run_prediction(
+            str(protein_pdb_file),
+            valid_smiles,
+            str(tmp_path / "out.csv"),
+            center=CENTER,
+            save_pose=False,
+        )
+        result = predictor.predict(str(protein_pdb_file), valid_smiles, center=CENTER)
+
+        assert result["docking_score"] == expected["docking_score"]
+        assert result["pKd"] == expected["pKd"]
+        assert result["status"] == "success"
+        assert list(result["row"]) == RESULT_COLUMNS
+        assert "poses" not in result
+
+    def test_targets_stay_warm(
+        self, predictor, protein_pdb_file, valid_smiles, trained_model_dir
+    ):
+        """Test that the second request reuses the prepared target."""
+        first = predictor.predict(str(protein_pdb_file), valid_smiles, center=CENTER)
+        second = predictor.predict(
+            str(protein_pdb_file), "CCO", center=CENTER, save_pose=True
+        )
+
+        assert first["metrics"]["counters"]["target_misses"] == 1
+        assert second["metrics"]["counters"]["target_hits"] == 1
+        assert "protein_prep" not in second["metrics"]["stages"]
+        assert "grid_maps" not in second["metrics"]["stages"]
+        assert "MODEL" in second["poses"]
+        stats = predictor.stats()
+        assert stats["predictions"] == 2
+        assert stats["model_loaded"]
+        assert [t["predictions"] for t in stats["targets"]] == [2]
+
+    def test_close_releases_ligand_cache(self, protein_pdb_file):
+        """Test that closing the predictor closes its ligand cache."""
+        predictor = BindingPredictor(batch_window_ms=0)
+        predictor.predict(str(protein_pdb_file), "CCO", center=CENTER)
+        predictor.close()
+        assert predictor._ligand_cache._connection is None
+
+    def test_least_recently_used_target_dropped(self, protein_pdb_file):
+        """Test that at most max_targets targets are kept."""
+        with BindingPredictor(max_targets=1) as predictor:
+            predictor.prepare_target(str(protein_pdb_file), center=CENTER)
+            predictor.prepare_target(str(protein_pdb_file), center=(12.0, 11.0, 10.0))
+            targets = predictor.stats()["targets"]
+        assert [t["center"] for t in targets] == [[12.0, 11.0, 10.0]]
+
+    def test_invalid_ligand(self, predictor, protein_pdb_file):
+        """Test that errors are raised to the caller."""
+        with pytest.raises((InputError, LigandError)):
+            predictor.predict(str(protein_pdb_file), "not a smiles", center=CENTER)
+        with pytest.raises(InputError):
+            predictor.predict(str(protein_pdb_file), "CCO", center=(1.0, 2.0))
+
+
+class TestMicroBatching:
+    """Test coalescing of concurrent requests into micro-batches."""
+
+    def test_requests_batched_by_target(
+        self, protein_pdb_file, trained_model_dir, tmp_path
+    ):
+        """Test that queued requests are docked and predicted per target."""
+        protein = str(protein_pdb_file)
+        other_box = (12.0, 11.0, 10.0)
+        ligands = ["CCO", "CC(=O)Oc1ccccc1C(=O)O", "c1ccccc1O"]
+        expected = [
+            run_prediction(protein, smiles, str(tmp_path / "out.csv"), center=CENTER)[
+                "pKd"
+            ]
+            for smiles in ligands
+        ]
+
+        with BindingPredictor(batch_window_ms=1000, max_batch_size=5) as predictor:
+            futures = [predictor.submit(protein, smiles, CENTER) for smiles in ligands]
+            futures.append(predictor.submit(protein, "CCO", other_box))
+            futures.append(predictor.submit(protein, "not a smiles", CENTER))
+            results = [future.result() for future in futures[:4]]
+            with pytest.raises((InputError, LigandError)):
+                futures[4].result()
+            stats = predictor.stats()
+
+        assert [result["pKd"] for result in results[:3]] == expected
+        assert [result["batch_size"] for result in results] == [4, 4, 4, 1]
+        assert results[0]["metrics"]["stages"]["docking"]["calls"] == 1
+        assert results[3]["center"] == other_box
+        assert stats["batches"] == 1
+        assert stats["predictions"] == 4
+
+    def test_batch_window_bounds_wait(self, protein_pdb_file):
+        """Test that a full batch is served without waiting for the window."""
+        protein = str(protein_pdb_file)
+        with BindingPredictor(batch_window_ms=60000, max_batch_size=2) as predictor:
+            predictor.prepare_target(protein, center=CENTER)
+            futures = [predictor.submit(protein, "CCO", CENTER) for _ in range(2)]
+            results = [future.result(timeout=30) for future in futures]
+        assert [result["batch_size"] for result in results] == [2, 2]
+
+
+class TestPredictionServer:
+    """Test the server and client over TCP and Unix sockets."""
+
+    @pytest.mark.parametrize("transport", ["tcp", "unix"])
+    def test_predict_through_server(
+        self,
+        transport,
+        predictor,
+        protein_pdb_file,
+        valid_smiles,
+        trained_model_dir,
+        tmp_path,
+    ):
+        """Test a round trip through the server."""
+        address = "127.0.0.1:0"
+        if transport == "unix":
+            address = f"unix:{tmp_path / 'bindigo.sock'}"
+        with PredictionServer(predictor, address).start() as server:
+            client = PredictionClient(format_address(server.address))
+            result = client.predict(str(protein_pdb_file), valid_smiles, center=CENTER)
+            health = client.health()
+
+        assert result["status"] == "success"
+        assert result["center"] == list(CENTER)
+        assert health["status"] == "ok"
+        assert health["predictions"] == 1
+        assert not (tmp_path / "bindigo.sock").exists()
+
+    def test_errors_raised_in_client(self, predictor, protein_pdb_file):
+        """Test that server-side Bindigo errors are re-raised by the client."""
+        with PredictionServer(predictor, "127.0.0.1:0").start() as server:
+            client = PredictionClient(format_address(server.address))
+            with pytest.raises(InputError):
+                client.predict(str(protein_pdb_file), "CCO", box_size=-1.0)
+
+    def test_unreachable_server(self, tmp_path):
+        """Test the error for a server that is not running."""
+        client = PredictionClient(f"unix:{tmp_path / 'missing.sock'}")
+        with pytest.raises(ServerError):
+            client.health()
+
+    def test_stale_socket_replaced(self, predictor, tmp_path):
+        """Test that a socket file left by a dead server is removed."""
+        import socket
+
+        path = tmp_path / "bindigo.sock"
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(str(path))
+        stale.close()
+
+        with PredictionServer(predictor, f"unix:{path}").start() as server:
+            assert PredictionClient(format_address(server.address)).health()
+            with pytest.raises(ServerError):
+                PredictionServer(predictor, f"unix:{path}")
+
+
+def test_parse_address(tmp_path):
+    """Test server address parsing."""
+    assert parse_address(None) == ("127.0.0.1", 8765)
+    assert parse_address("localhost:9000") == ("localhost", 9000)
+    assert parse_address("http://localhost:9000/") == ("localhost", 9000)
+    assert parse_address(":9000") == ("127.0.0.1", 9000)
+    assert parse_address(f"unix:{tmp_path}/s.sock") == f"{tmp_path}/s.sock"
+    assert parse_address(f"{tmp_path}/s.sock") == f"{tmp_path}/s.sock"
+    with pytest.raises(InputError):
+        parse_address("localhost")
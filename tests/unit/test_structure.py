@@ -0,0 +1,236 @@
+"""
+Test the array-backed protein structure and its parsers.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from bindigo.preprocessing.structure import (
+    clean_structure,
+    parse_mmcif,
+    parse_pdb,
+    read_structure,
+)
+from bindigo.utils.exceptions import ProteinError
+
+PDB_TEXT = (
+    "HEADER    TEST\n"
+    "ATOM      1  N   GLY A   1      10.000  10.000  10.000  1.00  5.00           N\n"
+    "ATOM      2  CA AGLY A   1      11.450  10.000  10.000  0.60  5.00           C\n"
+    "ATOM      3  CA BGLY A   1      11.500  10.100  10.000  0.40  5.00           C\n"
+    "ATOM      4  N   ALA A   2A     13.000  11.000  10.000  1.00  5.00           N\n"
+    "ATOM      5  N   ALA B   1      20.000  10.000  10.000  1.00  5.00           N\n"
+    "HETATM    6  O   HOH A 101      15.000  15.000  15.000  1.00  0.00           O\n"
+    "ENDMDL\n"
+    "ATOM      7  N   GLY A   1      99.000  99.000  99.000  1.00  5.00           N\n"
+)
+
+CIF_TEXT = """data_TEST
+#
+_entry.id TEST
+#
+loop_
+_atom_site.group_PDB
+_atom_site.id
+_atom_site.type_symbol
+_atom_site.label_atom_id
+_atom_site.label_alt_id
+_atom_site.label_comp_id
+_atom_site.label_asym_id
+_atom_site.label_seq_id
+_atom_site.pdbx_PDB_ins_code
+_atom_site.Cartn_x
+_atom_site.Cartn_y
+_atom_site.Cartn_z
+_atom_site.occupancy
+_atom_site.B_iso_or_equiv
+_atom_site.auth_seq_id
+_atom_site.auth_asym_id
+_atom_site.pdbx_PDB_model_num
+ATOM   1 N N     . GLY A 1 ? 10.000 10.000 10.000 1.00 5.00 1 A 1
+ATOM   2 C "C5'" A DA  A 2 ? 11.450 10.000 10.000 0.60 5.00 2 A 1
+ATOM   3 C "C5'" B DA  A 2 ? 11.500 10.100 10.000 0.40 5.00 2 A 1
+HETATM 4 O O     . HOH C . ? 15.000 15.000 15.000 1.00 0.00 101 B 1
+ATOM   5 N N     . GLY A 1 ? 99.000 99.000 99.000 1.00 5.00 1 A 2
+#
+loop_
+_atom_type.symbol
+C
+"""
+
+
+class TestParsePDB:
+    """Test PDB parsing into arrays."""
+
+    def test_fields(self):
+        """Test that each column lands in its array."""
+        structure = parse_pdb(PDB_TEXT)
+        assert len(structure) == 6
+        assert structure.coords.dtype == np.float32
+        assert structure.coords[1].tolist() == pytest.approx([11.45, 10.0, 10.0])
+        assert structure.names.tolist() == [b"N", b"CA", b"CA", b"N", b"N", b"O"]
+        assert structure.altlocs.tolist() == [b"", b"A", b"B", b"", b"", b""]
+        assert structure.icodes[3] == b"A"
+        assert structure.occupancy[2] == pytest.approx(0.4)
+        assert structure.hetero.tolist() == [False] * 5 + [True]
+        assert structure.chains == ["A", "B"]
+
+    def test_residue_index(self):
+        """Test residue numbering by chain, number and insertion code."""
+        structure = parse_pdb(PDB_TEXT)
+        assert structure.residue_index.tolist() == [0, 0, 0, 1, 2, 3]
+        assert structure.n_residues == 4
+
+    def test_element_guessed_from_name(self):
+        """Test a missing element column."""
+        structure = parse_pdb(
+            "ATOM      1  CA  GLY A   1      10.000  10.000  10.000\n"
+        )
+        assert structure.elements.tolist() == [b"C"]
+        assert structure.occupancy[0] == 1.0
+
+    def test_crlf_and_short_lines(self):
+        """Test Windows line endings and records without trailing columns."""
+        structure = parse_pdb(
+            "ATOM      1  N   GLY A   1      10.000  10.000  10.000\r\n"
+            "ATOM      2 FE   HEM A   2      11.000  10.000  10.000\r\n"
+        )
+        assert structure.elements.tolist() == [b"N", b"F"]
+        assert structure.names.tolist() == [b"N", b"FE"]
+        assert structure.b_factors.tolist() == [0.0, 0.0]
+
+    def test_malformed_record(self):
+        """Test that bad coordinates raise a ProteinError."""
+        with pytest.raises(ProteinError):
+            parse_pdb("ATOM      1  N   GLY A   1      xx.000  10.000  10.000\n")
+
+    def test_round_trip(self):
+        """Test that formatted PDB text parses back to the same arrays."""
+        structure = parse_pdb(PDB_TEXT)
+        again = parse_pdb(structure.to_pdb())
+        for name in ("coords", "names", "res_names", "chain_ids", "res_seq"):
+            assert np.array_equal(getattr(again, name), getattr(structure, name))
+
+
+class TestParseMMCIF:
+    """Test mmCIF parsing into arrays."""
+
+    def test_first_model_and_auth_fields(self):
+        """Test that author fields and the first model are used."""
+        structure = parse_mmcif(CIF_TEXT)
+        assert len(structure) == 4
+        assert structure.names[1] == b"C5'"
+        assert structure.chain_ids.tolist() == [b"A", b"A", b"A", b"B"]
+        assert structure.res_seq.tolist() == [1, 2, 2, 101]
+        assert structure.altlocs.tolist() == [b"", b"A", b"B", b""]
+        assert structure.icodes.tolist() == [b""] * 4
+        assert structure.hetero[3]
+
+    def test_matches_pdb_parser(self, tmp_path):
+        """Test that the same atoms parse identically from both formats."""
+        cif = parse_mmcif(CIF_TEXT)
+        pdb = parse_pdb(cif.to_pdb())
+        assert np.array_equal(pdb.coords, cif.coords)
+        assert np.array_equal(pdb.names, cif.names)
+
+    def test_long_chain_ids_in_pdb_output(self, caplog):
+        """Test that chain IDs PDB cannot hold are cut with a warning or refused."""
+        cut = parse_mmcif(CIF_TEXT.replace(" 101 B 1", " 101 BB 1"))
+        assert parse_pdb(cut.to_pdb()).chains == ["A", "B"]
+        assert "BB" in caplog.text
+
+        merged = parse_mmcif(CIF_TEXT.replace(" 101 B 1", " 101 AB 1"))
+        with pytest.raises(ProteinError, match="AB"):
+            merged.to_pdb()
+
+    def test_large_file_under_a_second(self):
+        """Test parsing speed on a 100k-atom mmCIF."""
+        header = "data_BIG\nloop_\n" + "".join(
+            f"_atom_site.{item}\n"
+            for item in (
+                "group_PDB id type_symbol label_atom_id label_alt_id label_comp_id "
+                "label_asym_id label_seq_id Cartn_x Cartn_y Cartn_z occupancy "
+                "B_iso_or_equiv auth_asym_id pdbx_PDB_model_num"
+            ).split()
+        )
+        rows = "".join(
+            f"ATOM {i} C CA . GLY A {i // 4} {i % 97}.5 {i % 89}.25 {i % 83}.125 "
+            "1.00 10.00 A 1\n"
+            for i in range(100_000)
+        )
+        data = (header + rows + "#\n").encode()
+        start = time.perf_counter()
+        structure = parse_mmcif(data)
+        assert time.perf_counter() - start < 1.0
+        assert len(structure) == 100_000
+        assert structure.coords[-1].tolist() == [89.5, 52.25, 67.125]
+
+    def test_missing_atom_site(self):
+        """Test mmCIF data without coordinates."""
+        with pytest.raises(ProteinError):
+            parse_mmcif("data_EMPTY\n_entry.id EMPTY\n")
+
+
+class TestCleanStructure:
+    """Test mask-based cleaning."""
+
+    def test_clean(self):
+        """Test altloc filtering, chain selection and water removal."""
+        structure = clean_structure(parse_pdb(PDB_TEXT), True, "A")
+        assert structure.names.tolist() == [b"N", b"CA", b"N"]
+        assert structure.altlocs[1] == b"A"
+        assert structure.chains == ["A"]
+
+    def test_keep_water_and_chains(self):
+        """Test cleaning with water and all chains kept."""
+        structure = clean_structure(parse_pdb(PDB_TEXT), False, None)
+        assert len(structure) == 5
+        assert structure.chains == ["A", "B"]
+
+    def test_missing_chain(self):
+        """Test selecting a chain that does not exist."""
+        with pytest.raises(ProteinError):
+            clean_structure(parse_pdb(PDB_TEXT), True, "Z")
+
+    def test_compact_memory(self):
+        """Test that per-atom storage stays small."""
+        structure = parse_pdb(PDB_TEXT)
+        assert structure.nbytes / len(structure) < 64
+
+
+def test_read_structure_by_extension(tmp_path):
+    """Test that .cif files use the mmCIF parser."""
+    cif = tmp_path / "test.cif"
+    cif.write_text(CIF_TEXT)
+    pdb = tmp_path / "test.ent"
+    pdb.write_text(PDB_TEXT)
+    assert len(read_structure(cif)) == 4
+    assert len(read_structure(pdb)) == 6
+    with pytest.raises(ProteinError):
+        read_structure(tmp_path / "missing.pdb")
+
+
+@pytest.mark.parametrize("suffix, text", [(".pdb", PDB_TEXT), (".cif", CIF_TEXT)])
+def test_read_structure_mmap(tmp_path, suffix, text):
+    """Test that memory-mapped reading gives the same structure."""
+    path = tmp_path / f"test{suffix}"
+    path.write_text(text)
+    mapped = read_structure(path, use_mmap=True)
+    read = read_structure(path, use_mmap=False)
+    for name in ("coords", "names", "chain_ids", "res_seq", "altlocs"):
+        assert np.array_equal(getattr(mapped, name), getattr(read, name))
+    empty = tmp_path / f"empty{suffix}"
+    empty.write_text("")
+    if suffix == ".pdb":
+        assert len(read_structure(empty, use_mmap=True)) == 0
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_read_structure_malformed(tmp_path, use_mmap):
+    """Test that malformed files raise a ProteinError, memory-mapped or not."""
+    path = tmp_path / "bad.pdb"
+    path.write_text("ATOM      1  N   GLY A   1      1x.000  10.000  10.000\n")
+    with pytest.raises(ProteinError, match="Malformed"):
+        read_structure(path, use_mmap=use_mmap)
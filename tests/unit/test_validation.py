@@ -13,6 +13,7 @@ from bindigo.utils.validation import (
     validate_binding_site,
     validate_output_path,
 )
+from bindigo.core.config import Config
 from bindigo.utils.exceptions import InputError, FileFormatError
 
 
@@ -128,6 +129,32 @@ class TestOutputPathValidation:
         validated = validate_output_path(str(output_path))
         assert validated.suffix == ".csv"
 
+    def test_gzipped_csv_path(self, temp_output_dir):
+        """Test that gzipped CSV output is accepted."""
+        output_path = temp_output_dir / "results.csv.gz"
+        validated = validate_output_path(str(output_path))
+        assert validated.name == "results.csv.gz"
+
+    def test_columnar_paths(self, temp_output_dir):
+        """Test that Parquet and Arrow outputs are accepted."""
+        for name in ["results.parquet", "results.arrow"]:
+            validated = validate_output_path(str(temp_output_dir / name))
+            assert validated.name == name
+
+    def test_extension_from_output_format(self, temp_output_dir, monkeypatch):
+        """Test that extensionless paths follow the requested format."""
+        output_path = str(temp_output_dir / "results")
+        assert validate_output_path(output_path, "parquet").suffix == ".parquet"
+        monkeypatch.setattr(Config, "OUTPUT_FORMAT", "arrow")
+        assert validate_output_path(output_path).suffix == ".arrow"
+
+    def test_format_mismatch_raises_error(self, temp_output_dir):
+        """Test that an extension contradicting the format is rejected."""
+        with pytest.raises(InputError):
+            validate_output_path(str(temp_output_dir / "results.csv"), "parquet")
+        with pytest.raises(InputError):
+            validate_output_path(str(temp_output_dir / "results"), "xlsx")
+
     def test_invalid_extension_raises_error(self, temp_output_dir):
         """Test that invalid extension raises error."""
         output_path = temp_output_dir / "results.txt"
@@ -0,0 +1,112 @@
+"""
+Test the supervised worker pool.
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bindigo.core.config import Config
+from bindigo.core.workers import WorkerPool
+from bindigo.utils.exceptions import InputError, WorkerError
+
+_STATE = {}
+
+
+def _init(value):
+    _STATE["value"] = value
+
+
+def _work(x):
+    return _STATE.get("value", 0) + x, os.getpid()
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _chunk_size():
+    return Config.SCREEN_CHUNK_SIZE
+
+
+def _fail():
+    raise InputError("bad item")
+
+
+def _mark_stopped():
+    with open(_STATE["value"], "w") as f:
+        f.write("stopped")
+
+
+def test_runs_tasks_in_initialized_workers():
+    """Test that tasks run in worker processes set up by the initializer."""
+    with WorkerPool(2, initializer=_init, initargs=(10,)) as pool:
+        result, pid = pool.run(_work, (1,))
+    assert result == 11
+    assert pid != os.getpid()
+
+
+def test_task_errors_are_raised():
+    """Test that a task's exception reaches the caller and keeps the worker."""
+    with WorkerPool(1) as pool:
+        with pytest.raises(InputError, match="bad item"):
+            pool.run(_fail)
+        pool.run(_work, (1,))
+        assert pool.workers_started == 1
+
+
+def test_finalizer_runs_when_worker_stops(tmp_path):
+    """Test that the finalizer runs in each worker when the pool closes."""
+    marker = tmp_path / "stopped"
+    with WorkerPool(1, _init, (str(marker),), finalizer=_mark_stopped) as pool:
+        pool.run(_sleep, (0,))
+    assert marker.read_text() == "stopped"
+
+
+def test_timeout_kills_and_replaces_worker():
+    """Test that a task past its timeout is killed and the pool recovers."""
+    with WorkerPool(1) as pool:
+        first = pool.run(_sleep, (0,))
+        start = time.perf_counter()
+        with pytest.raises(WorkerError, match="timed out"):
+            pool.run(_sleep, (30,), timeout=0.5)
+        assert time.perf_counter() - start < 10
+        second = pool.run(_sleep, (0,))
+    assert first != second
+    assert pool.workers_killed == 1
+    assert pool.workers_started == 2
+
+
+def test_memory_budget_limits_workers():
+    """Test that a tiny memory budget keeps the pool to one worker."""
+    with WorkerPool(3, memory_limit=1) as pool:
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            pids = list(threads.map(lambda _: pool.run(_sleep, (0.2,)), range(6)))
+    assert pool.peak_workers == 1
+    assert len(set(pids)) == 1
+
+
+def test_workers_without_budget_run_concurrently():
+    """Test that without a budget all workers are used."""
+    with WorkerPool(3) as pool:
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            list(threads.map(lambda _: pool.run(_sleep, (0.5,)), range(3)))
+    assert pool.peak_workers == 3
+
+
+def test_workers_within_budget_start_together():
+    """Test that workers fitting the budget run at once."""
+    with WorkerPool(3, memory_limit=2**40) as pool:
+        with ThreadPoolExecutor(max_workers=3) as threads:
+            list(threads.map(lambda _: pool.run(_sleep, (0.5,)), range(3)))
+    assert pool.peak_workers == 3
+
+
+def test_workers_see_parent_config(monkeypatch):
+    """Test that workers started without fork get the parent's Config."""
+    monkeypatch.setattr(Config, "SCREEN_CHUNK_SIZE", 7)
+    with WorkerPool(1, start_method="spawn") as pool:
+        assert pool.run(_chunk_size) == 7